@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 _ = os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+# Serve the read endpoints with the async views, see common/async_views.py.
+_ = os.environ.setdefault("ASYNC_READS", "True")
 
 application = get_asgi_application()
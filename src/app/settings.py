@@ -10,7 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import importlib
 import os
+import sys
 from pathlib import Path
 from typing import Any
 
@@ -50,6 +52,13 @@ INSTALLED_APPS = [
     "board",
     "subtask",
     "summary",
+    "search",
+    "transfer",
+    "jobs",
+    "monitoring",
+    "changefeed",
+    "sync",
+    "response_cache",
     "contact",
     "colorfield",
     "category",
@@ -61,12 +70,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "common.timing.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "common.replicas.ReplicaStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -99,21 +110,85 @@ USE_SQLITE = os.environ.get("USE_SQLITE", "True").lower() == "true"
 
 SQLITE_DB = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "common.db.sqlite3",
         "NAME": os.path.join(os.path.dirname(__file__), "db.sqlite3"),
     }
 }
-POSTGRES_DB = {
+
+# How gunicorn workers connect to PostgreSQL, see common/db:
+# - "persistent" keeps a connection per worker thread for DB_CONN_MAX_AGE
+#   seconds and checks it is alive before reusing it in a new request.
+# - "pool" uses Django's psycopg pool (needs ``pip install "psycopg[pool]"``).
+#   Every worker process has its own pool, so keep
+#   workers * DB_POOL_MAX_SIZE below the server's max_connections.
+# - "none" opens a new connection for every request.
+# Under ASGI (docker-compose.asgi.yml) Django closes the connection after every
+# request, so use "pool" or "none" there.
+DB_CONNECTIONS = os.environ.get("DB_CONNECTIONS", "persistent")
+POSTGRES_DB: dict[str, dict[str, Any]] = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "common.db.postgresql",
         "HOST": os.environ.get("DB_HOST", "scrum-api-db"),
         "NAME": os.environ.get("DB_NAME", "scrumapidevdb"),
         "USER": os.environ.get("DB_USER", "scrumapichangeme"),
         "PASSWORD": os.environ.get("DB_PASS", "scrumapidevuser"),
+        "CONN_MAX_AGE": (
+            int(os.environ.get("DB_CONN_MAX_AGE", "600"))
+            if DB_CONNECTIONS == "persistent"
+            else 0
+        ),
+        "CONN_HEALTH_CHECKS": DB_CONNECTIONS == "persistent",
+        "OPTIONS": {},
     }
 }
+if DB_CONNECTIONS == "pool":
+    # psycopg_pool is only installed where pooling is used, see DB_CONNECTIONS.
+    ConnectionPool = importlib.import_module("psycopg_pool").ConnectionPool
+
+    POSTGRES_DB["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "1")),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "4")),
+        # Seconds a request waits for a free connection before failing.
+        "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "600")),
+        # Test connections when they are taken from the pool.
+        "check": ConnectionPool.check_connection,
+    }
+
+# Read replicas for safe requests to the task, list, board and summary views,
+# see common/replicas.py. DB_REPLICA_HOSTS lists PostgreSQL replicas of
+# "default"; they mirror "default" in tests. The SQLite "replica" is a second
+# database standing in for one, only defined with READ_REPLICAS=replica and in
+# the test suite, which checks the routing against it.
+for index, host in enumerate(
+    host for host in os.environ.get("DB_REPLICA_HOSTS", "").split(",") if host
+):
+    POSTGRES_DB[f"replica_{index}"] = {
+        **POSTGRES_DB["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
 
 DATABASES = SQLITE_DB if USE_SQLITE else POSTGRES_DB
+DATABASE_ROUTERS = ["common.replicas.ReplicaRouter"]
+READ_REPLICAS = [
+    alias
+    for alias in os.environ.get(
+        "READ_REPLICAS",
+        ",".join(alias for alias in DATABASES if alias.startswith("replica_")),
+    ).split(",")
+    if alias
+]
+TESTING = sys.argv[1:2] == ["test"] or "pytest" in sys.modules
+if USE_SQLITE and ("replica" in READ_REPLICAS or TESTING):
+    SQLITE_DB["replica"] = {
+        "ENGINE": "common.db.sqlite3",
+        "NAME": os.path.join(os.path.dirname(__file__), "replica.sqlite3"),
+    }
+
+# Seconds a user keeps reading from "default" after a write.
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_CACHE_ALIAS = os.environ.get("REPLICA_CACHE_ALIAS") or None
 
 
 # Password validation
@@ -168,10 +243,109 @@ AUTH_USER_MODEL = "core.User"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "user.authentication.CachedTokenAuthentication",
         # other authentication classes as needed
     ],
     "EXCEPTION_HANDLER": "common.exceptions.drf_exception_handler",
+    "DEFAULT_PAGINATION_CLASS": "common.pagination.KeysetPagination",
+    "PAGE_SIZE": 100,
+}
+
+# Cached token authentication, see user/authentication.py.
+# Set TOKEN_AUTH_CACHE_ALIAS to a shared cache (e.g. redis) when running several
+# workers: every local hit then checks a per-user version in it, so a token
+# deletion or user deactivation is honoured by every worker at once. Without a
+# shared cache only the worker handling the change evicts its local LRU, so the
+# local TTL defaults to a few seconds.
+TOKEN_AUTH_CACHE_ALIAS = os.environ.get("TOKEN_AUTH_CACHE_ALIAS") or None
+TOKEN_AUTH_CACHE = {
+    "MAX_SIZE": int(os.environ.get("TOKEN_AUTH_CACHE_MAX_SIZE", "10000")),
+    "TTL": int(os.environ.get("TOKEN_AUTH_CACHE_TTL", "300")),
+    "LOCAL_TTL": int(
+        os.environ.get("TOKEN_AUTH_LOCAL_TTL", "300" if TOKEN_AUTH_CACHE_ALIAS else "5")
+    ),
+    "CACHE_ALIAS": TOKEN_AUTH_CACHE_ALIAS,
+}
+
+# Ordering engine for tasks and lists, see core/ordering.py. "dense" is the
+# django-ordered-model behaviour of shifting every sibling on a move; "sparse"
+# keeps gaps between order keys so a move only updates the moved row.
+ORDERING = {
+    "ENGINE": os.environ.get("ORDERING_ENGINE", "dense"),
+    "GAP": int(os.environ.get("ORDERING_GAP", "1024")),
+    "REBALANCE_IN_BACKGROUND": os.environ.get(
+        "ORDERING_REBALANCE_IN_BACKGROUND", "True"
+    ).lower()
+    == "true",
+}
+
+# Answer the task, list and board list/detail endpoints from flat values() rows
+# instead of the serializers, see common/flat_rows.py. The JSON is identical, but
+# the rows bypass serializer changes, so the fast path is opt-in.
+FLAT_ROW_READS = os.environ.get("FLAT_ROW_READS", "False").lower() == "true"
+
+# Serve the GET requests of the task, list and board list/detail endpoints and
+# the summary with async views and the async ORM, see common/async_views.py.
+# Only useful under an ASGI server, so app/asgi.py turns it on by default; under
+# WSGI every async view would run in its own event loop.
+ASYNC_READS = os.environ.get("ASYNC_READS", "False").lower() == "true"
+
+# Background jobs, see jobs/queue.py. "console" runs them in the request;
+# "database" needs a ``manage.py run_jobs`` worker, as in docker-compose.yml,
+# and "locmem" keeps jobs for tests.
+JOBS = {
+    "BACKEND": os.environ.get("JOBS_BACKEND", "console"),
+    "MAX_ATTEMPTS": int(os.environ.get("JOBS_MAX_ATTEMPTS", "5")),
+    "BACKOFF": int(os.environ.get("JOBS_BACKOFF", "30")),
+    "MAX_BACKOFF": int(os.environ.get("JOBS_MAX_BACKOFF", "3600")),
+}
+
+# Change events of boards, lists, tasks and subtasks streamed to clients, see
+# changefeed/brokers.py. The in-memory broker only reaches the streams of the
+# writing process; use changefeed.brokers.PostgresBroker with several workers
+# or nodes.
+CHANGEFEED: dict[str, Any] = {
+    "BROKER": os.environ.get("CHANGEFEED_BROKER", "changefeed.brokers.InMemoryBroker"),
+    "OPTIONS": {},
+    "HEARTBEAT": float(os.environ.get("CHANGEFEED_HEARTBEAT", "15")),
+    "TICKET_TTL": int(os.environ.get("CHANGEFEED_TICKET_TTL", "30")),
+    "RECHECK": float(os.environ.get("CHANGEFEED_RECHECK", "60")),
+}
+
+# Delta sync, see sync/changes.py. Cursors older than KEEP_TOMBSTONES seconds
+# need a full sync.
+SYNC = {
+    "KEEP_TOMBSTONES": int(os.environ.get("SYNC_KEEP_TOMBSTONES", "2592000")),
+}
+
+# Rendered board, contact and category lists and summaries cached per user, see
+# response_cache/cache.py. Every write to a user's rows retires their entries.
+# RESPONSE_CACHE_ALIAS names a shared cache (e.g. redis) in CACHES, so a write
+# retires the entries of every worker. Without one the cache is off: the
+# per-process default cache would serve other workers' stale entries.
+RESPONSE_CACHE_ALIAS = os.environ.get("RESPONSE_CACHE_ALIAS")
+RESPONSE_CACHE = {
+    "ENABLED": os.environ.get(
+        "RESPONSE_CACHE_ENABLED", str(bool(RESPONSE_CACHE_ALIAS))
+    ).lower()
+    == "true",
+    "CACHE_ALIAS": RESPONSE_CACHE_ALIAS or "default",
+    "TTL": int(os.environ.get("RESPONSE_CACHE_TTL", "300")),
+}
+
+# Query counts and timings of requests, see common/timing.py. Sent in a
+# Server-Timing header and served per view at /api/monitoring/metrics/ in the
+# Prometheus text format. Requests over their budget are logged with their
+# slowest queries, traced to their origin once they take REQUEST_TIMING_SLOW_QUERY_MS;
+# REQUEST_TIMING_BUDGET_MS=0 turns that off.
+REQUEST_TIMING: dict[str, Any] = {
+    "ENABLED": os.environ.get("REQUEST_TIMING_ENABLED", "False").lower() == "true",
+    "SERVER_TIMING": os.environ.get("REQUEST_TIMING_SERVER_TIMING", "True").lower()
+    == "true",
+    "BUDGET_MS": float(os.environ.get("REQUEST_TIMING_BUDGET_MS", "500")),
+    "BUDGETS": {},
+    "SLOW_QUERIES": int(os.environ.get("REQUEST_TIMING_SLOW_QUERIES", "5")),
+    "SLOW_QUERY_MS": float(os.environ.get("REQUEST_TIMING_SLOW_QUERY_MS", "50")),
 }
 
 SPECTACULAR_SETTINGS = {
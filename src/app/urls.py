@@ -36,6 +36,12 @@ urlpatterns = [
     path("api/subtask/", include("subtask.urls")),
     path("api/board/", include("board.urls")),
     path("api/summary/", include("summary.urls")),
+    path("api/search/", include("search.urls")),
+    path("api/transfer/", include("transfer.urls")),
+    path("api/jobs/", include("jobs.urls")),
+    path("api/monitoring/", include("monitoring.urls")),
+    path("api/changes/", include("changefeed.urls")),
+    path("api/sync/", include("sync.urls")),
     path("api/contact/", include("contact.urls")),
     path("api/category/", include("category.urls")),
     path("api/list_of_tasks/", include("list_of_tasks.urls")),
@@ -2,18 +2,26 @@
 Serializers for Board APIs
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, override
 
+from django.db.models import QuerySet
 from rest_framework.serializers import ModelSerializer
 
-from common.serializers_base import BoardModelSerializer
-from core.models import Board
+from common.serializers_base import (
+    BoardModelSerializer,
+    FieldSelection,
+    QueryPlanMixin,
+)
+from core.models import Board, ListOfTasks
 from list_of_tasks.serializers import ListSerializer
 
 
-class BoardSerializer(BoardModelSerializer):
+class BoardSerializer(QueryPlanMixin, BoardModelSerializer):
     """Serializer for boards."""
 
+    prefetch_related_fields = {"lists_of_tasks": "lists_of_tasks"}
+    expandable_fields = ("lists_of_tasks",)
+
     lists_of_tasks: ListSerializer = ListSerializer(many=True, read_only=True)
 
     class Meta:  # pyright: ignore[reportRedeclaration]
@@ -32,5 +40,16 @@ class BoardSerializer(BoardModelSerializer):
             "lists_of_tasks",
         ]
 
+    @override
+    @classmethod
+    def get_prefetch_queryset(
+        cls, field_name: str, selection: FieldSelection
+    ) -> QuerySet[Any] | None:
+        if field_name == "lists_of_tasks":
+            return ListSerializer.plan_queryset(
+                ListOfTasks.objects.order_by("-order"), selection
+            )
+        return None
+
     if TYPE_CHECKING:
         Meta: type[ModelSerializer.Meta]
@@ -2,12 +2,20 @@
 Tests for board APIs.
 """
 
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
 from typing_extensions import override
 
 from board.serializers import BoardSerializer
-from core.models import Board
+from core.models import Board, Subtask
 from core.tests.api_test_case import PrivateAPITestCase, PublicAPITestCase
-from core.tests.utils import create_test_board
+from core.tests.utils import (
+    create_test_board,
+    create_test_list_of_tasks,
+    create_test_populated_task,
+)
 
 
 class PublicBoardAPITests(PublicAPITestCase):
@@ -50,6 +58,10 @@ class PrivateBoardAPITests(PrivateAPITestCase):
         """Test retrieving boards."""
         self.assert_retrieve_models()
 
+    def test_forged_cursor_error(self):
+        """Test cursors with keys of the wrong type give error."""
+        self.assert_rejects_forged_cursors([["abc"], [{"a": 1}], [None]])
+
     def test_retrieve_board(self):
         """Test retrieving board."""
         self.assert_retrieve_model(self.user_board.pk)
@@ -87,3 +99,157 @@ class PrivateBoardAPITests(PrivateAPITestCase):
     def test_retrieve_other_user_board_error(self):
         """Test trying to retrieve another users board gives error."""
         self.assert_retrieve_other_user_model_error(self.other_user_board.pk)
+
+    def test_retrieve_board_query_count_is_constant(self):
+        """Test retrieving a board does not issue queries per list or task."""
+        url = self.api_url("detail", [self.user_board.pk])
+        list_of_tasks = create_test_list_of_tasks(self.user, self.user_board)
+        _ = create_test_populated_task(self.user, list_of_tasks, 0)
+        with CaptureQueriesContext(connection) as small_board:
+            _ = self.client.get(url)
+
+        for list_index in range(1, 4):
+            list_of_tasks = create_test_list_of_tasks(
+                self.user, self.user_board, name=f"List {list_index}", order=list_index
+            )
+            for task_index in range(3):
+                _ = create_test_populated_task(
+                    self.user, list_of_tasks, list_index * 10 + task_index
+                )
+
+        with CaptureQueriesContext(connection) as large_board:
+            _ = self.client.get(url)
+
+        self.assertEqual(len(large_board), len(small_board))
+
+    def test_retrieve_board_tree(self):
+        """Test the board tree matches the nested board serializer."""
+        for list_index in range(2):
+            list_of_tasks = create_test_list_of_tasks(
+                self.user, self.user_board, name=f"List {list_index}", order=list_index
+            )
+            for task_index in range(2):
+                _ = create_test_populated_task(
+                    self.user, list_of_tasks, list_index * 10 + task_index
+                )
+        url = self.api_url("tree", [self.user_board.pk])
+
+        # the ETag, then board, lists, tasks with categories, assignees,
+        # subtasks
+        with self.assertNumQueries(6):
+            res = self.client.get(url)
+
+        board = BoardSerializer.plan_queryset(
+            Board.objects.filter(pk=self.user_board.pk)
+        ).get()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, BoardSerializer(board).data)
+
+    def test_retrieve_board_cards(self):
+        """Test a card view skips the relations it does not render."""
+        list_of_tasks = create_test_list_of_tasks(self.user, self.user_board)
+        task = create_test_populated_task(self.user, list_of_tasks, 0)
+        url = self.api_url("detail", [self.user_board.pk])
+        fields = [
+            "id",
+            "title",
+            "lists_of_tasks.id",
+            "lists_of_tasks.tasks.id",
+            "lists_of_tasks.tasks.title",
+            "lists_of_tasks.tasks.order",
+            "lists_of_tasks.tasks.priority",
+        ]
+
+        # the ETag, then board, lists and tasks only
+        with self.assertNumQueries(4):
+            res = self.client.get(
+                url,
+                {"fields": ",".join(fields), "expand": "lists_of_tasks.tasks"},
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            {
+                "id": self.user_board.pk,
+                "title": self.user_board.title,
+                "lists_of_tasks": [
+                    {
+                        "id": list_of_tasks.pk,
+                        "tasks": [
+                            {
+                                "id": task.pk,
+                                "title": task.title,
+                                "order": task.order,
+                                "priority": task.priority,
+                            }
+                        ],
+                    }
+                ],
+            },
+        )
+
+    def test_retrieve_board_ids_only(self):
+        """Test an empty expand renders the nested lists as ids."""
+        list_of_tasks = create_test_list_of_tasks(self.user, self.user_board)
+        _ = create_test_populated_task(self.user, list_of_tasks, 0)
+
+        res = self.client.get(
+            self.api_url("detail", [self.user_board.pk]), {"expand": ""}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["lists_of_tasks"], [list_of_tasks.pk])
+        self.assertEqual(res.data["title"], self.user_board.title)
+
+    def test_retrieve_other_user_board_tree_error(self):
+        """Test trying to retrieve another users board tree gives error."""
+        res = self.client.get(self.api_url("tree", [self.other_user_board.pk]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": False})
+    def test_unchanged_boards_are_not_modified(self):
+        """Test a matching If-None-Match is answered with 304 and no body."""
+        list_of_tasks = create_test_list_of_tasks(self.user, self.user_board)
+        _ = create_test_populated_task(self.user, list_of_tasks, 0)
+        url = self.api_url("list", [])
+        res = self.client.get(url)
+        etag = res.headers["ETag"]
+
+        # Only the ETag query runs.
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.headers["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test_nested_changes_modify_board(self):
+        """Test edits and deletions anywhere in the tree change the ETag."""
+        list_of_tasks = create_test_list_of_tasks(self.user, self.user_board)
+        task = create_test_populated_task(self.user, list_of_tasks, 0)
+        url = self.api_url("detail", [self.user_board.pk])
+        etag = self.client.get(url).headers["ETag"]
+
+        subtask = Subtask.objects.get(task=task)
+        subtask.done = True
+        subtask.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.headers["ETag"], etag)
+
+        etag = res.headers["ETag"]
+        _ = subtask.delete()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["lists_of_tasks"][0]["tasks"][0]["subtasks"], [])
+
+    def test_other_user_changes_do_not_modify_board(self):
+        """Test the ETag only depends on the requesting user's data."""
+        url = self.api_url("list", [])
+        etag = self.client.get(url).headers["ETag"]
+
+        _ = create_test_list_of_tasks(self.other_user, self.other_user_board)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -2,6 +2,7 @@
 URL mappings for the board app.
 """
 
+from django.conf import settings
 from django.urls import (
     include,
     path,
@@ -9,6 +10,7 @@ from django.urls import (
 from rest_framework.routers import DefaultRouter
 
 from board import views
+from common.async_views import async_flat_rows_urls
 
 router = DefaultRouter()
 router.register("boards", views.BoardViewSet)
@@ -16,5 +18,12 @@ router.register("boards", views.BoardViewSet)
 app_name = "board"
 
 urlpatterns = [
-    path("", include(router.urls)),
+    path(
+        "",
+        include(
+            async_flat_rows_urls(router, owner_field="user")
+            if settings.ASYNC_READS
+            else router.urls
+        ),
+    ),
 ]
@@ -4,24 +4,50 @@ Views for the board APIs.
 
 from typing import override
 
-from django.db.models import Prefetch
 from django.db.models.query import QuerySet
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
 
 from board.serializers import BoardSerializer
-from common.serializers_base import BoardBasedSerializer
+from common.conditional import ConditionalGetMixin
+from common.flat_rows import BOARD_ROWS, FlatRowsMixin, load_boards
+from common.renderers import FastJSONRenderer
+from common.replicas import ReplicaReadMixin
+from common.serializers_base import BoardBasedSerializer, FieldSelection
 from common.views_base import BoardModelViewSet
-from core.models import Board, ListOfTasks, Task
+from core.models import Board, Category, Contact, ListOfTasks, Subtask, Task
+from response_cache.cache import ResponseCacheMixin
+from user.authentication import CachedTokenAuthentication
 
 
-class BoardViewSet(BoardModelViewSet):
+class BoardViewSet(
+    ReplicaReadMixin,
+    ResponseCacheMixin[Board],
+    ConditionalGetMixin[Board],
+    FlatRowsMixin[Board],
+    BoardModelViewSet,
+):
     """View for manage board APIs."""
 
     serializer_class = BoardSerializer
     queryset = Board.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated]
+    flat_rows = BOARD_ROWS
+    cursor_ordering = ("-id",)
+    conditional_dependencies = (
+        (Board, "user"),
+        (ListOfTasks, "owner"),
+        (Task, "owner"),
+        (Subtask, "owner"),
+        (Category, "user"),
+        (Contact, "user"),
+    )
 
     @override
     def get_queryset(self) -> QuerySet[Board]:
@@ -30,19 +56,31 @@ class BoardViewSet(BoardModelViewSet):
         with lists_of_tasks and tasks ordered by order.
         """
         assert self.queryset is not None
-        return (
-            self.queryset.filter(user=self.request.user)
-            .prefetch_related(
-                Prefetch(
-                    "lists_of_tasks",
-                    queryset=ListOfTasks.objects.prefetch_related(
-                        Prefetch("tasks", queryset=Task.objects.order_by("-order"))
-                    ).order_by("-order"),
-                )
-            )
-            .order_by("-id")
+        return BoardSerializer.plan_queryset(
+            self.queryset.filter(user=self.request.user).order_by("-id"),
+            FieldSelection.from_request(self.request),
         )
 
+    @action(detail=True, methods=["get"])
+    def tree(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Retrieve a board with its lists, tasks, subtasks, assignees and
+        categories using a fixed number of bulk queries.
+        """
+        assert self.queryset is not None
+        queryset = self.queryset.filter(user=request.user)
+
+        def build_response() -> Response:
+            try:
+                boards = load_boards(queryset.filter(pk=pk))
+            except (TypeError, ValueError) as exc:
+                raise NotFound() from exc
+            if not boards:
+                raise NotFound()
+            return Response(boards[0])
+
+        return self.conditional_get(build_response)
+
     @override
     def perform_create(  # pyright: ignore[reportIncompatibleMethodOverride]
         self,
@@ -6,28 +6,41 @@ from typing import override
 
 from django.db.models.functions import Lower
 from django.db.models.query import QuerySet
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from category.serializers import CategorySerializer
+from common.conditional import ConditionalGetMixin
 from common.serializers_base import CategoryBasedSerializer
 from common.views_base import CategoryModelViewSet
-from core.models import Category
+from core.models import Category, SearchDocument
+from response_cache.cache import ResponseCacheMixin
+from search.filters import FullTextSearchFilter
+from user.authentication import CachedTokenAuthentication
 
 
-class CategoryViewSet(CategoryModelViewSet):
+class CategoryViewSet(
+    ResponseCacheMixin[Category], ConditionalGetMixin[Category], CategoryModelViewSet
+):
     """View for manage category APIs."""
 
     serializer_class = CategorySerializer
     queryset = Category.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    filter_backends = [FullTextSearchFilter]
+    search_kind = SearchDocument.CATEGORY
+    cursor_ordering = ("lower_name", "id")
+    conditional_dependencies = ((Category, "user"),)
 
     @override
     def get_queryset(self) -> QuerySet[Category]:
         """Retrieve categories for authenticated user."""
         assert self.queryset is not None
-        return self.queryset.filter(user=self.request.user).order_by(Lower("name"))
+        return (
+            self.queryset.filter(user=self.request.user)
+            .annotate(lower_name=Lower("name"))
+            .order_by("lower_name", "id")
+        )
 
     @override
     def perform_create(  # pyright: ignore[reportIncompatibleMethodOverride]
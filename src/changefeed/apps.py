@@ -0,0 +1,12 @@
+from typing import override
+
+from django.apps import AppConfig
+
+
+class ChangefeedConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "changefeed"
+
+    @override
+    def ready(self):
+        import changefeed.signals  # pyright: ignore[reportUnusedImport]
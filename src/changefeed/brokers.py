@@ -0,0 +1,236 @@
+"""
+Brokers delivering change events to the subscribers of a user.
+
+``settings.CHANGEFEED["BROKER"]`` is the dotted path of the broker class and
+``CHANGEFEED["OPTIONS"]`` its keyword arguments::
+
+    CHANGEFEED = {"BROKER": "changefeed.brokers.InMemoryBroker"}
+
+``InMemoryBroker``
+    Delivers events to the subscribers of the publishing process only. Enough
+    for tests and for a single ASGI worker.
+``PostgresBroker``
+    Sends events with ``pg_notify`` and delivers the notifications every
+    process receives on one ``LISTEN`` connection to its own subscribers, so
+    events reach the stream of a user no matter which worker or node wrote
+    the row.
+
+Another broker (e.g. Redis pub/sub) subclasses ``InMemoryBroker``, publishes
+to its transport in ``publish`` and calls ``deliver`` with what it receives.
+"""
+
+import asyncio
+import logging
+import re
+import select
+import threading
+import time
+from functools import cache
+from types import TracebackType
+from typing import Any, override
+
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from changefeed.events import ALL_KINDS, RESYNC, ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS: dict[str, Any] = {
+    "BROKER": "changefeed.brokers.InMemoryBroker",
+    "OPTIONS": {},
+    # Seconds between keep-alive comments on idle streams.
+    "HEARTBEAT": 15.0,
+    # Seconds a stream ticket from ``changefeed:ticket`` may be used for.
+    "TICKET_TTL": 30,
+    # Seconds between checks that the token of an open stream is still valid.
+    "RECHECK": 60.0,
+}
+
+
+def changefeed_settings() -> dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "CHANGEFEED", {})}
+
+
+class Subscription:
+    """
+    The events of one user for one consumer, e.g. an event stream.
+
+    Create and read it in the consumer's event loop; events may be put from
+    any thread. If the consumer falls ``max_size`` events behind, the queued
+    events are replaced by a single ``resync`` event.
+    """
+
+    def __init__(self, broker: "InMemoryBroker", user_id: int, max_size: int) -> None:
+        super().__init__()
+        self.broker = broker
+        self.user_id = user_id
+        self.max_size = max_size
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue()
+
+    def put(self, event: ChangeEvent) -> None:
+        try:
+            _ = self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The consumer's loop is closed, it unsubscribes on exit.
+            pass
+
+    def _put(self, event: ChangeEvent) -> None:
+        if self.queue.qsize() >= self.max_size:
+            while not self.queue.empty():
+                _ = self.queue.get_nowait()
+            event = ChangeEvent(self.user_id, ALL_KINDS, RESYNC)
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> ChangeEvent | None:
+        """Return the next event, or None if none arrived within ``timeout``."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class InMemoryBroker:
+    """Delivers events to the subscribers of this process."""
+
+    def __init__(self, queue_size: int = 1000) -> None:
+        super().__init__()
+        self.queue_size = queue_size
+        self._subscriptions: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, event: ChangeEvent) -> None:
+        """Send ``event`` to the subscribers of its user."""
+        self.deliver(event)
+
+    def deliver(self, event: ChangeEvent) -> None:
+        """Hand ``event`` to the subscribers of its user in this process."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(event.user_id, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def deliver_resync(self) -> None:
+        """Ask every subscriber of this process to resync, e.g. after a gap."""
+        with self._lock:
+            user_ids = list(self._subscriptions)
+        for user_id in user_ids:
+            self.deliver(ChangeEvent(user_id, ALL_KINDS, RESYNC))
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(self, user_id, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(
+                len(subscriptions) for subscriptions in self._subscriptions.values()
+            )
+
+
+class PostgresBroker(InMemoryBroker):
+    """
+    Broker using PostgreSQL ``NOTIFY`` on ``channel`` of the ``alias``
+    database. Notifications are limited to 8000 bytes, which the compact
+    events stay far below.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        channel: str = "changefeed",
+        alias: str = "default",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        super().__init__(queue_size)
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", channel):
+            raise ValueError(f"Invalid channel name {channel!r}.")
+        self.channel = channel
+        self.alias = alias
+        self.reconnect_delay = reconnect_delay
+        self._listener: threading.Thread | None = None
+
+    @override
+    def publish(self, event: ChangeEvent) -> None:
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, event.to_json()])
+
+    @override
+    def subscribe(self, user_id: int) -> Subscription:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self.listen, name="changefeed-listener", daemon=True
+                )
+                self._listener.start()
+        return super().subscribe(user_id)
+
+    def listen(self) -> None:
+        """Deliver the notifications of ``channel`` until the process exits."""
+        connection = connections[self.alias]
+        reconnecting = False
+        while True:
+            try:
+                # A connection of its own: pooled or request connections are
+                # closed and reused under the listener's feet.
+                database: Any = getattr(connection, "Database")
+                raw: Any = database.connect(**connection.get_connection_params())
+                raw.autocommit = True
+                raw.cursor().execute(f"LISTEN {self.channel}")
+                if reconnecting:
+                    # Events sent while reconnecting are lost.
+                    self.deliver_resync()
+                reconnecting = True
+                try:
+                    while True:
+                        for payload in self.wait(raw, timeout=5.0):
+                            self.deliver(ChangeEvent.from_json(payload))
+                finally:
+                    raw.close()
+            except Exception:
+                logger.exception("Change feed listener failed, reconnecting.")
+                time.sleep(self.reconnect_delay)
+
+    @staticmethod
+    def wait(raw: Any, timeout: float) -> list[str]:
+        """Return the payloads of the notifications within ``timeout``."""
+        if hasattr(raw, "poll"):  # psycopg2
+            if select.select([raw], [], [], timeout)[0]:
+                raw.poll()
+            payloads = [notify.payload for notify in raw.notifies]
+            raw.notifies.clear()
+            return payloads
+        return [notify.payload for notify in raw.notifies(timeout=timeout)]
+
+
+@cache
+def get_broker() -> InMemoryBroker:
+    """Return the broker of this process, see ``settings.CHANGEFEED``."""
+    options = changefeed_settings()
+    return import_string(options["BROKER"])(**options["OPTIONS"])
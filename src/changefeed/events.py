@@ -0,0 +1,112 @@
+"""
+Compact row-level change events of the board tree.
+
+An event names the changed row and what happened to it::
+
+    {"kind": "task", "op": "moved", "id": 7,
+     "data": {"list_of_tasks": 2, "order": 3, ...}}
+
+``op`` is ``created``, ``updated``, ``moved`` (a list or task changed its
+parent or position) or ``deleted``, which has no ``data``. ``data`` holds the
+scalar fields of the row in the format of the API payloads, not its nested
+relations. ``resync`` events have no ``id`` and ask clients to re-fetch the
+rows of ``kind`` (``all`` for every kind), e.g. after a bulk task write or
+when a slow client missed events.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Self
+
+from django.db.models import Model
+
+from common.flat_rows import format_date, format_datetime
+from core.models import Board, ListOfTasks, Subtask, Task
+
+CREATED = "created"
+UPDATED = "updated"
+MOVED = "moved"
+DELETED = "deleted"
+RESYNC = "resync"
+
+ALL_KINDS = "all"
+
+# model: (kind, attribute of the owning user's id, attributes in ``data``)
+KINDS: dict[type[Model], tuple[str, str, tuple[str, ...]]] = {
+    Board: ("board", "user_id", ("title", "updated_at")),
+    ListOfTasks: ("list", "owner_id", ("board_id", "name", "order", "updated_at")),
+    Task: (
+        "task",
+        "owner_id",
+        (
+            "list_of_tasks_id",
+            "title",
+            "priority",
+            "due_date",
+            "order",
+            "updated_at",
+        ),
+    ),
+    Subtask: ("subtask", "owner_id", ("task_id", "title", "done", "updated_at")),
+}
+
+
+def encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    if isinstance(value, date):
+        return format_date(value)
+    return value
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A change of one row, or a resync, for the subscribers of ``user_id``."""
+
+    user_id: int
+    kind: str
+    op: str
+    id: int | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def for_instance(cls, instance: Model, op: str) -> Self | None:
+        """Return the ``op`` event of ``instance``, if it is part of the tree."""
+        kind, user_attribute, attributes = KINDS[type(instance)]
+        user_id: int | None = getattr(instance, user_attribute)
+        if user_id is None:
+            return None
+        data = (
+            {}
+            if op == DELETED
+            else {
+                attribute.removesuffix("_id"): encode_value(
+                    getattr(instance, attribute)
+                )
+                for attribute in attributes
+            }
+        )
+        return cls(user_id, kind, op, instance.pk, data)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the event as sent to clients."""
+        event: dict[str, Any] = {"kind": self.kind, "op": self.op, "id": self.id}
+        if self.data:
+            event["data"] = self.data
+        return event
+
+    def to_json(self) -> str:
+        """Serialize the event for brokers, see ``from_json``."""
+        return json.dumps({"user": self.user_id, **self.as_dict()})
+
+    @classmethod
+    def from_json(cls, payload: str) -> Self:
+        event = json.loads(payload)
+        return cls(
+            event["user"],
+            event["kind"],
+            event["op"],
+            event["id"],
+            event.get("data", {}),
+        )
@@ -0,0 +1,40 @@
+"""
+Publishing change events once the writing transaction commits.
+"""
+
+from typing import cast
+
+from django.db import transaction
+from django.db.models import Model
+
+from changefeed.brokers import get_broker
+from changefeed.events import MOVED, ChangeEvent
+from core.models import Task
+
+MOVED_ATTRIBUTE = "_changefeed_moved"
+
+
+def publish(event: ChangeEvent | None) -> None:
+    """Publish ``event`` if and when the current transaction commits."""
+    if event is None:
+        return
+    transaction.on_commit(lambda: get_broker().publish(event))
+
+
+def mark_moved(instance: Model) -> None:
+    """Publish the next save of ``instance`` as a move."""
+    setattr(instance, MOVED_ATTRIBUTE, True)
+
+
+def publish_reordered(task: Task, reordered: dict[int, int]) -> None:
+    """Publish the new order of the siblings a task move relabelled."""
+    for pk, order in reordered.items():
+        publish(
+            ChangeEvent(
+                cast(int, task.owner_id),
+                "task",
+                MOVED,
+                pk,
+                {"list_of_tasks": task.list_of_tasks_id, "order": order},
+            )
+        )
@@ -0,0 +1,75 @@
+"""
+Publish change events for writes of boards, lists, tasks and subtasks.
+"""
+
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from changefeed.events import (
+    ALL_KINDS,
+    CREATED,
+    DELETED,
+    MOVED,
+    RESYNC,
+    UPDATED,
+    ChangeEvent,
+)
+from changefeed.publish import MOVED_ATTRIBUTE, mark_moved, publish
+from core.models import Board, ListOfTasks, Subtask, Task, User, owner_changed
+from core.signals import in_bulk_task_changes, tasks_bulk_changed
+
+
+def skip(sender: type[Model]) -> bool:
+    """Bulk task writes publish one resync event instead."""
+    return sender in (Task, Subtask) and in_bulk_task_changes()
+
+
+@receiver(pre_save, sender=ListOfTasks)
+@receiver(pre_save, sender=Task)
+def remember_move(sender: type[ListOfTasks | Task], instance: Any, **kwargs: Any):
+    """Lists and tasks saved into another board or list were moved."""
+    if instance.pk is not None and instance._wrt_map() != instance._original_wrt_map:
+        mark_moved(instance)
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_save, sender=ListOfTasks)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+def publish_save(sender: type[Model], instance: Model, created: bool, **kwargs: Any):
+    if skip(sender):
+        return
+    op = (
+        CREATED
+        if created
+        else MOVED if getattr(instance, MOVED_ATTRIBUTE, False) else UPDATED
+    )
+    setattr(instance, MOVED_ATTRIBUTE, False)
+    publish(ChangeEvent.for_instance(instance, op))
+
+
+@receiver(post_delete, sender=Board)
+@receiver(post_delete, sender=ListOfTasks)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+def publish_delete(sender: type[Model], instance: Model, **kwargs: Any):
+    if skip(sender):
+        return
+    publish(ChangeEvent.for_instance(instance, DELETED))
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def publish_bulk_task_change(sender: type[Task], user: User, **kwargs: Any):
+    publish(ChangeEvent(user.pk, "task", RESYNC))
+
+
+@receiver(owner_changed)
+def publish_owner_change(
+    sender: type[Model], old_user_id: int, new_user_id: int, **kwargs: Any
+):
+    """Rows given to another user leave one tree and join the other."""
+    publish(ChangeEvent(old_user_id, ALL_KINDS, RESYNC))
+    publish(ChangeEvent(new_user_id, ALL_KINDS, RESYNC))
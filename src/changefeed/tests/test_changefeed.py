@@ -0,0 +1,324 @@
+"""
+Tests for the change feed.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
+from typing import Any, cast, override
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from changefeed.brokers import InMemoryBroker, get_broker
+from changefeed.events import (
+    ALL_KINDS,
+    CREATED,
+    DELETED,
+    MOVED,
+    RESYNC,
+    UPDATED,
+    ChangeEvent,
+)
+from changefeed.tickets import issue_ticket
+from core.models import Board, ListOfTasks, Subtask, User
+from core.tests.utils import (
+    create_test_board,
+    create_test_list_of_tasks,
+    create_test_task,
+    create_test_user,
+)
+
+STREAM_URL = reverse("changefeed:stream")
+TICKET_URL = reverse("changefeed:ticket")
+
+
+class ChangeEventTests(TestCase):
+    """Test writes publish change events once they commit."""
+
+    user = User()
+    board = Board()
+    todo = ListOfTasks()
+    done = ListOfTasks()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.board = create_test_board(self.user, title="Sprint")
+        self.todo = create_test_list_of_tasks(self.user, self.board, name="TODO")
+        self.done = create_test_list_of_tasks(
+            self.user, self.board, name="Done", order=1
+        )
+
+    @contextmanager
+    def published(self) -> Iterator[list[tuple[str, str, int | None]]]:
+        """Collect the (kind, op, id) of the events published in the block."""
+        events: list[tuple[str, str, int | None]] = []
+        with (
+            patch.object(get_broker(), "publish") as publish,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            yield events
+        publish: MagicMock
+        published = [cast(ChangeEvent, call.args[0]) for call in publish.call_args_list]
+        events.extend((event.kind, event.op, event.id) for event in published)
+
+    def test_create_update_delete(self):
+        """Test created, updated and deleted events of the board tree."""
+        with self.published() as events:
+            task = create_test_task(self.user, list_of_tasks=self.todo)
+            subtask = Subtask.objects.create(task=task, title="Subtask")
+            self.board.title = "Renamed"
+            self.board.save()
+
+        self.assertEqual(
+            events,
+            [
+                ("task", CREATED, task.pk),
+                ("subtask", CREATED, subtask.pk),
+                ("board", UPDATED, self.board.pk),
+            ],
+        )
+
+        task_id, subtask_id = task.pk, subtask.pk
+        with self.published() as events:
+            _ = task.delete()
+
+        self.assertEqual(
+            events, [("subtask", DELETED, subtask_id), ("task", DELETED, task_id)]
+        )
+
+    def test_event_data(self):
+        """Test events hold the row's fields in the API format."""
+        task = create_test_task(self.user, list_of_tasks=self.todo, title="Pipe")
+
+        with patch.object(get_broker(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                task.title = "Broken pipe"
+                task.save()
+
+        event: ChangeEvent = publish.call_args.args[0]
+        self.assertEqual(event.user_id, self.user.pk)
+        self.assertEqual(
+            event.as_dict(),
+            {
+                "kind": "task",
+                "op": UPDATED,
+                "id": task.pk,
+                "data": {
+                    "list_of_tasks": self.todo.pk,
+                    "title": "Broken pipe",
+                    "priority": task.priority,
+                    "due_date": task.due_date.isoformat(),
+                    "order": task.order,
+                    "updated_at": event.data["updated_at"],
+                },
+            },
+        )
+        self.assertEqual(ChangeEvent.from_json(event.to_json()), event)
+
+    def test_moves(self):
+        """Test moving a task publishes it and its relabelled siblings."""
+        task = create_test_task(self.user, list_of_tasks=self.todo, order=None)
+        other = create_test_task(self.user, list_of_tasks=self.todo, order=None)
+
+        with self.published() as events:
+            res = self.client.post(
+                reverse("task:task-move", args=[other.pk]),
+                {"list_of_tasks": self.done.pk, "position": 0},
+                format="json",
+            )
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+            res = self.client.patch(
+                reverse("task:task-detail", args=[task.pk]),
+                {"list_of_tasks": self.done.pk},
+                format="json",
+            )
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(events, [("task", MOVED, other.pk), ("task", MOVED, task.pk)])
+
+    def test_bulk_changes_resync(self):
+        """Test bulk task writes publish one resync event."""
+        tasks = [
+            create_test_task(self.user, list_of_tasks=self.todo, order=None)
+            for _ in range(2)
+        ]
+        _ = Subtask.objects.create(task=tasks[0], title="Subtask")
+
+        with self.published() as events:
+            res = self.client.delete(
+                reverse("task:task-bulk"),
+                {"ids": [task.pk for task in tasks]},
+                format="json",
+            )
+            self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(events, [("task", RESYNC, None)])
+
+    def test_rolled_back_writes_are_not_published(self):
+        """Test nothing is published without a commit."""
+        with patch.object(get_broker(), "publish") as publish:
+            _ = create_test_task(self.user, list_of_tasks=self.todo)
+
+        publish.assert_not_called()
+
+
+class InMemoryBrokerTests(SimpleTestCase):
+    """Test delivering events to subscribers."""
+
+    async def test_deliver_to_subscribers_of_user(self):
+        """Test events reach the subscriptions of their user only."""
+        broker = InMemoryBroker()
+        event = ChangeEvent(1, "board", CREATED, 5, {"title": "Board"})
+
+        with broker.subscribe(1) as mine, broker.subscribe(2) as theirs:
+            # Published from a request thread.
+            thread = threading.Thread(target=broker.publish, args=(event,))
+            thread.start()
+            thread.join()
+
+            self.assertEqual(await mine.get(timeout=1), event)
+            self.assertIsNone(await theirs.get(timeout=0.01))
+
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_slow_subscriber_resyncs(self):
+        """Test a subscriber falling behind gets one resync event."""
+        broker = InMemoryBroker(queue_size=2)
+
+        with broker.subscribe(1) as subscription:
+            for index in range(3):
+                broker.publish(ChangeEvent(1, "task", UPDATED, index))
+            await asyncio.sleep(0)
+
+            self.assertEqual(
+                await subscription.get(timeout=1), ChangeEvent(1, ALL_KINDS, RESYNC)
+            )
+            self.assertIsNone(await subscription.get(timeout=0.01))
+
+
+class ChangeStreamAPITests(TestCase):
+    """Test the server-sent event stream."""
+
+    user = User()
+    token = Token()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.token = Token.objects.create(user=self.user)
+
+    async def read_events(self, **params: Any) -> list[bytes]:
+        headers = {} if "ticket" in params else self.auth_headers()
+        res = await self.async_client.get(STREAM_URL, params, **headers)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        chunks = self.chunks(res)
+        first = await anext(chunks)
+        self.assertEqual(get_broker().subscriber_count(), 1)
+        get_broker().publish(ChangeEvent(self.user.pk, "board", DELETED, 3))
+        second = await anext(chunks)
+        await chunks.aclose()
+        return [first, second]
+
+    def auth_headers(self) -> dict[str, Any]:
+        return {"headers": {"authorization": f"Token {self.token.key}"}}
+
+    @staticmethod
+    def chunks(res: Any) -> AsyncGenerator[bytes]:
+        return cast(AsyncGenerator[bytes], getattr(res, "streaming_content"))
+
+    async def test_stream_events(self):
+        """Test events of the user are streamed."""
+        chunks = await self.read_events()
+
+        self.assertEqual(
+            chunks,
+            [
+                b": subscribed\n\n",
+                b'event: change\ndata: {"kind":"board","op":"deleted","id":3}\n\n',
+            ],
+        )
+
+    @override_settings(CHANGEFEED={"HEARTBEAT": 0.01})
+    async def test_stream_keep_alive(self):
+        """Test idle streams send comments."""
+        res = await self.async_client.get(STREAM_URL, **self.auth_headers())
+        chunks = self.chunks(res)
+
+        self.assertEqual(await anext(chunks), b": subscribed\n\n")
+        self.assertEqual(await anext(chunks), b": keep-alive\n\n")
+        await chunks.aclose()
+
+    async def test_ticket(self):
+        """Test EventSource clients may open streams with a ticket."""
+        res = await self.async_client.post(TICKET_URL, **self.auth_headers())
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body: dict[str, Any] = res.json()
+        self.assertEqual(body["expires_in"], 30)
+        self.assertNotIn(self.token.key, body["ticket"])
+
+        chunks = await self.read_events(ticket=body["ticket"])
+
+        self.assertEqual(chunks[0], b": subscribed\n\n")
+
+    async def test_ticket_expires(self):
+        """Test tickets are refused after their TTL."""
+        ticket = issue_ticket(self.user.pk, self.token.key)
+
+        with patch("django.core.signing.time.time", return_value=time.time() + 31):
+            res = await self.async_client.get(STREAM_URL, {"ticket": ticket})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_ticket_of_deleted_token(self):
+        """Test deleting the token invalidates its tickets."""
+        ticket = issue_ticket(self.user.pk, self.token.key)
+        _ = await self.token.adelete()
+        _ = await Token.objects.acreate(user=self.user)
+
+        res = await self.async_client.get(STREAM_URL, {"ticket": ticket})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_token_not_accepted_in_url(self):
+        """Test tokens are never read from the URL."""
+        res = await self.async_client.get(STREAM_URL, {"token": self.token.key})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_auth_required(self):
+        """Test streams need a valid ticket."""
+        res = await self.async_client.get(STREAM_URL, {"ticket": "invalid"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(CHANGEFEED={"RECHECK": 0.01})
+    async def test_stream_ends_when_token_deleted(self):
+        """Test open streams end once their token is deleted."""
+        res = await self.async_client.get(STREAM_URL, **self.auth_headers())
+        chunks = self.chunks(res)
+        self.assertEqual(await anext(chunks), b": subscribed\n\n")
+        self.assertEqual(await anext(chunks), b": keep-alive\n\n")
+
+        _ = await self.token.adelete()
+
+        with self.assertRaises(StopAsyncIteration):
+            _ = await anext(chunks)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    def test_wsgi_not_supported(self):
+        """Test WSGI workers refuse to hold streams open."""
+        res = self.client.get(STREAM_URL, **self.auth_headers())
+
+        self.assertEqual(res.status_code, status.HTTP_501_NOT_IMPLEMENTED)
@@ -0,0 +1,47 @@
+"""
+Short-lived tickets opening a change stream.
+
+``EventSource`` cannot send headers, so browsers open streams with a ticket in
+the URL instead of their token. A ticket is signed with ``SECRET_KEY``, names
+the user and a digest of their token, never the token itself, and expires
+after ``CHANGEFEED["TICKET_TTL"]`` seconds. Deleting the token invalidates
+its tickets.
+"""
+
+import hashlib
+import hmac
+from typing import Any
+
+from django.core import signing
+from rest_framework.authtoken.models import Token
+
+SALT = "changefeed.ticket"
+
+
+def token_digest(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def issue_ticket(user_id: int, key: str) -> str:
+    """Return a ticket for a stream of ``user_id`` with the token ``key``."""
+    return signing.dumps({"user": user_id, "token": token_digest(key)}, salt=SALT)
+
+
+async def aredeem_ticket(ticket: str, max_age: int) -> str | None:
+    """
+    Return the token key ``ticket`` was issued for, or None if it is invalid,
+    older than ``max_age`` seconds or its token was deleted.
+    """
+    try:
+        payload: dict[str, Any] = signing.loads(ticket, salt=SALT, max_age=max_age)
+    except signing.BadSignature:
+        # Also raised for expired tickets.
+        return None
+    key = await (
+        Token.objects.filter(user_id=payload["user"])
+        .values_list("key", flat=True)
+        .afirst()
+    )
+    if key is None or not hmac.compare_digest(token_digest(key), payload["token"]):
+        return None
+    return key
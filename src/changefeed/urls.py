@@ -0,0 +1,14 @@
+"""
+URL mappings for the changefeed app.
+"""
+
+from django.urls import path
+
+from changefeed import views
+
+app_name = "changefeed"
+
+urlpatterns = [
+    path("ticket/", views.ChangeTicketView.as_view(), name="ticket"),
+    path("stream/", views.ChangeStreamView.as_view(), name="stream"),
+]
@@ -0,0 +1,121 @@
+"""
+Views for the change feed APIs.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any, cast
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpRequest,
+    HttpResponseBase,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.views import View
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from changefeed.brokers import changefeed_settings, get_broker
+from changefeed.events import ChangeEvent
+from changefeed.tickets import aredeem_ticket, issue_ticket
+from core.models import User
+from user.authentication import CachedTokenAuthentication, aauthenticate_key, token_key
+
+
+def sse_message(event: ChangeEvent) -> str:
+    """Format ``event`` as a server-sent event named ``change``."""
+    data = json.dumps(event.as_dict(), ensure_ascii=False, separators=(",", ":"))
+    return f"event: change\ndata: {data}\n\n"
+
+
+async def event_stream(
+    user_id: int, key: str, heartbeat: float, recheck: float
+) -> AsyncIterator[str]:
+    """
+    Yield the events of ``user_id`` and a comment every idle ``heartbeat``
+    until the token ``key`` stops authenticating the user, which is checked
+    every ``recheck`` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    checked_at = loop.time()
+    with get_broker().subscribe(user_id) as subscription:
+        # Sent at once, so clients know they are subscribed.
+        yield ": subscribed\n\n"
+        while True:
+            event = await subscription.get(timeout=min(heartbeat, recheck))
+            if loop.time() - checked_at >= recheck:
+                user = await aauthenticate_key(key)
+                if user is None or user.pk != user_id:
+                    # The token was deleted or its user deactivated.
+                    return
+                checked_at = loop.time()
+            yield ": keep-alive\n\n" if event is None else sse_message(event)
+
+
+class ChangeTicketView(APIView):
+    """View for getting a ticket to open a change stream with."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        """
+        Return a ticket for ``?ticket=`` of the change stream, valid for
+        ``expires_in`` seconds.
+        """
+        ttl: int = changefeed_settings()["TICKET_TTL"]
+        ticket = issue_ticket(
+            cast(User, request.user).pk, cast(Token, request.auth).key
+        )
+        return Response({"ticket": ticket, "expires_in": ttl})
+
+
+class ChangeStreamView(View):
+    """
+    Server-sent events of the changes to the requesting user's boards, lists,
+    tasks and subtasks, see ``changefeed.events``.
+
+    ``EventSource`` cannot send headers, so besides the ``Authorization``
+    header a ticket from ``changefeed:ticket`` may be passed as ``?ticket=``.
+    The stream ends once its token is deleted or its user deactivated. Streams
+    are only served by the ASGI application, a WSGI worker would be blocked by
+    each of them.
+    """
+
+    async def get(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        options = changefeed_settings()
+        ticket = request.GET.get("ticket")
+        key = (
+            await aredeem_ticket(ticket, options["TICKET_TTL"])
+            if ticket
+            else token_key(request)
+        )
+        user = await aauthenticate_key(key) if key else None
+        if key is None or user is None:
+            return JsonResponse(
+                {"detail": "Invalid token or ticket."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "The change stream is served by app.asgi only."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        response = StreamingHttpResponse(
+            event_stream(user.pk, key, options["HEARTBEAT"], options["RECHECK"]),
+            content_type="text/event-stream",
+        )
+        response.headers["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream.
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,287 @@
+"""
+Async variants of the read endpoints for ASGI deployments.
+
+Under ``app.asgi`` with ``settings.ASYNC_READS`` on, the list and detail
+routes of the task, list and board viewsets and the summary are served by the
+views below. They answer plain JSON GET and HEAD requests with the async ORM,
+running the same query plans as the sync views (see ``common.queries``), so a
+worker keeps serving other requests while it waits for the database and for
+slow clients. The payloads, ETags and headers are identical.
+
+Every other request, and every GET the async path does not cover (other
+query parameters, the browsable API, authentication failures, errors), is
+handed to the sync view it replaces. Views whose sync view uses the response
+cache (see ``response_cache``) share its entries.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, override
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.urls import URLPattern, re_path
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.request import Request
+from rest_framework.routers import SimpleRouter
+
+from common.conditional import finish_conditional, not_modified, plan_etag
+from common.queries import arun
+from common.replicas import read_from, replica_for
+from response_cache.cache import ResponseCacheMixin, acached_response
+from user.authentication import aauthenticate_token
+
+
+def drf_request_of(request: HttpRequest) -> Request:
+    # django-stubs give HttpRequest a __new__ without arguments, which hides
+    # Request.__init__ from the type checker.
+    return Request(request)  # pyright: ignore[reportCallIssue]
+
+
+class AsyncReadView(View, ABC):
+    """
+    Async view answering GET and HEAD for ``sync_view``, an ``as_view()``
+    callable, and delegating everything else to it.
+
+    Subclasses implement ``read_data`` and return the query parameters it
+    understands from ``read_query_params``.
+    """
+
+    sync_view: Any = None
+
+    @override
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Any:
+        view = super().as_view(**initkwargs)
+        # Like the DRF views it replaces, authentication is by token only.
+        view.csrf_exempt = True  # pyright: ignore[reportFunctionMemberAccess]
+        return view
+
+    @property
+    def view_class(self) -> Any:
+        return self.sync_view.cls
+
+    async def get(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        response = await self.read(request, *args, **kwargs)
+        if response is None:
+            response = await self.delegate(request, *args, **kwargs)
+        return response
+
+    @override
+    async def options(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        return await self.delegate(request, *args, **kwargs)
+
+    @override
+    def http_method_not_allowed(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> Any:
+        return self.delegate(request, *args, **kwargs)
+
+    async def delegate(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """Answer ``request`` with the sync view."""
+        return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+    async def read(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase | None:
+        """Answer ``request`` like the sync view, or return None to delegate."""
+        if not self.read_query_params().issuperset(request.GET):
+            return None
+        negotiated = self.negotiate(request)
+        if negotiated is None:
+            return None
+        renderer, media_type = negotiated
+        user = await aauthenticate_token(request)
+        if user is None:
+            return None
+        # Like DRF's authentication, so the replica routing sees the token user.
+        request.user = user
+
+        drf_request = drf_request_of(request)
+        drf_request.user = user
+        drf_request.accepted_renderer = renderer
+        drf_request.accepted_media_type = media_type
+        # The sticky flag may live in a shared cache, whose client blocks.
+        alias = await sync_to_async(replica_for, thread_sensitive=False)(request)
+        try:
+            with read_from(alias):
+                if self.cache_responses():
+                    response = await acached_response(
+                        self.view_class.__name__,
+                        drf_request,
+                        lambda: self.build_response(drf_request, *args, **kwargs),
+                    )
+                else:
+                    response = await self.build_response(drf_request, *args, **kwargs)
+        except APIException:
+            return None
+        if response is None:
+            return None
+
+        response.headers["Allow"] = ", ".join(self.allowed_methods())
+        if len(self.view_class.renderer_classes) > 1:
+            patch_vary_headers(response, ["Accept"])
+        return response
+
+    async def build_response(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase | None:
+        """Render the data of ``read_data``, or return None to delegate."""
+        etag = await arun(plan_etag(request, self.view_class.conditional_dependencies))
+        response = not_modified(request, etag)
+        if response is None:
+            data = await self.read_data(request, *args, **kwargs)
+            if data is None:
+                return None
+            response = HttpResponse(
+                request.accepted_renderer.render(
+                    data, request.accepted_media_type, {"request": request}
+                ),
+                content_type=request.accepted_media_type,
+            )
+        return finish_conditional(response, etag)
+
+    def read_query_params(self) -> frozenset[str]:
+        return frozenset()
+
+    def cache_responses(self) -> bool:
+        """Return whether the sync view answers from the response cache."""
+        return False
+
+    @abstractmethod
+    async def read_data(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        """Return the response data, or None to delegate the request."""
+
+    def negotiate(self, request: HttpRequest) -> tuple[BaseRenderer, str] | None:
+        """
+        Return the renderer and media type the sync view would pick, if it is
+        plain JSON.
+        """
+        renderers = [renderer() for renderer in self.view_class.renderer_classes]
+        try:
+            renderer, media_type = DefaultContentNegotiation().select_renderer(
+                drf_request_of(request), renderers
+            )
+        except APIException:
+            return None
+        if not isinstance(renderer, JSONRenderer) or media_type != renderer.media_type:
+            return None
+        return renderer, media_type
+
+    def allowed_methods(self) -> list[str]:
+        """Return the methods of the sync view's ``Allow`` header."""
+        actions: dict[str, str] | None = getattr(self.sync_view, "actions", None)
+        methods = {
+            method
+            for method in self.view_class.http_method_names
+            if (
+                method in actions
+                if actions is not None
+                else hasattr(self.view_class, method)
+            )
+        }
+        if "get" in methods:
+            methods.add("head")
+        methods.add("options")
+        return [
+            method.upper()
+            for method in self.view_class.http_method_names
+            if method in methods
+        ]
+
+
+class AsyncFlatRowsView(AsyncReadView):
+    """
+    Async ``list`` or ``retrieve`` of a viewset with ``FlatRowsMixin`` and
+    ``ConditionalGetMixin``, for the rows whose ``owner_field`` is the user.
+    """
+
+    owner_field = "user"
+    detail = False
+
+    @override
+    def cache_responses(self) -> bool:
+        return not self.detail and issubclass(self.view_class, ResponseCacheMixin)
+
+    @override
+    def read_query_params(self) -> frozenset[str]:
+        if self.detail:
+            return frozenset()
+        paginator = self.view_class.pagination_class()
+        return frozenset(
+            {
+                paginator.cursor_query_param,
+                paginator.page_size_query_param,
+                paginator.paginate_query_param,
+            }
+        )
+
+    @override
+    async def read(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase | None:
+        if self.view_class.flat_rows is None or not settings.FLAT_ROW_READS:
+            return None
+        return await super().read(request, *args, **kwargs)
+
+    @override
+    async def read_data(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        viewset = self.view_class
+        flat_rows = viewset.flat_rows
+        queryset = viewset.queryset.filter(**{self.owner_field: request.user}).values(
+            *flat_rows.columns
+        )
+
+        if self.detail:
+            lookup = kwargs[viewset.lookup_url_kwarg or viewset.lookup_field]
+            try:
+                queryset = queryset.filter(**{viewset.lookup_field: lookup})
+            except (TypeError, ValueError):
+                return None
+            rows = [row async for row in queryset[:1]]
+            if not rows:
+                return None
+            return (await arun(flat_rows.plan(rows)))[0]
+
+        paginator = viewset.pagination_class()
+        rows = await arun(paginator.plan_page(queryset, request, viewset))
+        return paginator.get_paginated_response(await arun(flat_rows.plan(rows))).data
+
+
+def async_flat_rows_urls(router: SimpleRouter, **initkwargs: Any) -> list[Any]:
+    """
+    Return the URLs of ``router`` with its list and detail routes served by
+    ``AsyncFlatRowsView``, which delegates to the router's views.
+
+    The routes keep their order, so e.g. ``tasks/bulk/`` still matches before
+    the detail route.
+    """
+    return [
+        (
+            re_path(
+                str(pattern.pattern),
+                AsyncFlatRowsView.as_view(
+                    sync_view=pattern.callback,  # pyright: ignore[reportUnknownMemberType]
+                    detail=pattern.name.endswith("-detail"),
+                    **initkwargs,
+                ),
+                name=pattern.name,
+            )
+            if isinstance(pattern, URLPattern)
+            and pattern.name
+            and pattern.name.endswith(("-list", "-detail"))
+            and "format" not in pattern.pattern.regex.groupindex
+            else pattern
+        )
+        for pattern in router.urls
+    ]
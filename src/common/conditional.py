@@ -0,0 +1,133 @@
+"""
+Conditional GET support for the read endpoints.
+"""
+
+import hashlib
+from collections.abc import Callable
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, ClassVar, TypeVar, cast, override
+
+from django.db.models import Count, Max, Model, QuerySet, Value
+from django.http import HttpRequest, HttpResponseBase, HttpResponseNotModified
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from common.queries import QueryPlan, run
+from common.views_base import ModelViewSetMixinBase
+
+_MT = TypeVar("_MT", bound=Model)
+
+# (model, lookup from the model to its owning user)
+Dependency = tuple[type[Model], str]
+
+
+def compute_etag(request: Request, dependencies: tuple[Dependency, ...]) -> str:
+    """
+    Return a weak ETag for the response ``request`` would receive.
+
+    The validator combines the requested URL and media type with the row
+    count and latest ``updated_at`` of every table the payload is built from,
+    scoped to the requesting user. Edits and creations advance the latest
+    ``updated_at`` and deletions change the count, so the ETag changes whenever
+    the payload can, without serializing anything.
+    """
+    return run(plan_etag(request, dependencies))
+
+
+def plan_etag(request: Request, dependencies: tuple[Dependency, ...]) -> QueryPlan[str]:
+    """Plan ``compute_etag``, see ``common.queries``."""
+    hasher = hashlib.sha256()
+    accepted_media_type = getattr(request, "accepted_media_type", "") or ""
+    hasher.update(f"{request.user.pk}|{request.get_full_path()}".encode())
+    hasher.update(accepted_media_type.encode())
+    if not dependencies:
+        return f'W/"{hasher.hexdigest()[:32]}"'
+    # One row per table, all in a single UNION ALL query.
+    states: list[QuerySet[Any, dict[str, Any]]] = [
+        model._default_manager.filter(**{user_lookup: request.user})
+        .order_by()
+        .values(label=Value(model._meta.label))
+        .annotate(count=Count("pk"), updated_at=Max("updated_at"))
+        for model, user_lookup in dependencies
+    ]
+    rows: list[dict[str, Any]] = yield states[0].union(*states[1:], all=True)
+    for row in sorted(rows, key=itemgetter("label")):
+        updated_at: datetime | None = row["updated_at"]
+        hasher.update(
+            (
+                f"|{row['label']}:{row['count']}:"
+                + (updated_at.isoformat() if updated_at else "")
+            ).encode()
+        )
+    return f'W/"{hasher.hexdigest()[:32]}"'
+
+
+def not_modified(request: HttpRequest, etag: str) -> HttpResponseBase | None:
+    """
+    Return the 304 (or 412) answering the request's preconditions with
+    ``etag``, or None if the response has to be built.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if isinstance(response, HttpResponseNotModified):
+        response.headers["ETag"] = etag
+    return response
+
+
+def finish_conditional(response: HttpResponseBase, etag: str) -> HttpResponseBase:
+    """Add ``etag`` and the revalidation headers to ``response``."""
+    if 200 <= response.status_code < 300 and not response.has_header("ETag"):
+        response.headers["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_get(
+    request: Request,
+    dependencies: tuple[Dependency, ...],
+    build_response: Callable[[], HttpResponseBase],
+) -> HttpResponseBase:
+    """
+    Answer ``If-None-Match`` with a 304 before ``build_response`` runs.
+
+    Only an ``ETag`` is emitted. A ``Last-Modified`` date derived from
+    ``updated_at`` would miss deletions.
+    """
+    etag = compute_etag(request, dependencies)
+    response = not_modified(request, etag)
+    if response is None:
+        response = build_response()
+    return finish_conditional(response, etag)
+
+
+class ConditionalGetMixin(ModelViewSetMixinBase[_MT]):
+    """
+    Viewset mixin answering ``list`` and ``retrieve`` with 304 Not Modified
+    when the client's ``If-None-Match`` still matches.
+
+    Views list the tables their payload is read from in
+    ``conditional_dependencies``, each with the lookup to the owning user.
+    """
+
+    conditional_dependencies: ClassVar[tuple[Dependency, ...]] = ()
+
+    def conditional_get(self, build_response: Callable[[], Response]) -> Response:
+        return cast(
+            Response,
+            conditional_get(
+                self.request, self.conditional_dependencies, build_response
+            ),
+        )
+
+    @override
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.conditional_get(
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    @override
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.conditional_get(
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
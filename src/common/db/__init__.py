@@ -0,0 +1,86 @@
+"""
+Database backends that record how long it takes to get a connection.
+
+``common.db.postgresql`` and ``common.db.sqlite3`` wrap Django's backends.
+With ``CONN_MAX_AGE`` the time is spent once per worker thread and whenever
+a health check finds the connection broken; with the psycopg pool it is the
+wait for a free pooled connection on every request.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, override
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+@dataclass
+class ConnectStats:
+    """Connections handed out to one alias of this process."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+_lock = threading.Lock()
+connect_stats: dict[str, ConnectStats] = {}
+
+
+def record_connect(alias: str, elapsed_ms: float) -> None:
+    with _lock:
+        stats = connect_stats.setdefault(alias, ConnectStats())
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+
+if TYPE_CHECKING:
+    # Base of the backend mixins, so they type-check against the wrapper.
+    DatabaseWrapperMixinBase = BaseDatabaseWrapper
+else:
+    DatabaseWrapperMixinBase = object
+
+
+class TimedConnectMixin(DatabaseWrapperMixinBase):
+    """Records the time ``get_new_connection`` takes in ``connect_stats``."""
+
+    @override
+    def get_new_connection(self, conn_params: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().get_new_connection(conn_params)
+        finally:
+            record_connect(self.alias, (time.perf_counter() - start) * 1000)
+
+
+def database_metrics() -> dict[str, Any]:
+    """
+    Return the connection settings and the connects of this process per
+    alias, with the psycopg pool's statistics when pooling is enabled.
+    """
+    metrics: dict[str, Any] = {}
+    for alias in connections:
+        connection = connections[alias]
+        settings_dict = connection.settings_dict
+        pool = getattr(connection, "pool", None)
+        with _lock:
+            stats = connect_stats.get(alias, ConnectStats()).as_dict()
+        metrics[alias] = {
+            "vendor": connection.vendor,
+            "conn_max_age": settings_dict["CONN_MAX_AGE"],
+            "conn_health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+            "connects": stats,
+            "pool": None if pool is None else pool.get_stats(),
+        }
+    return metrics
@@ -0,0 +1,7 @@
+from django.db.backends.postgresql import base
+
+from common.db import TimedConnectMixin
+
+
+class DatabaseWrapper(TimedConnectMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,324 @@
+"""
+Build API payloads from flat ``values()`` rows.
+
+The nested serializers in ``board``, ``list_of_tasks`` and ``task`` create a
+serializer per object. For read-only endpoints that return whole trees the same
+JSON shape is assembled here from one bulk query per table instead. The
+payloads only hold strings, integers, booleans and ``None``, so
+``common.renderers.FastJSONRenderer`` can encode them directly.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, ClassVar, TypeVar, cast, override
+
+from django.conf import settings
+from django.db.models import Model, QuerySet
+from django.http import Http404
+from rest_framework.fields import DateField, DateTimeField
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from common.queries import QueryPlan, run
+from common.serializers_base import ALL_FIELDS, FieldSelection
+from common.views_base import ModelViewSetMixinBase
+from core.models import Board, ListOfTasks, Subtask, Task
+
+_MT = TypeVar("_MT", bound=Model)
+
+Row = dict[str, Any]
+
+_DATETIME_FIELD = DateTimeField()
+_DATE_FIELD = DateField()
+
+CATEGORY_COLUMNS = ["id", "name", "color", "created_at", "updated_at"]
+CONTACT_COLUMNS = ["id", "email", "name", "phone_number", "created_at", "updated_at"]
+SUBTASK_COLUMNS = ["id", "title", "done", "task_id", "created_at", "updated_at"]
+TASK_COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "due_date",
+    "priority",
+    "created_at",
+    "updated_at",
+    "list_of_tasks_id",
+    "order",
+]
+LIST_COLUMNS = ["id", "name", "board_id", "created_at", "updated_at", "order"]
+BOARD_COLUMNS = ["id", "created_at", "updated_at", "title"]
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a datetime exactly like the serializers do."""
+    return _DATETIME_FIELD.to_representation(value)
+
+
+def format_date(value: date) -> str:
+    """Format a date exactly like the serializers do."""
+    return _DATE_FIELD.to_representation(value)
+
+
+def category_payload(row: Row, prefix: str = "") -> Row:
+    """Return a ``CategorySerializer`` shaped dict from ``row``."""
+    return {
+        "id": row[f"{prefix}id"],
+        "name": row[f"{prefix}name"],
+        "color": row[f"{prefix}color"],
+        "created_at": format_datetime(row[f"{prefix}created_at"]),
+        "updated_at": format_datetime(row[f"{prefix}updated_at"]),
+    }
+
+
+def contact_payload(row: Row, prefix: str = "") -> Row:
+    """Return a ``ContactSerializer`` shaped dict from ``row``."""
+    phone_number = row[f"{prefix}phone_number"]
+    return {
+        "id": row[f"{prefix}id"],
+        "email": row[f"{prefix}email"],
+        "name": row[f"{prefix}name"],
+        "phone_number": str(phone_number) if phone_number else "",
+        "created_at": format_datetime(row[f"{prefix}created_at"]),
+        "updated_at": format_datetime(row[f"{prefix}updated_at"]),
+    }
+
+
+def subtask_payload(row: Row) -> Row:
+    """Return a ``SubtaskSerializer`` shaped dict from ``row``."""
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "done": row["done"],
+        "task": row["task_id"],
+        "created_at": format_datetime(row["created_at"]),
+        "updated_at": format_datetime(row["updated_at"]),
+    }
+
+
+def task_payload(row: Row, assignees: list[Row], subtasks: list[Row]) -> Row:
+    """Return a ``TaskSerializer`` shaped dict from ``row`` and its relations."""
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "description": row["description"],
+        "category": category_payload(row, prefix="category__"),
+        "assignees": assignees,
+        "subtasks": subtasks,
+        "due_date": format_date(row["due_date"]),
+        "priority": row["priority"],
+        "created_at": format_datetime(row["created_at"]),
+        "updated_at": format_datetime(row["updated_at"]),
+        "list_of_tasks": row["list_of_tasks_id"],
+        "order": row["order"],
+    }
+
+
+def list_payload(row: Row, tasks: list[Row]) -> Row:
+    """Return a ``ListSerializer`` shaped dict from ``row`` and its tasks."""
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "board": row["board_id"],
+        "created_at": format_datetime(row["created_at"]),
+        "updated_at": format_datetime(row["updated_at"]),
+        "tasks": tasks,
+        "order": row["order"],
+    }
+
+
+def board_payload(row: Row, lists_of_tasks: list[Row]) -> Row:
+    """Return a ``BoardSerializer`` shaped dict from ``row`` and its lists."""
+    return {
+        "id": row["id"],
+        "created_at": format_datetime(row["created_at"]),
+        "updated_at": format_datetime(row["updated_at"]),
+        "lists_of_tasks": lists_of_tasks,
+        "title": row["title"],
+    }
+
+
+TASK_VALUES = (*TASK_COLUMNS, *(f"category__{column}" for column in CATEGORY_COLUMNS))
+
+
+def plan_tasks(task_rows: list[Row]) -> QueryPlan[list[Row]]:
+    """
+    Plan task payloads for ``TASK_VALUES`` rows in their order.
+
+    Runs two queries: assignees joined with their contact and subtasks.
+    """
+    task_ids = [row["id"] for row in task_rows]
+    if not task_ids:
+        return []
+
+    assignees: defaultdict[int, list[Row]] = defaultdict(list)
+    assignee_rows: list[Row] = yield (
+        Task.assignees.through.objects.filter(task_id__in=task_ids)
+        .order_by("id")
+        .values("task_id", *(f"contact__{column}" for column in CONTACT_COLUMNS))
+    )
+    for row in assignee_rows:
+        assignees[row["task_id"]].append(contact_payload(row, prefix="contact__"))
+
+    subtasks: defaultdict[int, list[Row]] = defaultdict(list)
+    subtask_rows: list[Row] = yield (
+        Subtask.objects.filter(task_id__in=task_ids)
+        .order_by("-id")
+        .values(*SUBTASK_COLUMNS)
+    )
+    for row in subtask_rows:
+        subtasks[row["task_id"]].append(subtask_payload(row))
+
+    return [
+        task_payload(row, assignees[row["id"]], subtasks[row["id"]])
+        for row in task_rows
+    ]
+
+
+def plan_lists(list_rows: list[Row]) -> QueryPlan[list[Row]]:
+    """Plan list payloads for ``LIST_COLUMNS`` rows with their tasks."""
+    list_ids = [row["id"] for row in list_rows]
+    if not list_ids:
+        return []
+
+    tasks: defaultdict[int, list[Row]] = defaultdict(list)
+    task_queryset = Task.objects.filter(list_of_tasks_id__in=list_ids).order_by(
+        "-order"
+    )
+    task_rows: list[Row] = yield task_queryset.values(*TASK_VALUES)
+    for task in (yield from plan_tasks(task_rows)):
+        tasks[task["list_of_tasks"]].append(task)
+
+    return [list_payload(row, tasks[row["id"]]) for row in list_rows]
+
+
+def plan_boards(board_rows: list[Row]) -> QueryPlan[list[Row]]:
+    """Plan board payloads for ``BOARD_COLUMNS`` rows with their whole tree."""
+    board_ids = [row["id"] for row in board_rows]
+    if not board_ids:
+        return []
+
+    lists_of_tasks: defaultdict[int, list[Row]] = defaultdict(list)
+    list_queryset = ListOfTasks.objects.filter(board_id__in=board_ids).order_by(
+        "-order"
+    )
+    list_rows: list[Row] = yield list_queryset.values(*LIST_COLUMNS)
+    for list_of_tasks in (yield from plan_lists(list_rows)):
+        lists_of_tasks[list_of_tasks["board"]].append(list_of_tasks)
+
+    return [board_payload(row, lists_of_tasks[row["id"]]) for row in board_rows]
+
+
+def build_tasks(task_rows: list[Row]) -> list[Row]:
+    """Return task payloads for ``TASK_VALUES`` rows, see ``plan_tasks``."""
+    return run(plan_tasks(task_rows))
+
+
+def build_lists(list_rows: list[Row]) -> list[Row]:
+    """Return list payloads for ``LIST_COLUMNS`` rows with their tasks."""
+    return run(plan_lists(list_rows))
+
+
+def build_boards(board_rows: list[Row]) -> list[Row]:
+    """Return board payloads for ``BOARD_COLUMNS`` rows with their whole tree."""
+    return run(plan_boards(board_rows))
+
+
+def load_tasks(queryset: QuerySet[Task]) -> list[Row]:
+    """
+    Return task payloads for ``queryset`` in its order.
+
+    Runs three queries: tasks joined with their category, assignees joined
+    with their contact and subtasks.
+    """
+    return build_tasks(list(queryset.values(*TASK_VALUES)))
+
+
+def load_lists(queryset: QuerySet[ListOfTasks]) -> list[Row]:
+    """Return list payloads for ``queryset`` with their tasks ordered by order."""
+    return build_lists(list(queryset.values(*LIST_COLUMNS)))
+
+
+def load_boards(queryset: QuerySet[Board]) -> list[Row]:
+    """Return board payloads for ``queryset`` with their whole list/task tree."""
+    return build_boards(list(queryset.values(*BOARD_COLUMNS)))
+
+
+@dataclass(frozen=True)
+class FlatRows:
+    """The ``values()`` columns of a payload and the plan turning them into it."""
+
+    columns: tuple[str, ...]
+    plan: Callable[[list[Row]], QueryPlan[list[Row]]]
+
+    def build(self, rows: list[Row]) -> list[Row]:
+        return run(self.plan(rows))
+
+
+TASK_ROWS = FlatRows(TASK_VALUES, plan_tasks)
+LIST_ROWS = FlatRows(tuple(LIST_COLUMNS), plan_lists)
+BOARD_ROWS = FlatRows(tuple(BOARD_COLUMNS), plan_boards)
+
+
+class FlatRowsMixin(ModelViewSetMixinBase[_MT]):
+    """
+    Viewset mixin answering ``list`` and ``retrieve`` from ``flat_rows``.
+
+    The payload is built from ``values()`` rows instead of model instances and
+    serializers, with the same JSON shape. Requests selecting fields with
+    ``?fields=`` or ``?expand=``, and every request while
+    ``settings.FLAT_ROW_READS`` is off, go through the serializers.
+    """
+
+    flat_rows: ClassVar[FlatRows | None] = None
+
+    def use_flat_rows(self) -> bool:
+        return (
+            self.flat_rows is not None
+            and settings.FLAT_ROW_READS
+            and FieldSelection.from_request(self.request) == ALL_FIELDS
+        )
+
+    def get_flat_queryset(self) -> QuerySet[_MT, Row]:
+        """Return the filtered view queryset as ``values()`` rows."""
+        assert self.flat_rows is not None
+        queryset = self.filter_queryset(self.get_queryset())
+        # The rows are not model instances, drop the serializer's load plan.
+        return (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .values(*self.flat_rows.columns)
+        )
+
+    @override
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if not self.use_flat_rows():
+            return super().list(request, *args, **kwargs)
+        assert self.flat_rows is not None
+        queryset = self.get_flat_queryset()
+        # The paginators slice ``values()`` rows like model instances.
+        page = self.paginate_queryset(queryset)  # pyright: ignore[reportArgumentType]
+        if page is not None:
+            return self.get_paginated_response(
+                self.flat_rows.build(cast(list[Row], page))
+            )
+        return Response(self.flat_rows.build(list(queryset)))
+
+    @override
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if not self.use_flat_rows():
+            return super().retrieve(request, *args, **kwargs)
+        assert self.flat_rows is not None
+        queryset = self.get_flat_queryset()
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        # Raise the same errors as ``get_object``.
+        try:
+            rows = list(queryset.filter(**{self.lookup_field: lookup})[:1])
+        except (TypeError, ValueError) as exc:
+            raise Http404 from exc
+        if not rows:
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+        return Response(self.flat_rows.build(rows)[0])
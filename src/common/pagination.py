@@ -0,0 +1,267 @@
+"""
+Keyset (cursor) pagination for the API viewsets.
+"""
+
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, cast, override
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Field, Model, Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from common.queries import QueryPlan, run
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate on a composite key instead of an offset.
+
+    Views declare ``cursor_ordering``, a tuple of field or annotation names
+    (prefixed with ``-`` for descending) whose last entry must be unique, e.g.
+    ``("-order", "-id")``. The cursor encodes the key of the last row seen, so
+    every page is a bounded index range scan no matter how deep the client
+    pages, and rows inserted or removed meanwhile never shift the window.
+
+    Clients may pass ``?paginate=false`` to receive a plain list, which is only
+    honoured for collections of at most ``max_page_size`` rows.
+    """
+
+    page_size: int = api_settings.PAGE_SIZE or 100
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    paginate_query_param = "paginate"
+    default_ordering: tuple[str, ...] = ("-id",)
+    invalid_cursor_message = "Invalid cursor."
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.request: Request | None = None
+        self.ordering: tuple[str, ...] = self.default_ordering
+        self.paginated = True
+        self.next_position: list[Any] | None = None
+        self.previous_position: list[Any] | None = None
+
+    @override
+    def paginate_queryset(
+        self, queryset: QuerySet[Any], request: Request, view: APIView | None = None
+    ) -> list[Any] | None:
+        return run(self.plan_page(queryset, request, view))
+
+    def plan_page(
+        self, queryset: QuerySet[Any], request: Request, view: Any = None
+    ) -> QueryPlan[list[Any]]:
+        """Plan the rows of the requested page, see ``common.queries``."""
+        self.request = request
+        self.ordering = tuple(
+            getattr(view, "cursor_ordering", None) or self.default_ordering
+        )
+
+        if request.query_params.get(self.paginate_query_param, "").lower() == "false":
+            return (yield from self.plan_unpaginated_rows(queryset))
+
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        if position is not None:
+            position = self.clean_position(queryset, position)
+
+        ordering = self.reversed_ordering() if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after_position(ordering, position))
+
+        rows: list[Any] = yield queryset[: page_size + 1]
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        first = self.get_position(rows[0]) if rows else None
+        last = self.get_position(rows[-1]) if rows else None
+        if reverse:
+            self.next_position = last
+            self.previous_position = first if has_more else None
+        else:
+            self.next_position = last if has_more else None
+            self.previous_position = first if position is not None else None
+        return rows
+
+    def get_unpaginated_rows(self, queryset: QuerySet[Any]) -> list[Any]:
+        """Return the whole collection if it is small enough to skip paging."""
+        return run(self.plan_unpaginated_rows(queryset))
+
+    def plan_unpaginated_rows(self, queryset: QuerySet[Any]) -> QueryPlan[list[Any]]:
+        rows: list[Any] = yield queryset.order_by(*self.ordering)[
+            : self.max_page_size + 1
+        ]
+        if len(rows) > self.max_page_size:
+            raise ValidationError(
+                {
+                    self.paginate_query_param: [
+                        f"Collections larger than {self.max_page_size} items "
+                        + "must be paginated."
+                    ]
+                }
+            )
+        self.paginated = False
+        return rows
+
+    def get_page_size(self, request: Request) -> int:
+        """Return the requested page size, capped at ``max_page_size``."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def reversed_ordering(self) -> tuple[str, ...]:
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        )
+
+    def get_position(self, instance: Model | dict[str, Any]) -> list[Any]:
+        """Return the ordering key of ``instance``, a model or ``values()`` row."""
+        if isinstance(instance, dict):
+            return [instance[field.lstrip("-")] for field in self.ordering]
+        return [getattr(instance, field.lstrip("-")) for field in self.ordering]
+
+    def ordering_field(self, queryset: QuerySet[Any], name: str) -> "Field[Any, Any]":
+        """Return the model field or annotation output field named ``name``."""
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return cast("Field[Any, Any]", annotation.output_field)
+        field = queryset.model._meta.get_field(name)
+        if not isinstance(field, Field):
+            raise FieldDoesNotExist(name)
+        return cast("Field[Any, Any]", field)
+
+    def clean_position(self, queryset: QuerySet[Any], position: list[Any]) -> list[Any]:
+        """
+        Convert the cursor values with the fields they order by, so that a
+        forged cursor is rejected instead of failing in the query.
+        """
+        cleaned: list[Any] = []
+        for field, value in zip(self.ordering, position, strict=True):
+            if value is None or isinstance(value, (dict, list)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                ordering_field = self.ordering_field(queryset, field.lstrip("-"))
+                cleaned.append(ordering_field.to_python(value))
+            except (
+                DjangoValidationError,
+                FieldDoesNotExist,
+                TypeError,
+                ValueError,
+            ) as exc:
+                raise NotFound(self.invalid_cursor_message) from exc
+        return cleaned
+
+    @staticmethod
+    def after_position(ordering: tuple[str, ...], position: list[Any]) -> Q:
+        """
+        Build the lexicographic "comes after" filter for ``position``:
+        ``(a > x) OR (a = x AND b > y) OR ...`` honouring each direction.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def encode_cursor(self, position: list[Any], reverse: bool) -> str:
+        payload = json.dumps({"p": position, "r": reverse}, separators=(",", ":"))
+        return urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request: Request) -> tuple[list[Any] | None, bool]:
+        """Return the position and direction encoded in the request cursor."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode()))
+            position = payload["p"]
+            reverse = bool(payload["r"])
+        except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        position = cast(list[Any], position)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_link(self, position: list[Any] | None, reverse: bool) -> str | None:
+        if position is None or self.request is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position, reverse)
+        )
+
+    @override
+    def get_paginated_response(self, data: Any) -> Response:
+        if not self.paginated:
+            return Response(data)
+        return Response(
+            {
+                "next": self.get_link(self.next_position, reverse=False),
+                "previous": self.get_link(self.previous_position, reverse=True),
+                "results": data,
+            }
+        )
+
+    @override
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    @override
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.paginate_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Set to false to receive a plain list for collections of at "
+                    f"most {self.max_page_size} items."
+                ),
+                "schema": {"type": "boolean"},
+            },
+        ]
@@ -0,0 +1,57 @@
+"""
+Query plans that run on both the sync and the async ORM.
+
+A plan is a generator that yields the queries it needs and is sent their
+results: a ``QuerySet`` is answered with the list of its rows and an
+``Aggregate`` with the ``aggregate()`` dict. The plan's return value is the
+result. ``run`` evaluates a plan with the sync ORM and ``arun`` with the async
+one, so the read paths of the WSGI and ASGI views share one implementation.
+"""
+
+from collections.abc import Generator
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from django.db.models import QuerySet
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """``queryset.aggregate(**aggregates)`` as a step of a plan."""
+
+    queryset: QuerySet[Any, Any]
+    aggregates: dict[str, Any] = field(default_factory=dict)
+
+
+_T = TypeVar("_T")
+
+Query = QuerySet[Any, Any] | Aggregate
+QueryPlan = Generator[Query, Any, _T]
+
+
+def run(plan: QueryPlan[_T]) -> _T:
+    """Evaluate ``plan`` with the sync ORM."""
+    try:
+        query = next(plan)
+        while True:
+            if isinstance(query, Aggregate):
+                result: Any = query.queryset.aggregate(**query.aggregates)
+            else:
+                result = list(query)
+            query = plan.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def arun(plan: QueryPlan[_T]) -> _T:
+    """Evaluate ``plan`` with the async ORM."""
+    try:
+        query = next(plan)
+        while True:
+            if isinstance(query, Aggregate):
+                result: Any = await query.queryset.aaggregate(**query.aggregates)
+            else:
+                result = [row async for row in query]
+            query = plan.send(result)
+    except StopIteration as stop:
+        return stop.value
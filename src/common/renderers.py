@@ -0,0 +1,83 @@
+"""
+JSON rendering for the read endpoints, and plain text for the metrics.
+"""
+
+from collections.abc import Mapping
+from typing import Any, override
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+ORJSON_INSTALLED = orjson is not None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` encoding with orjson when it produces the same bytes.
+
+    For dicts, lists, strings, integers, booleans and ``None`` orjson's compact
+    output is identical to ``json.dumps`` with DRF's default settings, which
+    the flat row payloads of ``common.flat_rows`` consist of. Dates, times and
+    other types DRF's encoder formats itself make orjson raise, and the data is
+    rendered by ``JSONRenderer`` instead, as are indented responses and
+    non-default JSON settings. Floats would be encoded differently, so only
+    use this renderer for views without float fields.
+    """
+
+    @override
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        if (
+            data is None
+            or orjson is None
+            or not self.uses_default_format(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            rendered = orjson.dumps(
+                data,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped by JSONRenderer to keep the output valid JavaScript.
+        return rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+    def uses_default_format(
+        self, accepted_media_type: str | None, renderer_context: Mapping[str, Any]
+    ) -> bool:
+        return (
+            self.get_indent(accepted_media_type or "", renderer_context) is None
+            and self.compact
+            and not self.ensure_ascii
+            and self.encoder_class is JSONEncoder
+        )
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    """Renders metrics already formatted in the Prometheus text format."""
+
+    media_type = "text/plain"
+    format = "txt"
+    charset = "utf-8"
+
+    @override
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        return str(data).encode()
@@ -0,0 +1,172 @@
+"""
+Read replica routing for safe requests.
+
+Views with ``ReplicaReadMixin`` read from one of ``settings.READ_REPLICAS``
+while they handle a GET, HEAD or OPTIONS request. Authentication and
+permission checks still read from ``default``, so a token is usable as soon
+as it is created, and writes always go to ``default``.
+
+After a successful write, a user reads from ``default`` again for
+``REPLICA_STICKY_SECONDS``, so they see their own changes despite the
+replication lag. ``ReplicaStickinessMiddleware`` records writes in the cache
+(``REPLICA_CACHE_ALIAS``), keyed by user for token clients, and in a cookie,
+which also holds across workers that do not share a cache.
+"""
+
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, override
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponseBase
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+STICKY_COOKIE = "replica_sticky_until"
+
+_read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+
+def read_replicas() -> list[str]:
+    return list(getattr(settings, "READ_REPLICAS", []))
+
+
+def sticky_seconds() -> int:
+    return getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+
+
+def sticky_cache_key(user_id: int) -> str:
+    return f"replica-sticky:{user_id}"
+
+
+def _cache():
+    return caches[getattr(settings, "REPLICA_CACHE_ALIAS", None) or "default"]
+
+
+def mark_sticky(request: HttpRequest, response: HttpResponseBase) -> None:
+    """Send the next requests of the writer of ``request`` to ``default``."""
+    seconds = sticky_seconds()
+    if not read_replicas() or seconds <= 0:
+        return
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        _cache().set(sticky_cache_key(user.pk), True, seconds)
+    response.set_cookie(
+        STICKY_COOKIE,
+        str(int(time.time()) + seconds),
+        max_age=seconds,
+        httponly=True,
+        samesite="Lax",
+    )
+
+
+def is_sticky(request: HttpRequest) -> bool:
+    """Return whether the requesting user wrote within the sticky window."""
+    try:
+        if float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    user = getattr(request, "user", None)
+    return bool(
+        user is not None
+        and user.is_authenticated
+        and _cache().get(sticky_cache_key(user.pk))
+    )
+
+
+def replica_for(request: HttpRequest) -> str | None:
+    """Return the replica to answer ``request`` from, or None for ``default``."""
+    replicas = read_replicas()
+    if replicas and request.method in SAFE_METHODS and not is_sticky(request):
+        return random.choice(replicas)
+    return None
+
+
+def reads_from_replica() -> bool:
+    """Return whether the reads of the current request go to a replica."""
+    return _read_alias.get() not in (None, DEFAULT_DB_ALIAS)
+
+
+@contextmanager
+def read_from(alias: str | None) -> Iterator[None]:
+    """Route the reads of the block to ``alias``, or leave them if None."""
+    if alias is None:
+        yield
+        return
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Routes the reads of ``ReplicaReadMixin`` views to their replica."""
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        return _read_alias.get()
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str | None:
+        return None
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool | None:
+        # Replicas hold the same rows as the primary.
+        aliases = {DEFAULT_DB_ALIAS, *read_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+if TYPE_CHECKING:
+    # Base of the view mixin, so it type-checks against the view.
+    ReplicaReadMixinBase = APIView
+else:
+    ReplicaReadMixinBase = object
+
+
+class ReplicaReadMixin(ReplicaReadMixinBase):
+    """
+    View mixin reading from a random replica while answering safe requests
+    of users outside their sticky window.
+    """
+
+    _replica_token: Token[str | None] | None = None
+
+    @override
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        alias = replica_for(request)
+        if alias is not None:
+            self._replica_token = _read_alias.set(alias)
+
+    @override
+    def finalize_response(
+        self, request: Request, response: Response, *args: Any, **kwargs: Any
+    ) -> Response:
+        if self._replica_token is not None:
+            _read_alias.reset(self._replica_token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaStickinessMiddleware:
+    """Marks users as sticky to ``default`` after successful writes."""
+
+    def __init__(self, get_response: Any) -> None:
+        super().__init__()
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            mark_sticky(request, response)
+        return response
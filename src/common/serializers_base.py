@@ -1,9 +1,25 @@
-from typing import TYPE_CHECKING, Any, TypeVar, override
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar, cast, override
 
 from django.db import models
+from django.db.models import Prefetch, QuerySet
 from ordered_model.serializers import OrderedModelSerializer
 from rest_framework.authtoken.models import Token
-from rest_framework.serializers import BaseSerializer, ModelSerializer, Serializer
+from rest_framework.fields import Field
+from rest_framework.relations import (
+    ManyRelatedField,
+    PrimaryKeyRelatedField,
+    RelatedField,
+)
+from rest_framework.request import Request
+from rest_framework.serializers import (
+    BaseSerializer,
+    ListSerializer,
+    ModelSerializer,
+    Serializer,
+)
 from rest_framework.utils.serializer_helpers import ReturnDict
 
 _MT = TypeVar("_MT", bound=models.Model)
@@ -18,6 +34,191 @@ class AppModelSerializer(ModelSerializer[_MT]):
             ...
 
 
+FieldTree = dict[str, "FieldTree"]
+
+
+def parse_field_tree(value: str) -> FieldTree:
+    """
+    Parse a comma separated list of dotted field paths into a tree.
+
+    ``"id,tasks.title,tasks.order"`` becomes
+    ``{"id": {}, "tasks": {"title": {}, "order": {}}}``.
+    """
+    tree: FieldTree = {}
+    for path in value.split(","):
+        node = tree
+        for name in path.strip().split("."):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """
+    The fields and expanded relations a client asked for.
+
+    ``fields`` restricts the output to the named fields, ``None`` keeps all of
+    them; a nested field without sub-paths keeps all of its fields.
+    ``expand`` names the relations rendered as nested objects, the others are
+    rendered as ids; ``None`` expands every relation, as the serializers did
+    before the parameters existed.
+    """
+
+    fields: FieldTree | None = None
+    expand: FieldTree | None = None
+
+    @classmethod
+    def from_request(cls, request: Request | None) -> "FieldSelection":
+        """Read ``?fields=`` and ``?expand=`` from ``request``."""
+        if request is None:
+            return ALL_FIELDS
+        fields = request.query_params.get("fields")
+        expand = request.query_params.get("expand")
+        return cls(
+            fields=parse_field_tree(fields) if fields else None,
+            expand=parse_field_tree(expand) if expand is not None else None,
+        )
+
+    def includes(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def expands(self, name: str) -> bool:
+        return self.expand is None or name in self.expand
+
+    def child(self, name: str) -> "FieldSelection":
+        """Return the selection applying to the objects nested in ``name``."""
+        if not self.expands(name):
+            return IDS_ONLY
+        return FieldSelection(
+            fields=self.fields.get(name) or None if self.fields is not None else None,
+            expand=self.expand[name] if self.expand is not None else None,
+        )
+
+
+ALL_FIELDS = FieldSelection()
+IDS_ONLY = FieldSelection(fields={"id": {}}, expand={})
+
+
+if TYPE_CHECKING:
+    # Base of the serializer mixins, so they type-check against the serializer.
+    SerializerMixinBase = Serializer[Any]
+else:
+    SerializerMixinBase = object
+
+
+class QueryPlanMixin(SerializerMixinBase):
+    """
+    Declares the relations a serializer reads so that views can load them in
+    bulk instead of once per instance.
+
+    ``select_related_fields`` and ``prefetch_related_fields`` map serializer
+    field names to ORM lookups. Nested serializers return their own planned
+    queryset from ``get_prefetch_queryset`` so a whole tree is loaded with a
+    fixed number of queries.
+
+    Clients trim the output with ``?fields=`` and collapse the relations listed
+    in ``expandable_fields`` to ids with ``?expand=``, see ``FieldSelection``.
+    Views pass the same selection to ``plan_queryset``, which then skips the
+    joins and prefetches of everything that is not rendered.
+    """
+
+    select_related_fields: ClassVar[dict[str, str]] = {}
+    prefetch_related_fields: ClassVar[dict[str, str]] = {}
+    expandable_fields: ClassVar[tuple[str, ...]] = ()
+
+    @classmethod
+    def get_prefetch_queryset(
+        cls, field_name: str, selection: FieldSelection
+    ) -> QuerySet[Any] | None:
+        """Return the queryset used to prefetch ``selection`` of ``field_name``."""
+        return None
+
+    @classmethod
+    def plan_queryset(
+        cls, queryset: QuerySet[_MT], selection: FieldSelection = ALL_FIELDS
+    ) -> QuerySet[_MT]:
+        """Apply the select/prefetch plan of this serializer to ``queryset``."""
+        select_related = [
+            lookup
+            for field_name, lookup in cls.select_related_fields.items()
+            if selection.includes(field_name) and selection.expands(field_name)
+        ]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        prefetches = [
+            Prefetch(
+                lookup,
+                queryset=cls.get_prefetch_queryset(
+                    field_name, selection.child(field_name)
+                ),
+            )
+            for field_name, lookup in cls.prefetch_related_fields.items()
+            if selection.includes(field_name)
+        ]
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    @cached_property
+    def selection(self) -> FieldSelection:
+        """Return the part of the request's selection that applies here."""
+        node: Field[Any, Any, Any, Any] = self
+        parent = cast(BaseSerializer[Any] | None, node.parent)
+        if isinstance(parent, ListSerializer):
+            node = parent
+            parent = cast(BaseSerializer[Any] | None, node.parent)
+        if isinstance(parent, QueryPlanMixin):
+            return parent.selection.child(node.field_name or "")
+        return FieldSelection.from_request(node.context.get("request"))
+
+    def is_expanded(self, field_name: str) -> bool:
+        return self.selection.includes(field_name) and self.selection.expands(
+            field_name
+        )
+
+    @cached_property
+    def collapsed_fields(self) -> dict[str, Field[Any, Any, Any, Any]]:
+        """Return id fields standing in for the nested serializers."""
+        collapsed: dict[str, Field[Any, Any, Any, Any]] = {}
+        fields = cast(Mapping[str, Field[Any, Any, Any, Any]], self.fields)
+        for field_name in self.expandable_fields:
+            field = fields.get(field_name)
+            if not isinstance(field, BaseSerializer):
+                continue
+            source = cast(str, getattr(field, "source"))
+            if source == field_name:
+                source = None
+            id_field: Field[Any, Any, Any, Any]
+            if isinstance(field, ListSerializer):
+                child_relation = PrimaryKeyRelatedField[Any](read_only=True)
+                id_field = ManyRelatedField(
+                    child_relation=cast(RelatedField[Any, Any, Any], child_relation),
+                    read_only=True,
+                    source=source,
+                )
+            else:
+                id_field = PrimaryKeyRelatedField[Any](read_only=True, source=source)
+            id_field.bind(field_name, self)  # pyright: ignore[reportUnknownMemberType]
+            collapsed[field_name] = id_field
+        return collapsed
+
+    @property
+    @override
+    def _readable_fields(self) -> list[Field[Any, Any, Any, Any]]:
+        selection = self.selection
+        fields: list[Field[Any, Any, Any, Any]] = []
+        readable = cast(list[Field[Any, Any, Any, Any]], super()._readable_fields)
+        for field in readable:
+            field_name = field.field_name or ""
+            if not selection.includes(field_name):
+                continue
+            if not selection.expands(field_name):
+                field = self.collapsed_fields.get(field_name, field)
+            fields.append(field)
+        return fields
+
+
 if TYPE_CHECKING:
     from core.models import Board, Category, Contact, ListOfTasks, Subtask, Task, User
 
@@ -0,0 +1,345 @@
+"""
+Per-request query counts and timings, per view.
+
+``RequestTimingMiddleware`` measures every request while
+``settings.REQUEST_TIMING["ENABLED"]`` is set:
+
+- ``db``: the number of SQL queries and the time spent in them, on every
+  database alias;
+- ``render``: the time spent rendering the response data to bytes. Views
+  build the data itself (flat rows or ``serializer.data``) in the handler,
+  which is part of ``app``;
+- ``app``: the rest of the view and middleware time;
+- ``total``: the whole request.
+
+The timings are sent in a ``Server-Timing`` header, which browsers show in
+their developer tools, and aggregated per view and method into histograms,
+served in the Prometheus text format by ``monitoring``. A request taking
+longer than its budget, ``BUDGETS[view]`` or ``BUDGET_MS``, is logged with
+its ``SLOW_QUERIES`` slowest queries and the project lines that ran each.
+Finding those lines walks the stack, which would inflate the timings of every
+query, so only queries taking at least ``SLOW_QUERY_MS`` are traced and
+listed.
+
+Configured through ``settings.REQUEST_TIMING``::
+
+    REQUEST_TIMING = {
+        "ENABLED": True,
+        "BUDGET_MS": 500,
+        "BUDGETS": {},
+        "SLOW_QUERY_MS": 50,
+    }
+"""
+
+import heapq
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS: dict[str, Any] = {
+    "ENABLED": False,
+    # Send the timings to clients in a Server-Timing header.
+    "SERVER_TIMING": True,
+    # Milliseconds a request may take before it is logged, 0 never logs.
+    "BUDGET_MS": 500.0,
+    # Budgets of single views by class name, e.g. {"SummaryView": 200}.
+    "BUDGETS": {},
+    # Number of the slowest queries logged with a request over its budget.
+    "SLOW_QUERIES": 5,
+    # Milliseconds a query must take to be traced to its origin and logged,
+    # 0 traces every query.
+    "SLOW_QUERY_MS": 50.0,
+}
+
+# Upper bounds of the histogram buckets, the last one is +Inf.
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERIES_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+METRICS_PREFIX = "scrum_api_request"
+
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def timing_settings() -> dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "REQUEST_TIMING", {})}
+
+
+def budget_ms(options: dict[str, Any], view_name: str) -> float:
+    return float(options["BUDGETS"].get(view_name, options["BUDGET_MS"]))
+
+
+def query_origin(depth: int = 3) -> str:
+    """
+    Return the innermost ``depth`` project lines on the stack, outside this
+    module, innermost first, so helpers show who called them.
+    """
+    base_dir = str(settings.BASE_DIR)
+    lines: list[str] = []
+    frame = sys._getframe(1)  # pyright: ignore[reportPrivateUsage]
+    while frame is not None and len(lines) < depth:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(base_dir)
+            and filename != _THIS_FILE
+            and "site-packages" not in filename
+        ):
+            path = os.path.relpath(filename, base_dir)
+            lines.append(f"{path}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return " < ".join(lines) or "unknown"
+
+
+@dataclass(order=True)
+class SlowQuery:
+    ms: float
+    sql: str = field(compare=False)
+    origin: str = field(compare=False)
+
+
+@dataclass
+class RequestTiming:
+    """The queries and timings of one request."""
+
+    view_name: str = "unresolved"
+    keep_slow: int = 0
+    trace: bool = False
+    slow_query_ms: float = 0.0
+    queries: int = 0
+    db_ms: float = 0.0
+    render_ms: float = 0.0
+    total_ms: float = 0.0
+    slowest: list[SlowQuery] = field(default_factory=list)
+
+    def execute(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        """``execute_wrapper`` timing the queries of the request."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.queries += 1
+            self.db_ms += elapsed_ms
+            if self.trace and elapsed_ms >= self.slow_query_ms:
+                self.keep(elapsed_ms, sql)
+
+    def keep(self, elapsed_ms: float, sql: str) -> None:
+        """Trace a query if it is among the slowest so far."""
+        # A min-heap of the slowest queries so far.
+        if len(self.slowest) < self.keep_slow:
+            heapq.heappush(self.slowest, SlowQuery(elapsed_ms, sql, query_origin()))
+        elif self.slowest and elapsed_ms > self.slowest[0].ms:
+            _ = heapq.heapreplace(
+                self.slowest, SlowQuery(elapsed_ms, sql, query_origin())
+            )
+
+    @property
+    def app_ms(self) -> float:
+        return max(self.total_ms - self.db_ms - self.render_ms, 0.0)
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            [
+                f'db;dur={self.db_ms:.3f};desc="{self.queries} queries"',
+                f"render;dur={self.render_ms:.3f}",
+                f"app;dur={self.app_ms:.3f}",
+                f"total;dur={self.total_ms:.3f}",
+            ]
+        )
+
+
+@dataclass
+class Histogram:
+    """Observations counted in buckets with upper bounds ``bounds``."""
+
+    bounds: tuple[float, ...]
+    counts: list[int] = field(init=False)
+    count: int = 0
+    sum: float = 0.0
+
+    def __post_init__(self) -> None:
+        # One more bucket for values above the last bound.
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Iterator[tuple[str, int]]:
+        """Yield each ``le`` label with the count of values up to it."""
+        total = 0
+        for bound, count in zip([*self.bounds, "+Inf"], self.counts, strict=True):
+            total += count
+            yield (bound if isinstance(bound, str) else f"{bound:g}"), total
+
+
+@dataclass
+class ViewTimings:
+    """Requests of one view and method in this process."""
+
+    duration: Histogram = field(default_factory=lambda: Histogram(SECONDS_BUCKETS))
+    db: Histogram = field(default_factory=lambda: Histogram(SECONDS_BUCKETS))
+    render: Histogram = field(default_factory=lambda: Histogram(SECONDS_BUCKETS))
+    queries: Histogram = field(default_factory=lambda: Histogram(QUERIES_BUCKETS))
+    over_budget: int = 0
+
+
+_lock = threading.Lock()
+view_timings: dict[tuple[str, str], ViewTimings] = {}
+
+
+def record_request(method: str, timing: RequestTiming, over_budget: bool) -> None:
+    with _lock:
+        timings = view_timings.setdefault((timing.view_name, method), ViewTimings())
+        timings.duration.observe(timing.total_ms / 1000)
+        timings.db.observe(timing.db_ms / 1000)
+        timings.render.observe(timing.render_ms / 1000)
+        timings.queries.observe(timing.queries)
+        timings.over_budget += over_budget
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# name suffix, help, ViewTimings attribute
+HISTOGRAMS = (
+    ("duration_seconds", "Time to answer a request.", "duration"),
+    ("db_duration_seconds", "Time spent in SQL queries.", "db"),
+    ("render_duration_seconds", "Time spent rendering the response.", "render"),
+    ("queries", "SQL queries run.", "queries"),
+)
+
+
+def prometheus_metrics() -> str:
+    """Return the timings of this process in the Prometheus text format."""
+    with _lock:
+        snapshot = sorted(view_timings.items())
+        lines: list[str] = []
+        for suffix, help_text, attribute in HISTOGRAMS:
+            name = f"{METRICS_PREFIX}_{suffix}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (view_name, method), timings in snapshot:
+                labels = f'view="{_label(view_name)}",method="{_label(method)}"'
+                histogram: Histogram = getattr(timings, attribute)
+                lines += [
+                    f'{name}_bucket{{{labels},le="{le}"}} {count}'
+                    for le, count in histogram.cumulative()
+                ]
+                lines += [
+                    f"{name}_sum{{{labels}}} {histogram.sum:.6f}",
+                    f"{name}_count{{{labels}}} {histogram.count}",
+                ]
+        name = f"{METRICS_PREFIX}_over_budget_total"
+        lines += [
+            f"# HELP {name} Requests that took longer than their budget.",
+            f"# TYPE {name} counter",
+        ]
+        lines += [
+            f'{name}{{view="{_label(view_name)}",method="{_label(method)}"}} '
+            + str(timings.over_budget)
+            for (view_name, method), timings in snapshot
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def log_over_budget(request: HttpRequest, timing: RequestTiming, budget: float):
+    slowest = "".join(
+        f"\n  {query.ms:.3f} ms at {query.origin}: {query.sql}"
+        for query in sorted(timing.slowest, reverse=True)
+    )
+    logger.warning(
+        "%s %s (%s) took %.3f ms, over its %g ms budget; %d queries in %.3f ms, "
+        + "render %.3f ms. Slowest queries:%s",
+        request.method,
+        request.get_full_path(),
+        timing.view_name,
+        timing.total_ms,
+        budget,
+        timing.queries,
+        timing.db_ms,
+        timing.render_ms,
+        slowest or " none",
+    )
+
+
+def view_name_of(view_func: Any) -> str:
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    return getattr(view_class or view_func, "__name__", "unknown")
+
+
+class RequestTimingMiddleware:
+    """Measures the queries and timings of requests, see the module."""
+
+    def __init__(self, get_response: Any) -> None:
+        super().__init__()
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        options = timing_settings()
+        if not options["ENABLED"]:
+            return self.get_response(request)
+
+        trace = bool(options["BUDGET_MS"]) or any(options["BUDGETS"].values())
+        timing = RequestTiming(
+            keep_slow=options["SLOW_QUERIES"],
+            trace=trace,
+            slow_query_ms=float(options["SLOW_QUERY_MS"]),
+        )
+        request.request_timing = timing  # pyright: ignore[reportAttributeAccessIssue]
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing.execute))
+            response = self.get_response(request)
+        timing.total_ms = (time.perf_counter() - start) * 1000
+
+        budget = budget_ms(options, timing.view_name)
+        over_budget = 0 < budget < timing.total_ms
+        record_request(request.method or "", timing, over_budget)
+        if over_budget:
+            log_over_budget(request, timing, budget)
+        if options["SERVER_TIMING"]:
+            response["Server-Timing"] = timing.server_timing()
+        return response
+
+    def process_view(
+        self, request: HttpRequest, view_func: Any, *args: Any, **kwargs: Any
+    ) -> None:
+        timing: RequestTiming | None = getattr(request, "request_timing", None)
+        if timing is not None:
+            timing.view_name = view_name_of(view_func)
+
+    def process_template_response(self, request: HttpRequest, response: Any) -> Any:
+        timing: RequestTiming | None = getattr(request, "request_timing", None)
+        if timing is not None:
+            start = time.perf_counter()
+
+            def rendered(_: Any) -> None:
+                timing.render_ms += (time.perf_counter() - start) * 1000
+
+            # Called at once if the view rendered the response itself.
+            response.add_post_render_callback(rendered)
+        return response
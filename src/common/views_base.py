@@ -1,8 +1,11 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generic, TypeVar
 
+from django.db.models import Model
 from rest_framework.generics import CreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.viewsets import ModelViewSet
 
+_MT = TypeVar("_MT", bound=Model)
+
 if TYPE_CHECKING:
     from core.models import Board, Category, Contact, ListOfTasks, Subtask, Task, User
 
@@ -15,6 +18,8 @@ if TYPE_CHECKING:
     UserModelViewSet = ModelViewSet[User]
     UserRetrieveUpdateDestroyAPIView = RetrieveUpdateDestroyAPIView[User]
     UserCreateAPIView = CreateAPIView[User]
+    # Base of the viewset mixins, so they type-check against the viewset.
+    ModelViewSetMixinBase = ModelViewSet
 else:
     BoardModelViewSet = ModelViewSet
     CategoryModelViewSet = ModelViewSet
@@ -25,3 +30,6 @@ else:
     UserModelViewSet = ModelViewSet
     UserRetrieveUpdateDestroyAPIView = RetrieveUpdateDestroyAPIView
     UserCreateAPIView = CreateAPIView
+
+    class ModelViewSetMixinBase(Generic[_MT]):
+        pass
@@ -3,9 +3,12 @@ Tests for contact APIs.
 """
 
 from typing import override
+from unittest.mock import patch
 
 from django.db.models.functions import Lower
+from rest_framework import status
 
+from common.pagination import KeysetPagination
 from contact.serializers import ContactSerializer
 from core.models import Contact
 from core.tests.api_test_case import PrivateAPITestCase, PublicAPITestCase
@@ -57,6 +60,40 @@ class PrivateContactAPITests(PrivateAPITestCase):
         }
         self.assert_create_model(payload)
 
+    def test_paginate_contacts(self):
+        """Test contacts page in case-insensitive name order."""
+        for index, name in enumerate(["bob", "Alice", "alice", "Carol", "dave"]):
+            _ = create_test_contact(
+                self.user, f"paged{index}@example.com", name, phone_number=""
+            )
+        expected_ids = list(
+            Contact.objects.filter(user=self.user)
+            .order_by(Lower("name"), "id")
+            .values_list("id", flat=True)
+        )
+
+        self.assert_paginates_models(expected_ids, page_size=2)
+
+    def test_unpaginated_large_collection_error(self):
+        """Test opting out of pagination is refused for large collections."""
+        _ = create_test_contact(
+            self.user, TEST_OTHER_CONTACT_EMAIL, TEST_OTHER_CONTACT_FULL_NAME, ""
+        )
+        with patch.object(KeysetPagination, "max_page_size", 1):
+            res = self.client.get(self.api_url("list", []), {"paginate": "false"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor_error(self):
+        """Test a malformed cursor gives error."""
+        res = self.client.get(self.api_url("list", []), {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_forged_cursor_error(self):
+        """Test cursors with keys of the wrong type give error."""
+        self.assert_rejects_forged_cursors([["a", "b"], [["a"], 1], ["a", None]])
+
     def test_retrieve_contacts(self):
         """Test retrieving contacts."""
         self.assert_retrieve_models()
@@ -6,28 +6,41 @@ from typing import override
 
 from django.db.models.functions import Lower
 from django.db.models.query import QuerySet
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from common.conditional import ConditionalGetMixin
 from common.serializers_base import ContactBasedSerializer
 from common.views_base import ContactModelViewSet
 from contact.serializers import ContactSerializer
-from core.models import Contact
+from core.models import Contact, SearchDocument
+from response_cache.cache import ResponseCacheMixin
+from search.filters import FullTextSearchFilter
+from user.authentication import CachedTokenAuthentication
 
 
-class ContactViewSet(ContactModelViewSet):
+class ContactViewSet(
+    ResponseCacheMixin[Contact], ConditionalGetMixin[Contact], ContactModelViewSet
+):
     """View for manage contact APIs."""
 
     serializer_class = ContactSerializer
     queryset = Contact.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    filter_backends = [FullTextSearchFilter]
+    search_kind = SearchDocument.CONTACT
+    cursor_ordering = ("lower_name", "id")
+    conditional_dependencies = ((Contact, "user"),)
 
     @override
     def get_queryset(self) -> QuerySet[Contact]:
         """Retrieve contacts for authenticated user."""
         assert self.queryset is not None
-        return self.queryset.filter(user=self.request.user).order_by(Lower("name"))
+        return (
+            self.queryset.filter(user=self.request.user)
+            .annotate(lower_name=Lower("name"))
+            .order_by("lower_name", "id")
+        )
 
     @override
     def perform_create(  # pyright: ignore[reportIncompatibleMethodOverride]
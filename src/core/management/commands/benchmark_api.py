@@ -0,0 +1,454 @@
+"""
+Django command to benchmark the API endpoints on seeded data.
+"""
+
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Any, override
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.version import get_version
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from common.timing import RequestTiming
+from core.models import Board, Category, Contact, ListOfTasks, Subtask, Task, User
+from core.ordering import order_step, sparse_ordering
+from core.utils import PRIORITY_CHOICES
+from search.documents import rebuild as rebuild_search_documents
+from summary.counters import rebuild as rebuild_summary
+
+BENCHMARK_EMAIL = "api-benchmark-{index}@example.com"
+# Due dates count from a fixed day, so every run seeds the same rows.
+BASE_DATE = date(2030, 1, 1)
+
+
+@dataclass
+class Volumes:
+    """Rows seeded per user; lists are per board, tasks per list and so on."""
+
+    users: int
+    boards: int
+    lists: int
+    tasks: int
+    subtasks: int
+    contacts: int
+    categories: int
+
+
+@dataclass
+class Operation:
+    """
+    An API request benchmarked repeatedly. ``prepare`` returns the URL and
+    payload of the ``index``-th run.
+    """
+
+    name: str
+    method: str
+    expected_status: int
+    prepare: Callable[[int], tuple[str, dict[str, Any] | None]]
+    on_response: Callable[[Any], None] = lambda response: None
+
+
+@dataclass
+class OperationResult:
+    """The timed runs of one operation."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    db_ms: list[float] = field(default_factory=list)
+    peak_memory_kib: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        # The nearest rank, which needs no more runs than there are.
+        p95 = latencies[max(round(len(latencies) * 0.95) - 1, 0)]
+        return {
+            "runs": len(latencies),
+            "latency_ms": {
+                "min": round(latencies[0], 3),
+                "median": round(statistics.median(latencies), 3),
+                "mean": round(statistics.fmean(latencies), 3),
+                "p95": round(p95, 3),
+                "max": round(latencies[-1], 3),
+            },
+            "queries": {"min": min(self.queries), "max": max(self.queries)},
+            "db_ms_median": round(statistics.median(self.db_ms), 3),
+            "peak_memory_kib": round(self.peak_memory_kib, 1),
+        }
+
+
+def git_commit() -> str | None:
+    """Return the checked out commit, if the source is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+            timeout=10,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+@contextmanager
+def timed_queries() -> Iterator[RequestTiming]:
+    """Count the queries of the block, on every database alias."""
+    timing = RequestTiming()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(timing.execute))
+        yield timing
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the main API endpoints."""
+
+    help = (
+        "Seed synthetic users and time the board, task, summary, reorder, "
+        "create and delete endpoints of the first one through the full request "
+        "stack: latency, query count, database time and peak memory per "
+        "operation. Results are written as JSON, and --compare prints the "
+        "change against an earlier result file. By default a fresh test "
+        "database is created and destroyed, an in-memory one with SQLite; "
+        "set USE_SQLITE=False and the DB_* variables to run on PostgreSQL."
+    )
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument("--users", type=int, default=1)
+        _ = parser.add_argument("--boards", type=int, default=2, help="Per user.")
+        _ = parser.add_argument("--lists", type=int, default=4, help="Per board.")
+        _ = parser.add_argument("--tasks", type=int, default=25, help="Per list.")
+        _ = parser.add_argument("--subtasks", type=int, default=2, help="Per task.")
+        _ = parser.add_argument("--contacts", type=int, default=10, help="Per user.")
+        _ = parser.add_argument("--categories", type=int, default=5, help="Per user.")
+        _ = parser.add_argument("--repeat", type=int, default=20)
+        _ = parser.add_argument(
+            "--warmup", type=int, default=2, help="Untimed runs per operation."
+        )
+        _ = parser.add_argument("--seed", type=int, default=0)
+        _ = parser.add_argument("--output", default="benchmark_api.json")
+        _ = parser.add_argument(
+            "--compare", help="Earlier result file to compare the results with."
+        )
+        _ = parser.add_argument(
+            "--response-cache",
+            action="store_true",
+            help="Keep the response cache enabled, so repeated reads are hits.",
+        )
+        _ = parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help=(
+                "Use the configured database instead of a fresh one, in a "
+                "transaction rolled back at the end; on-commit work is skipped."
+            ),
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        if options["repeat"] <= 0:
+            raise CommandError("--repeat must be positive.")
+        volumes = Volumes(
+            **{name: options[name] for name in Volumes.__dataclass_fields__}
+        )
+        if min(asdict(volumes).values()) < 0 or 0 in (
+            volumes.users,
+            volumes.boards,
+            volumes.lists,
+            volumes.tasks,
+            volumes.contacts,
+            volumes.categories,
+        ):
+            raise CommandError("Volumes must be positive, --subtasks may be 0.")
+        previous = self.load(options["compare"]) if options["compare"] else None
+
+        overrides: dict[str, Any] = {
+            "ALLOWED_HOSTS": [*settings.ALLOWED_HOSTS, "testserver"],
+            "RESPONSE_CACHE": {
+                **getattr(settings, "RESPONSE_CACHE", {}),
+                "ENABLED": options["response_cache"],
+            },
+        }
+        if options["current_db"]:
+            with override_settings(**overrides), transaction.atomic():
+                results = self.run(volumes, options)
+                transaction.set_rollback(True)
+        else:
+            # Replicas would mirror the database the fresh one stands in for.
+            overrides["READ_REPLICAS"] = []
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                with override_settings(**overrides):
+                    results = self.run(volumes, options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+            _ = output.write("\n")
+        self.report(results, previous)
+        self.stdout.write(f"Results written to {options['output']}.")
+
+    def run(self, volumes: Volumes, options: dict[str, Any]) -> dict[str, Any]:
+        rng = random.Random(options["seed"])
+        start = time.perf_counter()
+        users = [self.seed_user(index, volumes, rng) for index in range(volumes.users)]
+        # The rows were inserted without signals.
+        user_ids = [user.pk for user in users]
+        _ = rebuild_summary(user_ids)
+        _ = rebuild_search_documents(user_ids)
+        seed_seconds = time.perf_counter() - start
+
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=users[0]).key}"
+        )
+        runs = options["warmup"] + options["repeat"]
+        results = {
+            operation.name: self.measure(client, operation, options).as_dict()
+            for operation in self.operations(users[0], rng, runs)
+        }
+        return {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "django": get_version(),
+                "database": connection.vendor,
+                "fresh_database": not options["current_db"],
+                "ordering_engine": "sparse" if sparse_ordering() else "dense",
+                "flat_row_reads": getattr(settings, "FLAT_ROW_READS", False),
+                "response_cache": options["response_cache"],
+                "volumes": asdict(volumes),
+                "seed": options["seed"],
+                "warmup": options["warmup"],
+                "repeat": options["repeat"],
+                "seed_seconds": round(seed_seconds, 3),
+            },
+            "results": results,
+        }
+
+    def seed_user(self, index: int, volumes: Volumes, rng: random.Random) -> User:
+        """Create a user with the rows of ``volumes``."""
+        email = BENCHMARK_EMAIL.format(index=index)
+        if User.objects.filter(email=email).exists():
+            raise CommandError(f"A user with email {email} already exists.")
+        user = User.objects.create_user(email=email, name=f"Benchmark {index}")
+        step = order_step()
+        categories = Category.objects.bulk_create(
+            Category(user=user, name=f"Category {number}", color="#FF0000")
+            for number in range(volumes.categories)
+        )
+        contacts = Contact.objects.bulk_create(
+            Contact(
+                user=user,
+                email=f"contact{number}@example.com",
+                name=f"Contact {number}",
+                phone_number="",
+            )
+            for number in range(volumes.contacts)
+        )
+        boards = Board.objects.bulk_create(
+            Board(user=user, title=f"Board {number}")
+            for number in range(volumes.boards)
+        )
+        lists = ListOfTasks.objects.bulk_create(
+            ListOfTasks(
+                board=board, owner=user, name=f"List {number}", order=number * step
+            )
+            for board in boards
+            for number in range(volumes.lists)
+        )
+        tasks = Task.objects.bulk_create(
+            Task(
+                list_of_tasks=list_of_tasks,
+                owner=user,
+                category=rng.choice(categories),
+                title=f"Task {number} of {list_of_tasks.name}",
+                description="Lorem ipsum dolor sit amet. " * rng.randint(0, 8),
+                priority=rng.choice(PRIORITY_CHOICES)[0],
+                due_date=BASE_DATE + timedelta(days=rng.randrange(90)),
+                order=number * step,
+            )
+            for list_of_tasks in lists
+            for number in range(volumes.tasks)
+        )
+        _ = Subtask.objects.bulk_create(
+            Subtask(task=task, owner=user, title=f"Subtask {number}")
+            for task in tasks
+            for number in range(volumes.subtasks)
+        )
+        _ = Task.assignees.through.objects.bulk_create(
+            Task.assignees.through(task=task, contact=contact)
+            for task in tasks
+            for contact in rng.sample(contacts, min(2, len(contacts)))
+        )
+        return user
+
+    def operations(self, user: User, rng: random.Random, runs: int) -> list[Operation]:
+        """
+        The benchmarked requests. Every created task is deleted again, so the
+        reads of later runs see the seeded rows only.
+        """
+        board = Board.objects.filter(user=user).order_by("pk").first()
+        list_of_tasks = ListOfTasks.objects.filter(board=board).order_by("pk").first()
+        assert board is not None and list_of_tasks is not None
+        list_size = Task.objects.filter(list_of_tasks=list_of_tasks).count()
+        moved = Task.objects.filter(list_of_tasks=list_of_tasks).order_by("pk").first()
+        assert moved is not None
+        category_id = Category.objects.filter(user=user).values_list("pk", flat=True)[0]
+        contact_ids = list(
+            Contact.objects.filter(user=user)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        # The memory run comes after the timed ones.
+        positions = [rng.randrange(list_size) for _ in range(runs + 1)]
+        created: list[int] = []
+
+        def create_payload(index: int) -> dict[str, Any]:
+            return {
+                "title": f"Benchmark task {index}",
+                "description": "Created by the benchmark.",
+                "category": category_id,
+                "assignees": contact_ids[:2],
+                "priority": "Medium",
+                "due_date": BASE_DATE.isoformat(),
+                "list_of_tasks": list_of_tasks.pk,
+                "subtasks": [{"title": "First", "done": False}],
+            }
+
+        return [
+            Operation(
+                "board_retrieve",
+                "get",
+                200,
+                lambda index: (reverse("board:board-detail", args=[board.pk]), None),
+            ),
+            Operation(
+                "board_list",
+                "get",
+                200,
+                lambda index: (reverse("board:board-list"), None),
+            ),
+            Operation(
+                "task_list", "get", 200, lambda index: (reverse("task:task-list"), None)
+            ),
+            Operation(
+                "summary", "get", 200, lambda index: (reverse("summary:summary"), None)
+            ),
+            Operation(
+                "task_reorder",
+                "post",
+                200,
+                lambda index: (
+                    reverse("task:task-move", args=[moved.pk]),
+                    {"list_of_tasks": list_of_tasks.pk, "position": positions[index]},
+                ),
+            ),
+            Operation(
+                "task_create",
+                "post",
+                201,
+                lambda index: (reverse("task:task-list"), create_payload(index)),
+                lambda response: created.append(response.json()["id"]),
+            ),
+            Operation(
+                "task_delete",
+                "delete",
+                204,
+                lambda index: (
+                    reverse("task:task-detail", args=[created.pop()]),
+                    None,
+                ),
+            ),
+        ]
+
+    def measure(
+        self, client: APIClient, operation: Operation, options: dict[str, Any]
+    ) -> OperationResult:
+        """
+        Run ``operation`` ``--warmup`` times, then ``--repeat`` timed runs,
+        then once more with tracemalloc for the peak memory, which tracing
+        would slow down in the timed runs.
+        """
+        result = OperationResult()
+        warmup = options["warmup"]
+        for index in range(warmup + options["repeat"] + 1):
+            url, payload = operation.prepare(index)
+            send = getattr(client, operation.method)
+            traced = index == warmup + options["repeat"]
+            if traced:
+                tracemalloc.start()
+            with timed_queries() as timing:
+                start = time.perf_counter()
+                response = send(url, payload, format="json")
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            if traced:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                result.peak_memory_kib = peak / 1024
+            if response.status_code != operation.expected_status:
+                raise CommandError(
+                    f"{operation.name} answered {response.status_code}: "
+                    + f"{response.content[:500]!r}"
+                )
+            operation.on_response(response)
+            if warmup <= index and not traced:
+                result.latencies_ms.append(elapsed_ms)
+                result.queries.append(timing.queries)
+                result.db_ms.append(timing.db_ms)
+        return result
+
+    @staticmethod
+    def load(path: str) -> dict[str, Any]:
+        try:
+            with open(path, encoding="utf-8") as previous:
+                return json.load(previous)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Cannot read {path}: {error}") from error
+
+    def report(self, results: dict[str, Any], previous: dict[str, Any] | None):
+        header = (
+            f"{'operation':<16}{'median ms':>11}{'p95 ms':>10}{'queries':>9}"
+            f"{'db ms':>9}{'peak KiB':>10}"
+        )
+        self.stdout.write(header + ("  vs previous" if previous else ""))
+        for name, result in results["results"].items():
+            latency = result["latency_ms"]
+            queries = result["queries"]
+            line = (
+                f"{name:<16}{latency['median']:>11.2f}{latency['p95']:>10.2f}"
+                f"{queries['max']:>9}{result['db_ms_median']:>9.2f}"
+                f"{result['peak_memory_kib']:>10.1f}"
+            )
+            before = (previous or {}).get("results", {}).get(name)
+            if before:
+                change = latency["median"] / before["latency_ms"]["median"] - 1
+                line += (
+                    f"  {change:+.1%} median, "
+                    f"{queries['max'] - before['queries']['max']:+d} queries"
+                )
+            self.stdout.write(line)
@@ -0,0 +1,161 @@
+"""
+Django command to compare the serializer and flat row read paths.
+"""
+
+import statistics
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import QuerySet
+from rest_framework.renderers import JSONRenderer
+
+from board.serializers import BoardSerializer
+from common.flat_rows import load_boards, load_lists, load_tasks
+from common.renderers import ORJSON_INSTALLED, FastJSONRenderer
+from core.models import Board, Category, Contact, ListOfTasks, Subtask, Task, User
+from list_of_tasks.serializers import ListSerializer
+from task.serializers import TaskSerializer
+
+BENCHMARK_EMAIL = "read-benchmark@example.com"
+
+
+class Command(BaseCommand):
+    """Django command to benchmark rendering the task, list and board reads."""
+
+    help = (
+        "Time building and encoding the task, list and board payloads of one "
+        "user with the serializers and JSONRenderer against flat values() rows "
+        "and FastJSONRenderer, and check both produce the same bytes. Unless "
+        "--user is given, a generated user is benchmarked and rolled back."
+    )
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument(
+            "--user", help="Benchmark the data of this user email instead."
+        )
+        _ = parser.add_argument("--boards", type=int, default=2)
+        _ = parser.add_argument("--lists", type=int, default=4, help="Per board.")
+        _ = parser.add_argument("--tasks", type=int, default=50, help="Per list.")
+        _ = parser.add_argument("--repeat", type=int, default=5)
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        if not ORJSON_INSTALLED:
+            self.stdout.write(
+                self.style.WARNING("orjson is not installed, encoding with json.")
+            )
+        with transaction.atomic():
+            if options["user"]:
+                user = User.objects.filter(email=options["user"]).first()
+                if user is None:
+                    raise CommandError(f"No user with email {options['user']}.")
+            else:
+                user = self.create_data(
+                    options["boards"], options["lists"], options["tasks"]
+                )
+            self.benchmark(user, options["repeat"])
+            transaction.set_rollback(True)
+
+    def create_data(self, boards: int, lists: int, tasks: int) -> User:
+        """Create a user with ``boards`` boards of ``lists`` lists of ``tasks``."""
+        user = User.objects.create_user(email=BENCHMARK_EMAIL, name="Benchmark")
+        categories = Category.objects.bulk_create(
+            Category(user=user, name=f"Category {index}", color="#FF0000")
+            for index in range(5)
+        )
+        contacts = Contact.objects.bulk_create(
+            Contact(
+                user=user,
+                email=f"contact{index}@example.com",
+                name=f"Contact {index}",
+                phone_number="",
+            )
+            for index in range(5)
+        )
+        created_boards = Board.objects.bulk_create(
+            Board(user=user, title=f"Board {index}") for index in range(boards)
+        )
+        created_lists = ListOfTasks.objects.bulk_create(
+            ListOfTasks(board=board, owner=user, name=f"List {index}", order=index)
+            for board in created_boards
+            for index in range(lists)
+        )
+        created_tasks = Task.objects.bulk_create(
+            Task(
+                list_of_tasks=list_of_tasks,
+                owner=user,
+                category=categories[index % len(categories)],
+                title=f"Task {index} of {list_of_tasks.name}",
+                description="Lorem ipsum dolor sit amet. " * 4,
+                priority="Medium",
+                order=index,
+            )
+            for list_of_tasks in created_lists
+            for index in range(tasks)
+        )
+        _ = Subtask.objects.bulk_create(
+            Subtask(task=task, owner=user, title=f"Subtask {index}")
+            for task in created_tasks
+            for index in range(2)
+        )
+        _ = Task.assignees.through.objects.bulk_create(
+            Task.assignees.through(task=task, contact=contacts[index % len(contacts)])
+            for index, task in enumerate(created_tasks)
+        )
+        return user
+
+    def benchmark(self, user: User, repeat: int) -> None:
+        tasks = Task.objects.filter(owner=user).order_by("-order")
+        lists = ListOfTasks.objects.filter(owner=user).order_by("-id")
+        boards = Board.objects.filter(user=user).order_by("-id")
+        endpoints: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+            (
+                "tasks",
+                lambda: TaskSerializer(self.plan(TaskSerializer, tasks), many=True),
+                lambda: load_tasks(tasks),
+            ),
+            (
+                "lists",
+                lambda: ListSerializer(self.plan(ListSerializer, lists), many=True),
+                lambda: load_lists(lists),
+            ),
+            (
+                "boards",
+                lambda: BoardSerializer(self.plan(BoardSerializer, boards), many=True),
+                lambda: load_boards(boards),
+            ),
+        ]
+        self.stdout.write(
+            f"{'payload':<8}{'bytes':>10}{'serializers ms':>16}"
+            + f"{'flat rows ms':>14}{'speedup':>9}"
+        )
+        for name, serialize, load in endpoints:
+            expected = JSONRenderer().render(serialize().data)
+            if FastJSONRenderer().render(load()) != expected:
+                raise CommandError(f"The {name} payloads differ.")
+            slow = self.time(lambda: JSONRenderer().render(serialize().data), repeat)
+            fast = self.time(lambda: FastJSONRenderer().render(load()), repeat)
+            self.stdout.write(
+                f"{name:<8}{len(expected):>10}{slow:>16.1f}{fast:>14.1f}"
+                + f"{slow / fast:>8.1f}x"
+            )
+
+    @staticmethod
+    def plan(serializer_class: Any, queryset: QuerySet[Any]) -> QuerySet[Any]:
+        return serializer_class.plan_queryset(queryset)
+
+    @staticmethod
+    def time(function: Callable[[], Any], repeat: int) -> float:
+        """Return the median wall time of ``function`` in milliseconds."""
+        timings: list[float] = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            _ = function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
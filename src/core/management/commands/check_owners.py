@@ -0,0 +1,41 @@
+"""
+Django command to check the denormalized owners of lists, tasks and subtasks.
+"""
+
+from argparse import ArgumentParser
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.owners import find_mismatches, repair
+
+
+class Command(BaseCommand):
+    """Django command to check or repair the owner columns."""
+
+    help = "Compare the owner of lists, tasks and subtasks with their board's user."
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Copy the board's user to every mismatched owner.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        if options["fix"]:
+            repaired = repair()
+            for label, count in repaired.items():
+                self.stdout.write(f"{label}: repaired {count} owners")
+            self.stdout.write(self.style.SUCCESS("Owners are consistent."))
+            return
+
+        mismatches = find_mismatches()
+        for label, pks in mismatches.items():
+            self.stdout.write(f"{label}: {len(pks)} stale owners, e.g. pk {pks[0]}")
+        if mismatches:
+            raise CommandError("Owners are inconsistent, rerun with --fix.")
+        self.stdout.write(self.style.SUCCESS("Owners are consistent."))
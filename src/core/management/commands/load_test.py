@@ -0,0 +1,130 @@
+"""
+Django command to load test a running server.
+"""
+
+import asyncio
+import statistics
+import time
+from argparse import ArgumentParser
+from dataclasses import dataclass, field
+from typing import Any, override
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+@dataclass
+class LoadTestResult:
+    """Latencies of the answered requests and the number of failures."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    seconds: float = 0.0
+
+    def percentile(self, percent: int) -> float:
+        """Return the ``percent`` latency percentile in milliseconds."""
+        if len(self.latencies) < 2:
+            return self.latencies[0] * 1000 if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100)[percent - 1] * 1000
+
+
+async def fetch(url: str, token: str | None) -> int:
+    """GET ``url`` on a new connection and return the status code."""
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    host = parts.hostname or "localhost"
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    headers = [
+        f"GET {path} HTTP/1.1",
+        f"Host: {parts.netloc}",
+        "Accept: application/json",
+        "Connection: close",
+    ]
+    if token:
+        headers.append(f"Authorization: Token {token}")
+
+    reader, writer = await asyncio.open_connection(host, port, ssl=secure or None)
+    try:
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        _ = await reader.read()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return int(status_line.split()[1])
+
+
+async def load_test(
+    urls: list[str], token: str | None, requests: int, concurrency: int
+) -> LoadTestResult:
+    """
+    Send ``requests`` GET requests to ``urls`` in turn from ``concurrency``
+    clients, each waiting for its response before sending the next request.
+    """
+    result = LoadTestResult()
+    counter = iter(range(requests))
+
+    async def client() -> None:
+        for index in counter:
+            start = time.perf_counter()
+            try:
+                status = await fetch(urls[index % len(urls)], token)
+            except (OSError, ValueError, IndexError):
+                result.errors += 1
+                continue
+            if status >= 400:
+                result.errors += 1
+            else:
+                result.latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    _ = await asyncio.gather(*(client() for _ in range(max(concurrency, 1))))
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+class Command(BaseCommand):
+    """Django command to measure the throughput and latency of a server."""
+
+    help = (
+        "Send GET requests from concurrent clients to a running server and "
+        "report requests per second and latency percentiles. Run it against the "
+        "gunicorn (WSGI) and uvicorn (ASGI) deployments to compare them."
+    )
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument(
+            "urls", nargs="+", help="URLs to request in turn, e.g. .../api/task/tasks/"
+        )
+        _ = parser.add_argument("--token", help="API token of the requesting user.")
+        _ = parser.add_argument("--requests", type=int, default=1000)
+        _ = parser.add_argument("--concurrency", type=int, default=50)
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        if options["requests"] <= 0:
+            raise CommandError("--requests must be positive.")
+        result = asyncio.run(
+            load_test(
+                options["urls"],
+                options["token"],
+                options["requests"],
+                options["concurrency"],
+            )
+        )
+        answered = len(result.latencies)
+        self.stdout.write(
+            f"requests: {answered + result.errors}, errors: {result.errors}, "
+            + f"seconds: {result.seconds:.2f}, "
+            + f"requests/s: {answered / result.seconds if result.seconds else 0:.1f}"
+        )
+        self.stdout.write(
+            f"latency ms p50: {result.percentile(50):.1f}, "
+            + f"p95: {result.percentile(95):.1f}, p99: {result.percentile(99):.1f}"
+        )
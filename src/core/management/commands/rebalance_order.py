@@ -0,0 +1,50 @@
+"""
+Django command to respace the order keys of tasks and lists.
+"""
+
+from argparse import ArgumentParser
+from typing import Any, override
+
+from django.core.management.base import BaseCommand
+
+from core.models import Board, ListOfTasks, Task
+from core.ordering import rebalance
+
+
+class Command(BaseCommand):
+    """Django command to rebalance the sparse order keys."""
+
+    help = (
+        "Respace the order keys of every list's tasks and every board's lists "
+        "by ORDERING['GAP'], e.g. after switching to the sparse ordering engine."
+    )
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument(
+            "--board",
+            type=int,
+            action="append",
+            dest="board_ids",
+            help="Only rebalance this board id (repeatable).",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        boards = Board.objects.order_by("pk")
+        if options["board_ids"]:
+            boards = boards.filter(pk__in=options["board_ids"])
+
+        lists = tasks = 0
+        for board_id in boards.values_list("pk", flat=True).iterator():
+            lists += rebalance(ListOfTasks.objects.filter(board_id=board_id))
+            list_ids = ListOfTasks.objects.filter(board_id=board_id).values_list(
+                "pk", flat=True
+            )
+            for list_id in list_ids:
+                tasks += rebalance(Task.objects.filter(list_of_tasks_id=list_id))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebalanced {lists} lists and {tasks} tasks.")
+        )
@@ -4,12 +4,14 @@ from django.db import migrations, models
 
 
 def assign_positions(apps, schema_editor):
+    db = schema_editor.connection.alias
     List = apps.get_model("core", "List")
     Board = apps.get_model("core", "Board")
-    for board in Board.objects.all():
+    for board in Board.objects.using(db).all():
         # Fetch lists with position less than or equal to 0 or position is null
         lists = (
-            List.objects.filter(board=board)
+            List.objects.using(db)
+            .filter(board=board)
             .filter(models.Q(position__lte=0) | models.Q(position__isnull=True))
             .order_by("created_at")
         )
@@ -4,12 +4,14 @@ from django.db import migrations, models
 
 
 def assign_positions(apps, schema_editor):
+    db = schema_editor.connection.alias
     Task = apps.get_model("core", "Task")
     List = apps.get_model("core", "List")
-    for list in List.objects.all():
+    for list in List.objects.using(db).all():
         # Fetch tasks with position less than or equal to 0 or position is null
         tasks = (
-            Task.objects.filter(list=list)
+            Task.objects.using(db)
+            .filter(list=list)
             .filter(models.Q(position__lte=0) | models.Q(position__isnull=True))
             .order_by("created_at")
         )
@@ -19,7 +21,8 @@ def assign_positions(apps, schema_editor):
 
     # Then, handle tasks where list is None
     tasks_without_list = (
-        Task.objects.filter(list__isnull=True)
+        Task.objects.using(db)
+        .filter(list__isnull=True)
         .filter(models.Q(position__lte=0) | models.Q(position__isnull=True))
         .order_by("created_at")
     )
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.8 on 2026-10-18 00:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_summary_counters(apps, schema_editor):
+    db = schema_editor.connection.alias
+    Task = apps.get_model("core", "Task")
+    SummaryCounter = apps.get_model("core", "SummaryCounter")
+    lookups = {
+        "list": "list_of_tasks_id",
+        "priority": "priority",
+        "category": "category_id",
+    }
+    counters = []
+    for dimension, lookup in lookups.items():
+        rows = (
+            Task.objects.using(db)
+            .values("list_of_tasks__board__user_id", lookup)
+            .annotate(count=Count("id"), latest_due_date=Max("due_date"))
+            .order_by()
+        )
+        counters.extend(
+            SummaryCounter(
+                user_id=row["list_of_tasks__board__user_id"],
+                dimension=dimension,
+                key=str(row[lookup]),
+                count=row["count"],
+                latest_due_date=row["latest_due_date"],
+            )
+            for row in rows
+        )
+    SummaryCounter.objects.using(db).bulk_create(counters, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0097_remove_listoftasks_unique_order_per_board"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SummaryCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("list", "List"),
+                            ("priority", "Priority"),
+                            ("category", "Category"),
+                        ]
+                    ),
+                ),
+                ("key", models.CharField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("latest_due_date", models.DateField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="summary_counters",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "dimension", "key"),
+                        name="core_summarycounter_unique_group",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_summary_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_owner(apps, schema_editor):
+    db = schema_editor.connection.alias
+    Board = apps.get_model("core", "Board")
+    ListOfTasks = apps.get_model("core", "ListOfTasks")
+    Task = apps.get_model("core", "Task")
+    Subtask = apps.get_model("core", "Subtask")
+    ListOfTasks.objects.using(db).update(
+        owner_id=Subquery(
+            Board.objects.using(db)
+            .filter(pk=OuterRef("board_id"))
+            .values("user_id")[:1]
+        )
+    )
+    Task.objects.using(db).update(
+        owner_id=Subquery(
+            ListOfTasks.objects.using(db)
+            .filter(pk=OuterRef("list_of_tasks_id"))
+            .values("owner_id")[:1]
+        )
+    )
+    Subtask.objects.using(db).update(
+        owner_id=Subquery(
+            Task.objects.using(db).filter(pk=OuterRef("task_id")).values("owner_id")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0099_owner"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_owner, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+
+def backfill_search_documents(apps, schema_editor):
+    db = schema_editor.connection.alias
+    Task = apps.get_model("core", "Task")
+    Subtask = apps.get_model("core", "Subtask")
+    Contact = apps.get_model("core", "Contact")
+    Category = apps.get_model("core", "Category")
+    SearchDocument = apps.get_model("core", "SearchDocument")
+
+    subtask_titles = {}
+    for task_id, title in (
+        Subtask.objects.using(db).order_by("id").values_list("task_id", "title")
+    ):
+        subtask_titles.setdefault(task_id, []).append(title)
+    documents = [
+        SearchDocument(
+            user_id=owner_id,
+            kind="task",
+            object_id=pk,
+            title=title,
+            body="\n".join([description, *subtask_titles.get(pk, [])]),
+        )
+        for pk, owner_id, title, description in Task.objects.using(db).values_list(
+            "pk", "owner_id", "title", "description"
+        )
+    ]
+    documents.extend(
+        SearchDocument(
+            user_id=user_id, kind="contact", object_id=pk, title=name, body=email
+        )
+        for pk, user_id, name, email in Contact.objects.using(db).values_list(
+            "pk", "user_id", "name", "email"
+        )
+    )
+    documents.extend(
+        SearchDocument(user_id=user_id, kind="category", object_id=pk, title=name)
+        for pk, user_id, name in Category.objects.using(db).values_list(
+            "pk", "user_id", "name"
+        )
+    )
+    SearchDocument.objects.using(db).bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0102_searchdocument"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
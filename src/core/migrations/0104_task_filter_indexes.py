@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 01:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0103_backfill_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["category", "due_date"], name="core_task_category_due_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "priority", "due_date"],
+                name="core_task_owner_priority_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "due_date"], name="core_task_owner_due_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0105_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("board", "Board"),
+                            ("list", "List"),
+                            ("task", "Task"),
+                            ("subtask", "Subtask"),
+                            ("contact", "Contact"),
+                            ("category", "Category"),
+                        ]
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="board",
+            index=models.Index(
+                fields=["user", "updated_at"], name="core_board_user_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["user", "updated_at"], name="core_category_user_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["user", "updated_at"], name="core_contact_user_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listoftasks",
+            index=models.Index(
+                fields=["owner", "updated_at"], name="core_listoftasks_owner_upd_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subtask",
+            index=models.Index(
+                fields=["owner", "updated_at"], name="core_subtask_owner_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "updated_at"], name="core_task_owner_updated_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="tombstone",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tombstones",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["user", "id"], name="core_tombstone_user_seq_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["deleted_at"], name="core_tombstone_deleted_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,135 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0106_sync_tombstones"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncSequence",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("value", models.BigIntegerField(default=0)),
+                ("purged", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="board",
+            name="core_board_user_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="category",
+            name="core_category_user_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="contact",
+            name="core_contact_user_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="listoftasks",
+            name="core_listoftasks_owner_upd_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="subtask",
+            name="core_subtask_owner_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="core_task_owner_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="tombstone",
+            name="core_tombstone_user_seq_idx",
+        ),
+        migrations.AddField(
+            model_name="board",
+            name="seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="contact",
+            name="seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="listoftasks",
+            name="seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="subtask",
+            name="seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="tombstone",
+            name="seq",
+            field=models.BigIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="board",
+            index=models.Index(fields=["user", "seq"], name="core_board_user_seq_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["user", "seq"], name="core_category_user_seq_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["user", "seq"], name="core_contact_user_seq_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listoftasks",
+            index=models.Index(
+                fields=["owner", "seq"], name="core_listoftasks_owner_seq_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subtask",
+            index=models.Index(
+                fields=["owner", "seq"], name="core_subtask_owner_seq_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["owner", "seq"], name="core_task_owner_seq_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["user", "seq"], name="core_tombstone_user_seq_idx"
+            ),
+        ),
+    ]
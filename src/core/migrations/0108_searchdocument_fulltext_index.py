@@ -0,0 +1,96 @@
+"""
+Database specific full-text index over the search documents.
+
+PostgreSQL gets a generated ``tsvector`` column with a GIN index; SQLite an
+external content FTS5 table that triggers keep in sync with the documents.
+Other databases have no index. The statements are idempotent, as databases
+migrated before this migration may have the index already.
+"""
+
+from django.db import migrations
+
+FTS_TABLE = "core_searchdocument_fts"
+
+POSTGRESQL_INDEX = [
+    """
+    ALTER TABLE core_searchdocument ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A')
+        || setweight(to_tsvector('simple', body), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS core_searchdocument_search_vector_idx
+    ON core_searchdocument USING GIN (search_vector)
+    """,
+]
+
+POSTGRESQL_DROP_INDEX = [
+    "DROP INDEX IF EXISTS core_searchdocument_search_vector_idx",
+    "ALTER TABLE core_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INDEX = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, body,
+        content='core_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON core_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON core_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE ON core_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE} (rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    # Index the documents written before the table existed.
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_INDEX = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def create_search_index(apps, schema_editor):
+    statements = {"postgresql": POSTGRESQL_INDEX, "sqlite": SQLITE_INDEX}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    statements = {"postgresql": POSTGRESQL_DROP_INDEX, "sqlite": SQLITE_DROP_INDEX}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0107_sync_sequence"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
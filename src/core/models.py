@@ -4,8 +4,9 @@ Database models.
 
 import os
 import uuid
+from abc import abstractmethod
 from datetime import date, datetime, timedelta
-from typing import TYPE_CHECKING, Any, Literal, override
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, override
 
 from colorfield.fields import ColorField
 from django.contrib.auth.models import (
@@ -13,13 +14,15 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db import models
+from django.db import connections, models, router, transaction
 from django.db.models.constraints import CheckConstraint, UniqueConstraint
 from django.db.models.expressions import Combinable
+from django.dispatch import Signal
 from django.utils import timezone
 from ordered_model.models import OrderedModel
 from phonenumber_field.modelfields import PhoneNumberField
 
+from core.ordering import SparseOrderedModel
 from core.utils import PRIORITY_CHOICES, generate_name
 from core.validators import (
     DEFAULT_TEXT_FIELD_MAX_LENGTH,
@@ -64,6 +67,44 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+class SyncedModel(models.Model):
+    """
+    Abstract base class that adds ``seq``, the change sequence of the delta
+    sync, see ``sync.changes``.
+
+    Every save sets it to the next value of the user's ``SyncSequence`` in the
+    saving transaction. Writes that bypass ``save`` (bulk writes, relabels,
+    owner changes and imports) set it with ``next_sync_seq`` themselves.
+    """
+
+    if TYPE_CHECKING:
+        seq: models.BigIntegerField[int, int]
+
+    # The relation to the user whose sequence the row's changes take.
+    sync_user_field: ClassVar[str] = "owner"
+
+    seq = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def sync_user_id(self) -> int | None:
+        return getattr(self, f"{self.sync_user_field}_id")
+
+    @override
+    def save_base(self, *args: Any, **kwargs: Any) -> None:
+        using: str = kwargs.get("using") or router.db_for_write(type(self))
+        with transaction.atomic(using=using, savepoint=False):
+            user_id = self.sync_user_id
+            if user_id is not None and not kwargs.get("raw"):
+                self.seq = next_sync_seq(user_id, using)
+                update_fields = kwargs.get("update_fields")
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "seq"}
+            super().save_base(*args, **kwargs)
+
+
 if TYPE_CHECKING:
     UserBasedManager = BaseUserManager["User"]
 else:
@@ -174,13 +215,52 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
         ]
 
 
-class Board(TimeStampedModel):
+# Sent with the model of a saved row as ``sender`` once it and the rows below
+# it were given to another user, ``old_user_id`` to ``new_user_id``. ``pks``
+# holds their ids by model; the rows below are written with queryset updates.
+owner_changed = Signal()
+
+
+def give_owned_rows(
+    row: models.Model,
+    old_user_id: int,
+    new_user_id: int,
+    owned_rows: list[models.QuerySet[Any]],
+) -> None:
+    """
+    Give ``owned_rows``, the rows below the saved ``row``, to the new owner of
+    ``row`` and send ``owner_changed``.
+    """
+    pks: dict[type[models.Model], list[int]] = {type(row): [row.pk]}
+    now = timezone.now()
+    with transaction.atomic():
+        seq = next_sync_seq(new_user_id)
+        for queryset in owned_rows:
+            moved: list[int] = list(queryset.values_list("pk", flat=True))
+            if moved:
+                _ = queryset.model._default_manager.filter(pk__in=moved).update(
+                    owner=new_user_id, updated_at=now, seq=seq
+                )
+                pks[queryset.model] = moved
+        _ = owner_changed.send(
+            sender=type(row),
+            old_user_id=old_user_id,
+            new_user_id=new_user_id,
+            pks=pks,
+        )
+
+
+class Board(SyncedModel, TimeStampedModel):
     """Board Object."""
 
     if TYPE_CHECKING:
         user: models.ForeignKey[User, User]
+        # Set by the ``user`` field.
+        user_id: int  # pyright: ignore[reportUninitializedInstanceVariable]
         title: models.CharField[str, str]
 
+    sync_user_field = "user"
+
     user = models.ForeignKey(
         to=User,
         on_delete=models.CASCADE,
@@ -194,6 +274,10 @@ class Board(TimeStampedModel):
     )
 
     class Meta:  # pyright: ignore[reportIncompatibleVariableOverride]
+        # Rows changed since a sync cursor, see sync.changes.
+        indexes: list[models.Index] = [
+            models.Index(fields=["user", "seq"], name="core_board_user_seq_idx"),
+        ]
         constraints: list[CheckConstraint] = [
             models.CheckConstraint(
                 name="%(app_label)s_%(class)s_title_check",
@@ -204,27 +288,127 @@ class Board(TimeStampedModel):
             ),
         ]
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._original_user_id: int | None = self.user_id
+
+    @override
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+        old_user_id = self._original_user_id
+        if old_user_id is not None and old_user_id != self.user_id:
+            give_owned_rows(
+                self,
+                old_user_id,
+                self.user_id,
+                [
+                    ListOfTasks.objects.filter(board=self),
+                    Task.objects.filter(list_of_tasks__board=self),
+                    Subtask.objects.filter(task__list_of_tasks__board=self),
+                ],
+            )
+        self._original_user_id = self.user_id
+
     @override
     def __str__(self) -> str:
         return f"{self.title}"
 
 
-class ListOfTasks(OrderedModel, TimeStampedModel):
+class OwnedModel(models.Model):
+    """
+    Abstract base class that adds ``owner``, a copy of the user of the board
+    the row belongs to, so that rows can be scoped to a user without joining
+    up to the board.
+
+    The owner is copied from the ``owner_parent`` relation whenever a row is
+    created or moved to another parent, and changes of it are passed on to
+    the rows of ``owned_rows`` by ``give_owned_rows``.
+    """
+
+    if TYPE_CHECKING:
+        owner: models.ForeignKey[User, User]
+        # Set by the ``owner`` field.
+        owner_id: int | None  # pyright: ignore[reportUninitializedInstanceVariable]
+
+    owner_parent: ClassVar[str]
+
+    owner = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._original_owner_id = self.owner_id
+        self._original_parent_id = self.owner_parent_id
+
+    @property
+    def owner_parent_id(self) -> int | None:
+        return getattr(self, f"{self.owner_parent}_id")
+
+    @abstractmethod
+    def parent_owner_id(self) -> int | None:
+        """Return the owner of the parent row."""
+
+    def owned_rows(self) -> list[models.QuerySet[Any]]:
+        """Return the rows below this one, which share its owner."""
+        return []
+
+    @override
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # A parent that is loaded already is read for free, which also picks
+        # up owners changed through the ``user`` setters.
+        if (
+            self.owner_id is None
+            or self.owner_parent_id != self._original_parent_id
+            or self.owner_parent in self._state.fields_cache
+        ):
+            self.owner_id = self.parent_owner_id()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "owner"}
+        super().save(*args, **kwargs)
+        old_owner_id = self._original_owner_id
+        if old_owner_id is not None and self.owner_id not in (None, old_owner_id):
+            give_owned_rows(self, old_owner_id, self.owner_id, self.owned_rows())
+        self._original_owner_id = self.owner_id
+        self._original_parent_id = self.owner_parent_id
+
+
+class ListOfTasks(OwnedModel, SparseOrderedModel, SyncedModel, TimeStampedModel):
     """ListOfTasks Object."""
 
     if TYPE_CHECKING:
         name: models.CharField[str, str]
         board: models.ForeignKey[Board, Board]
 
+    owner_parent = "board"
+
     @property
     def user(self) -> User:
-        return self.board.user
+        return self.owner
 
     @user.setter
     def user(self, value: User):
         self.board.user = value
         self.board.save()
 
+    @override
+    def parent_owner_id(self) -> int | None:
+        return self.board.user_id
+
+    @override
+    def owned_rows(self) -> list[models.QuerySet[Any]]:
+        return [
+            Task.objects.filter(list_of_tasks=self),
+            Subtask.objects.filter(task__list_of_tasks=self),
+        ]
+
     name = models.CharField(
         default="Unnamed",
         validators=[
@@ -243,6 +427,12 @@ class ListOfTasks(OrderedModel, TimeStampedModel):
         OrderedModel.Meta
     ):
         verbose_name_plural: str = "ListsOfTasks"
+        # Rows changed since a sync cursor, see sync.changes.
+        indexes: list[models.Index] = [
+            models.Index(
+                fields=["owner", "seq"], name="core_listoftasks_owner_seq_idx"
+            ),
+        ]
         constraints: list[UniqueConstraint | CheckConstraint] = [
             models.CheckConstraint(
                 name="%(app_label)s_%(class)s_name_check",
@@ -258,13 +448,17 @@ class ListOfTasks(OrderedModel, TimeStampedModel):
         return f"{self.name}"
 
 
-class Category(TimeStampedModel):
+class Category(SyncedModel, TimeStampedModel):
     """Category Object"""
 
     if TYPE_CHECKING:
         user: models.ForeignKey[User, User]
+        # Set by the ``user`` field.
+        user_id: int  # pyright: ignore[reportUninitializedInstanceVariable]
         name: models.CharField[str, str]
 
+    sync_user_field = "user"
+
     user = models.ForeignKey(
         to=User,
         on_delete=models.CASCADE,
@@ -280,6 +474,10 @@ class Category(TimeStampedModel):
 
     class Meta:  # pyright: ignore[reportIncompatibleVariableOverride]
         verbose_name_plural: str = "Categories"
+        # Rows changed since a sync cursor, see sync.changes.
+        indexes: list[models.Index] = [
+            models.Index(fields=["user", "seq"], name="core_category_user_seq_idx"),
+        ]
         constraints: list[UniqueConstraint | CheckConstraint] = [
             models.UniqueConstraint(
                 fields=["user", "name"], name="unique_name_per_user"
@@ -298,14 +496,18 @@ class Category(TimeStampedModel):
         return f"{self.name}"
 
 
-class Contact(TimeStampedModel):
+class Contact(SyncedModel, TimeStampedModel):
     """Contact object"""
 
     if TYPE_CHECKING:
         user: models.ForeignKey[User, User]
+        # Set by the ``user`` field.
+        user_id: int  # pyright: ignore[reportUninitializedInstanceVariable]
         name: models.CharField[str, str]
         email: models.EmailField[str, str]
 
+    sync_user_field = "user"
+
     user = models.ForeignKey(
         to=User,
         on_delete=models.CASCADE,
@@ -328,6 +530,10 @@ class Contact(TimeStampedModel):
     phone_number = PhoneNumberField(blank=True)
 
     class Meta:  # pyright: ignore[reportIncompatibleVariableOverride]
+        # Rows changed since a sync cursor, see sync.changes.
+        indexes: list[models.Index] = [
+            models.Index(fields=["user", "seq"], name="core_contact_user_seq_idx"),
+        ]
         constraints: list[UniqueConstraint | CheckConstraint] = [
             models.UniqueConstraint(
                 fields=["user", "email"],
@@ -367,27 +573,41 @@ class Contact(TimeStampedModel):
         return f"{self.name or self.email or self.phone_number} - {self.pk}"
 
 
-class Task(OrderedModel, TimeStampedModel):
+class Task(OwnedModel, SparseOrderedModel, SyncedModel, TimeStampedModel):
     """Task object."""
 
     if TYPE_CHECKING:
         title: models.CharField[str, str]
         description: models.TextField[str, str]
         category: models.ForeignKey[Category, Category]
+        # Set by the ``category`` field.
+        category_id: int | None  # pyright: ignore[reportUninitializedInstanceVariable]
         assignees: models.ManyToManyField[Contact, Any]
         due_date: models.DateField[date, date]
         priority: models.CharField[str, str]
         list_of_tasks: models.ForeignKey[ListOfTasks, ListOfTasks]
+        # Set by the ``list_of_tasks`` field.
+        list_of_tasks_id: int  # pyright: ignore[reportUninitializedInstanceVariable]
+
+    owner_parent = "list_of_tasks"
 
     @property
     def user(self) -> User:
-        return self.list_of_tasks.user
+        return self.owner
 
     @user.setter
     def user(self, value: User):
         self.list_of_tasks.user = value
         self.list_of_tasks.save()
 
+    @override
+    def parent_owner_id(self) -> int | None:
+        return self.list_of_tasks.owner_id
+
+    @override
+    def owned_rows(self) -> list[models.QuerySet[Any]]:
+        return [Subtask.objects.filter(task=self)]
+
     title = models.CharField(
         default="Untitled",
         validators=[
@@ -427,6 +647,20 @@ class Task(OrderedModel, TimeStampedModel):
     class Meta(  # pyright: ignore[reportIncompatibleVariableOverride]
         OrderedModel.Meta
     ):
+        # Access paths of the task filters. (list_of_tasks, order) is covered
+        # by the unique constraint.
+        indexes: list[models.Index] = [
+            models.Index(
+                fields=["category", "due_date"], name="core_task_category_due_idx"
+            ),
+            models.Index(
+                fields=["owner", "priority", "due_date"],
+                name="core_task_owner_priority_idx",
+            ),
+            models.Index(fields=["owner", "due_date"], name="core_task_owner_due_idx"),
+            # Rows changed since a sync cursor, see sync.changes.
+            models.Index(fields=["owner", "seq"], name="core_task_owner_seq_idx"),
+        ]
         constraints: list[UniqueConstraint | CheckConstraint] = [
             models.UniqueConstraint(
                 fields=["list_of_tasks", "order"], name="unique_order_per_list"
@@ -461,23 +695,31 @@ class Task(OrderedModel, TimeStampedModel):
         return f"{self.title}"
 
 
-class Subtask(TimeStampedModel):
+class Subtask(OwnedModel, SyncedModel, TimeStampedModel):
     """Subtask object."""
 
     if TYPE_CHECKING:
         task: models.ForeignKey[Task, Task]
+        # Set by the ``task`` field.
+        task_id: int  # pyright: ignore[reportUninitializedInstanceVariable]
         title: models.CharField[str, str]
         done: models.BooleanField[bool, bool]
 
+    owner_parent = "task"
+
     @property
     def user(self) -> User:
-        return self.task.user
+        return self.owner
 
     @user.setter
     def user(self, value: User):
         self.task.user = value
         self.task.save()
 
+    @override
+    def parent_owner_id(self) -> int | None:
+        return self.task.owner_id
+
     task = models.ForeignKey(to=Task, on_delete=models.CASCADE, related_name="subtasks")
     title = models.CharField(
         default="Untitled",
@@ -489,6 +731,10 @@ class Subtask(TimeStampedModel):
     done = models.BooleanField(default=False)
 
     class Meta:  # pyright: ignore[reportIncompatibleVariableOverride]
+        # Rows changed since a sync cursor, see sync.changes.
+        indexes: list[models.Index] = [
+            models.Index(fields=["owner", "seq"], name="core_subtask_owner_seq_idx"),
+        ]
         constraints: list[CheckConstraint] = [
             models.CheckConstraint(
                 name="%(app_label)s_%(class)s_title_check",
@@ -504,4 +750,265 @@ class Subtask(TimeStampedModel):
         return f"{self.title}"
 
 
+class SummaryCounter(models.Model):
+    """
+    Materialized task count and latest due date of one summary group.
+
+    Maintained incrementally by ``summary.signals``; rebuild it with the
+    ``rebuild_summary`` management command.
+    """
+
+    LIST = "list"
+    PRIORITY = "priority"
+    CATEGORY = "category"
+    DIMENSION_CHOICES = [
+        (LIST, "List"),
+        (PRIORITY, "Priority"),
+        (CATEGORY, "Category"),
+    ]
+
+    if TYPE_CHECKING:
+        user: models.ForeignKey[User, User]
+        dimension: models.CharField[str, str]
+        key: models.CharField[str, str]
+        count: models.PositiveIntegerField[int, int]
+        latest_due_date: models.DateField[date | None, date | None]
+
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name="summary_counters",
+    )
+    dimension = models.CharField(choices=DIMENSION_CHOICES)
+    key = models.CharField()
+    count = models.PositiveIntegerField(default=0)
+    latest_due_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        constraints: list[UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["user", "dimension", "key"],
+                name="%(app_label)s_%(class)s_unique_group",
+            ),
+        ]
+
+    @override
+    def __str__(self) -> str:
+        return f"{self.dimension} {self.key}: {self.count}"
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one task, contact or category.
+
+    Maintained by ``search.signals``; rebuild it with the
+    ``rebuild_search_index`` management command. The full-text index over
+    ``title`` and ``body`` is database specific, see migration
+    ``0108_searchdocument_fulltext_index``.
+    """
+
+    TASK = "task"
+    CONTACT = "contact"
+    CATEGORY = "category"
+    KIND_CHOICES = [
+        (TASK, "Task"),
+        (CONTACT, "Contact"),
+        (CATEGORY, "Category"),
+    ]
+
+    if TYPE_CHECKING:
+        user: models.ForeignKey[User, User]
+        # Set by the ``user`` field.
+        user_id: int  # pyright: ignore[reportUninitializedInstanceVariable]
+        kind: models.CharField[str, str]
+        object_id: models.PositiveBigIntegerField[int, int]
+        title: models.TextField[str, str]
+        body: models.TextField[str, str]
+
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name="search_documents",
+    )
+    kind = models.CharField(choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+
+    class Meta:
+        constraints: list[UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"],
+                name="%(app_label)s_%(class)s_unique_object",
+            ),
+        ]
+
+    @override
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id}: {self.title}"
+
+
+class Job(models.Model):
+    """
+    A background job of the database queue, see ``jobs.queue``.
+
+    The ``run_jobs`` worker claims pending jobs once ``run_at`` has passed.
+    Failed attempts are retried with exponential backoff until
+    ``max_attempts`` is reached.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    if TYPE_CHECKING:
+        name: models.CharField[str, str]
+        payload: models.JSONField[Any, Any]
+        status: models.CharField[str, str]
+        attempts: models.PositiveIntegerField[int, int]
+        max_attempts: models.PositiveIntegerField[int, int]
+        last_error: models.TextField[str, str]
+        enqueued_at: models.DateTimeField[datetime, datetime]
+        run_at: models.DateTimeField[datetime, datetime]
+        started_at: models.DateTimeField[datetime | None, datetime | None]
+        finished_at: models.DateTimeField[datetime | None, datetime | None]
+
+    name = models.CharField()
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    last_error = models.TextField(blank=True)
+    enqueued_at = models.DateTimeField(default=timezone.now)
+    run_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: list[models.Index] = [
+            models.Index(
+                fields=["status", "run_at"], name="core_job_status_run_at_idx"
+            ),
+        ]
+
+    @override
+    def __str__(self) -> str:
+        return f"{self.name} {self.pk}: {self.status}"
+
+
+class Tombstone(models.Model):
+    """
+    A deleted board, list, task, subtask, contact or category.
+
+    Written by ``sync.signals`` for the delta sync, see ``sync.changes``, with
+    ``seq`` taken from the user's ``SyncSequence`` like the rows' own. Tombstones
+    older than ``SYNC["KEEP_TOMBSTONES"]`` are purged.
+    """
+
+    BOARD = "board"
+    LIST = "list"
+    TASK = "task"
+    SUBTASK = "subtask"
+    CONTACT = "contact"
+    CATEGORY = "category"
+    KIND_CHOICES = [
+        (BOARD, "Board"),
+        (LIST, "List"),
+        (TASK, "Task"),
+        (SUBTASK, "Subtask"),
+        (CONTACT, "Contact"),
+        (CATEGORY, "Category"),
+    ]
+
+    if TYPE_CHECKING:
+        user: models.ForeignKey[User, User]
+        # Set by the ``user`` field.
+        user_id: int  # pyright: ignore[reportUninitializedInstanceVariable]
+        kind: models.CharField[str, str]
+        object_id: models.PositiveBigIntegerField[int, int]
+        seq: models.BigIntegerField[int, int]
+        deleted_at: models.DateTimeField[datetime, datetime]
+
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name="tombstones",
+        # Deleting a user writes tombstones for its rows after its own
+        # tombstones were collected; they are left behind and purged.
+        db_constraint=False,
+    )
+    kind = models.CharField(choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes: list[models.Index] = [
+            models.Index(fields=["user", "seq"], name="core_tombstone_user_seq_idx"),
+            models.Index(fields=["deleted_at"], name="core_tombstone_deleted_idx"),
+        ]
+
+    @override
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id} deleted"
+
+
+class SyncSequence(models.Model):
+    """
+    The change sequence of a user's rows and tombstones for the delta sync.
+
+    ``next_sync_seq`` increments ``value`` and so locks the row until the
+    writing transaction ends. The writes of a user thus commit in the order
+    of their ``seq``, and once a sync reads ``value`` every write up to it has
+    committed. ``purged`` is the last ``seq`` of the user's purged tombstones.
+    """
+
+    if TYPE_CHECKING:
+        user: models.OneToOneField[User, User]
+        # Set by the ``user`` field.
+        user_id: int  # pyright: ignore[reportUninitializedInstanceVariable]
+        value: models.BigIntegerField[int, int]
+        purged: models.BigIntegerField[int, int]
+
+    user = models.OneToOneField(
+        to=User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+        # Tombstones of a deleted user's rows take values after its sequence
+        # was deleted; the row left behind is purged with them.
+        db_constraint=False,
+    )
+    value = models.BigIntegerField(default=0)
+    purged = models.BigIntegerField(default=0)
+
+    @override
+    def __str__(self) -> str:
+        return f"{self.user_id}: {self.value}"
+
+
+def next_sync_seq(user_id: int, using: str = "default") -> int:
+    """
+    Return the next ``seq`` of ``user_id``. Call it in the transaction that
+    writes the rows taking it.
+    """
+    table = SyncSequence._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (user_id, value, purged) VALUES (%s, 1, 0) "
+            + f"ON CONFLICT (user_id) DO UPDATE SET value = {table}.value + 1 "
+            + "RETURNING value",
+            [user_id],
+        )
+        row = cursor.fetchone()
+    return row[0]
+
+
 ScrumAPIModel = Board | Category | Contact | ListOfTasks | Subtask | Task
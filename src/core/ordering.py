@@ -0,0 +1,496 @@
+"""
+Sparse order keys for ``OrderedModel`` subclasses.
+
+django-ordered-model keeps ``order`` dense (0, 1, 2, ...), so every move or
+delete shifts all siblings in between with an UPDATE. With the ``sparse``
+engine, new items are appended ``GAP`` apart and a move takes a free key
+between its new neighbours, so only the moved row is written.
+
+Once two neighbours are adjacent, the smallest window of siblings around the
+insertion point that has room is relabelled. The whole scope is then spread
+out again after the transaction commits, in a background thread unless
+``REBALANCE_IN_BACKGROUND`` is off.
+
+Inserts and moves lock the row their scope belongs to, e.g. the list of a
+task, so concurrent ones in one scope never pick the same free key.
+
+Configured through ``settings.ORDERING``::
+
+    ORDERING = {"ENGINE": "sparse", "GAP": 1024, "REBALANCE_IN_BACKGROUND": True}
+"""
+
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, TypeVar, cast, override
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.dispatch import Signal
+from django.utils import timezone
+from ordered_model.models import (
+    OrderedModel,
+    OrderedModelBase,
+    OrderedModelManager,
+    OrderedModelQuerySet,
+)
+
+DEFAULTS: dict[str, Any] = {
+    "ENGINE": "dense",
+    "GAP": 1024,
+    "REBALANCE_IN_BACKGROUND": True,
+}
+
+# Keys stay below 2**30 so relabelling can park rows above the largest key
+# without leaving the range of a positive 32 bit integer.
+MAX_ORDER = 2**30
+
+RELABEL_BATCH_SIZE = 500
+
+_M = TypeVar("_M", bound=OrderedModelBase, covariant=True)
+_R = TypeVar("_R", covariant=True)
+
+# Sent with the model as ``sender`` and the relabelled ``pks`` by ``relabel``,
+# which writes the keys with queryset updates instead of saving the rows.
+keys_relabelled = Signal()
+
+_deferred_delete_shifts: ContextVar[bool] = ContextVar(
+    "deferred_delete_shifts", default=False
+)
+
+
+def ordering_settings() -> dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "ORDERING", {})}
+
+
+def sparse_ordering() -> bool:
+    """Return whether the sparse ordering engine is enabled."""
+    return ordering_settings()["ENGINE"] == "sparse"
+
+
+def order_step() -> int:
+    """Return the distance between the keys of appended items."""
+    return ordering_settings()["GAP"] if sparse_ordering() else 1
+
+
+def key_between(lower: int | None, upper: int | None) -> int | None:
+    """
+    Return a free key strictly between ``lower`` and ``upper`` (``None``
+    meaning unbounded), or ``None`` if they are adjacent.
+    """
+    gap = ordering_settings()["GAP"]
+    if lower is None and upper is None:
+        return 0
+    if lower is None:
+        assert upper is not None
+        if upper == 0:
+            return None
+        return upper - gap if upper - gap >= 0 else upper // 2
+    if upper is None:
+        if lower + gap <= MAX_ORDER:
+            return lower + gap
+        upper = MAX_ORDER + 1
+    if upper - lower < 2:
+        return None
+    return (lower + upper) // 2
+
+
+def relabel(queryset: models.QuerySet[Any, Any], keys_by_pk: dict[int, int]) -> None:
+    """
+    Set the order of the rows in ``keys_by_pk`` within one ordering scope.
+
+    Rows are parked above both the largest current and the largest new key
+    first, so the unique order constraint never sees two rows with the same
+    key in between.
+    """
+    if not keys_by_pk:
+        return
+    model = queryset.model
+    order_field_name: str = model.order_field_name
+    touch: dict[str, Any] = (
+        {"updated_at": timezone.now()}
+        if any(field.name == "updated_at" for field in model._meta.concrete_fields)
+        else {}
+    )
+    max_order = cast(OrderedModelQuerySet[Any, Any], queryset).get_max_order()
+    parked = max(max_order or 0, *keys_by_pk.values()) + 1
+    pks = list(keys_by_pk)
+    for keys in (
+        {pk: parked + index for index, pk in enumerate(pks)},
+        keys_by_pk,
+    ):
+        for start in range(0, len(pks), RELABEL_BATCH_SIZE):
+            batch = pks[start : start + RELABEL_BATCH_SIZE]
+            _ = queryset.filter(pk__in=batch).update(
+                **{
+                    order_field_name: Case(
+                        *(When(pk=pk, then=Value(keys[pk])) for pk in batch),
+                        output_field=IntegerField(),
+                    )
+                },
+                **touch,
+            )
+    _ = keys_relabelled.send(sender=model, pks=pks)
+
+
+def rebalance(queryset: models.QuerySet[Any, Any]) -> int:
+    """
+    Respace the items of one ordering scope ``GAP`` apart, keeping their
+    relative order, and return how many items were relabelled.
+    """
+    gap = ordering_settings()["GAP"]
+    with transaction.atomic():
+        pks: list[int] = list(
+            queryset.select_for_update()
+            .order_by(queryset.model.order_field_name, "pk")
+            .values_list("pk", flat=True)
+        )
+        relabel(queryset, {pk: index * gap for index, pk in enumerate(pks)})
+    return len(pks)
+
+
+@contextmanager
+def deferred_delete_shifts() -> Iterator[None]:
+    """
+    Skip the dense engine's shift of the siblings above each row deleted in
+    the block; close the gaps once per scope with ``close_gaps`` instead.
+    """
+    token = _deferred_delete_shifts.set(True)
+    try:
+        yield
+    finally:
+        _deferred_delete_shifts.reset(token)
+
+
+def close_gaps(queryset: models.QuerySet[Any, Any]) -> int:
+    """
+    Renumber the items of one ordering scope 0, 1, 2, ... keeping their
+    relative order, and return how many items were relabelled.
+    """
+    order_field_name: str = queryset.model.order_field_name
+    rows: list[tuple[int, int]] = list(
+        queryset.order_by(order_field_name, "pk").values_list("pk", order_field_name)
+    )
+    keys_by_pk = {pk: index for index, (pk, order) in enumerate(rows) if order != index}
+    relabel(queryset, keys_by_pk)
+    return len(keys_by_pk)
+
+
+def _run_in_thread(task: Callable[[], object]) -> None:
+    try:
+        _ = task()
+    finally:
+        connection.close()
+
+
+def schedule_rebalance(queryset: models.QuerySet[Any, Any]) -> None:
+    """Rebalance the ordering scope ``queryset`` once the transaction commits."""
+
+    def run() -> None:
+        _ = rebalance(queryset.all())
+
+    if ordering_settings()["REBALANCE_IN_BACKGROUND"]:
+        transaction.on_commit(
+            lambda: threading.Thread(
+                target=_run_in_thread, args=(run,), daemon=True
+            ).start()
+        )
+    else:
+        transaction.on_commit(run)
+
+
+class SparseOrderingQuerySet(OrderedModelQuerySet[_M, _R]):
+    """Ordered queryset that appends with the gap of the active engine."""
+
+    @override
+    def get_next_order(self) -> int:
+        if not sparse_ordering():
+            return super().get_next_order()
+        order = self.get_max_order()
+        return 0 if order is None else order + order_step()
+
+    @override
+    def bulk_create(self, objs: Iterable[_M], *args: Any, **kwargs: Any) -> list[_M]:
+        if not sparse_ordering():
+            return super().bulk_create(objs, *args, **kwargs)
+        # Unlike the dense engine, explicitly given keys are kept.
+        order_field_name = self._get_order_field_name()
+        objs = list(objs)
+        next_orders: dict[frozenset[tuple[str, Any]], int] = {}
+        for obj in objs:
+            if getattr(obj, order_field_name) is not None:
+                continue
+            wrt_map = obj._wrt_map()
+            scope = frozenset(wrt_map.items())
+            if scope not in next_orders:
+                next_orders[scope] = self.filter(**wrt_map).get_next_order()
+            setattr(obj, order_field_name, next_orders[scope])
+            next_orders[scope] += order_step()
+        return super(OrderedModelQuerySet, self).bulk_create(objs, *args, **kwargs)
+
+
+if TYPE_CHECKING:
+
+    class SparseOrderingManager(OrderedModelManager[_M]):
+        @override
+        def get_queryset(self) -> SparseOrderingQuerySet[_M, _M]: ...
+
+else:
+
+    class SparseOrderingManager(
+        OrderedModelManager.from_queryset(SparseOrderingQuerySet)
+    ):
+        pass
+
+
+class SparseOrderedModel(OrderedModel):
+    """
+    ``OrderedModel`` that switches to sparse order keys when the ``sparse``
+    engine is enabled and behaves exactly like ``OrderedModel`` otherwise.
+
+    ``to(order)`` keeps its meaning: the item lands where the item currently
+    at ``order`` is, next to it in the direction it came from.
+    """
+
+    if not TYPE_CHECKING:
+        # Typed as the default manager, whose querysets subclasses inherit.
+        objects = SparseOrderingManager()
+
+    class Meta(OrderedModel.Meta):
+        abstract = True
+
+    @override
+    @classmethod
+    def _on_ordered_model_delete(
+        cls, sender: Any = None, instance: Any = None, **kwargs: Any
+    ) -> None:
+        # Queryset and cascade deletes leave a gap instead of shifting.
+        if sparse_ordering() or _deferred_delete_shifts.get():
+            return
+        super()._on_ordered_model_delete(sender=sender, instance=instance, **kwargs)
+
+    @override
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if not sparse_ordering():
+            return super().save(*args, **kwargs)
+        wrt_changed = self._wrt_map() != self._original_wrt_map
+        with transaction.atomic():
+            if getattr(self, self.order_field_name) is None or wrt_changed:
+                self.lock_ordering_scope()
+                setattr(self, self.order_field_name, self.get_next_sparse_order())
+            super(OrderedModelBase, self).save(*args, **kwargs)
+        self._original_wrt_map = self._wrt_map()
+
+    @override
+    def delete(self, *args: Any, extra_update: Any = None, **kwargs: Any) -> Any:
+        if not sparse_ordering():
+            return super().delete(*args, extra_update=extra_update, **kwargs)
+        self._was_deleted_via_delete_method = True
+        return super(OrderedModelBase, self).delete(*args, **kwargs)
+
+    @override
+    def to(self, order: object, extra_update: Any = None) -> None:
+        if not isinstance(order, int):
+            raise TypeError(
+                "Order value must be set using an 'int', not using a "
+                + f"'{type(order).__name__}'."
+            )
+        if not sparse_ordering():
+            return super().to(order, extra_update=extra_update)
+        current: int = getattr(self, self.order_field_name)
+        order = min(max(order, 0), MAX_ORDER)
+        if current == order:
+            return
+        with transaction.atomic():
+            self.lock_ordering_scope()
+            setattr(self, self.order_field_name, self.get_free_order(order, current))
+            self.save()
+
+    def lock_ordering_scope(self) -> None:
+        """
+        Lock the rows this item is ordered with respect to, e.g. the list of
+        a task, until the transaction ends.
+
+        Inserts and moves pick a free key from the keys of their neighbours,
+        so two of them in the same scope at once could pick the same key.
+        Holding the lock, the second one waits and then reads the first one's
+        key.
+        """
+        wrt_map = self._wrt_map()
+        for field in self._meta.concrete_fields:
+            pk = wrt_map.get(field.name)
+            if isinstance(field, models.ForeignKey) and pk is not None:
+                related_model = cast(type[models.Model], field.related_model)
+                _ = list(
+                    related_model._default_manager.select_for_update()
+                    .filter(pk=pk)
+                    .values_list("pk", flat=True)
+                )
+
+    def get_next_sparse_order(self) -> int:
+        """Return the key after the last sibling, rebalancing if none is left."""
+        queryset = self.get_ordering_queryset()
+        order = queryset.get_next_order()
+        if order > MAX_ORDER:
+            _ = rebalance(queryset)
+            order = queryset.get_next_order()
+        return order
+
+    def get_free_order(self, order: int, current: int) -> int:
+        """
+        Return a free key for landing at ``order``: the key itself if it is
+        free, otherwise one between the item holding it and that item's
+        neighbour on the side this item comes from.
+        """
+        siblings = self.get_ordering_queryset().exclude(pk=self.pk)
+        if not siblings.filter(**{self.order_field_name: order}).exists():
+            return order
+        if order > current:
+            lower, upper = order, siblings.above(order).get_min_order()
+        else:
+            lower, upper = siblings.below(order).get_max_order(), order
+        key = key_between(lower, upper)
+        if key is None:
+            key = self.make_room(lower, upper)[self.pk]
+        return key
+
+    def make_room(self, lower: int | None, upper: int | None) -> dict[int, int]:
+        """
+        Relabel the smallest window of siblings around the insertion point
+        between ``lower`` and ``upper`` that leaves gaps, schedule a
+        rebalance of the whole scope and return the new keys of the window,
+        this item included, by pk.
+        """
+        order_field_name = self.order_field_name
+        gap = ordering_settings()["GAP"]
+        scope = self.get_ordering_queryset()
+        siblings = scope.exclude(pk=self.pk)
+        below_lower = (
+            siblings.below(lower, inclusive=True).order_by(f"-{order_field_name}")
+            if lower is not None
+            else siblings.none()
+        )
+        above_upper = (
+            siblings.above(upper, inclusive=True).order_by(order_field_name)
+            if upper is not None
+            else siblings.none()
+        )
+        size = 4
+        while True:
+            below: list[tuple[int, int]] = list(
+                below_lower.values_list("pk", order_field_name)[: size + 1]
+            )
+            above: list[tuple[int, int]] = list(
+                above_upper.values_list("pk", order_field_name)[: size + 1]
+            )
+            floor = below.pop()[1] if len(below) > size else -1
+            window = [pk for pk, _ in reversed(below)] + [self.pk]
+            window += [pk for pk, _ in above[:size]]
+            if len(above) > size:
+                ceiling = above[size][1]
+            else:
+                ceiling = min(floor + gap * (len(window) + 1), MAX_ORDER + 1)
+            step = (ceiling - floor) // (len(window) + 1)
+            if step >= 2 or (floor == -1 and len(above) <= size):
+                break
+            size *= 2
+
+        keys = {pk: floor + step * (index + 1) for index, pk in enumerate(window)}
+        relabel(scope, keys)
+        schedule_rebalance(scope)
+        return keys
+
+    def move_to_position(self, position: int, reverse: bool = False) -> dict[int, int]:
+        """
+        Move this item to ``position`` among its siblings and save it.
+
+        The siblings are those of the scope the item is assigned to now, which
+        may differ from the saved one, e.g. to move a task to another list.
+        ``position`` counts from the lowest key, or from the highest one if
+        ``reverse``, and is clamped to the end. Return the new keys of the
+        other items that had to be relabelled, by pk.
+        """
+        position = max(position, 0)
+        if sparse_ordering():
+            return self._move_sparse(position, reverse)
+        return self._move_dense(position, reverse)
+
+    def _save_moved(self) -> None:
+        # The key is final, so skip the append of a scope change in save.
+        self._original_wrt_map = self._wrt_map()
+        self.save()
+
+    def _move_sparse(self, position: int, reverse: bool) -> dict[int, int]:
+        order_field_name = self.order_field_name
+        self.lock_ordering_scope()
+        siblings = (
+            self.get_ordering_queryset()
+            .exclude(pk=self.pk)
+            .order_by(f"-{order_field_name}" if reverse else order_field_name)
+            .values_list(order_field_name, flat=True)
+        )
+        before: int | None = None
+        after: int | None = None
+        if position == 0:
+            after = siblings.first()
+        else:
+            # Past the end the item goes after the last sibling.
+            neighbours = list(siblings[position - 1 : position + 1]) or list(
+                siblings.reverse()[:1]
+            )
+            before = neighbours[0] if neighbours else None
+            after = neighbours[1] if len(neighbours) > 1 else None
+        lower, upper = (after, before) if reverse else (before, after)
+
+        current: int = getattr(self, order_field_name)
+        if (
+            self._wrt_map() == self._original_wrt_map
+            and (lower is None or lower < current)
+            and (upper is None or current < upper)
+        ):
+            return {}
+        reordered: dict[int, int] = {}
+        key = key_between(lower, upper)
+        if key is None:
+            reordered = self.make_room(lower, upper)
+            key = reordered.pop(self.pk)
+        setattr(self, order_field_name, key)
+        self._save_moved()
+        return reordered
+
+    def _move_dense(self, position: int, reverse: bool) -> dict[int, int]:
+        order_field_name = self.order_field_name
+        original_wrt_map = self._original_wrt_map
+        same_scope = self._wrt_map() == original_wrt_map
+        scope = self.get_ordering_queryset()
+        siblings: list[tuple[int, int]] = list(
+            scope.exclude(pk=self.pk)
+            .order_by(order_field_name, "pk")
+            .values_list("pk", order_field_name)
+        )
+        index = min(position, len(siblings))
+        if reverse:
+            index = len(siblings) - index
+        current: int = getattr(self, order_field_name)
+        sequence = siblings[:index] + [(self.pk, current)] + siblings[index:]
+        keys = {pk: new for new, (pk, key) in enumerate(sequence) if key != new}
+        if same_scope and not keys:
+            return {}
+        # Relabelling never writes this item's row while it is still saved
+        # in another scope, so its new key is free once that is done.
+        relabel(scope, keys)
+        setattr(self, order_field_name, index)
+        self._save_moved()
+        if not same_scope:
+            # Close the gap left behind in the original scope.
+            left = self.get_ordering_queryset(wrt=original_wrt_map)
+            closed = {
+                pk: key - 1
+                for pk, key in left.above(current).values_list("pk", order_field_name)
+            }
+            relabel(left, closed)
+            keys.update(closed)
+        _ = keys.pop(self.pk, None)
+        return keys
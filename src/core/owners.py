@@ -0,0 +1,55 @@
+"""
+Consistency of the denormalized ``owner`` column of lists, tasks and subtasks.
+
+The owner is a copy of ``board.user`` that model saves keep up to date. Raw
+queryset updates and SQL bypass them, so ``find_mismatches`` compares every
+owner with its source and ``repair`` copies the source back.
+"""
+
+from typing import Any
+
+from django.db import transaction
+from django.db.models import F, Model, OuterRef, Subquery
+
+from core.models import Board, ListOfTasks, Subtask, Task
+
+# Models with an owner and the lookup of their board's user, parents first.
+OWNER_SOURCES: list[tuple[type[Model], str]] = [
+    (ListOfTasks, "board__user_id"),
+    (Task, "list_of_tasks__board__user_id"),
+    (Subtask, "task__list_of_tasks__board__user_id"),
+]
+
+
+def find_mismatches() -> dict[str, list[int]]:
+    """Return the pks of the rows whose owner differs from their board's user."""
+    mismatches: dict[str, list[int]] = {}
+    for model, lookup in OWNER_SOURCES:
+        pks = list(
+            model._default_manager.exclude(owner_id=F(lookup))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        if pks:
+            mismatches[model._meta.label] = pks
+    return mismatches
+
+
+def repair() -> dict[str, int]:
+    """Copy the board's user to every mismatched owner, return counts by model."""
+    sources: dict[type[Model], Any] = {
+        ListOfTasks: Board.objects.filter(pk=OuterRef("board_id")).values("user_id"),
+        Task: ListOfTasks.objects.filter(pk=OuterRef("list_of_tasks_id")).values(
+            "owner_id"
+        ),
+        Subtask: Task.objects.filter(pk=OuterRef("task_id")).values("owner_id"),
+    }
+    repaired: dict[str, int] = {}
+    with transaction.atomic():
+        for model, lookup in OWNER_SOURCES:
+            updated = model._default_manager.exclude(owner_id=F(lookup)).update(
+                owner_id=Subquery(sources[model][:1])
+            )
+            if updated:
+                repaired[model._meta.label] = updated
+    return repaired
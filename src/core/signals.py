@@ -0,0 +1,39 @@
+"""
+Signals for task writes that bypass the per-instance model signals.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.dispatch import Signal
+
+from core.models import Task, User
+
+# Sent with ``sender=Task`` and ``user`` once a bulk write finished.
+tasks_bulk_changed = Signal()
+
+_bulk_task_changes: ContextVar[bool] = ContextVar("bulk_task_changes", default=False)
+
+
+def in_bulk_task_changes() -> bool:
+    """Return whether the current task writes are part of a bulk change."""
+    return _bulk_task_changes.get()
+
+
+@contextmanager
+def bulk_task_changes(user: User) -> Iterator[None]:
+    """
+    Group the task writes of the block into one bulk change of ``user``.
+
+    Receivers of the per-instance ``Task`` signals that maintain derived data
+    should return early while a bulk change is active and update from
+    ``tasks_bulk_changed`` instead, which is sent once when the block exits
+    without an error. Use inside the transaction of the writes.
+    """
+    token = _bulk_task_changes.set(True)
+    try:
+        yield
+    finally:
+        _bulk_task_changes.reset(token)
+    _ = tasks_bulk_changed.send(sender=Task, user=user)
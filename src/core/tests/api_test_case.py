@@ -1,3 +1,5 @@
+import json
+from base64 import urlsafe_b64encode
 from datetime import date
 from typing import Any, override
 
@@ -85,6 +87,49 @@ class PrivateAPITestCase(ScrumAPITestCase):
         results = self.get_queryset()
         serializer = self.api_serializer(results, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(data["results"], serializer.data)
+        self.assertIsNone(data["next"])
+
+    def assert_paginates_models(self, expected_ids: list[Any], page_size: int):
+        """Test walking the cursor pages forwards and backwards."""
+        url: str | None = self.api_url("list", [])
+        params: dict[str, Any] = {"page_size": page_size}
+        pages: list[dict[str, Any]] = []
+        while url:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            page = validate_response_data(res)
+            self.assertLessEqual(len(page["results"]), page_size)
+            pages.append(page)
+            url, params = page["next"], {}
+
+        forward_ids = [row["id"] for page in pages for row in page["results"]]
+        self.assertEqual(forward_ids, expected_ids)
+
+        url = pages[-1]["previous"]
+        backward_ids = [row["id"] for row in pages[-1]["results"]]
+        while url:
+            page = validate_response_data(self.client.get(url))
+            backward_ids = [row["id"] for row in page["results"]] + backward_ids
+            url = page["previous"]
+        self.assertEqual(backward_ids, expected_ids)
+
+    def assert_rejects_forged_cursors(self, positions: list[Any]):
+        """Test well-formed cursors holding invalid keys are rejected."""
+        for position in positions:
+            payload = json.dumps({"p": position, "r": False}).encode()
+            cursor = urlsafe_b64encode(payload).decode()
+            with self.subTest(position=position):
+                res = self.client.get(self.api_url("list", []), {"cursor": cursor})
+
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def assert_retrieve_unpaginated_models(self):
+        """Test opting out of pagination for a small collection."""
+        res = self.client.get(self.api_url("list", []), {"paginate": "false"})
+        data = validate_response_data(res)
+        serializer = self.api_serializer(self.get_queryset(), many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(data, serializer.data)
 
     def assert_retrieve_model(self, model_pk: Any):
@@ -0,0 +1,201 @@
+"""
+Tests for the async read views of ASGI deployments.
+"""
+
+import json
+from typing import Any, override
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.test.client import AsyncRequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from board import urls as board_urls
+from common.async_views import AsyncFlatRowsView, async_flat_rows_urls
+from core.models import Board, ListOfTasks, Task, User
+from core.tests.utils import (
+    create_test_board,
+    create_test_list_of_tasks,
+    create_test_populated_task,
+    create_test_user,
+)
+from list_of_tasks import urls as list_urls
+from response_cache.cache import cache_stats
+from summary.views import AsyncSummaryView, SummaryView
+from task import urls as task_urls
+
+# Vary also holds the headers of middleware, which AsyncRequestFactory skips.
+COMPARED_HEADERS = ("Content-Type", "ETag", "Cache-Control", "Allow")
+
+
+def async_views() -> dict[str, Any]:
+    """Return the async views by URL name, as ASYNC_READS would route them."""
+    views: dict[str, Any] = {
+        "summary": AsyncSummaryView.as_view(sync_view=SummaryView.as_view())
+    }
+    for router, owner_field in [
+        (board_urls.router, "user"),
+        (list_urls.router, "owner"),
+        (task_urls.router, "owner"),
+    ]:
+        # The first pattern of a name is the route without a format suffix.
+        for pattern in async_flat_rows_urls(router, owner_field=owner_field):
+            _ = views.setdefault(pattern.name, pattern.callback)
+    return views
+
+
+@override_settings(FLAT_ROW_READS=True)
+class AsyncReadViewTests(TestCase):
+    """Test the async views answer exactly like the sync views."""
+
+    user = User()
+    token = Token()
+    board = Board()
+    list_of_tasks = ListOfTasks()
+    task = Task()
+    views: dict[str, Any] = {}
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.board = create_test_board(self.user, title="Sprint board")
+        for list_index in range(2):
+            self.list_of_tasks = create_test_list_of_tasks(
+                self.user, self.board, name=f"List {list_index}", order=list_index
+            )
+            for task_index in range(3):
+                self.task = create_test_populated_task(
+                    self.user, self.list_of_tasks, list_index * 10 + task_index
+                )
+        self.views = async_views()
+
+    def async_get(
+        self,
+        name: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        url = reverse(f"{name.split('-')[0]}:{name}", kwargs=kwargs)
+        request = AsyncRequestFactory().get(
+            url,
+            params or {},
+            headers={"authorization": f"Token {self.token.key}", **(headers or {})},
+        )
+        return self.call(name, request, **kwargs)
+
+    def call(self, name: str, request: Any, **kwargs: Any) -> Any:
+        res = async_to_sync(self.views[name])(request, **kwargs)
+        # Like Django's handler, render the responses of the sync views.
+        if hasattr(res, "render"):
+            res = res.render()
+        return res
+
+    def assert_same_response(
+        self, name: str, params: dict[str, str] | None = None, **kwargs: Any
+    ) -> Any:
+        url = reverse(f"{name.split('-')[0]}:{name}", kwargs=kwargs)
+        expected = self.client.get(url, params or {})
+        res = self.async_get(name, params, **kwargs)
+
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res.content, expected.content)
+        for header in COMPARED_HEADERS:
+            self.assertEqual(res.get(header), expected.get(header), header)
+        self.assertIn("Accept", res["Vary"])
+        return res
+
+    def test_collections_match_sync_views(self):
+        """Test the task, list and board collections are identical."""
+        for name in ["task-list", "list-list", "board-list"]:
+            with self.subTest(name):
+                self.assert_same_response(name)
+                self.assert_same_response(name, {"paginate": "false"})
+
+    def test_pages_match_sync_views(self):
+        """Test cursor pages are identical."""
+        res = self.assert_same_response("task-list", {"page_size": "4"})
+        cursor = json.loads(res.content)["next"].split("cursor=")[1].split("&")[0]
+
+        self.assert_same_response("task-list", {"page_size": "4", "cursor": cursor})
+
+    def test_details_match_sync_views(self):
+        """Test retrieving a task, list and board is identical."""
+        self.assert_same_response("task-detail", pk=self.task.pk)
+        self.assert_same_response("list-detail", pk=self.list_of_tasks.pk)
+        self.assert_same_response("board-detail", pk=self.board.pk)
+
+    def test_summary_matches_sync_view(self):
+        """Test the summary is identical."""
+        self.assert_same_response("summary")
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": True})
+    def test_response_cache_is_shared(self):
+        """Test the async views answer from the sync views' response cache."""
+        cache_stats.clear()
+        for name, view_name in [
+            ("summary", "SummaryView"),
+            ("board-list", "BoardViewSet"),
+        ]:
+            with self.subTest(name):
+                self.assert_same_response(name)
+                self.assert_same_response(name)
+
+                self.assertEqual(cache_stats[view_name].misses, 1)
+                self.assertEqual(cache_stats[view_name].hits, 3)
+
+    def test_not_modified(self):
+        """Test a matching If-None-Match is answered with 304."""
+        etag = self.async_get("board-list")["ETag"]
+
+        res = self.async_get("board-list", headers={"if-none-match": etag})
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_delegates_to_sync_views(self):
+        """Test requests outside the async path get the sync responses."""
+        self.assert_same_response("task-list", {"priority": "Low"})
+        self.assert_same_response("task-detail", pk=0)
+        self.assert_same_response("task-detail", pk="invalid")
+        self.assert_same_response("task-list", {"cursor": "invalid"})
+
+        res = self.async_get("board-list", headers={"accept": "text/html"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/html"))
+
+        request = AsyncRequestFactory().post(
+            reverse("board:board-list"),
+            {"title": "Created"},
+            content_type="application/json",
+            headers={"authorization": f"Token {self.token.key}"},
+        )
+        res = self.call("board-list", request)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Board.objects.filter(title="Created").exists())
+
+    @override_settings(FLAT_ROW_READS=False)
+    def test_serializers_without_flat_rows(self):
+        """Test the flat row views delegate to the serializers when off."""
+        with patch.object(AsyncFlatRowsView, "read_data") as read_data:
+            self.assert_same_response("board-list")
+            self.assert_same_response("task-detail", pk=self.task.pk)
+
+        read_data.assert_not_called()
+
+    def test_authentication_required(self):
+        """Test invalid tokens and inactive users are rejected."""
+        res = self.async_get("summary", headers={"authorization": "Token invalid"})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.async_get("board-list")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -2,12 +2,21 @@
 Test custom Django management commands.
 """
 
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from django.core.management import call_command
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase
+from django.urls import reverse
 from psycopg2 import OperationalError as Psycopq2OpError
+from rest_framework.authtoken.models import Token
+
+from core.models import User
+from core.tests.utils import create_test_board, create_test_user
 
 
 # Mock behavior of database
@@ -36,3 +45,89 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=["default"])
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    """Test the load test command."""
+
+    def test_load_test(self):
+        """Test requests are sent and summarized."""
+        user = create_test_user()
+        _ = create_test_board(user)
+        token = Token.objects.create(user=user)
+        out = StringIO()
+
+        _ = call_command(
+            "load_test",
+            self.live_server_url + reverse("board:board-list"),
+            self.live_server_url + reverse("summary:summary"),
+            token=token.key,
+            requests=6,
+            concurrency=2,
+            stdout=out,
+        )
+
+        self.assertIn("requests: 6, errors: 0", out.getvalue())
+        self.assertIn("latency ms p50:", out.getvalue())
+
+    def test_load_test_counts_errors(self):
+        """Test failed requests are counted as errors."""
+        out = StringIO()
+
+        _ = call_command(
+            "load_test",
+            self.live_server_url + reverse("summary:summary"),
+            requests=3,
+            stdout=out,
+        )
+
+        self.assertIn("requests: 3, errors: 3", out.getvalue())
+
+
+class BenchmarkAPICommandTests(TestCase):
+    """Test the API benchmark command."""
+
+    def test_benchmark_api(self):
+        """Test every operation is measured, written as JSON and compared."""
+        with tempfile.TemporaryDirectory() as directory:
+            first = Path(directory, "first.json")
+            out = StringIO()
+            options = {
+                "current_db": True,
+                "users": 2,
+                "boards": 1,
+                "lists": 2,
+                "tasks": 3,
+                "repeat": 2,
+                "warmup": 1,
+            }
+
+            _ = call_command("benchmark_api", output=str(first), stdout=out, **options)
+            _ = call_command(
+                "benchmark_api",
+                output=str(Path(directory, "second.json")),
+                compare=str(first),
+                stdout=out,
+                **options,
+            )
+
+            results = json.loads(first.read_text())
+        self.assertEqual(
+            list(results["results"]),
+            [
+                "board_retrieve",
+                "board_list",
+                "task_list",
+                "summary",
+                "task_reorder",
+                "task_create",
+                "task_delete",
+            ],
+        )
+        for result in results["results"].values():
+            self.assertEqual(result["runs"], 2)
+            self.assertGreater(result["queries"]["min"], 0)
+            self.assertGreater(result["peak_memory_kib"], 0)
+        self.assertEqual(results["meta"]["volumes"]["tasks"], 3)
+        self.assertIn("median", out.getvalue().splitlines()[-2])
+        self.assertFalse(User.objects.filter(email__startswith="api-benchmark-"))
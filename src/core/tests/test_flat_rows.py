@@ -0,0 +1,140 @@
+"""
+Tests for answering the read endpoints from flat rows.
+"""
+
+from datetime import datetime, timezone
+from io import StringIO
+from typing import override
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from common.flat_rows import FlatRowsMixin
+from common.renderers import FastJSONRenderer
+from core.models import Board, ListOfTasks, Task, User
+from core.tests.utils import (
+    create_test_board,
+    create_test_list_of_tasks,
+    create_test_populated_task,
+    create_test_user,
+)
+
+
+class FlatRowReadTests(TestCase):
+    """Test the flat row path renders the same bytes as the serializers."""
+
+    user = User()
+    board = Board()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.board = create_test_board(self.user, title="Sprint board")
+        for list_index in range(2):
+            list_of_tasks = create_test_list_of_tasks(
+                self.user, self.board, name=f"List {list_index}", order=list_index
+            )
+            for task_index in range(3):
+                _ = create_test_populated_task(
+                    self.user,
+                    list_of_tasks,
+                    list_index * 10 + task_index,
+                    description='Plän «Quote " and \\ and \u2028 line separator ✓»',
+                )
+
+    def assert_same_content(self, url: str, **params: str) -> None:
+        with override_settings(FLAT_ROW_READS=False):
+            expected = self.client.get(url, params)
+        with override_settings(FLAT_ROW_READS=True):
+            res = self.client.get(url, params)
+
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res.content, expected.content)
+
+    def test_collections_match_serializers(self):
+        """Test the task, list and board collections are byte-identical."""
+        for view_name in ["task", "list", "board"]:
+            with self.subTest(view_name):
+                url = reverse(f"{view_name}:{view_name}-list")
+                self.assert_same_content(url)
+                self.assert_same_content(url, paginate="false")
+
+    def test_pages_match_serializers(self):
+        """Test cursor pages are byte-identical."""
+        url = reverse("task:task-list")
+        with override_settings(FLAT_ROW_READS=True):
+            next_url: str = self.client.get(url, {"page_size": 4}).json()["next"]
+
+        self.assert_same_content(url, page_size="4")
+        self.assert_same_content(next_url)
+
+    def test_details_match_serializers(self):
+        """Test retrieving a task, list and board is byte-identical."""
+        list_of_tasks = ListOfTasks.objects.filter(board=self.board).first()
+        assert list_of_tasks is not None
+        task = Task.objects.filter(list_of_tasks=list_of_tasks).first()
+        assert task is not None
+        for view_name, pk in [
+            ("task", task.pk),
+            ("list", list_of_tasks.pk),
+            ("board", self.board.pk),
+        ]:
+            with self.subTest(view_name):
+                self.assert_same_content(
+                    reverse(f"{view_name}:{view_name}-detail", args=[pk])
+                )
+        self.assert_same_content(reverse("board:board-detail", args=[0]))
+
+    def test_setting_selects_path(self):
+        """Test the serializers answer unless ``FLAT_ROW_READS`` is on."""
+        url = reverse("task:task-list")
+        get_flat_rows: object = getattr(FlatRowsMixin, "get_flat_queryset")
+        for enabled in [False, True]:
+            with (
+                self.subTest(enabled=enabled),
+                override_settings(FLAT_ROW_READS=enabled),
+                patch.object(
+                    FlatRowsMixin,
+                    "get_flat_queryset",
+                    autospec=True,
+                    side_effect=get_flat_rows,
+                ) as get_flat_queryset,
+            ):
+                self.assertEqual(self.client.get(url).status_code, 200)
+                self.assertEqual(get_flat_queryset.called, enabled)
+
+    def test_field_selection_uses_serializers(self):
+        """Test ?fields= and ?expand= are still honoured."""
+        url = reverse("board:board-detail", args=[self.board.pk])
+        with override_settings(FLAT_ROW_READS=True):
+            res = self.client.get(url, {"fields": "id,title"})
+
+        self.assertEqual(res.json(), {"id": self.board.pk, "title": self.board.title})
+
+    def test_renderer_falls_back_for_other_types(self):
+        """Test data orjson would format differently is rendered by DRF."""
+        data = {"at": datetime(2030, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)}
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2"),
+        )
+
+    def test_benchmark_command(self):
+        """Test the benchmark checks both paths and reports every payload."""
+        out = StringIO()
+
+        _ = call_command(
+            "benchmark_reads", "--boards=1", "--lists=2", "--tasks=3", stdout=out
+        )
+
+        for name in ["tasks", "lists", "boards"]:
+            self.assertIn(name, out.getvalue())
+        self.assertFalse(User.objects.filter(email="read-benchmark@example.com"))
@@ -0,0 +1,173 @@
+"""
+Tests for the sparse ordering engine.
+"""
+
+from io import StringIO
+from typing import override
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.models import ListOfTasks, Task, User
+from core.ordering import MAX_ORDER, key_between
+from core.tests.utils import (
+    create_test_list_of_tasks,
+    create_test_task,
+    create_test_user,
+)
+
+SPARSE = {"ENGINE": "sparse", "GAP": 1024, "REBALANCE_IN_BACKGROUND": False}
+
+
+def create_tasks(user: User, list_of_tasks: ListOfTasks, count: int) -> list[Task]:
+    return [
+        create_test_task(
+            user, list_of_tasks=list_of_tasks, title=f"Task {index}", order=None
+        )
+        for index in range(count)
+    ]
+
+
+def task_titles(list_of_tasks: ListOfTasks) -> list[str]:
+    return list(
+        Task.objects.filter(list_of_tasks=list_of_tasks)
+        .order_by("order")
+        .values_list("title", flat=True)
+    )
+
+
+@override_settings(ORDERING=SPARSE)
+class SparseOrderingTests(TestCase):
+    """Test moving tasks with sparse order keys."""
+
+    user = User()
+    list_of_tasks = ListOfTasks()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.list_of_tasks = create_test_list_of_tasks(self.user)
+
+    def test_new_tasks_are_appended_with_gaps(self):
+        """Test created tasks get keys a gap apart."""
+        tasks = create_tasks(self.user, self.list_of_tasks, 3)
+
+        self.assertEqual([task.order for task in tasks], [0, 1024, 2048])
+
+    def test_move_updates_one_row(self):
+        """Test a move between two tasks only writes the moved task."""
+        tasks = create_tasks(self.user, self.list_of_tasks, 50)
+
+        with CaptureQueriesContext(connection) as queries:
+            tasks[0].to(tasks[30].order)
+
+        updates = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(tasks[0].order, (tasks[30].order + tasks[31].order) // 2)
+
+    def test_moves_match_dense_positions(self):
+        """Test a move lands at the position of the task at the target key."""
+        tasks = create_tasks(self.user, self.list_of_tasks, 5)
+        expected = task_titles(self.list_of_tasks)
+        for moved, target in [(0, 3), (4, 1), (2, 4), (1, 0), (3, 3)]:
+            tasks[moved].refresh_from_db()
+            target_task = Task.objects.filter(
+                list_of_tasks=self.list_of_tasks
+            ).order_by("order")[target]
+            tasks[moved].to(target_task.order)
+            expected.remove(tasks[moved].title)
+            expected.insert(target, tasks[moved].title)
+
+            self.assertEqual(task_titles(self.list_of_tasks), expected)
+
+    def test_delete_leaves_siblings_alone(self):
+        """Test deleting a task does not shift the other tasks."""
+        tasks = create_tasks(self.user, self.list_of_tasks, 3)
+
+        tasks[0].delete()
+
+        self.assertEqual(
+            list(
+                Task.objects.filter(list_of_tasks=self.list_of_tasks)
+                .order_by("order")
+                .values_list("order", flat=True)
+            ),
+            [1024, 2048],
+        )
+
+    def test_inserts_and_moves_lock_their_list(self):
+        """Test appends and moves lock their list before picking a free key."""
+        first = create_tasks(self.user, self.list_of_tasks, 1)[0]
+        manager = ListOfTasks.objects
+
+        with patch.object(
+            manager, "select_for_update", wraps=manager.select_for_update
+        ) as lock:
+            task = create_tasks(self.user, self.list_of_tasks, 1)[0]
+            task.to(first.order)
+
+        self.assertEqual(lock.call_count, 2)
+
+    def test_exhausted_gap_is_relabelled_and_rebalanced(self):
+        """Test moving into a full gap relabels nearby keys, then rebalances."""
+        with self.settings(ORDERING={**SPARSE, "GAP": 4}):
+            tasks = create_tasks(self.user, self.list_of_tasks, 20)
+            expected = task_titles(self.list_of_tasks)
+            with self.captureOnCommitCallbacks() as callbacks:
+                for task in tasks[10:]:
+                    # Keep inserting right above the lowest task.
+                    task.refresh_from_db()
+                    task.to(
+                        Task.objects.filter(list_of_tasks=self.list_of_tasks)
+                        .order_by("order")[1]
+                        .order
+                    )
+                    expected.remove(task.title)
+                    expected.insert(1, task.title)
+
+            self.assertEqual(task_titles(self.list_of_tasks), expected)
+            self.assertGreater(len(callbacks), 0)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                for callback in callbacks:
+                    callback()
+
+            orders = list(
+                Task.objects.filter(list_of_tasks=self.list_of_tasks)
+                .order_by("order")
+                .values_list("order", flat=True)
+            )
+            self.assertEqual(orders, [index * 4 for index in range(20)])
+            self.assertEqual(task_titles(self.list_of_tasks), expected)
+
+    def test_rebalance_command(self):
+        """Test the command spreads dense keys apart."""
+        with self.settings(ORDERING={**SPARSE, "ENGINE": "dense"}):
+            _ = create_tasks(self.user, self.list_of_tasks, 3)
+
+        _ = call_command("rebalance_order", stdout=StringIO())
+
+        self.assertEqual(
+            list(
+                Task.objects.filter(list_of_tasks=self.list_of_tasks)
+                .order_by("order")
+                .values_list("order", flat=True)
+            ),
+            [0, 1024, 2048],
+        )
+
+    def test_key_between(self):
+        """Test free keys are found between neighbours."""
+        self.assertEqual(key_between(0, 1024), 512)
+        self.assertIsNone(key_between(4, 5))
+        self.assertEqual(key_between(None, 2048), 1024)
+        self.assertIsNone(key_between(None, 0))
+        self.assertEqual(key_between(2048, None), 3072)
+        self.assertEqual(key_between(MAX_ORDER - 2, None), MAX_ORDER - 1)
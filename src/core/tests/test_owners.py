@@ -0,0 +1,135 @@
+"""
+Tests for the denormalized owners of lists, tasks and subtasks.
+"""
+
+from io import StringIO
+from typing import override
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import (
+    ListOfTasks,
+    SearchDocument,
+    Subtask,
+    SummaryCounter,
+    Task,
+    Tombstone,
+    User,
+)
+from core.owners import find_mismatches
+from core.tests.utils import (
+    TEST_OTHER_USER_EMAIL,
+    create_test_list_of_tasks,
+    create_test_subtask,
+    create_test_task,
+    create_test_user,
+)
+
+
+class OwnerTests(TestCase):
+    """Test the owner column follows the board's user."""
+
+    user = User()
+    other_user = User()
+    task = Task()
+    subtask = Subtask()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.other_user = create_test_user(email=TEST_OTHER_USER_EMAIL)
+        self.task = create_test_task(self.user)
+        self.subtask = create_test_subtask(self.user, self.task)
+
+    def assert_owners(self, user: User) -> None:
+        self.task.refresh_from_db()
+        self.subtask.refresh_from_db()
+        self.assertEqual(self.task.list_of_tasks.owner_id, user.pk)
+        self.assertEqual(self.task.owner_id, user.pk)
+        self.assertEqual(self.subtask.owner_id, user.pk)
+        self.assertEqual(find_mismatches(), {})
+
+    def test_owner_set_on_create(self):
+        """Test new lists, tasks and subtasks are owned by the board's user."""
+        self.assert_owners(self.user)
+        self.assertEqual(self.task.user, self.user)
+
+    def test_owner_follows_moved_task(self):
+        """Test moving a task to another user's list moves its subtasks too."""
+        other_list = create_test_list_of_tasks(self.other_user)
+
+        self.task.list_of_tasks = other_list
+        self.task.save()
+
+        self.assert_owners(self.other_user)
+
+    def test_owner_follows_board_user(self):
+        """Test handing a board over updates every row below it."""
+        board = self.task.list_of_tasks.board
+
+        board.user = self.other_user
+        board.save()
+
+        self.assert_owners(self.other_user)
+
+    def test_board_handover_updates_derived_data(self):
+        """Test rows handed over with a board are re-indexed and recounted."""
+        board = self.task.list_of_tasks.board
+        updated_at = self.task.updated_at
+
+        board.user = self.other_user
+        board.save()
+
+        self.task.refresh_from_db()
+        self.assertGreater(self.task.updated_at, updated_at)
+        document = SearchDocument.objects.get(
+            kind=SearchDocument.TASK, object_id=self.task.pk
+        )
+        self.assertEqual(document.user_id, self.other_user.pk)
+        self.assertFalse(SummaryCounter.objects.filter(user=self.user).exists())
+        self.assertTrue(SummaryCounter.objects.filter(user=self.other_user).exists())
+        self.assertEqual(
+            set(
+                Tombstone.objects.filter(user=self.user).values_list(
+                    "kind", "object_id"
+                )
+            ),
+            {
+                (Tombstone.BOARD, board.pk),
+                (Tombstone.LIST, self.task.list_of_tasks_id),
+                (Tombstone.TASK, self.task.pk),
+                (Tombstone.SUBTASK, self.subtask.pk),
+            },
+        )
+
+    def test_scoped_queries_do_not_join_boards(self):
+        """Test the task list is scoped without joining up to the board."""
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = client.get(reverse("task:task-list"))
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertFalse([query for query in queries if "core_board" in query["sql"]])
+
+    def test_check_owners_command(self):
+        """Test the command reports stale owners and repairs them."""
+        _ = Task.objects.filter(pk=self.task.pk).update(owner=self.other_user)
+        _ = ListOfTasks.objects.filter(pk=self.task.list_of_tasks_id).update(
+            owner=self.other_user
+        )
+
+        with self.assertRaises(CommandError):
+            _ = call_command("check_owners", stdout=StringIO())
+
+        _ = call_command("check_owners", "--fix", stdout=StringIO())
+
+        self.assert_owners(self.user)
+        _ = call_command("check_owners", stdout=StringIO())
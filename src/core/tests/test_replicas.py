@@ -0,0 +1,121 @@
+"""
+Tests for routing safe requests to read replicas.
+"""
+
+import copy
+import json
+from typing import override
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.client import AsyncRequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from common.replicas import STICKY_COOKIE, sticky_cache_key
+from core.models import Board, User
+from core.tests.test_async_views import async_views
+from core.tests.utils import create_test_board, create_test_user
+
+BOARDS_URL = reverse("board:board-list")
+SUMMARY_URL = reverse("summary:summary")
+
+
+@override_settings(READ_REPLICAS=["replica"], REPLICA_STICKY_SECONDS=60)
+class ReplicaRoutingTests(TestCase):
+    """Test reads go to the replica unless the user wrote recently."""
+
+    databases = {"default", "replica"}
+
+    user = User()
+    board = Board()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.board = create_test_board(self.user, title="Primary board")
+        # The replica lags behind: it still has the old title.
+        _ = User.objects.using("replica").bulk_create([copy.copy(self.user)])
+        stale = copy.copy(self.board)
+        stale.title = "Replica board"
+        _ = Board.objects.using("replica").bulk_create([stale])
+        _ = cache.delete(sticky_cache_key(self.user.pk))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def board_titles(self, client: APIClient | None = None) -> list[str]:
+        res = (client or self.client).get(BOARDS_URL, {"paginate": "false"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [board["title"] for board in res.json()]
+
+    def async_board_titles(self) -> list[str]:
+        token, _ = Token.objects.get_or_create(user=self.user)
+        request = AsyncRequestFactory().get(
+            BOARDS_URL,
+            {"paginate": "false"},
+            headers={"authorization": f"Token {token.key}"},
+        )
+        res = async_to_sync(async_views()["board-list"])(request)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [board["title"] for board in json.loads(res.content)]
+
+    def test_safe_requests_read_replica(self):
+        """Test list requests are answered from the replica."""
+        self.assertEqual(self.board_titles(), ["Replica board"])
+        self.assertEqual(self.client.get(SUMMARY_URL).status_code, status.HTTP_200_OK)
+
+    def test_read_your_writes(self):
+        """Test a user reads from the primary after a write."""
+        res = self.client.post(BOARDS_URL, {"title": "New board"})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn(STICKY_COOKIE, res.cookies)
+
+        self.assertEqual(self.board_titles(), ["New board", "Primary board"])
+        # Other clients of the same user are sticky through the cache.
+        other_client = APIClient()
+        other_client.force_authenticate(self.user)
+        self.assertEqual(
+            self.board_titles(other_client), ["New board", "Primary board"]
+        )
+
+    def test_sticky_window_expires(self):
+        """Test reads return to the replica once the window has passed."""
+        _ = self.client.post(BOARDS_URL, {"title": "New board"})
+        _ = cache.delete(sticky_cache_key(self.user.pk))
+        self.client.cookies[STICKY_COOKIE] = "0"
+
+        self.assertEqual(self.board_titles(), ["Replica board"])
+
+    def test_failed_writes_are_not_sticky(self):
+        """Test rejected writes keep the user on the replica."""
+        res = self.client.post(BOARDS_URL, {"title": " "})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self.board_titles(), ["Replica board"])
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": True})
+    def test_replica_reads_are_not_cached(self):
+        """Test responses read from a replica never outlive the sticky window."""
+        self.assertEqual(self.board_titles(), ["Replica board"])
+
+        cache.set(sticky_cache_key(self.user.pk), True)
+
+        self.assertEqual(self.board_titles(), ["Primary board"])
+        self.assertEqual(self.board_titles(), ["Primary board"])
+
+    @override_settings(FLAT_ROW_READS=True)
+    def test_async_reads_of_sticky_users(self):
+        """Test async reads of token users stay on the primary after a write."""
+        self.assertEqual(self.async_board_titles(), ["Replica board"])
+
+        cache.set(sticky_cache_key(self.user.pk), True)
+
+        self.assertEqual(self.async_board_titles(), ["Primary board"])
+
+    @override_settings(READ_REPLICAS=[])
+    def test_without_replicas(self):
+        """Test everything reads from the primary without replicas."""
+        self.assertEqual(self.board_titles(), ["Primary board"])
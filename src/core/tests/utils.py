@@ -108,7 +108,7 @@ def create_test_task(
     title: str = "Fix broken pipe",
     description: str = "",
     priority: str = "Urgent",
-    order: int = 0,
+    order: int | None = 0,
     **params: Any,
 ) -> Task:
     if user and list_of_tasks:
@@ -165,6 +165,30 @@ def create_test_subtask(
     return Subtask.objects.create(title=title, task=task, done=done, **params)
 
 
+def create_test_populated_task(
+    user: User, list_of_tasks: ListOfTasks, index: int, **params: Any
+) -> Task:
+    """Create a task with its own category, an assignee and a subtask."""
+    category = create_test_category(user, name=f"Category {index}")
+    contact = create_test_contact(
+        user,
+        email=f"contact{index}@example.com",
+        name=f"Contact {index}",
+        phone_number="",
+    )
+    task = create_test_task(
+        user=user,
+        category=category,
+        list_of_tasks=list_of_tasks,
+        title=f"Task {index}",
+        order=index,
+        **params,
+    )
+    task.assignees.add(contact)
+    _ = create_test_subtask(user=user, task=task, title=f"Subtask {index}")
+    return task
+
+
 def validate_response_data(response: Any) -> dict[str, Any]:
     """Validate that the response has data and return it as a dictionary."""
     if getattr(response, "data", None) is None:
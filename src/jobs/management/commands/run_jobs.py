@@ -0,0 +1,66 @@
+"""
+Django command to run the jobs of the database queue.
+"""
+
+import time
+from argparse import ArgumentParser
+from typing import Any, override
+
+from django.core.management.base import BaseCommand
+
+from core.models import Job
+from jobs.queue import (
+    jobs_settings,
+    purge_finished_jobs,
+    requeue_stale_jobs,
+    run_next_job,
+)
+from sync.changes import purge_tombstones
+
+MAINTENANCE_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    """Django command to work through the job queue."""
+
+    help = (
+        "Run due jobs of the database queue, polling for new ones. Several "
+        "workers may run side by side."
+    )
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling.",
+        )
+        _ = parser.add_argument(
+            "--poll-interval",
+            type=float,
+            help="Seconds to sleep while no job is due (default: JOBS setting).",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        poll_interval: float = (
+            options["poll_interval"] or jobs_settings()["POLL_INTERVAL"]
+        )
+        last_maintenance = 0.0
+        while True:
+            if time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                _ = requeue_stale_jobs()
+                _ = purge_finished_jobs()
+                _ = purge_tombstones()
+                last_maintenance = time.monotonic()
+            job = run_next_job()
+            if job is not None:
+                style = (
+                    self.style.SUCCESS if job.status == Job.DONE else self.style.ERROR
+                )
+                self.stdout.write(style(f"{job.name} {job.pk}: {job.status}"))
+                continue
+            if options["once"]:
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,267 @@
+"""
+A small job queue for work that should not hold up a request.
+
+``enqueue(function, **kwargs)`` stores the dotted path of a module level
+function and its JSON serializable keyword arguments. The backend is chosen
+with ``settings.JOBS``::
+
+    JOBS = {"BACKEND": "database", "MAX_ATTEMPTS": 5, "BACKOFF": 30}
+
+The default is ``console``, so nothing waits for a worker that is not
+running; deployments with a ``run_jobs`` worker choose ``database``.
+
+``database``
+    Jobs are ``core.models.Job`` rows, written in the caller's transaction and
+    run by the ``run_jobs`` worker. Failures are retried after
+    ``BACKOFF * 2 ** (attempt - 1)`` seconds, at most ``MAX_BACKOFF``, until
+    ``MAX_ATTEMPTS`` attempts have failed.
+``locmem``
+    Jobs are kept in ``outbox`` until ``run_locmem_jobs`` runs them, for tests.
+``console``
+    Jobs are logged and run in the request once the transaction commits.
+"""
+
+import logging
+import statistics
+import traceback
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS: dict[str, Any] = {
+    "BACKEND": "console",
+    "MAX_ATTEMPTS": 5,
+    "BACKOFF": 30,
+    "MAX_BACKOFF": 3600,
+    "POLL_INTERVAL": 1.0,
+    # Running jobs older than this are assumed to belong to a dead worker.
+    "TIMEOUT": 600,
+    "KEEP_FINISHED": 7 * 24 * 3600,
+}
+
+# Jobs enqueued with the locmem backend, like ``django.core.mail.outbox``.
+outbox: list[Job] = []
+
+
+def jobs_settings() -> dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "JOBS", {})}
+
+
+def job_name(function: Callable[..., object]) -> str:
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+def enqueue(function: Callable[..., object], *, delay: float = 0, **kwargs: Any) -> Job:
+    """Run ``function(**kwargs)`` in the background after ``delay`` seconds."""
+    options = jobs_settings()
+    now = timezone.now()
+    job = Job(
+        name=job_name(function),
+        payload=kwargs,
+        max_attempts=options["MAX_ATTEMPTS"],
+        enqueued_at=now,
+        run_at=now + timedelta(seconds=delay),
+    )
+    backend = options["BACKEND"]
+    if backend == "database":
+        job.save()
+    elif backend == "locmem":
+        outbox.append(job)
+    elif backend == "console":
+        logger.info("Running job %s(%s)", job.name, job.payload)
+        transaction.on_commit(lambda: execute(job))
+    else:
+        raise ValueError(f"Unknown job backend {backend!r}.")
+    return job
+
+
+def backoff(attempts: int) -> timedelta:
+    """Return the delay before retrying a job that failed ``attempts`` times."""
+    options = jobs_settings()
+    seconds = options["BACKOFF"] * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, options["MAX_BACKOFF"]))
+
+
+def execute(job: Job) -> bool:
+    """
+    Make one attempt at ``job`` and record the outcome on it, without saving.
+    Return whether it succeeded.
+    """
+    now = timezone.now()
+    job.attempts += 1
+    job.started_at = now
+    try:
+        _ = import_string(job.name)(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+            logger.exception("Job %s %s failed for good", job.name, job.pk)
+        else:
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + backoff(job.attempts)
+            logger.warning("Job %s %s failed, retrying", job.name, job.pk)
+        return False
+    job.status = Job.DONE
+    job.finished_at = timezone.now()
+    return True
+
+
+def run_locmem_jobs() -> int:
+    """Run the jobs in ``outbox`` until they succeed or fail for good."""
+    count = 0
+    while outbox:
+        job = outbox.pop(0)
+        count += 1
+        if not execute(job) and job.status == Job.PENDING:
+            outbox.append(job)
+    return count
+
+
+def claim_job() -> Job | None:
+    """Mark the next due job as running and return it."""
+    now = timezone.now()
+    with transaction.atomic():
+        queryset = Job.objects.filter(status=Job.PENDING, run_at__lte=now).order_by(
+            "run_at", "pk"
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        job = queryset.first()
+        if job is None:
+            return None
+        # Without row locks, another worker may have claimed it meanwhile.
+        claimed = Job.objects.filter(pk=job.pk, status=Job.PENDING).update(
+            status=Job.RUNNING, started_at=now
+        )
+    if not claimed:
+        return None
+    job.status = Job.RUNNING
+    return job
+
+
+def run_next_job() -> Job | None:
+    """Claim and run the next due job; return it, or None if none is due."""
+    job = claim_job()
+    if job is None:
+        return None
+    _ = execute(job)
+    job.save(
+        update_fields=[
+            "status",
+            "attempts",
+            "last_error",
+            "run_at",
+            "started_at",
+            "finished_at",
+        ]
+    )
+    return job
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Put running jobs of workers that died back in the queue, or fail them if
+    that was their last attempt. Return how many jobs were requeued.
+    """
+    timeout = jobs_settings()["TIMEOUT"]
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.RUNNING, started_at__lt=now - timedelta(seconds=timeout)
+    )
+    with transaction.atomic():
+        failed = stale.filter(attempts__gte=F("max_attempts") - 1).update(
+            status=Job.FAILED,
+            attempts=F("attempts") + 1,
+            finished_at=now,
+            last_error=f"The worker running the job stopped for over {timeout}s.",
+        )
+        requeued = stale.update(
+            status=Job.PENDING, attempts=F("attempts") + 1, run_at=now
+        )
+    if failed:
+        logger.error("%s stale jobs failed for good", failed)
+    return requeued
+
+
+def purge_finished_jobs() -> int:
+    """Delete finished jobs older than ``KEEP_FINISHED`` seconds."""
+    cutoff = timezone.now() - timedelta(seconds=jobs_settings()["KEEP_FINISHED"])
+    deleted, _ = Job.objects.filter(
+        status__in=[Job.DONE, Job.FAILED], finished_at__lt=cutoff
+    ).delete()
+    return deleted
+
+
+def _stats(values: list[float]) -> dict[str, float | int | None]:
+    if not values:
+        return {"count": 0, "mean": None, "p95": None, "max": None}
+    values.sort()
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+        "max": values[-1],
+    }
+
+
+def queue_metrics(window: int = 3600) -> dict[str, Any]:
+    """
+    Return the depth of the queue and, for the jobs started in the last
+    ``window`` seconds, the latency between being due and starting, and the
+    run time of those that finished, in seconds.
+    """
+    now = timezone.now()
+    backend = jobs_settings()["BACKEND"]
+    depth: dict[str, Any]
+    if backend == "locmem":
+        due_at = [job.run_at for job in outbox if job.run_at <= now]
+        depth = {
+            "pending": len(outbox),
+            "due": len(due_at),
+            "running": 0,
+            "failed": 0,
+            "oldest_due": min(due_at, default=None),
+        }
+    else:
+        pending = Q(status=Job.PENDING)
+        depth = Job.objects.aggregate(
+            pending=Count("pk", filter=pending),
+            due=Count("pk", filter=pending & Q(run_at__lte=now)),
+            running=Count("pk", filter=Q(status=Job.RUNNING)),
+            failed=Count("pk", filter=Q(status=Job.FAILED)),
+            oldest_due=Min("run_at", filter=pending & Q(run_at__lte=now)),
+        )
+    oldest_due = depth.pop("oldest_due")
+    started = Job.objects.filter(
+        started_at__gte=now - timedelta(seconds=window)
+    ).values_list("run_at", "started_at", "finished_at", "status")
+    latencies: list[float] = []
+    durations: list[float] = []
+    for run_at, started_at, finished_at, status in started:
+        if status == Job.PENDING:
+            # Retried: run_at already points at the next attempt.
+            continue
+        latencies.append(max((started_at - run_at).total_seconds(), 0))
+        if finished_at is not None:
+            durations.append((finished_at - started_at).total_seconds())
+    return {
+        "backend": backend,
+        **depth,
+        "oldest_due_age": (
+            None if oldest_due is None else (now - oldest_due).total_seconds()
+        ),
+        "latency": _stats(latencies),
+        "duration": _stats(durations),
+    }
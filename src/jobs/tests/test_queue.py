@@ -0,0 +1,222 @@
+"""
+Tests for the job queue.
+"""
+
+from datetime import timedelta
+from io import StringIO
+from typing import override
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Job
+from core.tests.utils import create_test_superuser, create_test_user
+from jobs import queue
+from jobs.queue import (
+    backoff,
+    enqueue,
+    job_name,
+    queue_metrics,
+    requeue_stale_jobs,
+    run_locmem_jobs,
+    run_next_job,
+)
+
+METRICS_URL = reverse("jobs:metrics")
+
+calls: list[str] = []
+
+
+def record(value: str) -> None:
+    calls.append(value)
+
+
+def fail_twice(value: str) -> None:
+    calls.append(value)
+    if len(calls) <= 2:
+        raise OSError("Mail server unavailable")
+
+
+@override_settings(JOBS={"BACKEND": "database"})
+class JobQueueTests(TestCase):
+    """Test the database, locmem and console backends."""
+
+    @override
+    def setUp(self):
+        calls.clear()
+        queue.outbox.clear()
+
+    def test_run_database_jobs(self):
+        """Test due jobs run in order and are marked done."""
+        first = enqueue(record, value="first")
+        later = enqueue(record, delay=60, value="later")
+        _ = enqueue(record, value="second")
+
+        self.assertEqual(run_next_job(), first)
+        self.assertIsNotNone(run_next_job())
+        self.assertIsNone(run_next_job())
+
+        self.assertEqual(calls, ["first", "second"])
+        first.refresh_from_db()
+        self.assertEqual(first.status, Job.DONE)
+        self.assertEqual(first.attempts, 1)
+        self.assertIsNotNone(first.finished_at)
+        later.refresh_from_db()
+        self.assertEqual(later.status, Job.PENDING)
+
+    @override_settings(
+        JOBS={
+            "BACKEND": "database",
+            "MAX_ATTEMPTS": 3,
+            "BACKOFF": 10,
+            "MAX_BACKOFF": 15,
+        }
+    )
+    def test_retry_with_backoff(self):
+        """Test failed jobs are retried later until they run out of attempts."""
+        job = enqueue(fail_twice, value="reset")
+
+        before = timezone.now()
+        _ = run_next_job()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertIn("Mail server unavailable", job.last_error)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=10))
+        self.assertIsNone(run_next_job())
+
+        for _ in range(2):
+            _ = Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+            _ = run_next_job()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(backoff(1), timedelta(seconds=10))
+        self.assertEqual(backoff(3), timedelta(seconds=15))
+
+    @override_settings(JOBS={"BACKEND": "database", "MAX_ATTEMPTS": 2, "BACKOFF": 0})
+    def test_fail_after_max_attempts(self):
+        """Test a job failing every attempt ends up failed."""
+        calls.extend(["", "", ""])
+        job = enqueue(fail_twice, value="never")
+        calls.clear()
+
+        _ = run_next_job()
+        _ = run_next_job()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNone(run_next_job())
+
+    def test_requeue_stale_jobs(self):
+        """Test jobs left running by a dead worker run again."""
+        job = Job.objects.create(
+            name=job_name(record),
+            payload={"value": "stale"},
+            status=Job.RUNNING,
+            started_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(requeue_stale_jobs(), 1)
+        self.assertEqual(run_next_job(), job)
+        self.assertEqual(calls, ["stale"])
+
+    def test_fail_stale_jobs_after_max_attempts(self):
+        """Test stale jobs on their last attempt fail instead of running again."""
+        started_at = timezone.now() - timedelta(hours=1)
+        last_attempt = Job.objects.create(
+            name=job_name(record),
+            status=Job.RUNNING,
+            attempts=1,
+            max_attempts=2,
+            started_at=started_at,
+        )
+        retried = Job.objects.create(
+            name=job_name(record), status=Job.RUNNING, started_at=started_at
+        )
+
+        self.assertEqual(requeue_stale_jobs(), 1)
+
+        last_attempt.refresh_from_db()
+        self.assertEqual(last_attempt.status, Job.FAILED)
+        self.assertEqual(last_attempt.attempts, 2)
+        self.assertIsNotNone(last_attempt.finished_at)
+        self.assertIn("stopped", last_attempt.last_error)
+        retried.refresh_from_db()
+        self.assertEqual(retried.status, Job.PENDING)
+        self.assertEqual(retried.attempts, 1)
+
+    @override_settings(JOBS={"BACKEND": "locmem"})
+    def test_locmem_backend(self):
+        """Test locmem jobs wait in the outbox until they are run."""
+        _ = enqueue(fail_twice, value="reset")
+
+        self.assertEqual(len(queue.outbox), 1)
+        self.assertEqual(queue_metrics()["pending"], 1)
+        self.assertEqual(run_locmem_jobs(), 3)
+        self.assertEqual(calls, ["reset"] * 3)
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS={})
+    def test_console_backend_by_default(self):
+        """Test jobs run after the commit unless a worker backend is chosen."""
+        with self.captureOnCommitCallbacks(execute=True):
+            _ = enqueue(record, value="console")
+            self.assertEqual(calls, [])
+
+        self.assertEqual(calls, ["console"])
+        self.assertFalse(Job.objects.exists())
+
+    def test_run_jobs_command(self):
+        """Test the worker runs due jobs and exits with --once."""
+        _ = enqueue(record, value="command")
+        out = StringIO()
+
+        _ = call_command("run_jobs", "--once", stdout=out)
+
+        self.assertEqual(calls, ["command"])
+        self.assertIn("done", out.getvalue())
+
+
+@override_settings(JOBS={"BACKEND": "database"})
+class JobMetricsAPITests(TestCase):
+    """Test the queue metrics API."""
+
+    client = APIClient()
+
+    @override
+    def setUp(self):
+        calls.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(create_test_superuser())
+
+    def test_metrics(self):
+        """Test queue depth and latency are reported."""
+        _ = enqueue(record, value="done")
+        _ = run_next_job()
+        _ = enqueue(record, value="due")
+        _ = enqueue(record, delay=60, value="later")
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        data = res.json()
+        self.assertEqual(data["pending"], 2)
+        self.assertEqual(data["due"], 1)
+        self.assertEqual(data["failed"], 0)
+        self.assertGreaterEqual(data["oldest_due_age"], 0)
+        self.assertEqual(data["latency"]["count"], 1)
+        self.assertEqual(data["duration"]["count"], 1)
+
+    def test_metrics_staff_only(self):
+        """Test only staff may read the metrics."""
+        self.client = APIClient()
+        self.client.force_authenticate(create_test_user())
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
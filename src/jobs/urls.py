@@ -0,0 +1,13 @@
+"""
+URL mappings for the jobs app.
+"""
+
+from django.urls import path
+
+from jobs import views
+
+app_name = "jobs"
+
+urlpatterns = [
+    path("metrics/", views.JobMetricsView.as_view(), name="metrics"),
+]
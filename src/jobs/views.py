@@ -0,0 +1,26 @@
+"""
+Views for the jobs APIs.
+"""
+
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from jobs.queue import queue_metrics
+from user.authentication import CachedTokenAuthentication
+
+
+class JobMetricsView(APIView):
+    """View for monitoring the job queue."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """
+        Return the number of pending, due, running and failed jobs, the age
+        of the oldest due job, and the latency (due until started) and run
+        time of the jobs started in the last hour, in seconds.
+        """
+        return Response(queue_metrics())
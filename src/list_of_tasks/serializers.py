@@ -2,18 +2,26 @@
 Serializers for ListOfTasks APIs
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, override
 
+from django.db.models import QuerySet
 from rest_framework.serializers import IntegerField, ModelSerializer
 
-from common.serializers_base import ListOfTasksModelSerializer
-from core.models import ListOfTasks
+from common.serializers_base import (
+    FieldSelection,
+    ListOfTasksModelSerializer,
+    QueryPlanMixin,
+)
+from core.models import ListOfTasks, Task
 from task.serializers import TaskSerializer
 
 
-class ListSerializer(ListOfTasksModelSerializer):
+class ListSerializer(QueryPlanMixin, ListOfTasksModelSerializer):
     """Serializer for lists."""
 
+    prefetch_related_fields = {"tasks": "tasks"}
+    expandable_fields = ("tasks",)
+
     tasks = TaskSerializer(many=True, read_only=True)
     order = IntegerField(required=False, allow_null=True)
 
@@ -23,5 +31,16 @@ class ListSerializer(ListOfTasksModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
         write_only_fields = ["board"]
 
+    @override
+    @classmethod
+    def get_prefetch_queryset(
+        cls, field_name: str, selection: FieldSelection
+    ) -> QuerySet[Any] | None:
+        if field_name == "tasks":
+            return TaskSerializer.plan_queryset(
+                Task.objects.order_by("-order"), selection
+            )
+        return None
+
     if TYPE_CHECKING:
         Meta: type[ModelSerializer.Meta]
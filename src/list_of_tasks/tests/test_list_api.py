@@ -4,6 +4,9 @@ Tests for list APIs.
 
 from typing import override
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from core.models import Board, ListOfTasks
 from core.tests.api_test_case import (
     PrivateAPITestCase,
@@ -12,6 +15,7 @@ from core.tests.api_test_case import (
 from core.tests.utils import (
     create_test_board,
     create_test_list_of_tasks,
+    create_test_populated_task,
 )
 from list_of_tasks.serializers import ListSerializer
 
@@ -136,3 +140,18 @@ class PrivateListAPITests(PrivateAPITestCase):
     def test_retrieve_other_user_list_error(self):
         """Test trying to retrieve another users list gives error."""
         self.assert_retrieve_other_user_model_error(self.other_user_list_of_tasks.pk)
+
+    def test_retrieve_lists_query_count_is_constant(self):
+        """Test listing lists does not issue queries per task."""
+        url = self.api_url("list", [])
+        _ = create_test_populated_task(self.user, self.user_list_of_tasks, 0)
+        with CaptureQueriesContext(connection) as few_tasks:
+            _ = self.client.get(url)
+
+        for index in range(1, 6):
+            _ = create_test_populated_task(self.user, self.user_list_of_tasks, index)
+
+        with CaptureQueriesContext(connection) as many_tasks:
+            _ = self.client.get(url)
+
+        self.assertEqual(len(many_tasks), len(few_tasks))
@@ -4,36 +4,52 @@ Views for the list APIs.
 
 from typing import override
 
-from django.db.models import Prefetch
 from django.db.models.query import QuerySet
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 
-from common.serializers_base import ListOfTasksBasedSerializer
+from common.conditional import ConditionalGetMixin
+from common.flat_rows import LIST_ROWS, FlatRowsMixin
+from common.renderers import FastJSONRenderer
+from common.replicas import ReplicaReadMixin
+from common.serializers_base import FieldSelection, ListOfTasksBasedSerializer
 from common.views_base import ListOfTasksModelViewSet
-from core.models import ListOfTasks, Task
+from core.models import Category, Contact, ListOfTasks, Subtask, Task
 from list_of_tasks.serializers import ListSerializer
+from user.authentication import CachedTokenAuthentication
 
 
-class ListViewSet(ListOfTasksModelViewSet):
+class ListViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin[ListOfTasks],
+    FlatRowsMixin[ListOfTasks],
+    ListOfTasksModelViewSet,
+):
     """View for manage list APIs."""
 
     serializer_class = ListSerializer
     queryset = ListOfTasks.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated]
+    flat_rows = LIST_ROWS
+    cursor_ordering = ("-id",)
+    conditional_dependencies = (
+        (ListOfTasks, "owner"),
+        (Task, "owner"),
+        (Subtask, "owner"),
+        (Category, "user"),
+        (Contact, "user"),
+    )
 
     @override
     def get_queryset(self) -> QuerySet[ListOfTasks]:
         """Retrieve list for authenticated user."""
         # Prefetch related tasks to optimize query performance
         assert self.queryset is not None
-        return (
-            self.queryset.filter(board__user=self.request.user)
-            .prefetch_related(
-                Prefetch("tasks", queryset=Task.objects.order_by("-order"))
-            )
-            .order_by("-id")
+        return ListSerializer.plan_queryset(
+            self.queryset.filter(owner=self.request.user).order_by("-id"),
+            FieldSelection.from_request(self.request),
         )
 
     @override
@@ -0,0 +1,52 @@
+"""
+Tests for the database monitoring API.
+"""
+
+from typing import override
+
+from django.db import connections
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from common.db import connect_stats
+from core.tests.utils import create_test_superuser, create_test_user
+
+DATABASE_URL = reverse("monitoring:database")
+
+
+class DatabaseMetricsAPITests(TestCase):
+    """Test the database metrics API."""
+
+    client = APIClient()
+
+    @override
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(create_test_superuser())
+
+    def test_connects_are_timed(self):
+        """Test new connections are counted with the time they took."""
+        before = connect_stats["default"].count if "default" in connect_stats else 0
+        wrapper = connections.create_connection("default")
+        raw = wrapper.get_new_connection(wrapper.get_connection_params())
+        raw.close()
+
+        res = self.client.get(DATABASE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        default = res.json()["default"]
+        self.assertEqual(default["connects"]["count"], before + 1)
+        self.assertGreaterEqual(default["connects"]["max_ms"], 0)
+        self.assertIn("conn_max_age", default)
+        self.assertIsNone(default["pool"])
+
+    def test_staff_only(self):
+        """Test only staff may read the metrics."""
+        self.client = APIClient()
+        self.client.force_authenticate(create_test_user())
+
+        res = self.client.get(DATABASE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,152 @@
+"""
+Tests for the request timing middleware and metrics API.
+"""
+
+from typing import override
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from common.timing import Histogram, view_timings
+from core.models import User
+from core.tests.utils import (
+    create_test_category,
+    create_test_superuser,
+    create_test_user,
+)
+
+CATEGORIES_URL = reverse("category:category-list")
+SUMMARY_URL = reverse("summary:summary")
+METRICS_URL = reverse("monitoring:metrics")
+
+
+@override_settings(
+    REQUEST_TIMING={"ENABLED": True, "BUDGET_MS": 0},
+    RESPONSE_CACHE={"ENABLED": False},
+)
+class RequestTimingTests(TestCase):
+    """Test requests are measured per view."""
+
+    user = User()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        _ = create_test_category(self.user)
+        view_timings.clear()
+
+    def test_server_timing_header(self):
+        """Test responses carry their query count and timings."""
+        res = self.client.get(CATEGORIES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        entries = [entry.split(";")[0] for entry in res["Server-Timing"].split(", ")]
+        self.assertEqual(entries, ["db", "render", "app", "total"])
+        self.assertRegex(res["Server-Timing"], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_requests_are_aggregated_per_view(self):
+        """Test the histograms count the requests of each view and method."""
+        _ = self.client.get(CATEGORIES_URL)
+        _ = self.client.get(CATEGORIES_URL)
+        _ = self.client.get(SUMMARY_URL)
+
+        timings = view_timings[("CategoryViewSet", "GET")]
+        self.assertEqual(timings.duration.count, 2)
+        self.assertGreater(timings.queries.sum, 0)
+        self.assertEqual(view_timings[("SummaryView", "GET")].duration.count, 1)
+
+    @override_settings(
+        REQUEST_TIMING={
+            "ENABLED": True,
+            "BUDGETS": {"CategoryViewSet": 1e-6},
+            "SLOW_QUERY_MS": 0,
+        }
+    )
+    def test_over_budget_logs_slowest_queries(self):
+        """Test requests over their budget log their slowest queries' origin."""
+        with self.assertLogs("common.timing", "WARNING") as logs:
+            _ = self.client.get(CATEGORIES_URL)
+
+        self.assertIn("(CategoryViewSet)", logs.output[0])
+        self.assertIn("core_category", logs.output[0])
+        self.assertRegex(logs.output[0], r"ms at \w+/[\w/]+\.py:\d+ in \w+")
+        self.assertEqual(view_timings[("CategoryViewSet", "GET")].over_budget, 1)
+
+    @override_settings(
+        REQUEST_TIMING={
+            "ENABLED": True,
+            "BUDGETS": {"CategoryViewSet": 1e-6},
+            "SLOW_QUERY_MS": 1e6,
+        }
+    )
+    def test_fast_queries_are_not_traced(self):
+        """Test only queries over the slow query threshold are traced."""
+        with self.assertLogs("common.timing", "WARNING") as logs:
+            _ = self.client.get(CATEGORIES_URL)
+
+        self.assertIn("Slowest queries: none", logs.output[0])
+
+    @override_settings(REQUEST_TIMING={"ENABLED": False})
+    def test_disabled(self):
+        """Test nothing is measured unless enabled."""
+        res = self.client.get(CATEGORIES_URL)
+
+        self.assertNotIn("Server-Timing", res)
+        self.assertEqual(view_timings, {})
+
+
+class HistogramTests(TestCase):
+    """Test the histogram buckets."""
+
+    def test_cumulative_buckets(self):
+        """Test values are counted in every bucket whose bound they reach."""
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        self.assertEqual(
+            list(histogram.cumulative()), [("1", 2), ("5", 3), ("+Inf", 4)]
+        )
+        self.assertEqual(histogram.sum, 14.5)
+
+
+@override_settings(REQUEST_TIMING={"ENABLED": True, "BUDGET_MS": 0})
+class RequestMetricsAPITests(TestCase):
+    """Test the request metrics API."""
+
+    @override
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(create_test_superuser())
+        view_timings.clear()
+
+    def test_prometheus_text(self):
+        """Test the histograms are served in the Prometheus text format."""
+        _ = self.client.get(METRICS_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        text = res.content.decode()
+        self.assertIn("# TYPE scrum_api_request_duration_seconds histogram", text)
+        labels = 'view="RequestMetricsView",method="GET"'
+        self.assertIn(
+            f'scrum_api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1',
+            text,
+        )
+        self.assertIn(f"scrum_api_request_queries_count{{{labels}}} 1", text)
+        self.assertIn(f"scrum_api_request_over_budget_total{{{labels}}} 0", text)
+
+    def test_staff_only(self):
+        """Test only staff may read the metrics."""
+        self.client = APIClient()
+        self.client.force_authenticate(create_test_user())
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,19 @@
+"""
+URL mappings for the monitoring app.
+"""
+
+from django.urls import path
+
+from monitoring import views
+
+app_name = "monitoring"
+
+urlpatterns = [
+    path("database/", views.DatabaseMetricsView.as_view(), name="database"),
+    path(
+        "response-cache/",
+        views.ResponseCacheMetricsView.as_view(),
+        name="response-cache",
+    ),
+    path("metrics/", views.RequestMetricsView.as_view(), name="metrics"),
+]
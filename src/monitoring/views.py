@@ -0,0 +1,63 @@
+"""
+Views for the monitoring APIs.
+"""
+
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.db import database_metrics
+from common.renderers import PrometheusTextRenderer
+from common.timing import prometheus_metrics
+from response_cache.cache import response_cache_metrics
+from user.authentication import CachedTokenAuthentication
+
+
+class DatabaseMetricsView(APIView):
+    """View for monitoring the database connections of a worker."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """
+        Return, per database alias, the connection settings, how many
+        connections this worker process got and how long that took (the pool
+        wait when pooling), and the psycopg pool's statistics if enabled.
+        """
+        return Response(database_metrics())
+
+
+class ResponseCacheMetricsView(APIView):
+    """View for monitoring the response cache of a worker."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """
+        Return the response cache settings and, per view, the hits and misses
+        of this worker process.
+        """
+        return Response(response_cache_metrics())
+
+
+class RequestMetricsView(APIView):
+    """View for scraping the request timings of a worker."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusTextRenderer]
+
+    def get(self, request: Request) -> Response:
+        """
+        Return, per view and method, histograms of the duration, database
+        time, render time and query count of the requests this worker process
+        answered, in the Prometheus text format. Scrape every worker with a
+        staff user's token as ``Authorization: Token <key>``.
+        """
+        return Response(
+            prometheus_metrics(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
@@ -0,0 +1,12 @@
+from typing import override
+
+from django.apps import AppConfig
+
+
+class ResponseCacheConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "response_cache"
+
+    @override
+    def ready(self):
+        import response_cache.signals  # pyright: ignore[reportUnusedImport]
@@ -0,0 +1,258 @@
+"""
+Versioned per-user cache of rendered read responses.
+
+Responses are stored as bytes in the ``CACHE_ALIAS`` cache under keys that
+embed a version of the requesting user. Every write to the user's boards,
+lists, tasks, subtasks, contacts or categories bumps the version, see
+``response_cache.signals``, so later requests miss and the stale entries
+expire after ``TTL`` seconds.
+
+A version is bumped when the write happens and again once its transaction
+commits: a request reading in between may store the data from before the
+commit under the first bump's version, which the second bump retires. A
+missing version, of a new user or evicted, starts at a random number, so it
+never revives older entries. Responses read from a lagging replica (see
+``common.replicas``) are served but never stored, as no later write would
+retire them.
+
+Bumps only reach the workers sharing ``CACHE_ALIAS``, so the cache is off
+unless enabled, and with several workers it needs a shared cache (e.g.
+redis). Configured through ``settings.RESPONSE_CACHE``::
+
+    RESPONSE_CACHE = {"ENABLED": True, "CACHE_ALIAS": "shared", "TTL": 300}
+"""
+
+import hashlib
+import random
+import threading
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar, cast, override
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+from django.db.models import Model
+from django.http import HttpResponse, HttpResponseBase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.conditional import finish_conditional, not_modified
+from common.replicas import reads_from_replica
+from common.views_base import ModelViewSetMixinBase
+from core.models import User
+
+_MT = TypeVar("_MT", bound=Model)
+
+DEFAULTS: dict[str, Any] = {
+    # Off by default: a per-process cache serves other workers' stale entries.
+    "ENABLED": False,
+    "CACHE_ALIAS": "default",
+    # Seconds entries are kept; stale ones are never read again.
+    "TTL": 300,
+}
+
+
+def response_cache_settings() -> dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "RESPONSE_CACHE", {})}
+
+
+def get_cache() -> BaseCache:
+    return caches[response_cache_settings()["CACHE_ALIAS"]]
+
+
+@dataclass
+class CacheStats:
+    """Lookups of one view in this process."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+_lock = threading.Lock()
+cache_stats: dict[str, CacheStats] = {}
+
+
+def record_lookup(view_name: str, hit: bool) -> None:
+    with _lock:
+        stats = cache_stats.setdefault(view_name, CacheStats())
+        if hit:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+
+
+def response_cache_metrics() -> dict[str, Any]:
+    """Return the settings and the lookups of this process per view."""
+    options = response_cache_settings()
+    with _lock:
+        views = {name: stats.as_dict() for name, stats in cache_stats.items()}
+    return {
+        "enabled": options["ENABLED"],
+        "cache_alias": options["CACHE_ALIAS"],
+        "ttl": options["TTL"],
+        "views": views,
+    }
+
+
+def version_key(user_id: int) -> str:
+    return f"response:version:{user_id}"
+
+
+def current_version(cache: BaseCache, user_id: int) -> int:
+    """Return the version of ``user_id``, starting a new one if missing."""
+    key = version_key(user_id)
+    version: int | None = cache.get(key)
+    if version is None:
+        started = random.randrange(1, 2**62)
+        # Another request may have started one first.
+        _ = cache.add(key, started, timeout=None)
+        version = cache.get(key, started)
+    return cast(int, version)
+
+
+async def acurrent_version(cache: BaseCache, user_id: int) -> int:
+    """Async ``current_version``."""
+    key = version_key(user_id)
+    version: int | None = await cache.aget(key)
+    if version is None:
+        started = random.randrange(1, 2**62)
+        _ = await cache.aadd(key, started, timeout=None)
+        version = await cache.aget(key, started)
+    return cast(int, version)
+
+
+def _bump(user_id: int) -> None:
+    try:
+        _ = get_cache().incr(version_key(user_id))
+    except ValueError:
+        # No version: the next request starts a new one.
+        pass
+
+
+def bump_version(user_id: int) -> None:
+    """Retire the cached responses of ``user_id`` now and after the commit."""
+    _bump(user_id)
+    transaction.on_commit(lambda: _bump(user_id))
+
+
+def response_key(user: User, version: int, request: Request) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(request.get_full_path().encode())
+    hasher.update(f"|{getattr(request, 'accepted_media_type', '') or ''}".encode())
+    # Ids are reused after a rollback, e.g. between tests, but users with
+    # the same id are told apart by their creation time.
+    created = user.created_at.timestamp() if user.created_at else ""
+    return f"response:{user.pk}:{created}:{version}:{hasher.hexdigest()[:32]}"
+
+
+CacheEntry = tuple[bytes, str, str | None]
+
+
+def entry_response(request: Request, entry: CacheEntry) -> HttpResponseBase:
+    """Answer ``request`` from a cached entry, honouring ``If-None-Match``."""
+    content, content_type, etag = entry
+    if etag is None:
+        return HttpResponse(content, content_type=content_type)
+    response = not_modified(request, etag) or HttpResponse(
+        content, content_type=content_type
+    )
+    return finish_conditional(response, etag)
+
+
+def cache_entry(response: HttpResponse) -> CacheEntry:
+    return response.content, response["Content-Type"], response.get("ETag")
+
+
+def cached_response(
+    view: APIView, request: Request, build_response: Callable[[], HttpResponseBase]
+) -> HttpResponseBase:
+    """
+    Answer a GET from the cache, or with ``build_response`` and cache the
+    rendered bytes. Only JSON responses are cached; ``If-None-Match`` is
+    answered from the ETag stored with the entry.
+    """
+    options = response_cache_settings()
+    if not options["ENABLED"] or not isinstance(
+        getattr(request, "accepted_renderer", None), JSONRenderer
+    ):
+        return build_response()
+
+    cache = get_cache()
+    user: User = request.user  # pyright: ignore[reportAssignmentType]
+    key = response_key(user, current_version(cache, user.pk), request)
+    entry: CacheEntry | None = cache.get(key)
+    record_lookup(type(view).__name__, entry is not None)
+    if entry is not None:
+        return entry_response(request, entry)
+
+    # Checked before finalizing the response, which ends the replica reads.
+    from_replica = reads_from_replica()
+    response = build_response()
+    if (
+        isinstance(response, Response)
+        and response.status_code == 200
+        and not from_replica
+    ):
+        response = view.finalize_response(request, response)
+        _ = response.render()
+        cache.set(key, cache_entry(response), options["TTL"])
+    return response
+
+
+async def acached_response(
+    view_name: str,
+    request: Request,
+    build_response: Callable[[], Awaitable[HttpResponseBase | None]],
+) -> HttpResponseBase | None:
+    """
+    ``cached_response`` for the async views of ``common.async_views``, with
+    the async cache API. ``build_response`` returns the rendered JSON
+    response, or None for the async view to delegate the request.
+    """
+    options = response_cache_settings()
+    if not options["ENABLED"]:
+        return await build_response()
+
+    cache = get_cache()
+    user = cast(User, request.user)
+    key = response_key(user, await acurrent_version(cache, user.pk), request)
+    entry: CacheEntry | None = await cache.aget(key)
+    record_lookup(view_name, entry is not None)
+    if entry is not None:
+        return entry_response(request, entry)
+
+    from_replica = reads_from_replica()
+    response = await build_response()
+    if (
+        isinstance(response, HttpResponse)
+        and response.status_code == 200
+        and not from_replica
+    ):
+        await cache.aset(key, cache_entry(response), options["TTL"])
+    return response
+
+
+class ResponseCacheMixin(ModelViewSetMixinBase[_MT]):
+    """Viewset mixin answering ``list`` from the per-user response cache."""
+
+    @override
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return cast(
+            Response,
+            cached_response(
+                self,
+                request,
+                lambda: super(ResponseCacheMixin, self).list(request, *args, **kwargs),
+            ),
+        )
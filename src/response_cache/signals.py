@@ -0,0 +1,99 @@
+"""
+Bump the response cache version of the users whose rows are written.
+"""
+
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import (
+    Board,
+    Category,
+    Contact,
+    ListOfTasks,
+    Subtask,
+    Task,
+    User,
+    owner_changed,
+)
+from core.ordering import keys_relabelled
+from core.signals import in_bulk_task_changes, tasks_bulk_changed
+from response_cache.cache import bump_version
+
+# model: field of the owning user
+USER_FIELDS: dict[type[Model], str] = {
+    Board: "user",
+    Category: "user",
+    Contact: "user",
+    ListOfTasks: "owner",
+    Task: "owner",
+    Subtask: "owner",
+}
+
+
+def bump_owners(instance: Any) -> None:
+    """Bump the user of ``instance`` and, if it was given away, the former."""
+    attname = f"{USER_FIELDS[type(instance)]}_id"
+    user_ids: set[int | None] = {
+        getattr(instance, attname),
+        # Still the former user while the post_save receivers run.
+        getattr(instance, f"_original_{attname}", None),
+    }
+    for user_id in user_ids:
+        if user_id is not None:
+            bump_version(user_id)
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Contact)
+@receiver(post_save, sender=ListOfTasks)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Board)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Contact)
+@receiver(post_delete, sender=ListOfTasks)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+def bump_on_write(sender: type[Model], instance: Model, **kwargs: Any):
+    """Saves and deletes, including those of the admin."""
+    if sender in (Task, Subtask) and in_bulk_task_changes():
+        return
+    bump_owners(instance)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def bump_on_assignees_change(sender: type[Model], instance: Model, **kwargs: Any):
+    """Assignees changed from either side of the relation."""
+    if kwargs["action"].startswith("post_"):
+        bump_owners(instance)
+
+
+@receiver(keys_relabelled)
+def bump_on_relabel(sender: type[Model], pks: list[int], **kwargs: Any):
+    """Order keys relabelled without saving the rows, e.g. by a rebalance."""
+    user_ids = (
+        sender._default_manager.filter(pk__in=pks)
+        .order_by()
+        .values_list(USER_FIELDS[sender], flat=True)
+        .distinct()
+    )
+    for user_id in user_ids:
+        bump_version(user_id)
+
+
+@receiver(owner_changed)
+def bump_on_owner_change(
+    sender: type[Model], old_user_id: int, new_user_id: int, **kwargs: Any
+):
+    """Rows given to another user with queryset updates."""
+    bump_version(old_user_id)
+    bump_version(new_user_id)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def bump_on_bulk_task_change(sender: type[Task], user: User, **kwargs: Any):
+    bump_version(user.pk)
@@ -0,0 +1,187 @@
+"""
+Tests for the response cache.
+"""
+
+from typing import override
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Category, ListOfTasks, Task, User
+from core.ordering import rebalance
+from core.tests.utils import (
+    create_test_category,
+    create_test_contact,
+    create_test_list_of_tasks,
+    create_test_superuser,
+    create_test_task,
+    create_test_user,
+)
+from response_cache.cache import cache_stats, get_cache, version_key
+
+BOARDS_URL = reverse("board:board-list")
+CATEGORIES_URL = reverse("category:category-list")
+CONTACTS_URL = reverse("contact:contact-list")
+SUMMARY_URL = reverse("summary:summary")
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": True})
+class ResponseCacheTests(TestCase):
+    """Test cached responses and their invalidation."""
+
+    user = User()
+    category = Category()
+    list_of_tasks = ListOfTasks()
+    task = Task()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.category = create_test_category(self.user)
+        self.list_of_tasks = create_test_list_of_tasks(self.user)
+        self.task = create_test_task(
+            self.user, category=self.category, list_of_tasks=self.list_of_tasks
+        )
+        cache_stats.clear()
+
+    def test_hit_serves_same_bytes_without_queries(self):
+        """Test a repeated request is answered from the cache."""
+        first = self.client.get(CATEGORIES_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(CATEGORIES_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(
+            cache_stats["CategoryViewSet"].as_dict(),
+            {"hits": 1, "misses": 1, "hit_ratio": 0.5},
+        )
+
+    def test_hit_answers_if_none_match(self):
+        """Test a matching ETag is answered with 304 from the cache."""
+        etag = self.client.get(SUMMARY_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(SUMMARY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_api_writes_retire_entries(self):
+        """Test the lists follow creations, updates and deletions."""
+        self.assertEqual(len(self.client.get(CONTACTS_URL).json()["results"]), 0)
+        contact = create_test_contact(self.user)
+        self.assertEqual(len(self.client.get(CONTACTS_URL).json()["results"]), 1)
+
+        res = self.client.patch(
+            reverse("contact:contact-detail", args=[contact.pk]),
+            {"name": "Renamed"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.get(CONTACTS_URL).json()["results"][0]["name"], "Renamed"
+        )
+
+        _ = self.client.delete(reverse("contact:contact-detail", args=[contact.pk]))
+        self.assertEqual(self.client.get(CONTACTS_URL).json()["results"], [])
+
+    def test_other_users_are_unaffected(self):
+        """Test writes only retire the entries of the owning user."""
+        _ = self.client.get(CATEGORIES_URL)
+        other = create_test_user(email="other@example.com")
+        _ = create_test_category(other, name="Other")
+
+        _ = self.client.get(CATEGORIES_URL)
+
+        self.assertEqual(cache_stats["CategoryViewSet"].hits, 1)
+
+    def test_admin_edits_retire_entries(self):
+        """Test edits through the admin retire the user's entries."""
+        _ = self.client.get(CATEGORIES_URL)
+        admin = APIClient()
+        admin.force_login(create_test_superuser())
+
+        res = admin.post(
+            reverse("admin:core_category_change", args=[self.category.pk]),
+            {"name": "Edited", "color": "#00FF00", "user": self.user.pk},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(
+            self.client.get(CATEGORIES_URL).json()["results"][0]["name"], "Edited"
+        )
+
+    def test_reorders_retire_entries(self):
+        """Test moves and rebalances, which update siblings in bulk, retire."""
+        other = create_test_task(
+            self.user, category=self.category, list_of_tasks=self.list_of_tasks, order=1
+        )
+        board_order = lambda: [  # noqa: E731
+            task["id"]
+            for task in self.client.get(BOARDS_URL).json()["results"][0][
+                "lists_of_tasks"
+            ][0]["tasks"]
+        ]
+        before = board_order()
+
+        res = self.client.post(
+            reverse("task:task-move", args=[other.pk]),
+            {"list_of_tasks": self.list_of_tasks.pk, "position": 1},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(board_order(), before[::-1])
+
+        version = get_cache().get(version_key(self.user.pk))
+        _ = rebalance(Task.objects.filter(list_of_tasks=self.list_of_tasks))
+        self.assertNotEqual(get_cache().get(version_key(self.user.pk)), version)
+
+    def test_bulk_task_changes_retire_entries(self):
+        """Test bulk task writes, which skip the model signals, retire."""
+        self.assertEqual(
+            self.client.get(SUMMARY_URL).json()["tasks_by_priority"][0]["count"], 1
+        )
+
+        res = self.client.delete(
+            reverse("task:task-bulk"), {"ids": [self.task.pk]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(SUMMARY_URL).json()["tasks_by_priority"], [])
+
+    def test_browsable_api_is_not_cached(self):
+        """Test only JSON responses are cached."""
+        _ = self.client.get(CATEGORIES_URL, HTTP_ACCEPT="text/html")
+
+        self.assertNotIn("CategoryViewSet", cache_stats)
+
+
+class ResponseCacheMetricsAPITests(TestCase):
+    """Test the response cache metrics endpoint."""
+
+    def test_metrics(self):
+        """Test staff see the lookups per view, and the cache is off by default."""
+        client = APIClient()
+        client.force_authenticate(create_test_superuser())
+
+        res = client.get(reverse("monitoring:response-cache"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(res.json()["enabled"])
+        self.assertIn("views", res.json())
+
+    def test_staff_only(self):
+        """Test regular users cannot read the metrics."""
+        client = APIClient()
+        client.force_authenticate(create_test_user())
+
+        res = client.get(reverse("monitoring:response-cache"))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
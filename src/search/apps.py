@@ -0,0 +1,12 @@
+from typing import override
+
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "search"
+
+    @override
+    def ready(self):
+        import search.signals  # pyright: ignore[reportUnusedImport]
@@ -0,0 +1,170 @@
+"""
+Ranked full-text search over the search documents.
+
+PostgreSQL matches a generated, GIN indexed ``tsvector`` column and ranks with
+``ts_rank``; SQLite matches an FTS5 table and ranks with ``bm25``. Both weigh
+the title above the body and match every term as a prefix, so results grow
+while the user types. Other databases fall back to ``icontains`` without a
+ranking. The index itself is created by migration
+``core.0108_searchdocument_fulltext_index``.
+"""
+
+import re
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from core.models import SearchDocument
+
+MAX_TERMS = 8
+
+TERM_REGEX = re.compile(r"\w+")
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    object_id: int
+    title: str
+    rank: float
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a query into word terms, which are safe to quote in any syntax."""
+    return TERM_REGEX.findall(query.lower())[:MAX_TERMS]
+
+
+def kinds_clause(kinds: list[str] | None, column: str) -> tuple[str, list[str]]:
+    if not kinds:
+        return "", []
+    placeholders = ", ".join(["%s"] * len(kinds))
+    return f" AND {column} IN ({placeholders})", kinds
+
+
+def postgresql_query(terms: list[str]) -> str:
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def sqlite_query(terms: list[str]) -> str:
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_postgresql(
+    user_id: int, terms: list[str], kinds: list[str] | None, limit: int
+) -> list[SearchHit]:
+    kinds_sql, kinds_params = kinds_clause(kinds, "kind")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT kind, object_id, title, ts_rank(search_vector, query) AS rank
+            FROM core_searchdocument, to_tsquery('simple', %s) AS query
+            WHERE user_id = %s AND search_vector @@ query{kinds_sql}
+            ORDER BY rank DESC, id
+            LIMIT %s
+            """,
+            [postgresql_query(terms), user_id, *kinds_params, limit],
+        )
+        return [SearchHit(*row) for row in cursor.fetchall()]
+
+
+def search_sqlite(
+    user_id: int, terms: list[str], kinds: list[str] | None, limit: int
+) -> list[SearchHit]:
+    kinds_sql, kinds_params = kinds_clause(kinds, "document.kind")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT document.kind, document.object_id, document.title,
+                -bm25(core_searchdocument_fts, 10.0, 1.0) AS rank
+            FROM core_searchdocument_fts
+            JOIN core_searchdocument AS document
+                ON document.id = core_searchdocument_fts.rowid
+            WHERE core_searchdocument_fts MATCH %s
+                AND document.user_id = %s{kinds_sql}
+            ORDER BY rank DESC, document.id
+            LIMIT %s
+            """,
+            [sqlite_query(terms), user_id, *kinds_params, limit],
+        )
+        return [SearchHit(*row) for row in cursor.fetchall()]
+
+
+def fallback_documents(
+    user_id: int, terms: list[str], kinds: list[str] | None
+) -> QuerySet[SearchDocument]:
+    documents = SearchDocument.objects.filter(user_id=user_id)
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    for term in terms:
+        documents = documents.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return documents
+
+
+def search_fallback(
+    user_id: int, terms: list[str], kinds: list[str] | None, limit: int
+) -> list[SearchHit]:
+    documents = fallback_documents(user_id, terms, kinds)
+    return [
+        SearchHit(kind, object_id, title, 0.0)
+        for kind, object_id, title in documents.order_by("id").values_list(
+            "kind", "object_id", "title"
+        )[:limit]
+    ]
+
+
+BACKENDS = {
+    "postgresql": search_postgresql,
+    "sqlite": search_sqlite,
+}
+
+
+def search(
+    user_id: int, query: str, kinds: Iterable[str] | None = None, limit: int = 20
+) -> list[SearchHit]:
+    """Return the best ``limit`` documents of a user matching ``query``."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    backend = BACKENDS.get(connection.vendor, search_fallback)
+    return backend(user_id, terms, list(kinds) if kinds else None, limit)
+
+
+def matching(user_id: int, query: str, kind: str) -> Q:
+    """
+    Return a filter keeping the rows of ``kind`` whose documents of a user
+    match ``query``, all of them, unranked.
+
+    The match runs as a subquery of the filtered queryset, so no result is
+    dropped and the queryset's ordering and pagination apply.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return Q(pk__in=[])
+    if connection.vendor == "postgresql":
+        return Q(
+            pk__in=RawSQL(
+                """
+                SELECT object_id FROM core_searchdocument
+                WHERE user_id = %s AND kind = %s
+                    AND search_vector @@ to_tsquery('simple', %s)
+                """,
+                [user_id, kind, postgresql_query(terms)],
+            )
+        )
+    if connection.vendor == "sqlite":
+        return Q(
+            pk__in=RawSQL(
+                """
+                SELECT document.object_id
+                FROM core_searchdocument_fts
+                JOIN core_searchdocument AS document
+                    ON document.id = core_searchdocument_fts.rowid
+                WHERE core_searchdocument_fts MATCH %s
+                    AND document.user_id = %s AND document.kind = %s
+                """,
+                [sqlite_query(terms), user_id, kind],
+            )
+        )
+    return Q(pk__in=fallback_documents(user_id, terms, [kind]).values("object_id"))
@@ -0,0 +1,111 @@
+"""
+Build and store the search documents of tasks, contacts and categories.
+
+A task document holds the title, weighted highest, and the description with
+the subtask titles; a contact document the name and email; a category
+document the name.
+"""
+
+from collections.abc import Iterable
+
+from django.db import transaction
+
+from core.models import Category, Contact, SearchDocument, Subtask, Task
+
+UPSERT_FIELDS = ["user", "title", "body"]
+
+
+def save_documents(documents: list[SearchDocument]) -> None:
+    _ = SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=UPSERT_FIELDS,
+    )
+
+
+def delete_documents(kind: str, object_ids: Iterable[int]) -> None:
+    _ = SearchDocument.objects.filter(
+        kind=kind, object_id__in=list(object_ids)
+    ).delete()
+
+
+def task_documents(tasks: Iterable[Task]) -> list[SearchDocument]:
+    tasks = list(tasks)
+    subtask_titles: dict[int, list[str]] = {}
+    for task_id, title in (
+        Subtask.objects.filter(task__in=tasks)
+        .order_by("id")
+        .values_list("task_id", "title")
+    ):
+        subtask_titles.setdefault(task_id, []).append(title)
+    return [
+        SearchDocument(
+            user_id=task.owner_id,
+            kind=SearchDocument.TASK,
+            object_id=task.pk,
+            title=task.title,
+            body="\n".join([task.description, *subtask_titles.get(task.pk, [])]),
+        )
+        for task in tasks
+    ]
+
+
+def contact_document(contact: Contact) -> SearchDocument:
+    return SearchDocument(
+        user_id=contact.user_id,
+        kind=SearchDocument.CONTACT,
+        object_id=contact.pk,
+        title=contact.name,
+        body=contact.email,
+    )
+
+
+def category_document(category: Category) -> SearchDocument:
+    return SearchDocument(
+        user_id=category.user_id,
+        kind=SearchDocument.CATEGORY,
+        object_id=category.pk,
+        title=category.name,
+    )
+
+
+def index_tasks(task_ids: Iterable[int]) -> None:
+    """Write the documents of ``task_ids``; missing tasks are skipped."""
+    save_documents(task_documents(Task.objects.filter(pk__in=list(task_ids))))
+
+
+def index_user_tasks(user_id: int) -> None:
+    """Write the documents of all tasks of a user and drop stale ones."""
+    tasks = Task.objects.filter(owner_id=user_id)
+    with transaction.atomic():
+        _ = (
+            SearchDocument.objects.filter(user_id=user_id, kind=SearchDocument.TASK)
+            .exclude(object_id__in=tasks.values("pk"))
+            .delete()
+        )
+        save_documents(task_documents(tasks))
+
+
+def rebuild(user_ids: list[int] | None = None) -> int:
+    """Recreate the documents of ``user_ids`` (or everyone)."""
+    tasks = Task.objects.all()
+    contacts = Contact.objects.all()
+    categories = Category.objects.all()
+    documents = SearchDocument.objects.all()
+    if user_ids is not None:
+        tasks = tasks.filter(owner_id__in=user_ids)
+        contacts = contacts.filter(user_id__in=user_ids)
+        categories = categories.filter(user_id__in=user_ids)
+        documents = documents.filter(user_id__in=user_ids)
+
+    with transaction.atomic():
+        _ = documents.delete()
+        created = [
+            *task_documents(tasks),
+            *map(contact_document, contacts),
+            *map(category_document, categories),
+        ]
+        save_documents(created)
+    return len(created)
@@ -0,0 +1,49 @@
+"""
+Filter backend restricting a viewset to the results of a full-text search.
+"""
+
+from typing import Any, cast, override
+
+from django.db.models import QuerySet
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from core.models import User
+from search.backends import matching
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Keep every row matching ``?search=`` in the search index.
+
+    Views declare ``search_kind``, the ``SearchDocument`` kind of their rows.
+    The view's ordering and pagination are kept; use the search endpoint for
+    results ordered by relevance.
+    """
+
+    search_param: str = api_settings.SEARCH_PARAM
+
+    @override
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet[Any], view: APIView
+    ) -> QuerySet[Any]:
+        query = request.query_params.get(self.search_param, "")
+        if not query.strip():
+            return queryset
+        return queryset.filter(
+            matching(cast(User, request.user).pk, query, getattr(view, "search_kind"))
+        )
+
+    @override
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search terms, matched as prefixes.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -0,0 +1,32 @@
+"""
+Django command to rebuild the search documents.
+"""
+
+from argparse import ArgumentParser
+from typing import Any, override
+
+from django.core.management.base import BaseCommand
+
+from search.documents import rebuild
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the search documents."""
+
+    help = "Recreate the search documents of tasks, contacts and categories."
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only rebuild the documents of this user id (repeatable).",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        created = rebuild(options["user_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {created} search documents."))
@@ -0,0 +1,84 @@
+"""
+Keep the search documents in step with writes of the searchable models.
+"""
+
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import (
+    Category,
+    Contact,
+    SearchDocument,
+    Subtask,
+    Task,
+    User,
+    owner_changed,
+)
+from core.signals import in_bulk_task_changes, tasks_bulk_changed
+from search.documents import (
+    category_document,
+    contact_document,
+    delete_documents,
+    index_tasks,
+    index_user_tasks,
+    save_documents,
+)
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender: type[Task], instance: Task, **kwargs: Any):
+    if in_bulk_task_changes():
+        return
+    index_tasks([instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def unindex_task(sender: type[Task], instance: Task, **kwargs: Any):
+    if in_bulk_task_changes():
+        return
+    delete_documents(SearchDocument.TASK, [instance.pk])
+
+
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Subtask)
+def index_subtask_task(sender: type[Subtask], instance: Subtask, **kwargs: Any):
+    """Subtask titles are part of their task's document."""
+    if in_bulk_task_changes():
+        return
+    index_tasks([instance.task_id])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def index_tasks_after_bulk_change(sender: type[Task], user: User, **kwargs: Any):
+    index_user_tasks(user.pk)
+
+
+@receiver(owner_changed)
+def index_given_tasks(
+    sender: type[Model], pks: dict[type[Model], list[int]], **kwargs: Any
+):
+    """Tasks given to another user along with their board or list."""
+    index_tasks(pks.get(Task, []))
+
+
+@receiver(post_save, sender=Contact)
+def index_contact(sender: type[Contact], instance: Contact, **kwargs: Any):
+    save_documents([contact_document(instance)])
+
+
+@receiver(post_delete, sender=Contact)
+def unindex_contact(sender: type[Contact], instance: Contact, **kwargs: Any):
+    delete_documents(SearchDocument.CONTACT, [instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def index_category(sender: type[Category], instance: Category, **kwargs: Any):
+    save_documents([category_document(instance)])
+
+
+@receiver(post_delete, sender=Category)
+def unindex_category(sender: type[Category], instance: Category, **kwargs: Any):
+    delete_documents(SearchDocument.CATEGORY, [instance.pk])
@@ -0,0 +1,216 @@
+"""
+Tests for the search APIs.
+"""
+
+from io import StringIO
+from typing import Any, override
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import ListOfTasks, SearchDocument, Task, User
+from core.tests.utils import (
+    TEST_OTHER_USER_EMAIL,
+    create_test_category,
+    create_test_contact,
+    create_test_list_of_tasks,
+    create_test_subtask,
+    create_test_task,
+    create_test_user,
+)
+from search.backends import matching
+
+SEARCH_URL = reverse("search:search")
+
+
+class PublicSearchAPITests(TestCase):
+    """Test unauthenticated API requests."""
+
+    @override
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test auth is required to search."""
+        res = self.client.get(SEARCH_URL, {"q": "pipe"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateSearchAPITests(TestCase):
+    """Test authenticated API requests."""
+
+    user = User()
+    other_user = User()
+    list_of_tasks = ListOfTasks()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.other_user = create_test_user(email=TEST_OTHER_USER_EMAIL)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.list_of_tasks = create_test_list_of_tasks(self.user)
+
+    def search(self, query: str, **params: Any) -> list[tuple[str, str]]:
+        res = self.client.get(SEARCH_URL, {"q": query, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [(hit["kind"], hit["title"]) for hit in res.json()["results"]]
+
+    def create_task(self, title: str, **params: Any):
+        return create_test_task(
+            self.user,
+            list_of_tasks=self.list_of_tasks,
+            title=title,
+            order=None,
+            **params,
+        )
+
+    def test_search_ranks_titles_first(self):
+        """Test title matches rank above description matches."""
+        _ = self.create_task("Clean the kitchen", description="Buy a new pipe")
+        _ = self.create_task("Fix broken pipe")
+        _ = self.create_task("Water the plants")
+
+        self.assertEqual(
+            self.search("pipe"),
+            [("task", "Fix broken pipe"), ("task", "Clean the kitchen")],
+        )
+
+    def test_search_matches_every_source(self):
+        """Test subtask titles, contacts and categories are searchable."""
+        task = self.create_task("Release")
+        _ = create_test_subtask(self.user, task, title="Tag the sprocket build")
+        _ = create_test_contact(self.user, name="Sprocket Smith", email="s@a.com")
+        _ = create_test_contact(
+            self.user, name="Jane Doe", email="jane@sprocket.io", phone_number=""
+        )
+        _ = create_test_category(self.user, name="Sprockets")
+
+        self.assertCountEqual(
+            self.search("sprocket"),
+            [
+                ("task", "Release"),
+                ("contact", "Sprocket Smith"),
+                ("contact", "Jane Doe"),
+                ("category", "Sprockets"),
+            ],
+        )
+        self.assertEqual(
+            self.search("sprocket", kind="category"), [("category", "Sprockets")]
+        )
+
+    def test_search_matches_prefixes_of_all_terms(self):
+        """Test every term has to match, as a prefix."""
+        _ = self.create_task("Deploy the backend")
+        _ = self.create_task("Deploy the frontend")
+
+        self.assertEqual(self.search("depl back"), [("task", "Deploy the backend")])
+
+    def test_search_only_own_documents(self):
+        """Test other users' documents are never returned."""
+        _ = create_test_task(self.other_user, title="Secret pipe")
+
+        self.assertEqual(self.search("secret"), [])
+
+    def test_index_follows_writes(self):
+        """Test edits and deletions update the index."""
+        task = self.create_task("Paint the fence")
+        subtask = create_test_subtask(self.user, task, title="Buy varnish")
+        self.assertEqual(self.search("varnish"), [("task", "Paint the fence")])
+
+        task.title = "Paint the gate"
+        task.save()
+        _ = subtask.delete()
+
+        self.assertEqual(self.search("varnish"), [])
+        self.assertEqual(self.search("gate"), [("task", "Paint the gate")])
+
+        task.delete()
+        self.assertEqual(self.search("gate"), [])
+
+    def test_task_created_with_subtasks_is_indexed(self):
+        """Test subtasks created with their task through the API are indexed."""
+        category = create_test_category(self.user)
+        res = self.client.post(
+            reverse("task:task-list"),
+            {
+                "title": "Ship it",
+                "category": category.pk,
+                "list_of_tasks": self.list_of_tasks.pk,
+                "subtasks": [{"title": "Write the changelog"}],
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.search("changelog"), [("task", "Ship it")])
+
+    def test_bulk_task_changes_are_indexed(self):
+        """Test bulk creates and deletes update the index."""
+        category = create_test_category(self.user)
+        url = reverse("task:task-bulk")
+        res = self.client.post(
+            url,
+            [
+                {
+                    "title": f"Bulk widget {index}",
+                    "category": category.pk,
+                    "list_of_tasks": self.list_of_tasks.pk,
+                }
+                for index in range(3)
+            ],
+            format="json",
+        )
+        self.assertEqual(len(self.search("widget")), 3)
+
+        _ = self.client.delete(url, {"ids": [res.json()[0]["id"]]}, format="json")
+
+        self.assertCountEqual(
+            self.search("widget"),
+            [("task", "Bulk widget 1"), ("task", "Bulk widget 2")],
+        )
+
+    def test_task_list_search_filter(self):
+        """Test ?search= restricts the task list to matching tasks."""
+        _ = self.create_task("Fix broken pipe")
+        _ = self.create_task("Water the plants")
+
+        res = self.client.get(reverse("task:task-list"), {"search": "pipe"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [task["title"] for task in res.json()["results"]], ["Fix broken pipe"]
+        )
+
+    def test_search_filter_keeps_every_match(self):
+        """Test ?search= matches in a subquery, without a cap on the hits."""
+        tasks = [self.create_task(f"Pipe {index}") for index in range(3)]
+        _ = self.create_task("Water the plants")
+
+        with self.assertNumQueries(1):
+            matches = list(Task.objects.filter(matching(self.user.pk, "pipe", "task")))
+
+        self.assertCountEqual(matches, tasks)
+        self.assertFalse(
+            Task.objects.filter(matching(self.other_user.pk, "pipe", "task"))
+        )
+
+    def test_query_required(self):
+        """Test searching without terms is rejected."""
+        res = self.client.get(SEARCH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_command(self):
+        """Test the rebuild command recreates lost documents."""
+        _ = self.create_task("Fix broken pipe")
+        _ = SearchDocument.objects.all().delete()
+        self.assertEqual(self.search("pipe"), [])
+
+        _ = call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(self.search("pipe"), [("task", "Fix broken pipe")])
@@ -0,0 +1,66 @@
+"""
+Views for the search APIs.
+"""
+
+from typing import cast
+
+from rest_framework import serializers
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import SearchDocument, User
+from search.backends import search
+from user.authentication import CachedTokenAuthentication
+
+
+class SearchQuerySerializer(serializers.Serializer[dict[str, object]]):
+    """Query parameters of a search."""
+
+    q = serializers.CharField(trim_whitespace=True)
+    kind = serializers.ListField(
+        child=serializers.ChoiceField(choices=SearchDocument.KIND_CHOICES),
+        required=False,
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class SearchView(APIView):
+    """View for ranked search across tasks, contacts and categories."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request):
+        """
+        Search the authenticated user's tasks (title, description, subtask
+        titles), contacts (name, email) and categories (name), best first.
+        ``kind`` may be repeated to restrict the result to some of them.
+        """
+        params = SearchQuerySerializer(
+            data={
+                **request.query_params.dict(),
+                "kind": request.query_params.getlist("kind"),
+            }
+        )
+        _ = params.is_valid(raise_exception=True)
+        hits = search(
+            cast(User, request.user).pk,
+            params.validated_data["q"],
+            params.validated_data.get("kind"),
+            params.validated_data["limit"],
+        )
+        return Response(
+            {
+                "results": [
+                    {
+                        "kind": hit.kind,
+                        "id": hit.object_id,
+                        "title": hit.title,
+                        "rank": hit.rank,
+                    }
+                    for hit in hits
+                ]
+            }
+        )
@@ -5,30 +5,31 @@ Views for the subtask APIs.
 from typing import override
 
 from django.db.models.query import QuerySet
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from common.conditional import ConditionalGetMixin
 from common.serializers_base import SubtaskBasedSerializer
 from common.views_base import SubtaskModelViewSet
 from core.models import Subtask
 from subtask.serializers import SubtaskSerializer
+from user.authentication import CachedTokenAuthentication
 
 
-class SubtaskViewSet(SubtaskModelViewSet):
+class SubtaskViewSet(ConditionalGetMixin[Subtask], SubtaskModelViewSet):
     """View for manage subtask APIs."""
 
     serializer_class = SubtaskSerializer
     queryset = Subtask.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-id",)
+    conditional_dependencies = ((Subtask, "owner"),)
 
     @override
     def get_queryset(self) -> QuerySet[Subtask]:
         """Retrieve tasks for authenticated user."""
         assert self.queryset is not None
-        return self.queryset.filter(
-            task__list_of_tasks__board__user=self.request.user
-        ).order_by("-id")
+        return self.queryset.filter(owner=self.request.user).order_by("-id")
 
     @override
     def perform_create(  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -1,6 +1,12 @@
+from typing import override
+
 from django.apps import AppConfig
 
 
 class SummaryConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "summary"
+
+    @override
+    def ready(self):
+        import summary.signals  # pyright: ignore[reportUnusedImport]
@@ -0,0 +1,304 @@
+"""
+Incrementally maintained summary counters.
+
+Every task contributes to one ``SummaryCounter`` per dimension: its list, its
+priority and its category. Writes adjust only the counters of the groups a
+task leaves and joins, so reading the summary never scans the user's tasks.
+"""
+
+from collections.abc import Iterable
+from datetime import date
+from typing import Any, NamedTuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, QuerySet, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from common.queries import QueryPlan, run
+from core.models import Category, ListOfTasks, SummaryCounter, Task
+
+
+class TaskSnapshot(NamedTuple):
+    """The task columns the summary depends on."""
+
+    user_id: int
+    list_of_tasks_id: int
+    priority: str
+    category_id: int
+    due_date: date
+
+    def groups(self) -> list[tuple[str, str]]:
+        return [
+            (SummaryCounter.LIST, str(self.list_of_tasks_id)),
+            (SummaryCounter.PRIORITY, self.priority),
+            (SummaryCounter.CATEGORY, str(self.category_id)),
+        ]
+
+
+SNAPSHOT_COLUMNS = [
+    "owner_id",
+    "list_of_tasks_id",
+    "priority",
+    "category_id",
+    "due_date",
+]
+
+GROUP_LOOKUPS = {
+    SummaryCounter.LIST: "list_of_tasks_id",
+    SummaryCounter.PRIORITY: "priority",
+    SummaryCounter.CATEGORY: "category_id",
+}
+
+
+def user_tasks(user_id: int) -> QuerySet[Task]:
+    return Task.objects.filter(owner_id=user_id)
+
+
+def load_snapshots(task_ids: Iterable[int]) -> dict[int, TaskSnapshot]:
+    """Read the current summary columns of ``task_ids`` from the database."""
+    rows = Task.objects.filter(pk__in=list(task_ids)).values_list(
+        "pk", *SNAPSHOT_COLUMNS
+    )
+    return {row[0]: TaskSnapshot(*row[1:]) for row in rows}
+
+
+def load_snapshot(task_id: int) -> TaskSnapshot | None:
+    return load_snapshots([task_id]).get(task_id)
+
+
+def add_task(snapshot: TaskSnapshot) -> None:
+    """Count ``snapshot`` in each of its groups."""
+    for dimension, key in snapshot.groups():
+        counters = SummaryCounter.objects.filter(
+            user_id=snapshot.user_id, dimension=dimension, key=key
+        )
+        updates: dict[str, Any] = {
+            "count": F("count") + 1,
+            "latest_due_date": Greatest(
+                Coalesce("latest_due_date", Value(snapshot.due_date)),
+                Value(snapshot.due_date),
+            ),
+        }
+        if counters.update(**updates):
+            continue
+        try:
+            with transaction.atomic():
+                _ = SummaryCounter.objects.create(
+                    user_id=snapshot.user_id,
+                    dimension=dimension,
+                    key=key,
+                    count=1,
+                    latest_due_date=snapshot.due_date,
+                )
+        except IntegrityError:
+            # Another request created the counter first.
+            _ = counters.update(**updates)
+
+
+def remove_task(snapshot: TaskSnapshot) -> None:
+    """
+    Stop counting ``snapshot`` in each of its groups.
+
+    Must run after the task row was deleted or changed, because the latest due
+    date of a group is recomputed when the removed task held it.
+    """
+    for dimension, key in snapshot.groups():
+        counters = SummaryCounter.objects.filter(
+            user_id=snapshot.user_id, dimension=dimension, key=key
+        )
+        _ = counters.update(count=F("count") - 1)
+        _ = counters.filter(count__lte=0).delete()
+        _ = counters.filter(latest_due_date__lte=snapshot.due_date).update(
+            latest_due_date=user_tasks(snapshot.user_id)
+            .filter(**{GROUP_LOOKUPS[dimension]: key})
+            .aggregate(latest=Max("due_date"))["latest"]
+        )
+
+
+def apply_change(before: TaskSnapshot | None, after: TaskSnapshot | None) -> None:
+    """Move a task's contribution from ``before`` to ``after``."""
+    if before == after:
+        return
+    if before is not None:
+        remove_task(before)
+    if after is not None:
+        add_task(after)
+
+
+def compute_groups(
+    tasks: QuerySet[Task],
+) -> dict[tuple[int, str, str], tuple[int, date | None]]:
+    """Aggregate ``tasks`` into ``(user, dimension, key) -> (count, latest)``."""
+    groups: dict[tuple[int, str, str], tuple[int, date | None]] = {}
+    for dimension, lookup in GROUP_LOOKUPS.items():
+        rows = (
+            tasks.values("owner_id", lookup)
+            .annotate(count=Count("id"), latest_due_date=Max("due_date"))
+            .order_by()
+        )
+        for row in rows:
+            key = (row["owner_id"], dimension, str(row[lookup]))
+            groups[key] = (row["count"], row["latest_due_date"])
+    return groups
+
+
+def stored_groups(
+    counters: QuerySet[SummaryCounter],
+) -> dict[tuple[int, str, str], tuple[int, date | None]]:
+    return {
+        (user_id, dimension, key): (count, latest_due_date)
+        for user_id, dimension, key, count, latest_due_date in counters.values_list(
+            "user_id", "dimension", "key", "count", "latest_due_date"
+        )
+    }
+
+
+def rebuild(user_ids: list[int] | None = None) -> int:
+    """Recreate the counters of ``user_ids`` (or everyone) from the tasks."""
+    tasks = Task.objects.all()
+    counters = SummaryCounter.objects.all()
+    if user_ids is not None:
+        tasks = tasks.filter(owner_id__in=user_ids)
+        counters = counters.filter(user_id__in=user_ids)
+
+    with transaction.atomic():
+        _ = counters.delete()
+        created = SummaryCounter.objects.bulk_create(
+            SummaryCounter(
+                user_id=user_id,
+                dimension=dimension,
+                key=key,
+                count=count,
+                latest_due_date=latest_due_date,
+            )
+            for (user_id, dimension, key), (
+                count,
+                latest_due_date,
+            ) in compute_groups(tasks).items()
+        )
+    return len(created)
+
+
+def verify(user_ids: list[int] | None = None) -> list[str]:
+    """Return a description of every counter that differs from the tasks."""
+    tasks = Task.objects.all()
+    counters = SummaryCounter.objects.filter(count__gt=0)
+    if user_ids is not None:
+        tasks = tasks.filter(owner_id__in=user_ids)
+        counters = counters.filter(user_id__in=user_ids)
+
+    expected = compute_groups(tasks)
+    actual = stored_groups(counters)
+    return [
+        f"user {key[0]} {key[1]} {key[2]}: "
+        + f"expected {expected.get(key)}, stored {actual.get(key)}"
+        for key in sorted(expected.keys() | actual.keys())
+        if expected.get(key) != actual.get(key)
+    ]
+
+
+def build_summary(user_id: int) -> dict[str, list[dict[str, Any]]]:
+    """
+    Return the summary payload of ``user_id`` from its counters.
+
+    The shape matches the former ``GROUP BY`` response: lists are grouped by
+    board title, list name and order, categories by name and color.
+    """
+    return run(plan_summary(user_id))
+
+
+def plan_summary(user_id: int) -> QueryPlan[dict[str, list[dict[str, Any]]]]:
+    """Plan ``build_summary``, see ``common.queries``."""
+    counters: list[tuple[str, str, int, date | None]] = yield (
+        SummaryCounter.objects.filter(user_id=user_id, count__gt=0).values_list(
+            "dimension", "key", "count", "latest_due_date"
+        )
+    )
+    by_dimension: dict[str, list[tuple[str, int, date | None]]] = {
+        dimension: [] for dimension in GROUP_LOOKUPS
+    }
+    for dimension, key, count, latest_due_date in counters:
+        by_dimension[dimension].append((key, count, latest_due_date))
+
+    list_ids = [int(key) for key, _, _ in by_dimension[SummaryCounter.LIST]]
+    list_rows: list[dict[str, Any]] = (
+        (
+            yield ListOfTasks.objects.filter(pk__in=list_ids).values(
+                "id", "board__title", "name", "order"
+            )
+        )
+        if list_ids
+        else []
+    )
+    lists = {
+        str(row["id"]): (row["board__title"], row["name"], row["order"])
+        for row in list_rows
+    }
+    category_ids = [int(key) for key, _, _ in by_dimension[SummaryCounter.CATEGORY]]
+    category_rows: list[dict[str, Any]] = (
+        (
+            yield Category.objects.filter(pk__in=category_ids).values(
+                "id", "name", "color"
+            )
+        )
+        if category_ids
+        else []
+    )
+    categories = {str(row["id"]): (row["name"], row["color"]) for row in category_rows}
+
+    tasks_in_lists = _merge(
+        (lists[key], count, latest)
+        for key, count, latest in by_dimension[SummaryCounter.LIST]
+        if key in lists
+    )
+    tasks_by_priority = _merge(
+        ((key,), count, latest)
+        for key, count, latest in by_dimension[SummaryCounter.PRIORITY]
+    )
+    tasks_by_category = _merge(
+        (categories[key], count, latest)
+        for key, count, latest in by_dimension[SummaryCounter.CATEGORY]
+        if key in categories
+    )
+
+    return {
+        "tasks_in_lists": [
+            {
+                "list_of_tasks__board__title": board_title,
+                "list_of_tasks__name": name,
+                "list_of_tasks__order": order,
+                "count": count,
+                "latest_due_date": latest,
+            }
+            for (board_title, name, order), (count, latest) in sorted(
+                tasks_in_lists.items(), key=lambda item: (item[0][0], item[0][2])
+            )
+        ],
+        "tasks_by_priority": [
+            {"priority": priority, "count": count, "latest_due_date": latest}
+            for (priority,), (count, latest) in sorted(tasks_by_priority.items())
+        ],
+        "tasks_by_category": [
+            {
+                "category__name": name,
+                "category__color": color,
+                "count": count,
+                "latest_due_date": latest,
+            }
+            for (name, color), (count, latest) in sorted(
+                tasks_by_category.items(), key=lambda item: item[0][0]
+            )
+        ],
+    }
+
+
+def _merge(
+    groups: Iterable[tuple[tuple[Any, ...], int, date | None]],
+) -> dict[tuple[Any, ...], tuple[int, date | None]]:
+    """Combine counters that map to the same response group."""
+    merged: dict[tuple[Any, ...], tuple[int, date | None]] = {}
+    for group, count, latest in groups:
+        previous_count, previous_latest = merged.get(group, (0, None))
+        dates = [value for value in (previous_latest, latest) if value is not None]
+        merged[group] = (previous_count + count, max(dates) if dates else None)
+    return merged
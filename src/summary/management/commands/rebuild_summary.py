@@ -0,0 +1,47 @@
+"""
+Django command to rebuild the materialized summary counters.
+"""
+
+from argparse import ArgumentParser
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandError
+
+from summary.counters import rebuild, verify
+
+
+class Command(BaseCommand):
+    """Django command to rebuild or check the summary counters."""
+
+    help = "Recompute the summary counters from the tasks."
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only rebuild the counters of this user id (repeatable).",
+        )
+        _ = parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report counters that differ from the tasks.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        user_ids: list[int] | None = options["user_ids"]
+        if options["check"]:
+            mismatches = verify(user_ids)
+            for mismatch in mismatches:
+                self.stdout.write(mismatch)
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} summary counters are stale.")
+            self.stdout.write(self.style.SUCCESS("Summary counters are up to date."))
+            return
+
+        created = rebuild(user_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {created} summary counters."))
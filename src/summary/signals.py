@@ -0,0 +1,60 @@
+"""
+Keep the summary counters in step with task writes.
+"""
+
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from core.models import Task, User, owner_changed
+from core.signals import in_bulk_task_changes, tasks_bulk_changed
+from summary.counters import TaskSnapshot, apply_change, load_snapshot, rebuild
+
+SNAPSHOT_ATTRIBUTE = "_summary_snapshot"
+
+
+@receiver(pre_save, sender=Task)
+@receiver(pre_delete, sender=Task)
+def remember_summary_snapshot(sender: type[Task], instance: Task, **kwargs: Any):
+    """Remember which summary groups the task counted in before the write."""
+    if in_bulk_task_changes():
+        return
+    snapshot = load_snapshot(instance.pk) if instance.pk is not None else None
+    setattr(instance, SNAPSHOT_ATTRIBUTE, snapshot)
+
+
+@receiver(post_save, sender=Task)
+def update_summary_on_save(sender: type[Task], instance: Task, **kwargs: Any):
+    """Move the task's contribution to the groups it now belongs to."""
+    if in_bulk_task_changes():
+        return
+    before: TaskSnapshot | None = getattr(instance, SNAPSHOT_ATTRIBUTE, None)
+    with transaction.atomic():
+        apply_change(before, load_snapshot(instance.pk))
+
+
+@receiver(post_delete, sender=Task)
+def update_summary_on_delete(sender: type[Task], instance: Task, **kwargs: Any):
+    """Stop counting a deleted task."""
+    if in_bulk_task_changes():
+        return
+    before: TaskSnapshot | None = getattr(instance, SNAPSHOT_ATTRIBUTE, None)
+    with transaction.atomic():
+        apply_change(before, None)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def rebuild_summary_after_bulk_change(sender: type[Task], user: User, **kwargs: Any):
+    """Recount the user's summary once after a bulk task write."""
+    _ = rebuild([user.pk])
+
+
+@receiver(owner_changed)
+def rebuild_summary_after_owner_change(
+    sender: type[Model], old_user_id: int, new_user_id: int, **kwargs: Any
+):
+    """Recount both users' summaries once rows were given to another user."""
+    _ = rebuild([old_user_id, new_user_id])
@@ -0,0 +1,38 @@
+"""
+Tests for the summary management commands.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.models import SummaryCounter
+from core.tests.utils import create_test_task, create_test_user
+from summary.counters import verify
+
+
+class RebuildSummaryCommandTests(TestCase):
+    """Test the rebuild_summary command."""
+
+    def test_check_reports_stale_counters(self):
+        """Test --check fails when a counter drifted from the tasks."""
+        user = create_test_user()
+        _ = create_test_task(user=user)
+        _ = SummaryCounter.objects.filter(user=user).update(count=7)
+
+        with self.assertRaises(CommandError):
+            _ = call_command("rebuild_summary", "--check", stdout=StringIO())
+
+    def test_rebuild_restores_counters(self):
+        """Test rebuilding recreates deleted and drifted counters."""
+        user = create_test_user()
+        _ = create_test_task(user=user)
+        _ = SummaryCounter.objects.filter(user=user).delete()
+        self.assertNotEqual(verify(), [])
+
+        _ = call_command("rebuild_summary", stdout=StringIO())
+
+        self.assertEqual(verify(), [])
+        self.assertEqual(SummaryCounter.objects.filter(user=user).count(), 3)
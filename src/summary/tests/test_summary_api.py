@@ -2,19 +2,54 @@
 Tests for subtask APIs.
 """
 
-from typing import override
+from datetime import date
+from typing import Any, cast, override
 
+from django.db.models import Count, Max
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import User
-from core.tests.utils import create_test_task, create_test_user, validate_response_data
+from core.models import SummaryCounter, Task, User
+from core.tests.utils import (
+    create_test_category,
+    create_test_list_of_tasks,
+    create_test_task,
+    create_test_user,
+    validate_response_data,
+)
+from summary.counters import verify
 
 SUMMARY_URL = reverse("summary:summary")
 
 
+def aggregate_summary(user: User) -> dict[str, list[dict[str, Any]]]:
+    """Compute the summary straight from the user's tasks."""
+    user_tasks = Task.objects.filter(list_of_tasks__board__user=user)
+    return {
+        "tasks_in_lists": list(
+            user_tasks.values(
+                "list_of_tasks__board__title",
+                "list_of_tasks__name",
+                "list_of_tasks__order",
+            )
+            .annotate(count=Count("id"), latest_due_date=Max("due_date"))
+            .order_by("list_of_tasks__board__title", "list_of_tasks__order")
+        ),
+        "tasks_by_priority": list(
+            user_tasks.values("priority")
+            .annotate(count=Count("id"), latest_due_date=Max("due_date"))
+            .order_by("priority")
+        ),
+        "tasks_by_category": list(
+            user_tasks.values("category__name", "category__color")
+            .annotate(count=Count("id"), latest_due_date=Max("due_date"))
+            .order_by("category__name")
+        ),
+    }
+
+
 class PublicSummaryAPITests(TestCase):
     """Test unauthenticated API requests."""
 
@@ -49,3 +84,98 @@ class PrivateSummaryAPITests(TestCase):
         self.assertEqual(len(data["tasks_in_lists"]), 1)
         self.assertEqual(len(data["tasks_by_priority"]), 1)
         self.assertEqual(len(data["tasks_by_category"]), 1)
+
+    def assert_summary_matches_tasks(self) -> None:
+        res = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            cast(dict[str, Any], getattr(res, "data")), aggregate_summary(self.user)
+        )
+        self.assertEqual(verify([self.user.pk]), [])
+
+    def test_summary_reads_counters(self):
+        """Test the summary does not depend on the number of tasks."""
+        list_of_tasks = create_test_list_of_tasks(self.user)
+        category = create_test_category(self.user)
+        for order in range(5):
+            _ = create_test_task(
+                self.user, category=category, list_of_tasks=list_of_tasks, order=order
+            )
+
+        # The ETag, then counters, lists and categories.
+        with self.assertNumQueries(4):
+            res = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(res.json()["tasks_in_lists"][0]["count"], 5)
+
+    def test_summary_follows_task_changes(self):
+        """Test the counters follow created, updated, moved and deleted tasks."""
+        todo = create_test_list_of_tasks(self.user, name="TODO", order=0)
+        done = create_test_list_of_tasks(
+            self.user, board=todo.board, name="Done", order=1
+        )
+        bug = create_test_category(self.user, name="bug")
+        feature = create_test_category(self.user, name="feature", color="#00FF00")
+        tasks = [
+            create_test_task(
+                self.user,
+                category=bug,
+                list_of_tasks=todo,
+                order=order,
+                due_date=date(2030, 1, order + 1),
+            )
+            for order in range(3)
+        ]
+        self.assert_summary_matches_tasks()
+
+        res = self.client.patch(
+            reverse("task:task-detail", args=[tasks[2].pk]),
+            {"priority": "Low", "category": feature.pk},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assert_summary_matches_tasks()
+
+        tasks[2].list_of_tasks = done
+        tasks[2].due_date = date(2031, 1, 1)
+        tasks[2].save()
+        self.assert_summary_matches_tasks()
+
+        tasks[1].delete()
+        self.assert_summary_matches_tasks()
+
+        tasks[2].delete()
+        self.assert_summary_matches_tasks()
+        self.assertFalse(
+            SummaryCounter.objects.filter(
+                user=self.user, dimension=SummaryCounter.LIST, key=str(done.pk)
+            ).exists()
+        )
+
+    def test_summary_ignores_other_users(self):
+        """Test other users' tasks are not counted."""
+        _ = create_test_task(user=self.user)
+        _ = create_test_task(user=create_test_user("other@example.com"))
+
+        self.assert_summary_matches_tasks()
+
+    def test_summary_not_modified(self):
+        """Test the summary honours If-None-Match until a task changes."""
+        task = create_test_task(user=self.user)
+        etag = self.client.get(SUMMARY_URL).headers["ETag"]
+
+        res = self.client.get(SUMMARY_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        task.priority = "Low"
+        task.save()
+
+        res = self.client.get(SUMMARY_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            cast(dict[str, Any], getattr(res, "data"))["tasks_by_priority"][0][
+                "priority"
+            ],
+            "Low",
+        )
@@ -2,6 +2,7 @@
 URL mappings for the summary app.
 """
 
+from django.conf import settings
 from django.urls import (  # include,
     path,
 )
@@ -17,5 +18,13 @@ from summary import views
 app_name = "summary"
 
 urlpatterns = [
-    path("", views.SummaryView.as_view(), name="summary"),
+    path(
+        "",
+        (
+            views.AsyncSummaryView.as_view(sync_view=views.SummaryView.as_view())
+            if settings.ASYNC_READS
+            else views.SummaryView.as_view()
+        ),
+        name="summary",
+    ),
 ]
@@ -2,59 +2,55 @@
 Views for the summary APIs.
 """
 
-from django.db.models import Count, Max
-from rest_framework.authentication import TokenAuthentication
+from typing import Any, cast, override
+
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.models import Task
+from common.async_views import AsyncReadView
+from common.conditional import conditional_get
+from common.queries import arun
+from common.replicas import ReplicaReadMixin
+from core.models import Board, Category, ListOfTasks, Task, User
+from response_cache.cache import cached_response
+from summary.counters import build_summary, plan_summary
+from user.authentication import CachedTokenAuthentication
 
 
-class SummaryView(APIView):
+class SummaryView(ReplicaReadMixin, APIView):
     """View for manage summary APIs."""
 
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    conditional_dependencies = (
+        (Board, "user"),
+        (ListOfTasks, "owner"),
+        (Task, "owner"),
+        (Category, "user"),
+    )
 
     def get(self, request: Request):
         """Retrieve summary for authenticated user."""
-        user = request.user
-        user_tasks = Task.objects.filter(list_of_tasks__board__user=user)
-
-        tasks_in_lists = (
-            user_tasks.values(
-                "list_of_tasks__board__title",
-                "list_of_tasks__name",
-                "list_of_tasks__order",
-            )
-            .annotate(count=Count("id"), latest_due_date=Max("due_date"))
-            .order_by(
-                "list_of_tasks__board__title",
-                "list_of_tasks__order",
-            )
+        return cached_response(
+            self,
+            request,
+            lambda: conditional_get(
+                request,
+                self.conditional_dependencies,
+                lambda: Response(build_summary(cast(User, request.user).pk)),
+            ),
         )
 
-        # Count tasks for each priority and get the latest due date for each
-        tasks_by_priority = (
-            user_tasks.values("priority")
-            .annotate(count=Count("id"), latest_due_date=Max("due_date"))
-            .order_by("priority")
-        )
 
-        # Count tasks for each category and get the latest due date for each
-        tasks_by_category = (
-            user_tasks.values("category__name", "category__color")
-            .annotate(count=Count("id"), latest_due_date=Max("due_date"))
-            .order_by("category__name")
-        )
+class AsyncSummaryView(AsyncReadView):
+    """Async GET of ``SummaryView``, see ``common.async_views``."""
 
-        # Construct response
-        return Response(
-            {
-                "tasks_in_lists": list(tasks_in_lists),
-                "tasks_by_priority": list(tasks_by_priority),
-                "tasks_by_category": list(tasks_by_category),
-            }
-        )
+    @override
+    def cache_responses(self) -> bool:
+        return True
+
+    @override
+    async def read_data(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        return await arun(plan_summary(cast(User, request.user).pk))
@@ -0,0 +1,12 @@
+from typing import override
+
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "sync"
+
+    @override
+    def ready(self):
+        import sync.signals  # pyright: ignore[reportUnusedImport]
@@ -0,0 +1,177 @@
+"""
+Delta sync of a user's categories, contacts, boards, lists, tasks and subtasks.
+
+A sync returns the rows changed after a cursor, the ids of the rows deleted
+after it and the cursor to pass to the next sync::
+
+    {"cursor": "42",
+     "changes": {"category": [...], "contact": [...], "board": [...],
+                 "list": [...], "task": [...], "subtask": [...]},
+     "deleted": {"category": [], "contact": [], "board": [], "list": [],
+                 "task": [7], "subtask": [8, 9]}}
+
+Rows are in the export format (``transfer.records``); task rows also hold the
+ids of their ``assignees``. Clients apply ``changes`` in kind order, then
+``deleted``. Deleting a contact removes it from the assignees of tasks without
+changing them, so clients drop deleted contacts from ``assignees``. Without
+a cursor every row is returned.
+
+The cursor is a ``seq``: every write of a row, including bulk writes,
+relabels, owner changes and imports, and every tombstone takes the next value
+of the user's ``SyncSequence`` (see ``core.models.SyncedModel``), found with
+the ``(user, seq)`` indexes. Writes hold that sequence until they commit, so
+the value a sync reads first is one every write up to has committed, and it
+is the next cursor. Neither clocks nor long transactions make a sync skip a
+write.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Self, override
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Model, OuterRef, Subquery
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from core.models import (
+    Board,
+    Category,
+    Contact,
+    ListOfTasks,
+    Subtask,
+    SyncSequence,
+    Task,
+    Tombstone,
+)
+from transfer.records import RECORD_KINDS, RecordKind, Row
+
+DEFAULTS: dict[str, Any] = {
+    # Seconds tombstones are kept, and thus cursors are valid for.
+    "KEEP_TOMBSTONES": 30
+    * 24
+    * 3600,
+}
+
+# The tombstone kind of each model; kinds are named like the record kinds.
+TOMBSTONE_KINDS: dict[type[Model], str] = {
+    Category: Tombstone.CATEGORY,
+    Contact: Tombstone.CONTACT,
+    Board: Tombstone.BOARD,
+    ListOfTasks: Tombstone.LIST,
+    Task: Tombstone.TASK,
+    Subtask: Tombstone.SUBTASK,
+}
+SYNC_KINDS = tuple(kind for kind in RECORD_KINDS if kind.model in TOMBSTONE_KINDS)
+
+
+def sync_settings() -> dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, "SYNC", {})}
+
+
+class CursorExpired(Exception):
+    """The tombstones after the cursor may have been purged."""
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Where a sync continues: rows and tombstones with a greater ``seq``."""
+
+    seq: int
+
+    @override
+    def __str__(self) -> str:
+        return str(self.seq)
+
+    @classmethod
+    def parse(cls, value: str) -> Self:
+        """Parse a cursor formatted by ``str``; raise ValueError if invalid."""
+        if not value.isdigit():
+            raise ValueError(f"Invalid cursor {value!r}.")
+        return cls(int(value))
+
+
+def changed_rows(
+    kind: RecordKind, user_id: int, since: Cursor | None, until: Cursor
+) -> list[Row]:
+    queryset = kind.queryset(user_id).filter(seq__lte=until.seq)
+    if since is not None:
+        queryset = queryset.filter(seq__gt=since.seq)
+    rows = list(queryset)
+    if kind.model is Task and rows:
+        assignees: dict[int, list[int]] = {row["id"]: [] for row in rows}
+        through = Task.assignees.through.objects.filter(
+            task__owner=user_id, task__seq__lte=until.seq
+        )
+        if since is not None:
+            through = through.filter(task__seq__gt=since.seq)
+        for task_id, contact_id in through.order_by("pk").values_list(
+            "task_id", "contact_id"
+        ):
+            # Tasks changed after ``rows`` were read are sent by the next sync.
+            if task_id in assignees:
+                assignees[task_id].append(contact_id)
+        for row in rows:
+            row["assignees"] = assignees[row["id"]]
+    return rows
+
+
+def deleted_ids(
+    user_id: int, since: Cursor | None, until: Cursor
+) -> dict[str, list[int]]:
+    deleted: dict[str, list[int]] = {kind.name: [] for kind in SYNC_KINDS}
+    if since is None:
+        return deleted
+    tombstones = Tombstone.objects.filter(
+        user=user_id, seq__gt=since.seq, seq__lte=until.seq
+    ).order_by("seq", "pk")
+    for kind, object_id in tombstones.values_list("kind", "object_id"):
+        deleted[kind].append(object_id)
+    return deleted
+
+
+def sync_changes(user_id: int, since: Cursor | None) -> tuple[dict[str, Any], Cursor]:
+    """
+    Return the changes of ``user_id`` after ``since`` and the next cursor.
+    Raise CursorExpired if tombstones after ``since`` were purged.
+    """
+    # Read before the rows: every write up to it has committed.
+    last, purged = (
+        SyncSequence.objects.filter(user_id=user_id)
+        .values_list("value", "purged")
+        .first()
+    ) or (0, 0)
+    if since is not None and since.seq < purged:
+        raise CursorExpired()
+    cursor = Cursor(max(last, since.seq if since else 0))
+
+    changes = {
+        "changes": {
+            kind.name: changed_rows(kind, user_id, since, cursor) for kind in SYNC_KINDS
+        },
+        "deleted": deleted_ids(user_id, since, cursor),
+    }
+    return changes, cursor
+
+
+def purge_tombstones() -> int:
+    """
+    Delete tombstones older than ``KEEP_TOMBSTONES`` seconds, expiring the
+    cursors before them.
+    """
+    cutoff = timezone.now() - timedelta(seconds=sync_settings()["KEEP_TOMBSTONES"])
+    old = Tombstone.objects.filter(deleted_at__lt=cutoff)
+    last_purged = (
+        old.filter(user_id=OuterRef("user_id"))
+        .order_by()
+        .values("user_id")
+        .annotate(last=Max("seq"))
+        .values("last")
+    )
+    with transaction.atomic():
+        _ = SyncSequence.objects.filter(user_id__in=old.values("user_id")).update(
+            purged=Greatest("purged", Subquery(last_purged))
+        )
+        deleted, _ = old.delete()
+    return deleted
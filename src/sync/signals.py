@@ -0,0 +1,76 @@
+"""
+Record tombstones of deleted rows for the delta sync.
+"""
+
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from core.models import (
+    Board,
+    Category,
+    Contact,
+    ListOfTasks,
+    Subtask,
+    Task,
+    Tombstone,
+    next_sync_seq,
+    owner_changed,
+)
+from core.ordering import keys_relabelled
+from sync.changes import TOMBSTONE_KINDS
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Contact)
+@receiver(post_delete, sender=Board)
+@receiver(post_delete, sender=ListOfTasks)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+def record_tombstone(sender: type[Model], instance: Any, **kwargs: Any):
+    # Boards, categories and contacts belong to ``user``, the rest to ``owner``.
+    user_id = getattr(instance, "user_id", None) or getattr(instance, "owner_id", None)
+    if user_id is None:
+        return
+    _ = Tombstone.objects.create(
+        user_id=user_id,
+        kind=TOMBSTONE_KINDS[sender],
+        object_id=instance.pk,
+        seq=next_sync_seq(user_id),
+    )
+
+
+@receiver(owner_changed)
+def record_given_rows(
+    sender: type[Model],
+    old_user_id: int,
+    new_user_id: int,
+    pks: dict[type[Model], list[int]],
+    **kwargs: Any,
+):
+    """
+    Rows given to another user are gone for the former one. Tombstones the
+    new one has of them, from being given away before, would delete them.
+    """
+    seq = next_sync_seq(old_user_id)
+    for model, model_pks in pks.items():
+        kind = TOMBSTONE_KINDS[model]
+        _ = Tombstone.objects.filter(
+            user_id=new_user_id, kind=kind, object_id__in=model_pks
+        ).delete()
+        _ = Tombstone.objects.bulk_create(
+            Tombstone(user_id=old_user_id, kind=kind, object_id=pk, seq=seq)
+            for pk in model_pks
+        )
+
+
+@receiver(keys_relabelled, sender=ListOfTasks)
+@receiver(keys_relabelled, sender=Task)
+def bump_relabelled(sender: type[ListOfTasks | Task], pks: list[int], **kwargs: Any):
+    """Relabelled rows changed their order with a queryset update."""
+    rows = sender._default_manager.filter(pk__in=pks)
+    user_ids = rows.order_by().values_list("owner_id", flat=True).distinct()
+    for user_id in list(user_ids):
+        _ = rows.filter(owner_id=user_id).update(seq=next_sync_seq(user_id))
@@ -0,0 +1,221 @@
+"""
+Tests for the sync APIs.
+"""
+
+import json
+from datetime import timedelta
+from typing import Any, override
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Board, ListOfTasks, Subtask, Task, Tombstone, User
+from core.ordering import rebalance
+from core.tests.utils import (
+    TEST_OTHER_USER_EMAIL,
+    create_test_board,
+    create_test_list_of_tasks,
+    create_test_populated_task,
+    create_test_user,
+)
+from sync.changes import purge_tombstones
+from transfer.importer import import_dataset
+
+SYNC_URL = reverse("sync:sync")
+
+
+class PublicSyncAPITests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def test_auth_required(self):
+        """Test auth is required to sync."""
+        res = APIClient().get(SYNC_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateSyncAPITests(TestCase):
+    """Test authenticated API requests."""
+
+    user = User()
+    board = Board()
+    list_of_tasks = ListOfTasks()
+    task = Task()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.board = create_test_board(self.user)
+        self.list_of_tasks = create_test_list_of_tasks(self.user, self.board)
+        self.task = create_test_populated_task(self.user, self.list_of_tasks, 0)
+
+    def sync(self, since: str | None = None) -> dict[str, Any]:
+        res = self.client.get(SYNC_URL, {} if since is None else {"since": since})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.json()
+
+    @staticmethod
+    def ids(data: dict[str, Any]) -> dict[str, list[int]]:
+        return {
+            kind: [row["id"] for row in rows] for kind, rows in data["changes"].items()
+        }
+
+    def test_full_sync(self):
+        """Test syncing without a cursor returns every row of the user."""
+        other = create_test_user(email=TEST_OTHER_USER_EMAIL)
+        _ = create_test_populated_task(
+            other, create_test_list_of_tasks(other, create_test_board(other)), 1
+        )
+
+        data = self.sync()
+
+        subtask = Subtask.objects.get(task=self.task)
+        contact = self.task.assignees.get()
+        self.assertEqual(
+            self.ids(data),
+            {
+                "category": [self.task.category_id],
+                "contact": [contact.pk],
+                "board": [self.board.pk],
+                "list": [self.list_of_tasks.pk],
+                "task": [self.task.pk],
+                "subtask": [subtask.pk],
+            },
+        )
+        task_row = data["changes"]["task"][0]
+        self.assertEqual(task_row["title"], self.task.title)
+        self.assertEqual(task_row["list_of_tasks"], self.list_of_tasks.pk)
+        self.assertEqual(task_row["assignees"], [contact.pk])
+        self.assertTrue(all(not ids for ids in data["deleted"].values()))
+
+    def test_changes_since_cursor(self):
+        """Test a sync returns only the rows changed after the cursor."""
+        cursor = self.sync()["cursor"]
+        self.task.title = "Renamed"
+        self.task.save()
+        list_of_tasks = create_test_list_of_tasks(
+            self.user, self.board, name="Done", order=1
+        )
+
+        data = self.sync(cursor)
+
+        self.assertEqual(
+            self.ids(data),
+            {
+                "category": [],
+                "contact": [],
+                "board": [],
+                "list": [list_of_tasks.pk],
+                "task": [self.task.pk],
+                "subtask": [],
+            },
+        )
+        self.assertEqual(data["changes"]["task"][0]["title"], "Renamed")
+        self.assertFalse(any(self.sync(data["cursor"])["changes"].values()))
+
+    def test_deletions_are_tombstones(self):
+        """Test deleted rows are returned by kind and id."""
+        cursor = self.sync()["cursor"]
+        subtask_id = Subtask.objects.get(task=self.task).pk
+        task_id = self.task.pk
+        _ = self.task.delete()
+
+        data = self.sync(cursor)
+
+        self.assertEqual(data["deleted"]["task"], [task_id])
+        self.assertEqual(data["deleted"]["subtask"], [subtask_id])
+        self.assertEqual(data["changes"]["task"], [])
+        self.assertEqual(self.sync(data["cursor"])["deleted"]["task"], [])
+
+    def test_bulk_writes_and_relabels_are_changes(self):
+        """Test rows written without saving them are sent by the next sync."""
+        cursor = self.sync()["cursor"]
+        res = self.client.patch(
+            reverse("task:task-bulk"),
+            [{"id": self.task.pk, "title": "Bulk"}],
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        data = self.sync(cursor)
+        self.assertEqual(self.ids(data)["task"], [self.task.pk])
+
+        _ = rebalance(ListOfTasks.objects.filter(board=self.board))
+
+        self.assertEqual(
+            self.ids(self.sync(data["cursor"]))["list"], [self.list_of_tasks.pk]
+        )
+
+    def test_imported_rows_are_changes(self):
+        """Test imported rows are sent even though they keep their updated_at."""
+        cursor = self.sync()["cursor"]
+        record = {
+            "type": "board",
+            "id": 1,
+            "title": "Imported",
+            "created_at": "2020-01-01T00:00:00Z",
+            "updated_at": "2020-01-01T00:00:00Z",
+        }
+
+        result = import_dataset(self.user, [("ndjson", None, [json.dumps(record)])])
+
+        self.assertEqual(result.created["board"], 1)
+        rows = self.sync(cursor)["changes"]["board"]
+        self.assertEqual([row["title"] for row in rows], ["Imported"])
+
+    def test_rows_given_to_another_user(self):
+        """Test rows given away are deleted for one user and new to the other."""
+        other = create_test_user(email=TEST_OTHER_USER_EMAIL)
+        cursor = self.sync()["cursor"]
+
+        self.board.user = other
+        self.board.save()
+
+        deleted = self.sync(cursor)["deleted"]
+        self.assertEqual(deleted["board"], [self.board.pk])
+        self.assertEqual(deleted["task"], [self.task.pk])
+        self.client = APIClient()
+        self.client.force_authenticate(other)
+        data = self.sync("0")
+        self.assertEqual(self.ids(data)["task"], [self.task.pk])
+        self.assertEqual(
+            self.ids(data)["subtask"], [Subtask.objects.get(task=self.task).pk]
+        )
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected."""
+        res = self.client.get(SYNC_URL, {"since": "yesterday"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_cursor(self):
+        """Test cursors before purged tombstones need a full sync."""
+        expired = self.sync()["cursor"]
+        _ = Subtask.objects.get(task=self.task).delete()
+        _ = Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=365))
+        current = self.sync()["cursor"]
+
+        self.assertEqual(purge_tombstones(), 1)
+
+        res = self.client.get(SYNC_URL, {"since": expired})
+        self.assertEqual(res.status_code, status.HTTP_410_GONE)
+        self.assertEqual(self.sync(current)["cursor"], current)
+
+    def test_purge_tombstones(self):
+        """Test old tombstones are purged."""
+        _ = Subtask.objects.get(task=self.task).delete()
+        _ = Tombstone.objects.create(
+            user=self.user,
+            kind=Tombstone.TASK,
+            object_id=1,
+            seq=1,
+            deleted_at=timezone.now() - timedelta(days=365),
+        )
+
+        self.assertEqual(purge_tombstones(), 1)
+        self.assertEqual(Tombstone.objects.get().kind, Tombstone.SUBTASK)
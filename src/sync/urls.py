@@ -0,0 +1,13 @@
+"""
+URL mappings for the sync app.
+"""
+
+from django.urls import path
+
+from sync import views
+
+app_name = "sync"
+
+urlpatterns = [
+    path("", views.SyncView.as_view(), name="sync"),
+]
@@ -0,0 +1,44 @@
+"""
+Views for the sync APIs.
+"""
+
+from typing import cast
+
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import User
+from sync.changes import Cursor, CursorExpired, sync_changes
+from user.authentication import CachedTokenAuthentication
+
+
+class SyncView(APIView):
+    """View for the rows changed since a previous sync."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """
+        Return the authenticated user's categories, contacts, boards, lists,
+        tasks and subtasks changed after the ``since`` cursor, the ids of
+        those deleted after it, and the ``cursor`` of the next sync. Without
+        ``since`` every row is returned. An expired cursor is answered with
+        410; sync again without ``since``.
+        """
+        value = request.query_params.get("since")
+        try:
+            since = None if value is None else Cursor.parse(value)
+        except ValueError:
+            raise serializers.ValidationError({"since": ["Invalid cursor."]})
+        try:
+            changes, cursor = sync_changes(cast(User, request.user).pk, since)
+        except CursorExpired:
+            return Response(
+                {"detail": "The cursor expired, sync again without since."},
+                status=status.HTTP_410_GONE,
+            )
+        return Response({"cursor": str(cursor), **changes})
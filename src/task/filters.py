@@ -0,0 +1,131 @@
+"""
+Query parameter filters for the task APIs.
+"""
+
+from typing import Any, override
+
+from django.db.models import Exists, OuterRef, QuerySet
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+from rest_framework.serializers import (
+    ChoiceField,
+    DateField,
+    IntegerField,
+    ListField,
+    Serializer,
+)
+from rest_framework.views import APIView
+
+from core.models import Task
+from core.utils import PRIORITY_CHOICES
+
+
+class TaskFilterSerializer(Serializer[dict[str, Any]]):
+    """
+    Task filters. List filters may be repeated and match any of their values;
+    different filters must all match.
+    """
+
+    priority = ListField(child=ChoiceField(choices=PRIORITY_CHOICES), required=False)
+    category = ListField(child=IntegerField(), required=False)
+    assignee = ListField(child=IntegerField(), required=False)
+    list_of_tasks = ListField(child=IntegerField(), required=False)
+    due_date_after = DateField(required=False)
+    due_date_before = DateField(required=False)
+
+    LIST_FIELDS = ("priority", "category", "assignee", "list_of_tasks")
+
+    # OpenAPI description and schema of each parameter.
+    PARAMETERS: dict[str, tuple[str, dict[str, Any]]] = {
+        "priority": (
+            "Only tasks with this priority (repeatable).",
+            {
+                "type": "array",
+                "items": {"type": "string", "enum": [p for p, _ in PRIORITY_CHOICES]},
+            },
+        ),
+        "category": (
+            "Only tasks of this category id (repeatable).",
+            {"type": "array", "items": {"type": "integer"}},
+        ),
+        "assignee": (
+            "Only tasks assigned to this contact id (repeatable).",
+            {"type": "array", "items": {"type": "integer"}},
+        ),
+        "list_of_tasks": (
+            "Only tasks in this list id (repeatable).",
+            {"type": "array", "items": {"type": "integer"}},
+        ),
+        "due_date_after": (
+            "Only tasks due on or after this date.",
+            {"type": "string", "format": "date"},
+        ),
+        "due_date_before": (
+            "Only tasks due on or before this date.",
+            {"type": "string", "format": "date"},
+        ),
+    }
+
+
+def filter_tasks(queryset: QuerySet[Task], filters: dict[str, Any]) -> QuerySet[Task]:
+    """Apply validated ``TaskFilterSerializer`` data to ``queryset``."""
+    if filters.get("priority"):
+        queryset = queryset.filter(priority__in=filters["priority"])
+    if filters.get("category"):
+        queryset = queryset.filter(category_id__in=filters["category"])
+    if filters.get("list_of_tasks"):
+        queryset = queryset.filter(list_of_tasks_id__in=filters["list_of_tasks"])
+    if filters.get("assignee"):
+        # A semi-join instead of a join, so tasks with several matching
+        # assignees are not repeated.
+        queryset = queryset.filter(
+            Exists(
+                Task.assignees.through.objects.filter(
+                    task_id=OuterRef("pk"), contact_id__in=filters["assignee"]
+                )
+            )
+        )
+    if "due_date_after" in filters:
+        queryset = queryset.filter(due_date__gte=filters["due_date_after"])
+    if "due_date_before" in filters:
+        queryset = queryset.filter(due_date__lte=filters["due_date_before"])
+    return queryset
+
+
+class TaskFilter(BaseFilterBackend):
+    """Filter tasks by priority, category, assignee, list and due date."""
+
+    @override
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet[Any], view: APIView
+    ) -> QuerySet[Any]:
+        params = request.query_params
+        data: dict[str, Any] = {
+            name: params.getlist(name)
+            for name in TaskFilterSerializer.LIST_FIELDS
+            if name in params
+        }
+        data.update(
+            (name, params[name])
+            for name in ("due_date_after", "due_date_before")
+            if name in params
+        )
+        if not data:
+            return queryset
+        serializer = TaskFilterSerializer(data=data)
+        _ = serializer.is_valid(raise_exception=True)
+        return filter_tasks(queryset, serializer.validated_data)
+
+    @override
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, Any]]:
+        parameters = TaskFilterSerializer.PARAMETERS
+        return [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": schema,
+            }
+            for name, (description, schema) in parameters.items()
+        ]
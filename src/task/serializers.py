@@ -2,25 +2,64 @@
 Serializers for Task APIs
 """
 
-from typing import TYPE_CHECKING, Any, override
+from collections import Counter
+from collections.abc import Callable
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, cast, override
 
+from django.db import transaction
+from django.db.models import Max, QuerySet
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from rest_framework.relations import ManyRelatedField, RelatedField
 from rest_framework.serializers import (
+    DateTimeField,
     IntegerField,
+    ListField,
+    ListSerializer,
     ModelSerializer,
     PrimaryKeyRelatedField,
+    Serializer,
 )
 
 from category.serializers import CategorySerializer
-from common.serializers_base import TaskModelSerializer
+from changefeed.publish import mark_moved, publish_reordered
+from common.serializers_base import (
+    FieldSelection,
+    QueryPlanMixin,
+    SubtaskModelSerializer,
+    TaskModelSerializer,
+)
 from contact.serializers import ContactSerializer
-from core.models import Category, Contact, ListOfTasks, Subtask, Task
+from core.models import (
+    Category,
+    Contact,
+    ListOfTasks,
+    Subtask,
+    Task,
+    User,
+    next_sync_seq,
+)
+from core.ordering import (
+    close_gaps,
+    deferred_delete_shifts,
+    order_step,
+    sparse_ordering,
+)
+from core.signals import bulk_task_changes
+from search.documents import index_tasks
 from subtask.serializers import SubtaskSerializer
 
+BULK_MAX_ITEMS = 1000
 
-class TaskSerializer(TaskModelSerializer):
+
+class TaskSerializer(QueryPlanMixin, TaskModelSerializer):
     """Serializer for tasks."""
 
+    select_related_fields = {"category": "category"}
+    prefetch_related_fields = {"assignees": "assignees", "subtasks": "subtasks"}
+    expandable_fields = ("category", "assignees", "subtasks")
+
     subtasks: SubtaskSerializer = SubtaskSerializer(many=True, required=False)
     category: RelatedField[Category, Category, Any] | ManyRelatedField = (
         PrimaryKeyRelatedField(
@@ -64,15 +103,39 @@ class TaskSerializer(TaskModelSerializer):
             "updated_at",
         ]
 
+    @override
+    @classmethod
+    def get_prefetch_queryset(
+        cls, field_name: str, selection: FieldSelection
+    ) -> QuerySet[Any] | None:
+        if field_name == "subtasks":
+            return Subtask.objects.order_by("-id")
+        return None
+
+    @cached_property
+    def category_serializer(self) -> CategorySerializer:
+        return CategorySerializer()
+
+    @cached_property
+    def assignees_serializer(self) -> ListSerializer[Any]:
+        return ListSerializer(child=ContactSerializer())
+
     @override
     def create(self, validated_data: dict[str, Any]) -> Task:
         subtasks_data = validated_data.pop("subtasks", [])
 
         task = super().create(validated_data)
 
-        _ = Subtask.objects.bulk_create(
-            [Subtask(task=task, **sd) for sd in subtasks_data]
-        )
+        if subtasks_data:
+            owner_id = cast(int, task.owner_id)
+            with transaction.atomic():
+                seq = next_sync_seq(owner_id)
+                _ = Subtask.objects.bulk_create(
+                    Subtask(task=task, owner_id=owner_id, seq=seq, **sd)
+                    for sd in subtasks_data
+                )
+            # bulk_create sends no signals, so add the titles to the index here.
+            index_tasks([task.pk])
 
         return task
 
@@ -86,12 +149,19 @@ class TaskSerializer(TaskModelSerializer):
     @override
     def to_representation(self, instance: Task) -> dict[str, Any]:
         representation = super().to_representation(instance)
-        representation["category"] = (
-            CategorySerializer(instance.category).data if instance.category else None
-        )
-        representation["assignees"] = ContactSerializer(
-            instance.assignees.all(), many=True
-        ).data
+        # Reuse one nested serializer per parent instead of building new ones
+        # for every task; the related rows come from the planned queryset.
+        # Collapsed relations keep the ids rendered by the related fields.
+        if self.is_expanded("category"):
+            representation["category"] = (
+                self.category_serializer.to_representation(instance.category)
+                if instance.category
+                else None
+            )
+        if self.is_expanded("assignees"):
+            representation["assignees"] = self.assignees_serializer.to_representation(
+                instance.assignees.all()
+            )
         return representation
 
     @override
@@ -105,3 +175,384 @@ class TaskSerializer(TaskModelSerializer):
 
     if TYPE_CHECKING:
         Meta: type[ModelSerializer.Meta]
+
+
+class BulkSubtaskSerializer(SubtaskModelSerializer):
+    """Subtask nested in a bulk task item; the task is implied."""
+
+    class Meta:  # pyright: ignore[reportRedeclaration]
+        model = Subtask
+        fields = ["title", "done"]
+
+    if TYPE_CHECKING:
+        Meta: type[ModelSerializer.Meta]
+
+
+class BulkTaskListSerializer(ListSerializer[Any]):
+    """
+    Validates and writes a batch of tasks with a fixed number of queries.
+
+    Related ids are resolved with one query per table and must belong to the
+    requesting user. Errors are reported per item, aligned with the input
+    list, and nothing is written unless every item is valid. Created tasks,
+    and tasks moved to another list, are appended to the top of their list
+    in input order; the remaining tasks keep their order values. Like the
+    single task endpoint, subtasks are only written when creating.
+    """
+
+    invalid_pk_message = 'Invalid pk "{pk_value}" - object does not exist.'
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)  # pyright: ignore[reportUnknownMemberType]
+        self.tasks_by_id: dict[int, Task] = {}
+        self.item_errors: list[Any] = []
+
+    @property
+    def user(self) -> User:
+        return self.context["request"].user
+
+    @override
+    def to_internal_value(self, data: Any) -> list[dict[str, Any]]:
+        self.item_errors = []
+        return self.validate_relations(super().to_internal_value(data))
+
+    @override
+    def run_child_validation(self, data: Any) -> dict[str, Any] | None:
+        # Keep going after an invalid item, so that ``validate_relations`` can report
+        # field and relation errors of the whole batch at once.
+        try:
+            validated = super().run_child_validation(data)
+        except ValidationError as exc:
+            self.item_errors.append(exc.detail)
+            return None
+        self.item_errors.append({})
+        return validated
+
+    def validate_relations(
+        self, attrs: list[dict[str, Any] | None]
+    ) -> list[dict[str, Any]]:
+        """Resolve the related ids of all items and report errors per item."""
+        errors = self.item_errors
+        valid = [
+            (item, errors[index])
+            for index, item in enumerate(attrs)
+            if item is not None
+        ]
+        updating = self.instance is not None
+        self.tasks_by_id = {}
+        duplicates: set[int] = set()
+        if self.instance is not None:
+            ids = [item["id"] for item, _ in valid if "id" in item]
+            tasks: QuerySet[Task] = self.instance
+            self.tasks_by_id = tasks.filter(pk__in=ids).in_bulk()
+            duplicates = {pk for pk, count in Counter(ids).items() if count > 1}
+
+        category_ids = set(
+            Category.objects.filter(
+                user=self.user,
+                pk__in={item["category"] for item, _ in valid if "category" in item},
+            ).values_list("pk", flat=True)
+        )
+        list_ids = set(
+            ListOfTasks.objects.filter(
+                owner=self.user,
+                pk__in={
+                    item["list_of_tasks"]
+                    for item, _ in valid
+                    if "list_of_tasks" in item
+                },
+            ).values_list("pk", flat=True)
+        )
+        contact_ids = set(
+            Contact.objects.filter(
+                user=self.user,
+                pk__in={pk for item, _ in valid for pk in item.get("assignees", [])},
+            ).values_list("pk", flat=True)
+        )
+
+        for item, item_errors in valid:
+            if updating:
+                if "id" not in item:
+                    item_errors["id"] = ["This field is required."]
+                elif item["id"] in duplicates:
+                    item_errors["id"] = ["Each task may only be updated once."]
+                elif item["id"] not in self.tasks_by_id:
+                    item_errors["id"] = [
+                        self.invalid_pk_message.format(pk_value=item["id"])
+                    ]
+            else:
+                item_errors.update(
+                    {
+                        field: ["This field is required."]
+                        for field in ("category", "list_of_tasks")
+                        if field not in item
+                    }
+                )
+            if "category" in item and item["category"] not in category_ids:
+                item_errors["category"] = [
+                    self.invalid_pk_message.format(pk_value=item["category"])
+                ]
+            if "list_of_tasks" in item and item["list_of_tasks"] not in list_ids:
+                item_errors["list_of_tasks"] = [
+                    self.invalid_pk_message.format(pk_value=item["list_of_tasks"])
+                ]
+            missing_contacts = [
+                pk for pk in item.get("assignees", []) if pk not in contact_ids
+            ]
+            if missing_contacts:
+                item_errors["assignees"] = [
+                    self.invalid_pk_message.format(pk_value=pk)
+                    for pk in missing_contacts
+                ]
+
+        if any(errors):
+            raise ValidationError(errors)
+        return [item for item in attrs if item is not None]
+
+    def next_orders(self, list_ids: set[int]) -> dict[int, int]:
+        """Lock ``list_ids`` and return the next free order of each list."""
+        _ = list(
+            ListOfTasks.objects.select_for_update()
+            .filter(pk__in=list_ids)
+            .values_list("pk", flat=True)
+        )
+        max_orders = dict(
+            Task.objects.filter(list_of_tasks_id__in=list_ids)
+            .values("list_of_tasks_id")
+            .annotate(max_order=Max("order"))
+            .order_by()
+            .values_list("list_of_tasks_id", "max_order")
+        )
+        step = order_step()
+        return {pk: max_orders[pk] + step if pk in max_orders else 0 for pk in list_ids}
+
+    @staticmethod
+    def set_assignees(assignees: dict[int, list[int]]) -> None:
+        """Replace the assignees of the tasks in ``assignees``."""
+        through = Task.assignees.through
+        _ = through.objects.filter(task_id__in=assignees).delete()
+        _ = through.objects.bulk_create(
+            through(task_id=task_id, contact_id=contact_id)
+            for task_id, contact_ids in assignees.items()
+            for contact_id in dict.fromkeys(contact_ids)
+        )
+
+    @override
+    def create(self, validated_data: list[dict[str, Any]]) -> list[Task]:
+        with transaction.atomic(), bulk_task_changes(self.user):
+            next_orders = self.next_orders(
+                {item["list_of_tasks"] for item in validated_data}
+            )
+            seq = next_sync_seq(self.user.pk)
+            tasks: list[Task] = []
+            for item in validated_data:
+                list_id = item["list_of_tasks"]
+                fields = {
+                    key: value
+                    for key, value in item.items()
+                    if key not in ("id", "assignees", "subtasks")
+                }
+                fields["list_of_tasks_id"] = fields.pop("list_of_tasks")
+                fields["category_id"] = fields.pop("category")
+                tasks.append(
+                    Task(**fields, owner=self.user, order=next_orders[list_id], seq=seq)
+                )
+                next_orders[list_id] += order_step()
+            tasks = Task.objects.bulk_create(tasks)
+
+            self.set_assignees(
+                {
+                    task.pk: item["assignees"]
+                    for task, item in zip(tasks, validated_data)
+                    if "assignees" in item
+                }
+            )
+            _ = Subtask.objects.bulk_create(
+                Subtask(task=task, owner_id=task.owner_id, seq=seq, **subtask)
+                for task, item in zip(tasks, validated_data)
+                for subtask in item.get("subtasks", [])
+            )
+        return tasks
+
+    @override
+    def update(
+        self, instance: QuerySet[Task], validated_data: list[dict[str, Any]]
+    ) -> list[Task]:
+        with transaction.atomic(), bulk_task_changes(self.user):
+            tasks = [self.tasks_by_id[item["id"]] for item in validated_data]
+            moved = {
+                item["list_of_tasks"]
+                for task, item in zip(tasks, validated_data)
+                if item.get("list_of_tasks", task.list_of_tasks_id)
+                != task.list_of_tasks_id
+            }
+            next_orders = self.next_orders(moved)
+
+            now = timezone.now()
+            seq = next_sync_seq(self.user.pk)
+            fields = {"updated_at", "seq"}
+            for task, item in zip(tasks, validated_data):
+                for key, value in item.items():
+                    if key in ("title", "description", "due_date", "priority"):
+                        setattr(task, key, value)
+                        fields.add(key)
+                if "category" in item:
+                    task.category_id = item["category"]
+                    fields.add("category")
+                list_id = item.get("list_of_tasks", task.list_of_tasks_id)
+                if list_id != task.list_of_tasks_id:
+                    task.list_of_tasks_id = list_id
+                    task.order = next_orders[list_id]
+                    next_orders[list_id] += order_step()
+                    fields.update(("list_of_tasks", "order"))
+                task.updated_at = now
+                task.seq = seq
+
+            _ = Task.objects.bulk_update(tasks, sorted(fields))
+            self.set_assignees(
+                {
+                    task.pk: item["assignees"]
+                    for task, item in zip(tasks, validated_data)
+                    if "assignees" in item
+                }
+            )
+        return tasks
+
+
+class BulkTaskSerializer(TaskModelSerializer):
+    """Item of a bulk task request; relations are given as plain ids."""
+
+    id: IntegerField = IntegerField(required=False)
+    category: IntegerField = IntegerField(required=False)
+    assignees: ListField = ListField(child=IntegerField(), required=False)
+    subtasks: BulkSubtaskSerializer = BulkSubtaskSerializer(many=True, required=False)
+    list_of_tasks: IntegerField = IntegerField(required=False)
+
+    class Meta:  # pyright: ignore[reportRedeclaration]
+        model = Task
+        fields = [
+            "id",
+            "title",
+            "description",
+            "category",
+            "assignees",
+            "subtasks",
+            "due_date",
+            "priority",
+            "list_of_tasks",
+        ]
+        list_serializer_class = BulkTaskListSerializer
+
+    @override
+    @classmethod
+    def many_init(cls, *args: Any, **kwargs: Any) -> BulkTaskListSerializer:
+        kwargs.setdefault("max_length", BULK_MAX_ITEMS)
+        kwargs.setdefault("allow_empty", False)
+        many_init: Callable[..., object] = getattr(super(), "many_init")
+        return cast(BulkTaskListSerializer, many_init(*args, **kwargs))
+
+    if TYPE_CHECKING:
+        Meta: type[ModelSerializer.Meta]
+
+
+class BulkTaskDeleteSerializer(Serializer[Any]):
+    """Ids of a batch of tasks to delete."""
+
+    ids: ListField = ListField(
+        child=IntegerField(), allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
+
+    @property
+    def user(self) -> User:
+        return self.context["request"].user
+
+    def validate_ids(self, ids: list[int]) -> list[int]:
+        owned = set(
+            Task.objects.filter(owner=self.user, pk__in=ids).values_list(
+                "pk", flat=True
+            )
+        )
+        errors = {
+            str(index): [BulkTaskListSerializer.invalid_pk_message.format(pk_value=pk)]
+            for index, pk in enumerate(ids)
+            if pk not in owned
+        }
+        if errors:
+            raise ValidationError(errors)
+        return ids
+
+    def delete(self) -> int:
+        """
+        Delete the validated tasks with their subtasks in one transaction.
+        The dense engine closes the gaps once per list afterwards, instead
+        of shifting the siblings of every deleted task.
+        """
+        tasks = Task.objects.filter(pk__in=self.validated_data["ids"])
+        with transaction.atomic(), bulk_task_changes(self.user):
+            list_ids = set(tasks.values_list("list_of_tasks_id", flat=True))
+            with deferred_delete_shifts():
+                deleted, _ = tasks.delete()
+            if not sparse_ordering():
+                for list_id in sorted(list_ids):
+                    _ = close_gaps(Task.objects.filter(list_of_tasks_id=list_id))
+        return deleted
+
+
+class TaskMoveSerializer(Serializer[Task]):
+    """
+    Target of a task move. Answers with the new order values only: those of
+    the task and those of the other tasks that had to be renumbered.
+    """
+
+    list_of_tasks: IntegerField = IntegerField()
+    position: IntegerField = IntegerField(min_value=0)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.reordered: dict[int, int] = {}
+
+    @property
+    def user(self) -> User:
+        return self.context["request"].user
+
+    def validate_list_of_tasks(self, list_id: int) -> int:
+        if not ListOfTasks.objects.filter(owner=self.user, pk=list_id).exists():
+            raise ValidationError(
+                BulkTaskListSerializer.invalid_pk_message.format(pk_value=list_id)
+            )
+        return list_id
+
+    @override
+    def update(self, instance: Task, validated_data: dict[str, Any]) -> Task:
+        with transaction.atomic():
+            task = Task.objects.select_for_update().get(pk=instance.pk)
+            # Lock the lists in a fixed order, so that concurrent moves
+            # between them wait for each other instead of deadlocking.
+            _ = list(
+                ListOfTasks.objects.select_for_update()
+                .filter(pk__in={task.list_of_tasks_id, validated_data["list_of_tasks"]})
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            task.list_of_tasks_id = validated_data["list_of_tasks"]
+            mark_moved(task)
+            # Positions count from the top of the list, as tasks are listed.
+            self.reordered = task.move_to_position(
+                validated_data["position"], reverse=True
+            )
+            # Relabelled with queryset updates, which send no signals.
+            publish_reordered(task, self.reordered)
+        return task
+
+    @override
+    def to_representation(self, instance: Task) -> dict[str, Any]:
+        return {
+            "id": instance.pk,
+            "list_of_tasks": instance.list_of_tasks_id,
+            "order": instance.order,
+            "updated_at": DateTimeField().to_representation(instance.updated_at),
+            "reordered": [
+                {"id": pk, "order": order}
+                for pk, order in sorted(self.reordered.items())
+            ],
+        }
@@ -0,0 +1,239 @@
+"""
+Tests for the bulk task APIs.
+"""
+
+from typing import Any, override
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import Category, Contact, ListOfTasks, Subtask, Task
+from core.ordering import order_step
+from core.tests.api_test_case import PrivateAPITestCase
+from core.tests.utils import (
+    create_test_category,
+    create_test_contact,
+    create_test_list_of_tasks,
+    create_test_task,
+)
+from summary.counters import verify
+
+
+def order_updates(queries: CaptureQueriesContext) -> int:
+    return sum(
+        query["sql"].startswith('UPDATE "core_task" SET "order"')
+        for query in queries.captured_queries
+    )
+
+
+class PrivateBulkTaskAPITests(PrivateAPITestCase):
+    """Test authenticated bulk task requests."""
+
+    user_category = Category()
+    user_contact = Contact()
+    user_list_of_tasks = ListOfTasks()
+    other_user_category = Category()
+    url = ""
+
+    VIEW_NAME = "task"
+
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+        self.user_list_of_tasks = create_test_list_of_tasks(user=self.user)
+        self.user_category = create_test_category(user=self.user)
+        self.user_contact = create_test_contact(self.user)
+        self.other_user_category = create_test_category(user=self.other_user)
+        self.url = self.api_url("bulk", [])
+
+    def task_payload(self, index: int, **params: Any) -> dict[str, Any]:
+        return {
+            "title": f"Task {index}",
+            "category": self.user_category.pk,
+            "assignees": [self.user_contact.pk],
+            "subtasks": [{"title": f"Subtask {index}", "done": False}],
+            "priority": "Medium",
+            "list_of_tasks": self.user_list_of_tasks.pk,
+            **params,
+        }
+
+    def test_bulk_create_tasks(self):
+        """Test creating a batch appends the tasks in input order."""
+        existing = create_test_task(
+            user=self.user, list_of_tasks=self.user_list_of_tasks, order=0
+        )
+        payload = [self.task_payload(index) for index in range(3)]
+
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [task["title"] for task in res.data], ["Task 0", "Task 1", "Task 2"]
+        )
+        step = order_step()
+        self.assertEqual(
+            [task["order"] for task in res.data], [step, 2 * step, 3 * step]
+        )
+        self.assertEqual(res.data[0]["assignees"][0]["id"], self.user_contact.pk)
+        self.assertEqual(res.data[0]["subtasks"][0]["title"], "Subtask 0")
+        self.assertEqual(
+            Subtask.objects.filter(task__title__startswith="Task ").count(), 3
+        )
+        existing.refresh_from_db()
+        self.assertEqual(existing.order, 0)
+        self.assertEqual(verify([self.user.pk]), [])
+
+    def test_bulk_create_query_count_is_constant(self):
+        """Test the number of queries does not grow with the batch size."""
+        with CaptureQueriesContext(connection) as few_tasks:
+            res = self.client.post(
+                self.url,
+                [self.task_payload(index) for index in range(2)],
+                format="json",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as many_tasks:
+            res = self.client.post(
+                self.url,
+                [self.task_payload(index) for index in range(2, 40)],
+                format="json",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(len(many_tasks), len(few_tasks))
+
+    def test_bulk_create_reports_item_errors(self):
+        """Test invalid items are reported by index and nothing is created."""
+        payload = [
+            self.task_payload(0),
+            self.task_payload(1, category=self.other_user_category.pk),
+            {"title": "Task 2", "category": self.user_category.pk},
+            self.task_payload(3, priority="Someday"),
+        ]
+
+        res = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data), 4)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("category", res.data[1])
+        self.assertIn("list_of_tasks", res.data[2])
+        self.assertIn("priority", res.data[3])
+        self.assertFalse(Task.objects.filter(title__startswith="Task ").exists())
+
+    def test_bulk_create_too_many_tasks_error(self):
+        """Test batches larger than the limit are rejected."""
+        with patch("task.serializers.BULK_MAX_ITEMS", 2):
+            res = self.client.post(
+                self.url,
+                [self.task_payload(index) for index in range(3)],
+                format="json",
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.filter(title__startswith="Task ").exists())
+
+    def test_bulk_update_tasks(self):
+        """Test updating a batch changes fields, lists and assignees."""
+        tasks = [
+            create_test_task(
+                user=self.user, list_of_tasks=self.user_list_of_tasks, order=index
+            )
+            for index in range(2)
+        ]
+        done = create_test_list_of_tasks(
+            self.user, board=self.user_list_of_tasks.board, name="Done", order=1
+        )
+        payload = [
+            {"id": tasks[0].pk, "priority": "Low", "assignees": [self.user_contact.pk]},
+            {"id": tasks[1].pk, "list_of_tasks": done.pk, "title": "Shipped"},
+        ]
+
+        res = self.client.patch(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        for task in tasks:
+            task.refresh_from_db()
+        self.assertEqual(tasks[0].priority, "Low")
+        self.assertEqual(list(tasks[0].assignees.all()), [self.user_contact])
+        self.assertEqual(tasks[1].list_of_tasks, done)
+        self.assertEqual(tasks[1].title, "Shipped")
+        self.assertEqual(tasks[1].order, 0)
+        self.assertGreater(tasks[1].updated_at, tasks[1].created_at)
+        self.assertEqual(res.data[1]["list_of_tasks"], done.pk)
+        self.assertEqual(verify([self.user.pk]), [])
+
+    def test_bulk_update_other_user_task_error(self):
+        """Test tasks of other users cannot be updated."""
+        task = create_test_task(user=self.user, list_of_tasks=self.user_list_of_tasks)
+        other_user_task = create_test_task(user=self.other_user)
+        payload = [
+            {"id": task.pk, "title": "Mine"},
+            {"id": other_user_task.pk, "title": "Theirs"},
+        ]
+
+        res = self.client.patch(self.url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", res.data[1])
+        task.refresh_from_db()
+        self.assertNotEqual(task.title, "Mine")
+
+    def test_bulk_delete_tasks(self):
+        """Test deleting a batch removes the tasks and their subtasks."""
+        res = self.client.post(
+            self.url, [self.task_payload(index) for index in range(3)], format="json"
+        )
+        ids = [task["id"] for task in res.data]
+
+        res = self.client.delete(self.url, {"ids": ids[:2]}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            list(Task.objects.filter(pk__in=ids).values_list("pk", flat=True)), ids[2:]
+        )
+        self.assertEqual(Subtask.objects.filter(task_id__in=ids).count(), 1)
+        self.assertEqual(verify([self.user.pk]), [])
+
+    def test_bulk_delete_closes_gaps_once(self):
+        """Test a batch shifts the remaining tasks once, not per deleted task."""
+        res = self.client.post(
+            self.url, [self.task_payload(index) for index in range(30)], format="json"
+        )
+        ids = [task["id"] for task in res.data]
+
+        with CaptureQueriesContext(connection) as few_tasks:
+            res = self.client.delete(self.url, {"ids": ids[:2]}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        with CaptureQueriesContext(connection) as many_tasks:
+            res = self.client.delete(self.url, {"ids": ids[2:20:2]}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(order_updates(many_tasks), order_updates(few_tasks))
+        remaining = Task.objects.filter(list_of_tasks=self.user_list_of_tasks)
+        self.assertEqual(
+            list(remaining.order_by("order").values_list("pk", flat=True)),
+            ids[3:20:2] + ids[20:],
+        )
+        if order_step() == 1:
+            self.assertEqual(
+                list(remaining.order_by("order").values_list("order", flat=True)),
+                list(range(remaining.count())),
+            )
+        self.assertEqual(verify([self.user.pk]), [])
+
+    def test_bulk_delete_other_user_task_error(self):
+        """Test a batch with another user's task deletes nothing."""
+        task = create_test_task(user=self.user, list_of_tasks=self.user_list_of_tasks)
+        other_user_task = create_test_task(user=self.other_user)
+
+        res = self.client.delete(
+            self.url, {"ids": [task.pk, other_user_task.pk]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("1", res.json()["ids"])
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())
@@ -0,0 +1,93 @@
+"""
+Tests for selecting the fields of the task APIs.
+"""
+
+from typing import override
+
+from rest_framework import status
+
+from core.models import Subtask, Task
+from core.tests.api_test_case import PrivateAPITestCase
+from core.tests.utils import create_test_list_of_tasks, create_test_populated_task
+
+
+class PrivateTaskFieldsAPITests(PrivateAPITestCase):
+    """Test ?fields= and ?expand= on the task APIs."""
+
+    task = Task()
+
+    VIEW_NAME = "task"
+
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+        list_of_tasks = create_test_list_of_tasks(self.user)
+        self.task = create_test_populated_task(self.user, list_of_tasks, 0)
+
+    def get_task(self, **params: str):
+        res = self.client.get(self.api_url("detail", [self.task.pk]), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_default_expands_relations(self):
+        """Test without parameters relations are rendered as nested objects."""
+        data = self.get_task()
+
+        self.assertEqual(data["category"]["name"], "Category 0")
+        self.assertEqual(data["assignees"][0]["name"], "Contact 0")
+        self.assertEqual(data["subtasks"][0]["title"], "Subtask 0")
+
+    def test_select_fields(self):
+        """Test only the requested fields are rendered."""
+        # the ETag, then the task without its relations
+        with self.assertNumQueries(2):
+            data = self.get_task(fields="id,title,order,priority")
+
+        self.assertEqual(
+            data,
+            {
+                "id": self.task.pk,
+                "title": "Task 0",
+                "order": self.task.order,
+                "priority": self.task.priority,
+            },
+        )
+
+    def test_ids_only(self):
+        """Test an empty expand renders every relation as ids."""
+        subtask = Subtask.objects.get(task=self.task)
+        contact = self.task.assignees.get()
+
+        data = self.get_task(expand="")
+
+        self.assertEqual(data["category"], self.task.category_id)
+        self.assertEqual(data["assignees"], [contact.pk])
+        self.assertEqual(data["subtasks"], [subtask.pk])
+        self.assertEqual(data["title"], "Task 0")
+
+    def test_expand_some_relations(self):
+        """Test listed relations are expanded and the others collapsed."""
+        res = self.client.get(
+            self.api_url("list", []),
+            {"fields": "id,category,assignees", "expand": "category"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        data = res.data["results"][0]
+        self.assertEqual(set(data), {"id", "category", "assignees"})
+        self.assertEqual(data["category"]["name"], "Category 0")
+        self.assertEqual(data["assignees"], [self.task.assignees.get().pk])
+
+    def test_fields_do_not_affect_writes(self):
+        """Test a restricted response still accepts and saves every field."""
+        res = self.client.patch(
+            self.api_url("detail", [self.task.pk]) + "?fields=id",
+            {"title": "Renamed", "priority": "Low"},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"id": self.task.pk})
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Renamed")
+        self.assertEqual(self.task.priority, "Low")
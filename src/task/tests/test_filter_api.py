@@ -0,0 +1,170 @@
+"""
+Tests for filtering the task APIs.
+"""
+
+from datetime import date
+from typing import Any, override
+
+from django.db import connection
+from django.db.models import QuerySet
+from rest_framework import status
+
+from core.models import Category, Contact, ListOfTasks, Task
+from core.tests.api_test_case import PrivateAPITestCase
+from core.tests.utils import (
+    create_test_category,
+    create_test_contact,
+    create_test_list_of_tasks,
+    create_test_task,
+)
+from task.filters import filter_tasks
+
+
+class PrivateTaskFilterAPITests(PrivateAPITestCase):
+    """Test filtering the task list."""
+
+    todo = ListOfTasks()
+    done = ListOfTasks()
+    bug = Category()
+    feature = Category()
+    contact = Contact()
+
+    VIEW_NAME = "task"
+
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+        self.todo = create_test_list_of_tasks(self.user, name="TODO")
+        self.done = create_test_list_of_tasks(
+            self.user, board=self.todo.board, name="Done", order=1
+        )
+        self.bug = create_test_category(self.user, name="Bug")
+        self.feature = create_test_category(self.user, name="Feature")
+        self.contact = create_test_contact(self.user)
+
+        self.create_task("Crash", self.bug, self.todo, "Urgent", date(2030, 1, 5))
+        self.create_task("Typo", self.bug, self.done, "Low", date(2030, 1, 20))
+        self.create_task("Export", self.feature, self.todo, "Medium", date(2030, 2, 1))
+        self.create_task("Import", self.feature, self.done, "Urgent", date(2030, 3, 1))
+        Task.objects.get(title="Export").assignees.add(self.contact)
+        _ = create_test_task(self.other_user, title="Theirs", priority="Urgent")
+
+    def create_task(
+        self,
+        title: str,
+        category: Category,
+        list_of_tasks: ListOfTasks,
+        priority: str,
+        due_date: date,
+    ) -> None:
+        _ = create_test_task(
+            self.user,
+            category=category,
+            list_of_tasks=list_of_tasks,
+            title=title,
+            priority=priority,
+            due_date=due_date,
+            order=None,
+        )
+
+    def filtered_titles(self, **params: Any) -> list[str]:
+        res = self.client.get(self.api_url("list", []), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return sorted(task["title"] for task in res.data["results"])
+
+    def test_filter_by_priority(self):
+        """Test repeated priorities match any of them."""
+        self.assertEqual(self.filtered_titles(priority="Urgent"), ["Crash", "Import"])
+        self.assertEqual(
+            self.filtered_titles(priority=["Urgent", "Low"]),
+            ["Crash", "Import", "Typo"],
+        )
+
+    def test_filter_by_category_and_list(self):
+        """Test category and list filters combine."""
+        self.assertEqual(self.filtered_titles(category=self.bug.pk), ["Crash", "Typo"])
+        self.assertEqual(
+            self.filtered_titles(category=self.bug.pk, list_of_tasks=self.done.pk),
+            ["Typo"],
+        )
+
+    def test_filter_by_assignee(self):
+        """Test tasks are filtered by assignee without duplicates."""
+        other_contact = create_test_contact(
+            self.user, name="Other", email="other@example.com", phone_number=""
+        )
+        Task.objects.get(title="Export").assignees.add(other_contact)
+
+        self.assertEqual(
+            self.filtered_titles(assignee=[self.contact.pk, other_contact.pk]),
+            ["Export"],
+        )
+
+    def test_filter_by_due_date_range(self):
+        """Test the due date bounds are inclusive."""
+        self.assertEqual(
+            self.filtered_titles(
+                due_date_after="2030-01-20", due_date_before="2030-02-01"
+            ),
+            ["Export", "Typo"],
+        )
+
+    def test_invalid_filter_error(self):
+        """Test invalid filter values are rejected."""
+        res = self.client.get(
+            self.api_url("list", []), {"priority": "Someday", "due_date_after": "x"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("priority", res.data)
+        self.assertIn("due_date_after", res.data)
+
+
+class TaskFilterIndexTests(PrivateAPITestCase):
+    """Test the task filters are answered from the composite indexes."""
+
+    def assert_uses_index(self, queryset: QuerySet[Task], *names: str) -> None:
+        if connection.vendor == "postgresql":
+            # Tiny test tables are cheaper to scan than to look up.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in names), plan)
+
+    def test_priority_and_due_date_use_index(self):
+        """Test the priority filter scans the owner, priority, due date index."""
+        queryset = filter_tasks(
+            Task.objects.filter(owner=self.user),
+            {"priority": ["Urgent"], "due_date_after": date(2030, 1, 1)},
+        )
+
+        self.assert_uses_index(queryset, "core_task_owner_priority_idx")
+
+    def test_due_date_uses_index(self):
+        """Test the due date range scans the owner, due date index."""
+        queryset = filter_tasks(
+            Task.objects.filter(owner=self.user),
+            {"due_date_after": date(2030, 1, 1), "due_date_before": date(2030, 2, 1)},
+        )
+
+        self.assert_uses_index(queryset, "core_task_owner_due_idx")
+
+    def test_category_and_due_date_use_index(self):
+        """Test the category filter scans the category, due date index."""
+        queryset = filter_tasks(
+            Task.objects.all(),
+            {"category": [1], "due_date_before": date(2030, 1, 1)},
+        )
+
+        self.assert_uses_index(queryset, "core_task_category_due_idx")
+
+    def test_list_uses_order_index(self):
+        """Test listing a list's tasks in order scans the unique order index."""
+        queryset = filter_tasks(Task.objects.all(), {"list_of_tasks": [1]}).order_by(
+            "-order"
+        )
+
+        # SQLite names the index of a unique constraint itself.
+        self.assert_uses_index(
+            queryset, "unique_order_per_list", "sqlite_autoindex_core_task"
+        )
@@ -0,0 +1,185 @@
+"""
+Tests for the task move API.
+"""
+
+from typing import override
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import ListOfTasks, Task
+from core.tests.api_test_case import PrivateAPITestCase
+from core.tests.utils import create_test_list_of_tasks, create_test_task
+from summary.counters import verify
+
+DENSE = {"ENGINE": "dense"}
+SPARSE = {"ENGINE": "sparse", "GAP": 1024, "REBALANCE_IN_BACKGROUND": False}
+
+
+@override_settings(ORDERING=DENSE)
+class PrivateTaskMoveAPITests(PrivateAPITestCase):
+    """Test authenticated task move requests."""
+
+    todo = ListOfTasks()
+    done = ListOfTasks()
+
+    VIEW_NAME = "task"
+
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+        self.todo = create_test_list_of_tasks(self.user, name="TODO")
+        self.done = create_test_list_of_tasks(
+            self.user, board=self.todo.board, name="Done", order=1
+        )
+
+    def create_tasks(self, list_of_tasks: ListOfTasks, count: int) -> list[Task]:
+        return [
+            create_test_task(
+                self.user,
+                list_of_tasks=list_of_tasks,
+                title=f"{list_of_tasks.name} {index}",
+                order=None,
+            )
+            for index in range(count)
+        ]
+
+    def titles(self, list_of_tasks: ListOfTasks) -> list[str]:
+        """Return the task titles of a list from the top, as they are listed."""
+        return list(
+            Task.objects.filter(list_of_tasks=list_of_tasks)
+            .order_by("-order")
+            .values_list("title", flat=True)
+        )
+
+    def orders(self, list_of_tasks: ListOfTasks) -> list[int]:
+        return list(
+            Task.objects.filter(list_of_tasks=list_of_tasks)
+            .order_by("-order")
+            .values_list("order", flat=True)
+        )
+
+    def move(self, task: Task, list_of_tasks: ListOfTasks, position: int):
+        return self.client.post(
+            self.api_url("move", [task.pk]),
+            {"list_of_tasks": list_of_tasks.pk, "position": position},
+            format="json",
+        )
+
+    def test_move_task_within_list(self):
+        """Test moving a task down its list renumbers the tasks in between."""
+        tasks = self.create_tasks(self.todo, 5)
+
+        res = self.move(tasks[4], self.todo, 2)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.titles(self.todo),
+            ["TODO 3", "TODO 2", "TODO 4", "TODO 1", "TODO 0"],
+        )
+        self.assertEqual(self.orders(self.todo), [4, 3, 2, 1, 0])
+        self.assertEqual(res.data["order"], 2)
+        self.assertEqual(
+            res.data["reordered"],
+            [{"id": tasks[2].pk, "order": 3}, {"id": tasks[3].pk, "order": 4}],
+        )
+
+    def test_move_task_to_other_list(self):
+        """Test moving a task closes its gap and opens one in the target."""
+        todo = self.create_tasks(self.todo, 3)
+        done = self.create_tasks(self.done, 3)
+
+        res = self.move(todo[0], self.done, 1)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.titles(self.todo), ["TODO 2", "TODO 1"])
+        self.assertEqual(self.orders(self.todo), [1, 0])
+        self.assertEqual(
+            self.titles(self.done), ["Done 2", "TODO 0", "Done 1", "Done 0"]
+        )
+        self.assertEqual(self.orders(self.done), [3, 2, 1, 0])
+        self.assertEqual(res.data["list_of_tasks"], self.done.pk)
+        self.assertEqual(res.data["order"], 2)
+        self.assertEqual(
+            res.data["reordered"],
+            [
+                {"id": todo[1].pk, "order": 0},
+                {"id": todo[2].pk, "order": 1},
+                {"id": done[2].pk, "order": 3},
+            ],
+        )
+        self.assertEqual(verify([self.user.pk]), [])
+
+    def test_move_task_past_the_end(self):
+        """Test a position past the end moves the task to the bottom."""
+        tasks = self.create_tasks(self.todo, 3)
+
+        res = self.move(tasks[2], self.todo, 10)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.titles(self.todo), ["TODO 1", "TODO 0", "TODO 2"])
+        self.assertEqual(self.orders(self.todo), [2, 1, 0])
+
+    def test_move_task_to_empty_list(self):
+        """Test moving a task into an empty list."""
+        tasks = self.create_tasks(self.todo, 2)
+
+        res = self.move(tasks[0], self.done, 0)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.titles(self.done), ["TODO 0"])
+        self.assertEqual(self.orders(self.done), [0])
+        self.assertEqual(self.orders(self.todo), [0])
+
+    @override_settings(ORDERING=SPARSE)
+    def test_sparse_move_writes_only_the_task(self):
+        """Test with sparse keys a move writes the moved task only."""
+        todo = self.create_tasks(self.todo, 3)
+        done = self.create_tasks(self.done, 20)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.move(todo[1], self.done, 5)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["reordered"], [])
+        self.assertEqual(self.titles(self.done)[5], "TODO 1")
+        self.assertEqual(res.data["order"], (done[14].order + done[15].order) // 2)
+        self.assertEqual(self.titles(self.todo), ["TODO 2", "TODO 0"])
+        updates = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "core_task"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(verify([self.user.pk]), [])
+
+    def test_move_to_other_user_list_error(self):
+        """Test tasks cannot be moved to lists of other users."""
+        task = self.create_tasks(self.todo, 1)[0]
+        other_user_list = create_test_list_of_tasks(self.other_user)
+
+        res = self.move(task, other_user_list, 0)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("list_of_tasks", res.data)
+        task.refresh_from_db()
+        self.assertEqual(task.list_of_tasks, self.todo)
+
+    def test_move_other_user_task_error(self):
+        """Test tasks of other users cannot be moved."""
+        other_user_task = create_test_task(user=self.other_user)
+
+        res = self.move(other_user_task, self.todo, 0)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_move_negative_position_error(self):
+        """Test positions must not be negative."""
+        task = self.create_tasks(self.todo, 1)[0]
+
+        res = self.move(task, self.todo, -1)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("position", res.data)
@@ -5,6 +5,9 @@ Tests for task APIs.
 from datetime import date
 from typing import override
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from core.models import Category, Contact, ListOfTasks, Subtask, Task
 from core.tests.api_test_case import (
     PrivateAPITestCase,
@@ -17,8 +20,10 @@ from core.tests.utils import (
     create_test_category,
     create_test_contact,
     create_test_list_of_tasks,
+    create_test_populated_task,
     create_test_subtask,
     create_test_task,
+    validate_response_data,
 )
 from task.serializers import TaskSerializer
 
@@ -102,6 +107,37 @@ class PrivateTaskAPITests(PrivateAPITestCase):
         """Test retrieving a list of tasks."""
         self.assert_retrieve_models()
 
+    def test_paginate_tasks(self):
+        """Test tasks with equal order in different lists page stably."""
+        other_list_of_tasks = create_test_list_of_tasks(
+            self.user, self.user_list_of_tasks.board, name="DONE", order=1
+        )
+        for order in range(1, 4):
+            for list_of_tasks in (self.user_list_of_tasks, other_list_of_tasks):
+                _ = create_test_task(
+                    user=self.user,
+                    category=self.user_category,
+                    list_of_tasks=list_of_tasks,
+                    order=order,
+                )
+        expected_ids = list(
+            Task.objects.filter(list_of_tasks__board__user=self.user)
+            .order_by("-order", "-id")
+            .values_list("id", flat=True)
+        )
+
+        self.assert_paginates_models(expected_ids, page_size=2)
+
+    def test_forged_cursor_error(self):
+        """Test cursors with keys of the wrong type give error."""
+        self.assert_rejects_forged_cursors(
+            [["abc", 1], [{"a": 1}, 2], [1, None], [[1], 1], [1, "2.5"]]
+        )
+
+    def test_retrieve_tasks_unpaginated(self):
+        """Test retrieving a small list of tasks without pagination."""
+        self.assert_retrieve_unpaginated_models()
+
     def test_retrieve_task(self):
         """Test retrieving tasks."""
         self.assert_retrieve_model(self.user_task.pk)
@@ -241,3 +277,26 @@ class PrivateTaskAPITests(PrivateAPITestCase):
     def test_retrieve_other_user_task_error(self):
         """Test trying to retrieve another users task gives error."""
         self.assert_retrieve_other_user_model_error(self.other_user_task.pk)
+
+    def test_retrieve_tasks_query_count_is_constant(self):
+        """Test listing tasks does not issue queries per task."""
+        url = self.api_url("list", [])
+        with CaptureQueriesContext(connection) as few_tasks:
+            _ = self.client.get(url)
+
+        for index in range(1, 6):
+            _ = create_test_populated_task(self.user, self.user_list_of_tasks, index)
+
+        with CaptureQueriesContext(connection) as many_tasks:
+            res = self.client.get(url)
+
+        self.assertEqual(len(validate_response_data(res)["results"]), 6)
+        self.assertEqual(len(many_tasks), len(few_tasks))
+
+    def test_retrieve_task_query_count(self):
+        """Test retrieving a task loads its relations in bulk."""
+        task = create_test_populated_task(self.user, self.user_list_of_tasks, 1)
+
+        # the ETag, then select task + category, assignees, subtasks
+        with self.assertNumQueries(4):
+            _ = self.client.get(self.api_url("detail", [task.pk]))
@@ -2,12 +2,14 @@
 URL mappings for the task app.
 """
 
+from django.conf import settings
 from django.urls import (
     include,
     path,
 )
 from rest_framework.routers import DefaultRouter
 
+from common.async_views import async_flat_rows_urls
 from task import views
 
 router = DefaultRouter()
@@ -16,5 +18,12 @@ router.register("tasks", views.TaskViewSet)
 app_name = "task"
 
 urlpatterns = [
-    path("", include(router.urls)),
+    path(
+        "",
+        include(
+            async_flat_rows_urls(router, owner_field="owner")
+            if settings.ASYNC_READS
+            else router.urls
+        ),
+    ),
 ]
@@ -2,42 +2,139 @@
 Views for the task APIs.
 """
 
-from typing import override
+from typing import cast, override
 
-from django.db.models import Prefetch
 from django.db.models.query import QuerySet
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.filters import SearchFilter
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
 
-from common.serializers_base import TaskBasedSerializer
+from common.conditional import ConditionalGetMixin
+from common.flat_rows import TASK_ROWS, FlatRowsMixin
+from common.renderers import FastJSONRenderer
+from common.replicas import ReplicaReadMixin
+from common.serializers_base import FieldSelection, TaskBasedSerializer
 from common.views_base import TaskModelViewSet
-from core.models import Subtask, Task
-from task.serializers import TaskSerializer
+from core.models import Category, Contact, SearchDocument, Subtask, Task
+from search.filters import FullTextSearchFilter
+from task.filters import TaskFilter
+from task.serializers import (
+    BulkTaskDeleteSerializer,
+    BulkTaskListSerializer,
+    BulkTaskSerializer,
+    TaskMoveSerializer,
+    TaskSerializer,
+)
+from user.authentication import CachedTokenAuthentication
 
 
-class TaskViewSet(TaskModelViewSet):
+class TaskViewSet(
+    ReplicaReadMixin, ConditionalGetMixin[Task], FlatRowsMixin[Task], TaskModelViewSet
+):
     """View for manage task APIs."""
 
     serializer_class = TaskSerializer
     queryset = Task.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated]
-    filter_backends = [SearchFilter]
+    filter_backends = [FullTextSearchFilter, TaskFilter]
+    search_kind = SearchDocument.TASK
+    flat_rows = TASK_ROWS
+    cursor_ordering = ("-order", "-id")
+    conditional_dependencies = (
+        (Task, "owner"),
+        (Subtask, "owner"),
+        (Category, "user"),
+        (Contact, "user"),
+    )
 
     @override
     def get_queryset(self) -> QuerySet[Task]:
         """Retrieve tasks for authenticated user."""
         assert self.queryset is not None
-        queryset = (
-            self.queryset.filter(list_of_tasks__board__user=self.request.user)
-            .order_by("-order")
-            .prefetch_related(
-                Prefetch("subtasks", queryset=Subtask.objects.order_by("-id"))
+        queryset = self.queryset.filter(owner=self.request.user).order_by("-order")
+        if self.action == "move":
+            return queryset
+
+        return TaskSerializer.plan_queryset(
+            queryset, FieldSelection.from_request(self.request)
+        )
+
+    @override
+    def get_serializer_class(self) -> type[BaseSerializer[Task]]:
+        if self.action == "bulk":
+            if self.request.method == "DELETE":
+                return BulkTaskDeleteSerializer
+            return BulkTaskSerializer
+        if self.action == "move":
+            return TaskMoveSerializer
+        return super().get_serializer_class()
+
+    @action(detail=False, methods=["post", "patch", "delete"])
+    def bulk(self, request: Request) -> Response:
+        """
+        Create (POST), partially update (PATCH) or delete (DELETE) a batch of
+        tasks in one transaction.
+
+        POST and PATCH take a list of tasks, PATCH items identify their task by
+        ``id``; DELETE takes ``{"ids": [...]}``. Invalid batches are rejected
+        as a whole with the errors of each item.
+        """
+        if request.method == "DELETE":
+            serializer = cast(
+                BulkTaskDeleteSerializer, self.get_serializer(data=request.data)
+            )
+            _ = serializer.is_valid(raise_exception=True)
+            _ = serializer.delete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        if request.method == "PATCH":
+            assert self.queryset is not None
+            tasks = self.queryset.filter(owner=request.user)
+            serializer = self.get_serializer(
+                tasks, data=request.data, many=True, partial=True
             )
+        else:
+            serializer = self.get_serializer(data=request.data, many=True)
+        _ = serializer.is_valid(raise_exception=True)
+        saved: list[Task] = cast(BulkTaskListSerializer, serializer).save()
+
+        ids = [task.pk for task in saved]
+        tasks_by_id = TaskSerializer.plan_queryset(
+            Task.objects.filter(pk__in=ids), FieldSelection.from_request(request)
+        ).in_bulk()
+        data = TaskSerializer(
+            [tasks_by_id[pk] for pk in ids],
+            many=True,
+            context=self.get_serializer_context(),
+        ).data
+        return Response(
+            data,
+            status=(
+                status.HTTP_200_OK
+                if request.method == "PATCH"
+                else status.HTTP_201_CREATED
+            ),
         )
 
-        return queryset
+    @action(detail=True, methods=["post"])
+    def move(self, request: Request, pk: int | None = None) -> Response:
+        """
+        Move the task to ``position`` of ``list_of_tasks``, counted from the
+        top, in one transaction.
+
+        Only the task and the siblings whose order has to change are written.
+        The response holds their new order values instead of the full task.
+        """
+        serializer = self.get_serializer(self.get_object(), data=request.data)
+        _ = serializer.is_valid(raise_exception=True)
+        _ = serializer.save()
+        return Response(serializer.data)
 
     @override
     def perform_create(  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -0,0 +1,83 @@
+"""
+Streaming export of a user's dataset as NDJSON or CSV.
+
+Rows are read with ``values().iterator(chunk_size=...)`` and encoded one at a
+time, so memory use does not depend on the size of the dataset. The lines are
+joined into chunks of about ``BUFFER_SIZE`` characters before they are handed
+to the response or file.
+"""
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from typing import Any
+
+from transfer.records import RecordKind, Row
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+def encode_value(value: Any) -> Any:
+    """Return a JSON or CSV friendly version of a ``values()`` value."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def export_rows(user_id: int, kind: RecordKind) -> Iterator[Row]:
+    """Yield the rows of ``kind`` belonging to ``user_id``."""
+    yield from kind.queryset(user_id).iterator(chunk_size=CHUNK_SIZE)
+
+
+def ndjson_lines(user_id: int, kinds: Iterable[RecordKind]) -> Iterator[str]:
+    """Yield one JSON object per row, tagged with its kind in ``type``."""
+    for kind in kinds:
+        for row in export_rows(user_id, kind):
+            yield json.dumps(
+                {"type": kind.name, **row},
+                default=encode_value,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ) + "\n"
+
+
+class _Echo:
+    """File-like object handing back what ``csv.writer`` writes."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, str)):
+        return value
+    return encode_value(value)
+
+
+def csv_lines(user_id: int, kind: RecordKind) -> Iterator[str]:
+    """Yield a header line and one CSV line per row of ``kind``."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(kind.columns)
+    for row in export_rows(user_id, kind):
+        yield writer.writerow([csv_value(row[column]) for column in kind.columns])
+
+
+def buffered(lines: Iterable[str], size: int = BUFFER_SIZE) -> Iterator[str]:
+    """Join ``lines`` into chunks of at least ``size`` characters."""
+    chunk: list[str] = []
+    length = 0
+    for line in lines:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(chunk)
+            chunk = []
+            length = 0
+    if chunk:
+        yield "".join(chunk)
@@ -0,0 +1,628 @@
+"""
+Bulk import of a user's dataset from the NDJSON or CSV files of the export.
+
+Records are parsed one line at a time, converted and validated in Python, and
+inserted in batches of ``BATCH_SIZE`` rows: with ``COPY ... FROM STDIN`` on
+PostgreSQL and ``executemany`` elsewhere. Rows get new primary keys reserved
+up front, and the exported ids are mapped to them in memory so later records
+can refer to earlier ones. Invalid rows are reported and skipped, together
+with the rows referring to them, instead of aborting the import.
+
+Validation runs each field's ``to_python`` and validators, and evaluates the
+model's ``CheckConstraint`` conditions and unique keys (``unique`` fields,
+``unique_together`` and ``UniqueConstraint``) in Python (see ``evaluate``),
+so the inserts themselves do not fail on bad data.
+"""
+
+import csv
+import io
+import json
+import operator
+import re
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast, override
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import (
+    BooleanField,
+    CheckConstraint,
+    Field,
+    ForeignKey,
+    Model,
+    Q,
+    UniqueConstraint,
+)
+from django.utils import timezone
+
+from changefeed.events import ALL_KINDS, RESYNC, ChangeEvent
+from changefeed.publish import publish
+from core.models import User, next_sync_seq
+from response_cache.cache import bump_version
+from search.documents import rebuild as rebuild_search_documents
+from summary.counters import rebuild as rebuild_summary
+from transfer.records import RECORD_KINDS, RecordKind, Row
+
+if TYPE_CHECKING:
+    ModelField = Field[Any, Any]
+else:
+    ModelField = Field
+
+BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+LOOKUPS: dict[str, Callable[[Any, Any], bool]] = {
+    "exact": operator.eq,
+    "regex": lambda value, pattern: re.search(pattern, str(value)) is not None,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda value, choices: value in choices,
+}
+
+
+def lookups(condition: Q) -> Iterator[tuple[str, Any]]:
+    """Yield the ``(path, value)`` lookups of ``condition``, recursively."""
+    for child in condition.children:
+        if isinstance(child, Q):
+            yield from lookups(child)
+        else:
+            yield cast(tuple[str, Any], child)
+
+
+def is_supported(condition: object) -> bool:
+    """Return whether ``evaluate`` can decide ``condition``."""
+    if not isinstance(condition, Q):
+        return False
+    for child in condition.children:
+        if isinstance(child, Q):
+            if not is_supported(child):
+                return False
+            continue
+        lookup = cast(tuple[str, Any], child)[0].partition("__")[2] or "exact"
+        if lookup not in LOOKUPS or "__" in lookup:
+            return False
+    return condition.connector in (Q.AND, Q.OR)
+
+
+def evaluate(condition: Q, values: dict[str, Any]) -> bool:
+    """
+    Evaluate ``condition`` for the field values of one row like the database.
+
+    Only the lookups in ``LOOKUPS`` on local fields are supported. ``None``
+    never matches a lookup, which differs from SQL's unknown result; the
+    constrained columns of the models are all NOT NULL.
+    """
+    results: list[bool] = []
+    for child in condition.children:
+        if isinstance(child, Q):
+            results.append(evaluate(child, values))
+            continue
+        path, expected = cast(tuple[str, Any], child)
+        name, _, lookup = path.partition("__")
+        value = values.get(name)
+        if value is not None and not isinstance(value, (str, int, bool)):
+            value = str(value)
+        results.append(
+            value is not None and LOOKUPS[lookup or "exact"](value, expected)
+        )
+    result = all(results) if condition.connector == Q.AND else any(results)
+    return not result if condition.negated else result
+
+
+@dataclass
+class RowError:
+    """An invalid record, identified by its source and line."""
+
+    source: str
+    line: int
+    kind: str | None
+    id: Any
+    errors: dict[str, list[str]]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "source": self.source,
+            "line": self.line,
+            "kind": self.kind,
+            "id": self.id,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class ImportResult:
+    """Rows created per kind and the first ``MAX_REPORTED_ERRORS`` errors."""
+
+    created: dict[str, int] = field(
+        default_factory=lambda: {kind.name: 0 for kind in RECORD_KINDS}
+    )
+    error_count: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+    def add_error(self, error: RowError) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "created": self.created,
+            "error_count": self.error_count,
+            "errors": [error.as_dict() for error in self.errors],
+        }
+
+
+@dataclass(frozen=True)
+class UniqueKey:
+    """Fields no two rows may share the values of, where ``condition`` holds."""
+
+    name: str
+    fields: tuple[str, ...]
+    condition: Q | None = None
+
+
+def unique_keys(model: type[Model]) -> list[UniqueKey]:
+    """
+    Return the unique keys of ``model`` that ``evaluate`` can check: its
+    ``unique`` fields, ``unique_together`` and ``UniqueConstraint``.
+    """
+    opts = model._meta
+    keys = [
+        UniqueKey(f"{opts.db_table}_{model_field.column}_key", (model_field.name,))
+        for model_field in opts.concrete_fields
+        if model_field.unique and not model_field.primary_key
+    ]
+    keys += [
+        UniqueKey(f"{opts.db_table}_{'_'.join(fields)}_uniq", tuple(fields))
+        for fields in opts.unique_together
+    ]
+    keys += [
+        UniqueKey(
+            constraint.name
+            % {"app_label": opts.app_label, "class": model.__name__.lower()},
+            tuple(constraint.fields),
+            constraint.condition,
+        )
+        for constraint in opts.constraints
+        if isinstance(constraint, UniqueConstraint)
+        and constraint.fields
+        and (constraint.condition is None or is_supported(constraint.condition))
+    ]
+    return keys
+
+
+def pk_field(model: type[Model]) -> ModelField:
+    return model._meta.pk_fields[0]
+
+
+class KindSchema:
+    """How the records of one kind are converted, validated and inserted."""
+
+    def __init__(self, kind: RecordKind, user_id: int, seq: int) -> None:
+        super().__init__()
+        self.kind = kind
+        self.model = kind.model
+        opts = self.model._meta
+        model_fields = {
+            model_field.name: model_field for model_field in opts.concrete_fields
+        }
+        self.has_id = "id" in kind.columns
+        self.fields: dict[str, ModelField] = {
+            column: model_fields[column] for column in kind.columns if column != "id"
+        }
+        self.foreign_keys: dict[str, str] = {
+            column: kind_for_model(model_field.related_model).name
+            for column, model_field in self.fields.items()
+            if isinstance(model_field, ForeignKey)
+        }
+        self.user_field: ModelField | None = model_fields.get(kind.user_lookup)
+        self.user_id = user_id
+        # Imported rows keep their ``updated_at``, the delta sync finds them
+        # by their ``seq``.
+        self.seq_field: ModelField | None = model_fields.get("seq")
+        self.seq = seq
+        self.insert_fields: list[ModelField] = [
+            *([pk_field(self.model)] if self.has_id else []),
+            *self.fields.values(),
+            *([self.user_field] if self.user_field else []),
+            *([self.seq_field] if self.seq_field else []),
+        ]
+        self.checks: list[tuple[str, Q]] = [
+            (constraint.name, constraint.condition)
+            for constraint in opts.constraints
+            if isinstance(constraint, CheckConstraint)
+            and isinstance(constraint.condition, Q)
+            and is_supported(constraint.condition)
+        ]
+        # The checks already validate these fields like their validators.
+        regex_checked = {
+            path.partition("__")[0]
+            for _, condition in self.checks
+            for path, _ in lookups(condition)
+            if path.endswith("__regex")
+        }
+        self.validated_fields = {
+            column
+            for column in self.fields
+            if column not in self.foreign_keys and column not in regex_checked
+        }
+        row_fields = {
+            *self.fields,
+            *([self.user_field.name] if self.user_field else []),
+        }
+        self.uniques = [
+            key for key in unique_keys(self.model) if set(key.fields) <= row_fields
+        ]
+        self.unique_keys = [self.existing_keys(key) for key in self.uniques]
+
+    def existing_keys(self, key: UniqueKey) -> set[tuple[Any, ...]]:
+        """Return the values the user's rows already hold for ``key``."""
+        if self.user_field is None or self.user_field.name not in key.fields:
+            # The rows refer to parents created by this import.
+            return set()
+        queryset = self.model._default_manager.filter(
+            **{self.user_field.name: self.user_id}
+        )
+        if key.condition is not None:
+            queryset = queryset.filter(key.condition)
+        attnames = [
+            (self.fields.get(name) or self.user_field).attname for name in key.fields
+        ]
+        return {
+            tuple(str(value) for value in values)
+            for values in cast(
+                Iterable[tuple[Any, ...]], queryset.values_list(*attnames)
+            )
+        }
+
+    def convert(
+        self, row: Row, id_maps: dict[str, dict[int, int]], from_csv: bool
+    ) -> tuple[dict[str, Any], dict[str, list[str]]]:
+        """Return the field values of ``row`` by field name, and its errors."""
+        values: dict[str, Any] = {}
+        errors: dict[str, list[str]] = {}
+        now = timezone.now()
+        for column, model_field in self.fields.items():
+            raw = row.get(column)
+            if (
+                from_csv
+                and raw == ""
+                and (model_field.null or column in self.foreign_keys)
+            ):
+                raw = None
+            if column in self.foreign_keys:
+                target = self.foreign_keys[column]
+                try:
+                    values[column] = id_maps[target][int(cast(Any, raw))]
+                except (KeyError, TypeError, ValueError):
+                    errors[column] = [f"Unknown {target} {raw!r}."]
+                continue
+            if column not in row or raw is None and not model_field.null:
+                if getattr(model_field, "auto_now", False) or getattr(
+                    model_field, "auto_now_add", False
+                ):
+                    values[column] = now
+                    continue
+                # Text fields default to "" like the model's constructor.
+                values[column] = model_field.get_default()
+                if values[column] is None and not model_field.null:
+                    errors[column] = ["This field is required."]
+                continue
+            try:
+                values[column] = to_python(model_field, raw)
+                if column in self.validated_fields:
+                    model_field.run_validators(values[column])
+            except ValidationError as exc:
+                errors[column] = list(exc.messages)
+        if errors:
+            return values, errors
+
+        if self.user_field is not None:
+            values[self.user_field.name] = self.user_id
+        if self.seq_field is not None:
+            values[self.seq_field.name] = self.seq
+        for name, condition in self.checks:
+            if not evaluate(condition, values):
+                errors.setdefault("non_field_errors", []).append(
+                    f"Violates {name % self.constraint_names}."
+                )
+        return values, errors
+
+    @property
+    def constraint_names(self) -> dict[str, str]:
+        return {
+            "app_label": self.model._meta.app_label,
+            "class": self.model.__name__.lower(),
+        }
+
+    def claim_unique_keys(self, values: dict[str, Any]) -> list[str]:
+        """Record the unique keys of ``values``; return the taken constraints."""
+        keys: list[tuple[set[tuple[Any, ...]], tuple[Any, ...]]] = []
+        taken: list[str] = []
+        for unique_key, seen in zip(self.uniques, self.unique_keys, strict=True):
+            if unique_key.condition is not None and not evaluate(
+                unique_key.condition, values
+            ):
+                continue
+            key = tuple(str(values[name]) for name in unique_key.fields)
+            if key in seen:
+                taken.append(unique_key.name)
+            keys.append((seen, key))
+        if not taken:
+            for seen, key in keys:
+                seen.add(key)
+        return taken
+
+    def db_row(self, pk: int | None, values: dict[str, Any]) -> tuple[Any, ...]:
+        """Return the insert parameters for ``values`` in ``insert_fields`` order."""
+        prepared = [
+            model_field.get_db_prep_save(values[model_field.name], connection)
+            for model_field in self.insert_fields
+            if not model_field.primary_key
+        ]
+        return (pk, *prepared) if self.has_id else tuple(prepared)
+
+
+def kind_for_model(model: Any) -> RecordKind:
+    for kind in RECORD_KINDS:
+        if kind.model is model:
+            return kind
+    raise LookupError(f"{model} is not exported.")
+
+
+def to_python(model_field: ModelField, raw: Any) -> Any:
+    """Convert a JSON or CSV value and validate it like the model field."""
+    if isinstance(model_field, BooleanField) and isinstance(raw, str):
+        lowered = raw.lower()
+        if lowered in ("true", "t", "1"):
+            return True
+        if lowered in ("false", "f", "0"):
+            return False
+    value = model_field.to_python(raw)
+    if not model_field.null and value is None:
+        raise ValidationError("This field may not be null.")
+    return value
+
+
+class BatchWriter:
+    """Reserves primary keys and inserts batches with ``executemany``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.next_ids: dict[type[Model], int] = {}
+
+    def reserve_ids(self, model: type[Model], count: int) -> list[int]:
+        if model not in self.next_ids:
+            table = model._meta.db_table
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT MAX({connection.ops.quote_name(pk_field(model).column)}) "
+                    + f"FROM {connection.ops.quote_name(table)}"
+                )
+                highest = cursor.fetchone()[0] or 0
+                if connection.vendor == "sqlite":
+                    # AUTOINCREMENT never reuses the ids of deleted rows.
+                    cursor.execute(
+                        "SELECT seq FROM sqlite_sequence WHERE name = %s", [table]
+                    )
+                    sequence = cursor.fetchone()
+                    highest = max(highest, sequence[0] if sequence else 0)
+            self.next_ids[model] = highest + 1
+        first = self.next_ids[model]
+        self.next_ids[model] += count
+        return list(range(first, first + count))
+
+    def insert(
+        self,
+        model: type[Model],
+        fields: list[ModelField],
+        rows: list[tuple[Any, ...]],
+    ) -> None:
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(model_field.column) for model_field in fields)
+        placeholders = ", ".join(["%s"] * len(fields))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {quote(model._meta.db_table)} ({columns}) "
+                + f"VALUES ({placeholders})",
+                rows,
+            )
+
+
+class CopyWriter(BatchWriter):
+    """Reserves primary keys from the sequences and inserts with ``COPY``."""
+
+    @staticmethod
+    def copy_data(rows: list[tuple[Any, ...]]) -> str:
+        buffer = io.StringIO()
+        # Quoted empty strings stay strings, the bare empty fields of None
+        # are read as NULL.
+        writer = csv.writer(buffer, quoting=csv.QUOTE_STRINGS)
+        for row in rows:
+            writer.writerow(
+                [
+                    value.isoformat() if hasattr(value, "isoformat") else value
+                    for value in row
+                ]
+            )
+        return buffer.getvalue()
+
+    @override
+    def reserve_ids(self, model: type[Model], count: int) -> list[int]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                + "FROM generate_series(1, %s)",
+                [model._meta.db_table, pk_field(model).column, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @override
+    def insert(
+        self,
+        model: type[Model],
+        fields: list[ModelField],
+        rows: list[tuple[Any, ...]],
+    ) -> None:
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(model_field.column) for model_field in fields)
+        sql = (
+            f"COPY {quote(model._meta.db_table)} ({columns}) "
+            + "FROM STDIN WITH (FORMAT csv)"
+        )
+        data = self.copy_data(rows)
+        with connection.cursor() as cursor:
+            raw_cursor: Any = cursor.cursor
+            if hasattr(raw_cursor, "copy_expert"):  # psycopg2
+                raw_cursor.copy_expert(sql, io.StringIO(data))
+            else:  # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(data)
+
+
+class Importer:
+    """
+    Imports records into one user's dataset.
+
+    Create it and feed it with ``read_ndjson`` and ``read_csv`` inside a
+    transaction, then call ``finish``.
+    """
+
+    def __init__(self, user: User, batch_size: int = BATCH_SIZE) -> None:
+        super().__init__()
+        self.user = user
+        self.batch_size = batch_size
+        self.writer = (
+            CopyWriter() if connection.vendor == "postgresql" else BatchWriter()
+        )
+        seq = next_sync_seq(user.pk)
+        self.schemas = {
+            kind.name: KindSchema(kind, user.pk, seq) for kind in RECORD_KINDS
+        }
+        self.id_maps: dict[str, dict[int, int]] = defaultdict(dict)
+        self.reserved: dict[str, deque[int]] = defaultdict(deque)
+        self.pending: dict[str, list[tuple[Any, ...]]] = defaultdict(list)
+        self.result = ImportResult()
+
+    def read_ndjson(self, lines: Iterable[str], source: str = "ndjson") -> None:
+        """Import NDJSON lines holding objects tagged with their ``type``."""
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record: object = json.loads(line)
+            except ValueError as exc:
+                self.reject(source, number, None, None, {"line": [str(exc)]})
+                continue
+            if not isinstance(record, dict):
+                self.reject(source, number, None, None, {"line": ["Not an object."]})
+                continue
+            row = cast(Row, record)
+            kind = row.get("type")
+            self.add(
+                source, number, kind if isinstance(kind, str) else None, row, False
+            )
+
+    def read_csv(self, lines: Iterable[str], kind: str, source: str = "csv") -> None:
+        """Import CSV lines of ``kind`` with a header line."""
+        for number, row in enumerate(csv.DictReader(lines), start=2):
+            self.add(source, number, kind, row, from_csv=True)
+
+    def add(
+        self, source: str, line: int, kind: str | None, row: Row, from_csv: bool
+    ) -> None:
+        schema = self.schemas.get(kind) if kind is not None else None
+        if schema is None:
+            self.reject(source, line, None, row.get("id"), {"type": ["Unknown type."]})
+            return
+        kind = schema.kind.name
+        source_id: int | None = None
+        if schema.has_id:
+            try:
+                source_id = int(row["id"])
+            except (KeyError, TypeError, ValueError):
+                self.reject(source, line, kind, row.get("id"), {"id": ["Invalid id."]})
+                return
+            if source_id in self.id_maps[kind]:
+                self.reject(source, line, kind, source_id, {"id": ["Duplicate id."]})
+                return
+
+        values, errors = schema.convert(row, self.id_maps, from_csv)
+        if not errors:
+            taken = schema.claim_unique_keys(values)
+            if taken:
+                errors = {"non_field_errors": [f"Violates {name}." for name in taken]}
+        if errors:
+            self.reject(source, line, kind, source_id, errors)
+            return
+
+        pk: int | None = None
+        if source_id is not None:
+            if not self.reserved[kind]:
+                self.reserved[kind] = deque(
+                    self.writer.reserve_ids(schema.model, self.batch_size)
+                )
+            pk = self.reserved[kind].popleft()
+            self.id_maps[kind][source_id] = pk
+        self.pending[kind].append(schema.db_row(pk, values))
+        if len(self.pending[kind]) >= self.batch_size:
+            self.flush(kind)
+
+    def reject(
+        self,
+        source: str,
+        line: int,
+        kind: str | None,
+        source_id: Any,
+        errors: dict[str, list[str]],
+    ) -> None:
+        self.result.add_error(RowError(source, line, kind, source_id, errors))
+
+    def flush(self, kind: str) -> None:
+        rows = self.pending.pop(kind, [])
+        if rows:
+            schema = self.schemas[kind]
+            self.writer.insert(schema.model, schema.insert_fields, rows)
+            self.result.created[kind] += len(rows)
+
+    def finish(self) -> ImportResult:
+        """Insert the remaining rows and rebuild the user's derived data."""
+        for kind in RECORD_KINDS:
+            self.flush(kind.name)
+        # The rows were inserted without signals.
+        _ = rebuild_summary([self.user.pk])
+        _ = rebuild_search_documents([self.user.pk])
+        bump_version(self.user.pk)
+        publish(ChangeEvent(self.user.pk, ALL_KINDS, RESYNC))
+        return self.result
+
+
+def import_dataset(
+    user: User, sources: Iterable[tuple[str, str | None, Iterable[str]]]
+) -> ImportResult:
+    """
+    Import ``(source, kind, lines)`` sources into ``user``'s dataset in one
+    transaction. ``kind`` is ``None`` for NDJSON, else the kind of a CSV file.
+    CSV sources are read in dependency order.
+    """
+    order = {kind.name: index for index, kind in enumerate(RECORD_KINDS)}
+    ordered = sorted(
+        sources, key=lambda item: -1 if item[1] is None else order[item[1]]
+    )
+    with transaction.atomic():
+        importer = Importer(user)
+        for source, kind, lines in ordered:
+            if kind is None:
+                importer.read_ndjson(lines, source)
+            else:
+                importer.read_csv(lines, kind, source)
+        return importer.finish()
+
+
+def text_lines(file: Any) -> Iterator[str]:
+    """Decode a binary upload line by line."""
+    yield from io.TextIOWrapper(file, encoding="utf-8", newline="")
@@ -0,0 +1,62 @@
+"""
+Django command to export a user's dataset.
+"""
+
+from argparse import ArgumentParser
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from transfer.export import buffered, csv_lines, ndjson_lines
+from transfer.records import RECORD_KINDS, RECORD_KINDS_BY_NAME
+
+
+class Command(BaseCommand):
+    """Django command to export a user's dataset."""
+
+    help = (
+        "Stream a user's categories, contacts, boards, lists, tasks, assignees "
+        "and subtasks as NDJSON, or a single kind as CSV, to a file or stdout."
+    )
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument("email", help="Email of the user to export.")
+        _ = parser.add_argument("--output", help="File to write to instead of stdout.")
+        _ = parser.add_argument(
+            "--file-format", choices=["ndjson", "csv"], default="ndjson"
+        )
+        _ = parser.add_argument(
+            "--kind",
+            action="append",
+            dest="kinds",
+            choices=list(RECORD_KINDS_BY_NAME),
+            help="Only export this kind (repeatable, exactly one for CSV).",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        user = User.objects.filter(email=options["email"]).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}.")
+        kinds = [
+            kind
+            for kind in RECORD_KINDS
+            if not options["kinds"] or kind.name in options["kinds"]
+        ]
+        if options["file_format"] == "csv":
+            if len(kinds) != 1:
+                raise CommandError("CSV exports hold exactly one --kind.")
+            lines = csv_lines(user.pk, kinds[0])
+        else:
+            lines = ndjson_lines(user.pk, kinds)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(buffered(lines))
+            self.stdout.write(self.style.SUCCESS(f"Exported to {options['output']}."))
+        else:
+            for chunk in buffered(lines):
+                self.stdout.write(chunk, ending="")
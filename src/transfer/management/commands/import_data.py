@@ -0,0 +1,63 @@
+"""
+Django command to import records into a user's dataset.
+"""
+
+from argparse import ArgumentParser
+from contextlib import ExitStack
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from transfer.importer import import_dataset
+from transfer.records import RECORD_KINDS_BY_NAME
+
+
+class Command(BaseCommand):
+    """Django command to import records into a user's dataset."""
+
+    help = (
+        "Import NDJSON exports, or CSV exports given as KIND=PATH, into a "
+        "user's dataset. Invalid records are skipped and reported."
+    )
+
+    @override
+    def add_arguments(self, parser: ArgumentParser):
+        _ = parser.add_argument("email", help="Email of the user to import into.")
+        _ = parser.add_argument(
+            "paths",
+            nargs="+",
+            help="NDJSON files, or CSV files prefixed with their kind (task=tasks.csv).",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any):
+        """Entrypoint for command."""
+        user = User.objects.filter(email=options["email"]).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}.")
+
+        with ExitStack() as stack:
+            sources: list[tuple[str, str | None, Any]] = []
+            for argument in options["paths"]:
+                kind, separator, path = argument.rpartition("=")
+                if separator and kind not in RECORD_KINDS_BY_NAME:
+                    raise CommandError(f"Unknown kind {kind}.")
+                file = stack.enter_context(open(path, encoding="utf-8", newline=""))
+                sources.append((path, kind or None, file))
+            result = import_dataset(user, sources)
+
+        for error in result.errors:
+            self.stderr.write(
+                f"{error.source}:{error.line}: {error.kind} {error.id}: {error.errors}"
+            )
+        if result.error_count > len(result.errors):
+            self.stderr.write(
+                f"... {result.error_count - len(result.errors)} more invalid records."
+            )
+        created = ", ".join(f"{count} {kind}" for kind, count in result.created.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created}; skipped {result.error_count} records."
+            )
+        )
@@ -0,0 +1,84 @@
+"""
+The record kinds of a user's dataset, shared by export and import.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from django.db.models import Model, QuerySet
+
+from core.models import Board, Category, Contact, ListOfTasks, Subtask, Task
+
+Row = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class RecordKind:
+    """
+    One table of a user's dataset.
+
+    ``columns`` are ``values()`` names; foreign keys are named after the field
+    and hold the related id. ``user_lookup`` leads from the model to its user.
+    """
+
+    name: str
+    model: type[Model]
+    user_lookup: str
+    columns: tuple[str, ...]
+
+    def queryset(self, user_id: int) -> QuerySet[Any, Row]:
+        """Return the rows of ``user_id`` in primary key order."""
+        return (
+            self.model._default_manager.filter(**{self.user_lookup: user_id})
+            .order_by("pk")
+            .values(*self.columns)
+        )
+
+
+# In dependency order: every kind only refers to kinds listed before it.
+RECORD_KINDS = (
+    RecordKind(
+        "category",
+        Category,
+        "user",
+        ("id", "name", "color", "created_at", "updated_at"),
+    ),
+    RecordKind(
+        "contact",
+        Contact,
+        "user",
+        ("id", "name", "email", "phone_number", "created_at", "updated_at"),
+    ),
+    RecordKind("board", Board, "user", ("id", "title", "created_at", "updated_at")),
+    RecordKind(
+        "list",
+        ListOfTasks,
+        "owner",
+        ("id", "board", "name", "order", "created_at", "updated_at"),
+    ),
+    RecordKind(
+        "task",
+        Task,
+        "owner",
+        (
+            "id",
+            "list_of_tasks",
+            "category",
+            "title",
+            "description",
+            "due_date",
+            "priority",
+            "order",
+            "created_at",
+            "updated_at",
+        ),
+    ),
+    RecordKind("assignee", Task.assignees.through, "task__owner", ("task", "contact")),
+    RecordKind(
+        "subtask",
+        Subtask,
+        "owner",
+        ("id", "task", "title", "done", "created_at", "updated_at"),
+    ),
+)
+RECORD_KINDS_BY_NAME = {kind.name: kind for kind in RECORD_KINDS}
@@ -0,0 +1,153 @@
+"""
+Tests for the export APIs.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from collections.abc import Iterable
+from io import StringIO
+from pathlib import Path
+from typing import Any, cast, override
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Task, User
+from core.tests.utils import (
+    TEST_OTHER_USER_EMAIL,
+    create_test_list_of_tasks,
+    create_test_populated_task,
+    create_test_superuser,
+    create_test_task,
+    create_test_user,
+)
+
+EXPORT_URL = reverse("transfer:export")
+
+
+def parse_ndjson(content: bytes) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+class PublicExportAPITests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def test_auth_required(self):
+        """Test auth is required to export."""
+        res = APIClient().get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateExportAPITests(TestCase):
+    """Test authenticated API requests."""
+
+    user = User()
+    other_user = User()
+    task = Task()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.other_user = create_test_user(email=TEST_OTHER_USER_EMAIL)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        list_of_tasks = create_test_list_of_tasks(self.user)
+        self.task = create_test_populated_task(self.user, list_of_tasks, 0)
+        _ = create_test_task(self.other_user, title="Theirs")
+
+    def export(self, **params: Any) -> bytes:
+        res = self.client.get(EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        return b"".join(cast(Iterable[bytes], getattr(res, "streaming_content")))
+
+    def test_export_ndjson(self):
+        """Test every kind is exported in dependency order."""
+        with patch("transfer.export.BUFFER_SIZE", 1):
+            records = parse_ndjson(self.export())
+
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["category", "contact", "board", "list", "task", "assignee", "subtask"],
+        )
+        task = records[4]
+        self.assertEqual(task["id"], self.task.pk)
+        self.assertEqual(task["title"], "Task 0")
+        self.assertEqual(task["list_of_tasks"], self.task.list_of_tasks_id)
+        self.assertEqual(task["due_date"], self.task.due_date.isoformat())
+        self.assertEqual(task["created_at"], self.task.created_at.isoformat())
+        self.assertEqual(
+            records[5],
+            {
+                "type": "assignee",
+                "task": self.task.pk,
+                "contact": self.task.assignees.get().pk,
+            },
+        )
+
+    def test_export_kinds(self):
+        """Test kinds may be restricted."""
+        records = parse_ndjson(self.export(kind=["task", "subtask"]))
+
+        self.assertEqual([record["type"] for record in records], ["task", "subtask"])
+
+    def test_export_csv(self):
+        """Test a single kind is exported as CSV."""
+        content = self.export(file_format="csv", kind="subtask").decode()
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["title"], "Subtask 0")
+        self.assertEqual(rows[0]["done"], "false")
+        self.assertEqual(rows[0]["task"], str(self.task.pk))
+
+    def test_export_csv_requires_one_kind(self):
+        """Test CSV exports of several kinds are rejected."""
+        res = self.client.get(EXPORT_URL, {"file_format": "csv"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("kind", res.json())
+
+    def test_export_other_user_forbidden(self):
+        """Test only staff may export other users' datasets."""
+        res = self.client.get(EXPORT_URL, {"user": self.other_user.pk})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_staff_export_other_user(self):
+        """Test staff may export another user's dataset."""
+        self.client = APIClient()
+        self.client.force_authenticate(create_test_superuser())
+
+        records = parse_ndjson(self.export(user=self.other_user.pk, kind="task"))
+
+        self.assertEqual([record["title"] for record in records], ["Theirs"])
+
+    def test_export_command(self):
+        """Test the command writes the same NDJSON as the API."""
+        expected = self.export()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "export.ndjson"
+
+            _ = call_command(
+                "export_data", self.user.email, output=path, stdout=StringIO()
+            )
+
+            self.assertEqual(path.read_bytes(), expected)
+
+        out = StringIO()
+        _ = call_command(
+            "export_data",
+            self.user.email,
+            file_format="csv",
+            kinds=["board"],
+            stdout=out,
+        )
+        self.assertTrue(out.getvalue().startswith("id,title,created_at,updated_at"))
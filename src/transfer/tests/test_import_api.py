@@ -0,0 +1,274 @@
+"""
+Tests for the import APIs.
+"""
+
+import json
+import tempfile
+from collections.abc import Iterable
+from io import StringIO
+from pathlib import Path
+from typing import Any, cast, override
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models import Q
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from changefeed.brokers import get_broker
+from changefeed.events import ALL_KINDS, RESYNC, ChangeEvent
+from core.models import Board, Contact, SearchDocument, Task, User
+from core.tests.utils import (
+    TEST_OTHER_USER_EMAIL,
+    create_test_board,
+    create_test_list_of_tasks,
+    create_test_populated_task,
+    create_test_user,
+)
+from summary.counters import verify
+from transfer.importer import evaluate
+
+EXPORT_URL = reverse("transfer:export")
+IMPORT_URL = reverse("transfer:import")
+
+
+def upload(name: str, content: bytes) -> SimpleUploadedFile:
+    return SimpleUploadedFile(name, content)
+
+
+def ndjson(*records: dict[str, Any]) -> bytes:
+    return "".join(json.dumps(record) + "\n" for record in records).encode()
+
+
+class EvaluateTests(TestCase):
+    """Test check constraint conditions are evaluated like the database."""
+
+    def test_evaluate(self):
+        """Test lookups, connectors and negation."""
+        condition = Q(name__regex=r"^.{1,5}$") & ~Q(name__regex=r"\s$")
+        condition |= Q(priority__in=[1, 2], order__gte=3)
+
+        self.assertTrue(evaluate(condition, {"name": "abc"}))
+        self.assertFalse(evaluate(condition, {"name": "abc "}))
+        self.assertFalse(evaluate(condition, {"name": "abcdef"}))
+        self.assertTrue(
+            evaluate(condition, {"name": "abcdef", "priority": 2, "order": 3})
+        )
+        self.assertFalse(
+            evaluate(condition, {"name": "abcdef", "priority": 2, "order": 2})
+        )
+
+
+class PublicImportAPITests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def test_auth_required(self):
+        """Test auth is required to import."""
+        res = APIClient().post(IMPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateImportAPITests(TestCase):
+    """Test authenticated API requests."""
+
+    user = User()
+    other_user = User()
+
+    @override
+    def setUp(self):
+        self.user = create_test_user()
+        self.other_user = create_test_user(email=TEST_OTHER_USER_EMAIL)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        board = create_test_board(self.user, title="Sprint board")
+        for index in range(2):
+            list_of_tasks = create_test_list_of_tasks(
+                self.user, board, name=f"List {index}", order=index
+            )
+            _ = create_test_populated_task(self.user, list_of_tasks, index)
+
+    def export(self, **params: Any) -> bytes:
+        res = self.client.get(EXPORT_URL, params)
+        return b"".join(cast(Iterable[bytes], getattr(res, "streaming_content")))
+
+    def import_files(self, **files: bytes) -> dict[str, Any]:
+        self.client = APIClient()
+        self.client.force_authenticate(self.other_user)
+        res = self.client.post(
+            IMPORT_URL,
+            {
+                name: upload(f"{name}.upload", content)
+                for name, content in files.items()
+            },
+            format="multipart",
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.content)
+        return res.json()
+
+    def test_import_round_trip(self):
+        """Test an export imports into another user with the same content."""
+        exported = self.export()
+
+        result = self.import_files(file=exported)
+
+        self.assertEqual(result["error_count"], 0)
+        self.assertEqual(result["created"]["task"], 2)
+        self.assertEqual(result["created"]["assignee"], 2)
+        self.client = APIClient()
+        self.client.force_authenticate(self.other_user)
+        reexported = [json.loads(line) for line in self.export().splitlines()]
+        original = [json.loads(line) for line in exported.splitlines()]
+        references = {"id", "board", "list_of_tasks", "category", "task", "contact"}
+
+        def strip(record: dict[str, Any]) -> dict[str, Any]:
+            return {
+                key: value for key, value in record.items() if key not in references
+            }
+
+        self.assertEqual(list(map(strip, reexported)), list(map(strip, original)))
+        task = Task.objects.get(owner=self.other_user, title="Task 1")
+        self.assertEqual(task.list_of_tasks.board.user, self.other_user)
+        self.assertEqual(task.assignees.get().user, self.other_user)
+        self.assertEqual(verify([self.other_user.pk]), [])
+        self.assertTrue(
+            SearchDocument.objects.filter(user=self.other_user, kind="task").exists()
+        )
+
+    def test_import_skips_invalid_rows(self):
+        """Test invalid rows and rows referring to them are skipped."""
+        records = [json.loads(line) for line in self.export().splitlines()]
+        board = next(record for record in records if record["type"] == "board")
+        lists = [record for record in records if record["type"] == "list"]
+        board["title"] = " padded"
+        lists[1]["board"] = 0
+        records.append({"type": "contact", "id": 999, "name": ""})
+        records.append({"type": "mystery"})
+
+        result = self.import_files(file=ndjson(*records) + b"not json\n")
+
+        self.assertEqual(result["created"]["board"], 0)
+        self.assertEqual(result["created"]["list"], 0)
+        self.assertEqual(result["created"]["task"], 0)
+        self.assertEqual(result["created"]["subtask"], 0)
+        self.assertEqual(result["created"]["category"], 2)
+        self.assertEqual(result["created"]["contact"], 2)
+        self.assertEqual(result["error_count"], 1 + 2 + 2 + 2 + 2 + 3)
+        errors = {(error["kind"], error["id"]): error for error in result["errors"]}
+        self.assertIn("non_field_errors", errors[("board", board["id"])]["errors"])
+        self.assertIn("board", errors[("list", lists[1]["id"])]["errors"])
+        self.assertIn("non_field_errors", errors[("contact", 999)]["errors"])
+        self.assertFalse(Board.objects.filter(user=self.other_user).exists())
+
+    def test_import_rejects_duplicate_unique_keys(self):
+        """Test rows clashing with the user's existing rows are skipped."""
+        _ = Contact.objects.create(
+            user=self.other_user, name="Mine", email="contact0@example.com"
+        )
+        records = [
+            json.loads(line) for line in self.export(kind="contact").splitlines()
+        ]
+
+        result = self.import_files(file=ndjson(*records))
+
+        self.assertEqual(result["created"]["contact"], 1)
+        self.assertEqual(result["error_count"], 1)
+
+    def test_import_rejects_duplicate_assignees(self):
+        """Test a repeated assignee line is skipped, not the whole import."""
+        records = [json.loads(line) for line in self.export().splitlines()]
+        assignee = next(record for record in records if record["type"] == "assignee")
+        records.append(assignee)
+
+        result = self.import_files(file=ndjson(*records))
+
+        self.assertEqual(result["created"]["assignee"], 2)
+        self.assertEqual(result["error_count"], 1)
+        self.assertEqual(
+            result["errors"][0]["errors"],
+            {"non_field_errors": ["Violates core_task_assignees_task_contact_uniq."]},
+        )
+
+    def test_import_runs_field_validators(self):
+        """Test fields without a check constraint are validated too."""
+        records = [
+            {"type": "contact", "id": 1, "name": "Ann", "phone_number": "+4912"},
+            {
+                "type": "contact",
+                "id": 2,
+                "name": "Bob",
+                "phone_number": "+4915112345678",
+            },
+        ]
+
+        result = self.import_files(file=ndjson(*records))
+
+        self.assertEqual(result["created"]["contact"], 1)
+        self.assertEqual(result["errors"][0]["id"], 1)
+        self.assertIn("phone_number", result["errors"][0]["errors"])
+
+    def test_import_csv(self):
+        """Test CSV exports import in dependency order."""
+        files = {
+            kind: self.export(file_format="csv", kind=kind)
+            for kind in ["subtask", "task", "category", "list", "board"]
+        }
+
+        result = self.import_files(**files)
+
+        self.assertEqual(result["error_count"], 0, result["errors"])
+        self.assertEqual(result["created"]["subtask"], 2)
+        self.assertEqual(
+            Task.objects.filter(
+                owner=self.other_user, category__user=self.other_user
+            ).count(),
+            2,
+        )
+
+    def test_import_publishes_resync(self):
+        """Test an import asks the user's change streams to resync."""
+        content = self.export()
+
+        with (
+            patch.object(get_broker(), "publish") as publish,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            _ = self.import_files(file=content)
+
+        publish.assert_called_once_with(
+            ChangeEvent(self.other_user.pk, ALL_KINDS, RESYNC)
+        )
+
+    def test_import_requires_file(self):
+        """Test an upload is required."""
+        res = self.client.post(IMPORT_URL, {}, format="multipart")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_other_user_forbidden(self):
+        """Test only staff may import into other users' datasets."""
+        res = self.client.post(
+            IMPORT_URL,
+            {"user": self.other_user.pk, "file": upload("a.ndjson", b"")},
+            format="multipart",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_command(self):
+        """Test the command imports CSV files in dependency order."""
+        with tempfile.TemporaryDirectory() as directory:
+            paths: list[str] = []
+            for kind in ["list", "board"]:
+                path = Path(directory) / f"{kind}.csv"
+                _ = path.write_bytes(self.export(file_format="csv", kind=kind))
+                paths.append(f"{kind}={path}")
+            out = StringIO()
+
+            _ = call_command("import_data", self.other_user.email, *paths, stdout=out)
+
+        self.assertIn("1 board, 2 list,", out.getvalue())
+        self.assertIn("skipped 0 records", out.getvalue())
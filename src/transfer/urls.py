@@ -0,0 +1,14 @@
+"""
+URL mappings for the transfer app.
+"""
+
+from django.urls import path
+
+from transfer import views
+
+app_name = "transfer"
+
+urlpatterns = [
+    path("export/", views.ExportView.as_view(), name="export"),
+    path("import/", views.ImportView.as_view(), name="import"),
+]
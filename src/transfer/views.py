@@ -0,0 +1,137 @@
+"""
+Views for the transfer APIs.
+"""
+
+from typing import Any, cast, override
+
+from django.http import StreamingHttpResponse
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import User
+from transfer.export import buffered, csv_lines, ndjson_lines
+from transfer.importer import import_dataset, text_lines
+from transfer.records import RECORD_KINDS, RECORD_KINDS_BY_NAME
+from user.authentication import CachedTokenAuthentication
+
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class ExportQuerySerializer(serializers.Serializer[dict[str, Any]]):
+    """Query parameters of an export."""
+
+    # ``format`` is taken by DRF's format suffix override.
+    file_format = serializers.ChoiceField(choices=list(CONTENT_TYPES), default="ndjson")
+    kind = serializers.ListField(
+        child=serializers.ChoiceField(choices=list(RECORD_KINDS_BY_NAME)),
+        required=False,
+    )
+    user = serializers.IntegerField(required=False)
+
+    @override
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if attrs["file_format"] == "csv" and len(attrs.get("kind", [])) != 1:
+            raise serializers.ValidationError(
+                {"kind": ["CSV exports hold exactly one kind."]}
+            )
+        return attrs
+
+
+def target_user_id(request: Request, user_id: int | None) -> int:
+    """Return ``user_id`` if given by staff, else the authenticated user's id."""
+    user = cast(User, request.user)
+    if user_id is None:
+        return user.pk
+    if not user.is_staff:
+        raise PermissionDenied()
+    if not User.objects.filter(pk=user_id).exists():
+        raise NotFound()
+    return user_id
+
+
+class ExportView(APIView):
+    """View for downloading a user's dataset."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> StreamingHttpResponse:
+        """
+        Stream the authenticated user's categories, contacts, boards, lists,
+        tasks, assignees and subtasks as NDJSON, one object per line tagged
+        with its ``type``, in that order. ``kind`` may be repeated to export
+        some of them only; ``file_format=csv`` exports a single kind as CSV.
+        Staff may export another user's dataset with ``user``.
+        """
+        params = ExportQuerySerializer(
+            data={
+                **request.query_params.dict(),
+                "kind": request.query_params.getlist("kind"),
+            }
+        )
+        _ = params.is_valid(raise_exception=True)
+        user_id = target_user_id(request, params.validated_data.get("user"))
+
+        file_format = params.validated_data["file_format"]
+        kind_names = params.validated_data.get("kind")
+        kinds = [
+            kind for kind in RECORD_KINDS if not kind_names or kind.name in kind_names
+        ]
+        lines = (
+            csv_lines(user_id, kinds[0])
+            if file_format == "csv"
+            else ndjson_lines(user_id, kinds)
+        )
+        filename = f"export-{user_id}.{file_format}"
+        if file_format == "csv":
+            filename = f"export-{user_id}-{kinds[0].name}.csv"
+        response = StreamingHttpResponse(
+            buffered(lines), content_type=CONTENT_TYPES[file_format]
+        )
+        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ImportView(APIView):
+    """View for uploading records into a user's dataset."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request: Request) -> Response:
+        """
+        Import an NDJSON export uploaded as ``file``, and/or CSV exports
+        uploaded under the name of their kind (``category``, ``task``...),
+        into the authenticated user's dataset. Ids are reassigned; references
+        between records are resolved within the upload. Invalid records and
+        the records referring to them are skipped and reported in ``errors``.
+        Staff may import into another user's dataset with ``user``.
+        """
+        user = request.data.get("user")
+        try:
+            user_id = target_user_id(request, None if user is None else int(user))
+        except ValueError:
+            raise serializers.ValidationError(
+                {"user": ["A valid integer is required."]}
+            )
+        sources = [
+            (file.name, None, text_lines(file))
+            for file in request.FILES.getlist("file")
+        ] + [
+            (file.name, name, text_lines(file))
+            for name in RECORD_KINDS_BY_NAME
+            for file in request.FILES.getlist(name)
+        ]
+        if not sources:
+            raise serializers.ValidationError(
+                {"file": ["Upload an NDJSON file or CSV files named after their kind."]}
+            )
+
+        result = import_dataset(User.objects.get(pk=user_id), sources)
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED)
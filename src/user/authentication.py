@@ -0,0 +1,291 @@
+"""
+Token authentication backed by an in-process LRU and an optional shared cache.
+"""
+
+import copy
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, cast, override
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+from django.http import HttpRequest
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+
+from core.models import User
+
+CachedCredentials = tuple[User, Token]
+
+
+class TokenCache:
+    """
+    Cache of authenticated ``(user, token)`` pairs keyed by token key.
+
+    Entries live in a bounded in-process LRU for ``local_ttl`` seconds and, if
+    ``cache_alias`` names a Django cache, in that shared cache for ``ttl``
+    seconds. The shared cache also holds a version per user, which every
+    token delete and user save or delete bumps, at once and again after the
+    commit. Entries remember the version they were cached under and every hit,
+    local or shared, checks it, so the other processes stop accepting the
+    token too. Without a shared cache only the process handling the change
+    evicts its entries, and the others keep them for ``local_ttl`` seconds.
+    """
+
+    KEY_PREFIX = "auth:token:"
+    VERSION_PREFIX = "auth:user-version:"
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: int = 300,
+        local_ttl: int = 300,
+        cache_alias: str | None = None,
+    ) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.cache_alias = cache_alias
+        self._entries: OrderedDict[str, tuple[float, CachedCredentials, int | None]] = (
+            OrderedDict()
+        )
+        self._keys_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "TokenCache":
+        config: dict[str, Any] = getattr(settings, "TOKEN_AUTH_CACHE", {})
+        return cls(
+            max_size=config.get("MAX_SIZE", 10_000),
+            ttl=config.get("TTL", 300),
+            local_ttl=config.get("LOCAL_TTL", config.get("TTL", 300)),
+            cache_alias=config.get("CACHE_ALIAS"),
+        )
+
+    @property
+    def shared_cache(self) -> BaseCache | None:
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def user_version(self, user_id: int) -> int | None:
+        """Return the version of ``user_id``, starting one if missing."""
+        shared_cache = self.shared_cache
+        if shared_cache is None:
+            return None
+        key = f"{self.VERSION_PREFIX}{user_id}"
+        version: int | None = shared_cache.get(key)
+        if version is None:
+            # Random, so a version evicted from the cache never comes back.
+            _ = shared_cache.add(key, random.randrange(1, 2**62), timeout=None)
+            version = shared_cache.get(key)
+        return version
+
+    def get(self, key: str) -> CachedCredentials | None:
+        """Return a copy of the cached credentials for ``key``, if any."""
+        hit: tuple[CachedCredentials, int | None] | None = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, credentials, version = entry
+                hit = credentials, version
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                else:
+                    self._remove_local(key)
+                    hit = None
+        if hit is not None:
+            credentials, version = hit
+            if version == self.user_version(self._user_id(credentials)):
+                return self._copy(credentials)
+            with self._lock:
+                self._remove_local(key)
+
+        shared_cache = self.shared_cache
+        if shared_cache is None:
+            return None
+        shared: tuple[CachedCredentials, int | None] | None = shared_cache.get(
+            self.KEY_PREFIX + key
+        )
+        if shared is None:
+            return None
+        credentials, version = shared
+        if version != self.user_version(self._user_id(credentials)):
+            return None
+        self._set_local(key, credentials, version)
+        return self._copy(credentials)
+
+    def set(self, key: str, credentials: CachedCredentials) -> None:
+        version = self.user_version(self._user_id(credentials))
+        self._set_local(key, credentials, version)
+        shared_cache = self.shared_cache
+        if shared_cache is not None:
+            shared_cache.set(self.KEY_PREFIX + key, (credentials, version), self.ttl)
+
+    def invalidate_token(self, key: str, user_id: int | None = None) -> None:
+        """Stop accepting ``key``, in every process if ``user_id`` is given."""
+        with self._lock:
+            self._remove_local(key)
+        shared_cache = self.shared_cache
+        if shared_cache is not None:
+            _ = shared_cache.delete(self.KEY_PREFIX + key)
+            if user_id is not None:
+                self.bump_version(user_id)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            keys = set(self._keys_by_user.get(user_id, ()))
+            for key in keys:
+                self._remove_local(key)
+        shared_cache = self.shared_cache
+        if shared_cache is not None:
+            keys.update(
+                Token.objects.filter(user_id=user_id).values_list("key", flat=True)
+            )
+            shared_cache.delete_many([self.KEY_PREFIX + key for key in keys])
+            self.bump_version(user_id)
+
+    def bump_version(self, user_id: int) -> None:
+        """
+        Retire the entries of ``user_id`` in every process, now and after the
+        commit, so a request reading the old rows before the commit cannot
+        cache them for longer.
+        """
+        self._bump(user_id)
+        transaction.on_commit(lambda: self._bump(user_id))
+
+    def _bump(self, user_id: int) -> None:
+        shared_cache = self.shared_cache
+        if shared_cache is None:
+            return
+        try:
+            _ = shared_cache.incr(f"{self.VERSION_PREFIX}{user_id}")
+        except ValueError:
+            # No version: the next lookup starts a new one.
+            pass
+
+    def clear(self) -> None:
+        """Drop every locally cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _set_local(
+        self, key: str, credentials: CachedCredentials, version: int | None
+    ) -> None:
+        with self._lock:
+            self._remove_local(key)
+            self._entries[key] = (
+                time.monotonic() + self.local_ttl,
+                credentials,
+                version,
+            )
+            self._keys_by_user.setdefault(self._user_id(credentials), set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove_local(next(iter(self._entries)))
+
+    def _remove_local(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = self._user_id(entry[1])
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+    @staticmethod
+    def _user_id(credentials: CachedCredentials) -> int:
+        return cast(int, credentials[0].pk)
+
+    @staticmethod
+    def _copy(credentials: CachedCredentials) -> CachedCredentials:
+        # Requests may modify request.user, so never hand out the cached instance.
+        user, token = credentials
+        user = copy.copy(user)
+        token = copy.copy(token)
+        token.user = user
+        return user, token
+
+
+token_cache = TokenCache.from_settings()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for ``TokenAuthentication`` that skips the token and
+    user lookup while the token is cached.
+
+    Entries are evicted from ``user.signals`` when a token is deleted or its
+    user is saved (e.g. deactivated) or deleted.
+    """
+
+    @override
+    def authenticate_credentials(self, key: str) -> CachedCredentials:
+        credentials = token_cache.get(key)
+        if credentials is not None:
+            return credentials
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, (user, token))
+        return user, token
+
+
+def token_key(request: HttpRequest) -> str | None:
+    """Return the key of the request's ``Authorization: Token <key>`` header."""
+    auth = get_authorization_header(cast(Request, request)).split()
+    if (
+        len(auth) != 2
+        or auth[0].lower() != CachedTokenAuthentication.keyword.lower().encode()
+    ):
+        return None
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        return None
+
+
+async def aauthenticate_token(request: HttpRequest) -> User | None:
+    """
+    Return the user of the request's ``Authorization: Token <key>`` header
+    like ``CachedTokenAuthentication`` with the async ORM, or None if the
+    header is missing or invalid.
+
+    Async views hand requests without a user to the sync view, which answers
+    with the authentication error.
+    """
+    key = token_key(request)
+    return None if key is None else await aauthenticate_key(key)
+
+
+async def aauthenticate_key(key: str) -> User | None:
+    """Return the active user of the token ``key``, or None."""
+    if token_cache.cache_alias is None:
+        credentials = token_cache.get(key)
+    else:
+        # The shared cache's client blocks, so keep it off the event loop.
+        credentials = await sync_to_async(token_cache.get, thread_sensitive=False)(key)
+    if credentials is None:
+        try:
+            token = await Token.objects.select_related("user").aget(key=key)
+        except Token.DoesNotExist:
+            return None
+        user = cast(User, token.user)
+        if not user.is_active:
+            return None
+        credentials = (user, token)
+        if token_cache.cache_alias is None:
+            token_cache.set(key, credentials)
+        else:
+            await sync_to_async(token_cache.set, thread_sensitive=False)(
+                key, credentials
+            )
+    return credentials[0]
@@ -1,13 +1,18 @@
-from typing import Any
+from typing import Any, cast
 
 from django.core.mail import EmailMultiAlternatives
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 from django.template.loader import render_to_string
 from django_rest_passwordreset.models import ResetPasswordToken
 from django_rest_passwordreset.signals import reset_password_token_created
 from django_rest_passwordreset.views import ResetPasswordRequestToken
+from rest_framework.authtoken.models import Token
 
 from app.settings import DEFAULT_FROM_EMAIL
+from core.models import User
+from jobs.queue import enqueue
+from user.authentication import token_cache
 
 
 @receiver(reset_password_token_created)
@@ -28,13 +33,33 @@ def password_reset_token_created(
     :param kwargs:
     :return:
     """
-    # send an e-mail to the user
+    # Sent by a worker, so a slow mail server does not hold up the request.
+    _ = enqueue(
+        send_password_reset_email,
+        token_id=reset_password_token.pk,
+        origin=instance.request.META.get("HTTP_ORIGIN"),
+    )
+
+
+def send_password_reset_email(token_id: int, origin: str | None) -> None:
+    """
+    Job sending the password reset e-mail for a token.
+    Mail server errors are raised, so the job is retried.
+    :param token_id: Primary key of the ResetPasswordToken
+    :param origin: Origin of the frontend that requested the reset
+    """
+    reset_password_token = (
+        ResetPasswordToken.objects.select_related("user").filter(pk=token_id).first()
+    )
+    if reset_password_token is None:
+        # Used or cleared before the job ran.
+        return
     context: dict[str, Any] = {
         "current_user": reset_password_token.user,
         "username": reset_password_token.user.name,
         "email": reset_password_token.user.email,
-        "absolute_uri": instance.request.META.get("HTTP_ORIGIN"),
-        "reset_password_url": f"{instance.request.META.get('HTTP_ORIGIN')}/auth/reset-password?token={reset_password_token.key}",
+        "absolute_uri": origin,
+        "reset_password_url": f"{origin}/auth/reset-password?token={reset_password_token.key}",
     }
 
     # render email text
@@ -48,5 +73,20 @@ def password_reset_token_created(
         [reset_password_token.user.email],
     )
     msg.attach_alternative(email_html_message, "text/html")
-    # TODO: add logging, set fail_silently=False try except that will raise OSError/smtplib.SMTPException
-    _ = msg.send(fail_silently=True)
+    _ = msg.send()
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender: type[Token], instance: Token, **kwargs: Any):
+    """Stop accepting a cached token once it has been deleted."""
+    token_cache.invalidate_token(instance.key, cast(int, getattr(instance, "user_id")))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_user_tokens(sender: type[User], instance: User, **kwargs: Any):
+    """
+    Drop cached credentials of a saved or deleted user, so deactivations,
+    deletions (including guest users) and profile changes take effect at once.
+    """
+    token_cache.invalidate_user(instance.pk)
@@ -0,0 +1,167 @@
+"""
+Tests for the cached token authentication.
+"""
+
+from typing import override
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import User
+from core.tests.utils import create_test_user
+from user.authentication import TokenCache, token_cache
+
+SUMMARY_URL = reverse("summary:summary")
+ME_URL = reverse("user:me")
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating with cached tokens."""
+
+    user = User()
+    token = Token()
+
+    @override
+    def setUp(self):
+        token_cache.clear()
+        self.user = create_test_user()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    @override
+    def tearDown(self):
+        token_cache.clear()
+
+    def test_token_lookup_is_cached(self):
+        """Test only the first request looks the token up."""
+        res = self.client.get(SUMMARY_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(SUMMARY_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any("authtoken_token" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_deleted_token_is_rejected(self):
+        """Test a deleted token is no longer accepted."""
+        _ = self.client.get(SUMMARY_URL)
+        _ = self.token.delete()
+
+        res = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test a deactivated user can no longer authenticate."""
+        _ = self.client.get(SUMMARY_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_guest_user_is_rejected(self):
+        """Test a deleted guest user's token is no longer accepted."""
+        res = self.client.post(reverse("user:create-guest"))
+        guest_client = APIClient()
+        guest_client.credentials(HTTP_AUTHORIZATION=f"Token {res.json()['token']}")
+        self.assertEqual(guest_client.get(ME_URL).status_code, status.HTTP_200_OK)
+
+        res = guest_client.delete(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        res = guest_client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_user_is_a_copy(self):
+        """Test changes to request.user do not leak into the cache."""
+        _ = self.client.get(SUMMARY_URL)
+        credentials = token_cache.get(self.token.key)
+        assert credentials is not None
+        credentials[0].name = "Changed"
+
+        cached = token_cache.get(self.token.key)
+        assert cached is not None
+        self.assertEqual(cached[0].name, self.user.name)
+
+
+class TokenCacheTests(TestCase):
+    """Test the token LRU."""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the cache never grows beyond its maximum size."""
+        cache = TokenCache(max_size=2)
+        users = [create_test_user(f"user{index}@example.com") for index in range(3)]
+        tokens = [Token.objects.create(user=user) for user in users]
+
+        cache.set(tokens[0].key, (users[0], tokens[0]))
+        cache.set(tokens[1].key, (users[1], tokens[1]))
+        _ = cache.get(tokens[0].key)
+        cache.set(tokens[2].key, (users[2], tokens[2]))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(tokens[0].key))
+        self.assertIsNone(cache.get(tokens[1].key))
+
+    def test_expired_entry_is_dropped(self):
+        """Test entries are not served after their TTL."""
+        cache = TokenCache(local_ttl=0)
+        user = create_test_user()
+        token = Token.objects.create(user=user)
+
+        cache.set(token.key, (user, token))
+
+        self.assertIsNone(cache.get(token.key))
+
+    def test_shared_cache_is_invalidated(self):
+        """Test invalidating a user also clears the shared cache."""
+        cache = TokenCache(cache_alias="default")
+        user = create_test_user()
+        token = Token.objects.create(user=user)
+        cache.set(token.key, (user, token))
+        cache.clear()
+
+        self.assertIsNotNone(cache.get(token.key))
+
+        cache.invalidate_user(user.pk)
+        cache.clear()
+
+        self.assertIsNone(cache.get(token.key))
+
+    def test_other_processes_stop_accepting_deleted_tokens(self):
+        """Test a token deleted in one process is rejected by the others."""
+        worker = TokenCache(cache_alias="default")
+        other_worker = TokenCache(cache_alias="default")
+        user = create_test_user()
+        token = Token.objects.create(user=user)
+        worker.set(token.key, (user, token))
+        self.assertIsNotNone(worker.get(token.key))
+
+        other_worker.invalidate_token(token.key, user.pk)
+
+        self.assertIsNone(worker.get(token.key))
+
+    def test_other_processes_stop_accepting_deactivated_users(self):
+        """Test a user saved in one process is looked up again by the others."""
+        worker = TokenCache(cache_alias="default")
+        other_worker = TokenCache(cache_alias="default")
+        user = create_test_user()
+        token = Token.objects.create(user=user)
+        worker.set(token.key, (user, token))
+        other_worker.set(token.key, (user, token))
+
+        user.is_active = False
+        user.save()
+        other_worker.invalidate_user(user.pk)
+
+        self.assertIsNone(worker.get(token.key))
+        self.assertIsNone(other_worker.get(token.key))
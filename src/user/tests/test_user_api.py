@@ -25,6 +25,7 @@ from core.tests.utils import (
     create_test_user,
     validate_response_data,
 )
+from jobs.queue import run_locmem_jobs
 
 CREATE_USER_URL = reverse("user:create")
 CREATE_GUEST_URL = reverse("user:create-guest")
@@ -146,12 +147,17 @@ class PublicUserApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
-    @override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+    @override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        JOBS={"BACKEND": "locmem"},
+    )
     def test_password_reset_api_triggers_email(self):
-        """Test that the password reset API triggers an email."""
+        """Test that the password reset API queues an email."""
         user = create_test_user()
         response = self.client.post(PASSWORD_RESET_URL, {"email": user.email})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(run_locmem_jobs(), 1)
         self.assertEqual(len(mail.outbox), 1)
         email = mail.outbox[0]
         self.assertIn("Password Reset for Join", str(email.subject))
@@ -5,7 +5,6 @@ Views for the user API.
 from typing import Any, cast, override
 
 from rest_framework import (
-    authentication,
     permissions,
     status,
 )
@@ -23,6 +22,7 @@ from common.views_base import (
     UserRetrieveUpdateDestroyAPIView,
 )
 from core.models import User
+from user.authentication import CachedTokenAuthentication
 from user.permissions import IsNotGuestUser
 from user.serializers import AuthTokenSerializer, UserImageSerializer, UserSerializer
 
@@ -55,7 +55,7 @@ class ManageUserView(UserRetrieveUpdateDestroyAPIView):
     """Manage the authenticated user."""
 
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsNotGuestUser]
 
     @override
@@ -66,7 +66,7 @@ class ManageUserView(UserRetrieveUpdateDestroyAPIView):
 
 class UserUploadImageView(UserModelViewSet):
     serializer_class = UserImageSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsNotGuestUser]
 
     @action(methods=["POST"], detail=True, url_path="upload-image")
@@ -0,0 +1,2 @@
+from django.dispatch.dispatcher import Signal as Signal
+from django.dispatch.dispatcher import receiver as receiver
@@ -2,50 +2,54 @@
 This type stub file was generated by pyright.
 """
 
-from typing import Any, Self
+from collections.abc import Iterable
+from typing import Any, ClassVar, Self, TypeVar
 from django.db import models
 
+_M = TypeVar("_M", bound=models.Model, covariant=True)
+_R = TypeVar("_R", covariant=True)
+
 def get_lookup_value(obj, field):  # -> Any | None:
     ...
 
-class OrderedModelQuerySet(models.QuerySet):
-    def get_max_order(self):  # -> Any | None:
-        ...
-
-    def get_min_order(self):  # -> Any | None:
-        ...
-
-    def get_next_order(self):  # -> Any | Literal[0]:
-        ...
-
-    def above(self, order, inclusive=...):  # -> Self:
+class OrderedModelQuerySet(models.QuerySet[_M, _R]):
+    def _get_order_field_name(self) -> str: ...
+    def get_max_order(self) -> int | None: ...
+    def get_min_order(self) -> int | None: ...
+    def get_next_order(self) -> int: ...
+    def above(self, order: int, inclusive: bool = ...) -> Self:
         """Filter items above order."""
         ...
 
-    def above_instance(self, ref, inclusive=...):  # -> Self:
+    def above_instance(self, ref: OrderedModelBase, inclusive: bool = ...) -> Self:
         """Filter items above ref's order."""
         ...
 
-    def below(self, order, inclusive=...):  # -> Self:
+    def below(self, order: int, inclusive: bool = ...) -> Self:
         """Filter items below order."""
         ...
 
-    def below_instance(self, ref, inclusive=...):  # -> Self:
+    def below_instance(self, ref: OrderedModelBase, inclusive: bool = ...) -> Self:
         """Filter items below ref's order."""
         ...
 
-    def decrease_order(self, **extra_kwargs):  # -> int:
+    def decrease_order(self, **extra_kwargs: Any) -> int:
         """Decrease `order_field_name` value by 1."""
         ...
 
-    def increase_order(self, **extra_kwargs):  # -> int:
+    def increase_order(self, **extra_kwargs: Any) -> int:
         """Increase `order_field_name` value by 1."""
         ...
 
-    def bulk_create(self, objs, *args, **kwargs):  # -> list[Any]:
-        ...
+    def bulk_create(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, objs: Iterable[_M], *args: Any, **kwargs: Any
+    ) -> list[_M]: ...
 
-class OrderedModelManager(models.Manager.from_queryset(OrderedModelQuerySet)): ...
+class OrderedModelManager(models.Manager[_M]):
+    def get_queryset(self) -> OrderedModelQuerySet[_M, _M]: ...
+    def get_max_order(self) -> int | None: ...
+    def get_min_order(self) -> int | None: ...
+    def get_next_order(self) -> int: ...
 
 class OrderedModelBase(models.Model):
     """
@@ -60,21 +64,28 @@ class OrderedModelBase(models.Model):
      - specify ``order_class_path`` in case of polymorphic classes
     """
 
-    objects = ...
-    order_field_name = ...
-    order_with_respect_to = ...
-    order_class_path = ...
+    order_field_name: ClassVar[str]
+    order_with_respect_to: Any
+    order_class_path: ClassVar[str | None]
+    _original_wrt_map: dict[str, Any]
+    _was_deleted_via_delete_method: bool
 
     class Meta:
         abstract = ...
 
     def __init__(self, *args, **kwargs) -> None: ...
     @classmethod
-    def get_order_with_respect_to(cls):  # -> tuple[Never] | tuple[Any, ...]:
-        ...
-
-    def get_ordering_queryset(self, qs=..., wrt=...):  # -> QuerySet[Any, Any] | Any:
-        ...
+    def get_order_with_respect_to(cls) -> tuple[str, ...]: ...
+    def _wrt_map(self) -> dict[str, Any]: ...
+    def get_ordering_queryset(
+        self,
+        qs: models.QuerySet[Any, Any] | None = ...,
+        wrt: dict[str, Any] | None = ...,
+    ) -> OrderedModelQuerySet[Self, Self]: ...
+    @classmethod
+    def _on_ordered_model_delete(
+        cls, sender: Any = ..., instance: Any = ..., **kwargs: Any
+    ) -> None: ...
 
     def previous(self):  # -> Any:
         """
@@ -89,8 +100,9 @@ class OrderedModelBase(models.Model):
         ...
 
     def save(self, *args: Any, **kwargs: Any) -> None: ...
-    def delete(self, *args, extra_update=..., **kwargs):  # -> None:
-        ...
+    def delete(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self, *args: Any, extra_update: Any = ..., **kwargs: Any
+    ) -> tuple[int, dict[str, int]]: ...
 
     def swap(self, replacement: OrderedModelBase) -> None:
         """